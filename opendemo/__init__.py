@@ -7,13 +7,18 @@ Open Demo CLI - 智能化的编程学习辅助CLI工具
 __version__ = "0.1.0"
 __author__ = "Open Demo Contributors"
 
-from opendemo.core.demo_repository import DemoRepository, Demo
-from opendemo.core.demo_search import DemoSearch
-from opendemo.services.config_service import ConfigService
+import importlib
 
-# Backward compatibility aliases
-DemoManager = DemoRepository
-SearchEngine = DemoSearch
+# 公开名称 -> (模块, 属性)，首次访问时才导入，避免 `import opendemo` 拖慢CLI启动
+_LAZY_ATTRIBUTES = {
+    "DemoRepository": ("opendemo.core.demo_repository", "DemoRepository"),
+    "Demo": ("opendemo.core.demo_repository", "Demo"),
+    "DemoSearch": ("opendemo.core.demo_search", "DemoSearch"),
+    "ConfigService": ("opendemo.services.config_service", "ConfigService"),
+    # Backward compatibility aliases
+    "DemoManager": ("opendemo.core.demo_repository", "DemoRepository"),
+    "SearchEngine": ("opendemo.core.demo_search", "DemoSearch"),
+}
 
 __all__ = [
     "DemoRepository",
@@ -23,3 +28,16 @@ __all__ = [
     "DemoManager",  # Alias
     "SearchEngine",  # Alias
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = getattr(importlib.import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,22 +4,22 @@ CLI主程序
 命令行接口实现。
 """
 
+import os
 import sys
 import json
 import click
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
+# 注意: AIService(依赖requests)、DemoGenerator、DemoVerifier 由 AppContext 按需创建，
+# QualityChecker、ReadmeUpdater、DemoListUpdater 在需要它们的子命令中按需导入，
+# 保证 search / config 等命令启动时不加载这些模块
 from opendemo.services.config_service import ConfigService
 from opendemo.services.storage_service import StorageService
-from opendemo.services.ai_service import AIService
+from opendemo.services.app_context import AppContext
+from opendemo.services.server_client import ServerClient
 from opendemo.core.demo_repository import DemoRepository
-from opendemo.core.demo_search import DemoSearch
-from opendemo.core.demo_generator import DemoGenerator
-from opendemo.core.demo_verifier import DemoVerifier
-from opendemo.core.readme_updater import ReadmeUpdater
-from opendemo.core.quality_checker import QualityChecker
-from opendemo.core.demo_list_updater import DemoListUpdater
+from opendemo.core.search_index import SearchIndex, PrefixIndex, TrigramIndex
 from opendemo.utils.formatters import (
     print_success,
     print_error,
@@ -42,26 +42,67 @@ README_PATH = Path(__file__).parent.parent / "README.md"
 # Demo列表文件路径
 DEMO_LIST_PATH = Path(__file__).parent.parent / "demo-list.md"
 
+# 输出目录匹配时各字段的权重(文件夹名称、metadata关键字)
+OUTPUT_MATCH_BOOSTS = {"name": 10.0, "keywords": 5.0}
+
+# 相近名称的相似度达到该值时视为拼写错误，提示已有demo而不调用AI生成
+TYPO_SIMILARITY_THRESHOLD = 0.6
+
+# 输出目录扫描结果缓存: {语言目录: (各demo目录及其metadata.json的状态, demo列表)}
+_OUTPUT_SCAN_CACHE: Dict[Tuple[str, str], Tuple[tuple, List[Dict[str, Any]]]] = {}
+
+# 匹配、相近名称提示和补全使用的索引缓存: {缓存键: (文档, 索引)}
+_INDEX_CACHE: Dict[Tuple[str, str], Tuple[tuple, Any]] = {}
+
 
 @click.group()
 @click.version_option(version="0.1.0")
-def cli():
+@click.pass_context
+def cli(ctx):
     """Open Demo - 智能化的编程学习辅助CLI工具"""
     # 初始化日志
     log_file = Path.home() / ".opendemo" / "logs" / "opendemo.log"
     setup_logger(log_file=str(log_file))
+    ctx.obj = _create_context()
 
 
-def _scan_output_demos(output_dir: Path, language: str) -> List[Dict[str, Any]]:
+def _create_context() -> AppContext:
+    """创建应用上下文(服务类在调用时从本模块查找，便于替换)"""
+    return AppContext(
+        config_factory=lambda: ConfigService(),
+        storage_factory=lambda config: StorageService(config),
+        repository_factory=lambda storage, config: DemoRepository(storage, config),
+    )
+
+
+def _get_context() -> AppContext:
+    """
+    获取本次命令执行共享的应用上下文
+
+    Returns:
+        应用上下文，同一次命令执行中的服务只创建一次
+    """
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return _create_context()
+
+    root = ctx.find_root()
+    if not isinstance(root.obj, AppContext):
+        root.obj = _create_context()
+    return root.obj
+
+
+def _scan_output_demos(output_dir: Path, language: str, storage=None) -> List[Dict[str, Any]]:
     """
     扫描输出目录中的demo
 
     Args:
         output_dir: 输出目录路径
         language: 语言名称
+        storage: 存储服务(可选)，提供时通过目录索引读取元数据
 
     Returns:
-        demo信息列表
+        demo信息列表，目录和metadata.json都没有变化时返回与上次相同的demo对象
     """
     demos = []
     lang_dir = output_dir / language.lower()
@@ -69,42 +110,43 @@ def _scan_output_demos(output_dir: Path, language: str) -> List[Dict[str, Any]]:
     if not lang_dir.exists():
         return demos
 
-    for item in lang_dir.iterdir():
-        if item.is_dir():
-            # 尝试读取metadata.json
-            metadata_file = item / "metadata.json"
-            if metadata_file.exists():
-                try:
+    if storage is not None:
+        storage.refresh_index(lang_dir)
+
+    items = [item for item in lang_dir.iterdir() if item.is_dir()]
+    state = tuple((item.name, _file_state(item / "metadata.json")) for item in items)
+    # demo的 path 沿用传入的(可能是相对)路径，因此键同时包含原路径和绝对路径
+    cache_key = (str(lang_dir), str(lang_dir.resolve()))
+    cached = _OUTPUT_SCAN_CACHE.get(cache_key)
+    if cached is not None and cached[0] == state:
+        return list(cached[1])
+
+    for item in items:
+        # 尝试读取metadata.json
+        metadata_file = item / "metadata.json"
+        if metadata_file.exists():
+            try:
+                if storage is not None:
+                    metadata = storage.load_demo_metadata(item)
+                    if metadata is None:
+                        raise ValueError(f"Invalid metadata: {metadata_file}")
+                else:
                     with open(metadata_file, "r", encoding="utf-8") as f:
                         metadata = json.load(f)
-                    demos.append(
-                        {
-                            "path": item,
-                            "name": item.name,
-                            "language": metadata.get("language", language),
-                            "keywords": metadata.get("keywords", []),
-                            "description": metadata.get("description", ""),
-                            "difficulty": metadata.get("difficulty", "beginner"),
-                            "verified": metadata.get("verified", False),
-                            "metadata": metadata,
-                        }
-                    )
-                except Exception:
-                    # 即使没有metadata，也列出目录
-                    demos.append(
-                        {
-                            "path": item,
-                            "name": item.name,
-                            "language": language,
-                            "keywords": [],
-                            "description": "",
-                            "difficulty": "unknown",
-                            "verified": False,
-                            "metadata": {},
-                        }
-                    )
-            else:
-                # 目录存在但没有metadata，也列出
+                demos.append(
+                    {
+                        "path": item,
+                        "name": item.name,
+                        "language": metadata.get("language", language),
+                        "keywords": metadata.get("keywords", []),
+                        "description": metadata.get("description", ""),
+                        "difficulty": metadata.get("difficulty", "beginner"),
+                        "verified": metadata.get("verified", False),
+                        "metadata": metadata,
+                    }
+                )
+            except Exception:
+                # 即使没有metadata，也列出目录
                 demos.append(
                     {
                         "path": item,
@@ -117,30 +159,79 @@ def _scan_output_demos(output_dir: Path, language: str) -> List[Dict[str, Any]]:
                         "metadata": {},
                     }
                 )
+        else:
+            # 目录存在但没有metadata，也列出
+            demos.append(
+                {
+                    "path": item,
+                    "name": item.name,
+                    "language": language,
+                    "keywords": [],
+                    "description": "",
+                    "difficulty": "unknown",
+                    "verified": False,
+                    "metadata": {},
+                }
+            )
 
+    _OUTPUT_SCAN_CACHE[cache_key] = (state, list(demos))
     return demos
 
 
+def _file_state(path: Path) -> Optional[Tuple[int, int]]:
+    """文件的修改时间和大小，不存在时返回None"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _cached_index(cache_key: Tuple[str, str], docs: List[Any], build):
+    """
+    按文档列表缓存索引
+
+    输出目录没有变化时扫描结果是同一批demo对象，逐个比较时直接按对象相同命中。
+
+    Args:
+        cache_key: 缓存键(索引类型, 语言)
+        docs: 文档列表
+        build: 构建索引的函数
+
+    Returns:
+        索引对象
+    """
+    docs = tuple(docs)
+    cached = _INDEX_CACHE.get(cache_key)
+    if cached is not None and cached[0] == docs:
+        return cached[1]
+    index = build()
+    _INDEX_CACHE[cache_key] = (docs, index)
+    return index
+
+
 def _match_demo_in_output(
-    output_dir: Path, language: str, keywords: List[str]
+    output_dir: Path, language: str, keywords: List[str], storage=None
 ) -> Optional[Dict[str, Any]]:
     """
     在输出目录中匹配demo
 
     优先级:
     1. 精确匹配文件夹名称
-    2. 文件夹名称包含关键字
-    3. 关键字在metadata的keywords中
+    2. 文件夹名称以关键字开头
+    3. 文件夹名称包含关键字
+    4. 关键字在metadata的keywords中
 
     Args:
         output_dir: 输出目录路径
         language: 语言名称
         keywords: 搜索关键字
+        storage: 存储服务(可选)，提供时通过目录索引读取元数据
 
     Returns:
         匹配的demo信息，未找到返回None
     """
-    demos = _scan_output_demos(output_dir, language)
+    demos = _scan_output_demos(output_dir, language, storage)
     if not demos:
         return None
 
@@ -148,36 +239,69 @@ def _match_demo_in_output(
     search_term = "-".join(kw.lower() for kw in keywords)
     search_term_single = keywords[0].lower() if keywords else ""
 
-    # 1. 精确匹配文件夹名称
-    for demo in demos:
-        folder_name = demo["name"].lower()
-        if folder_name == search_term or folder_name == search_term_single:
-            return demo
+    # 1. 精确匹配文件夹名称(前缀索引二分查找)
+    language = language.lower()
+    names = _cached_index(
+        ("prefix", language), demos, lambda: PrefixIndex(demos, key=lambda d: d["name"])
+    )
+    for term in (search_term, search_term_single):
+        exact = names.exact(term) if term else []
+        if exact:
+            return exact[0]
+
+    # 2. 文件夹名称以合并后的关键字开头，取名称最短的
+    prefixed = names.prefix(search_term) if search_term else []
+    if prefixed:
+        return min(prefixed, key=lambda d: len(d["name"]))
+
+    # 3/4. 文件夹名称或metadata关键字包含任一关键字(中文按二元组索引)
+    index = _cached_index(
+        ("search", language),
+        demos,
+        lambda: SearchIndex.build(demos, lambda d: d, OUTPUT_MATCH_BOOSTS),
+    )
+    scores: Dict[int, float] = {}
+    for keyword in keywords:
+        for doc_id, score in index.match(keyword).items():
+            scores[doc_id] = scores.get(doc_id, 0.0) + score
 
-    # 2. 文件夹名称包含任一关键字
-    best_match = None
-    best_score = 0
+    if scores:
+        # 同分时取扫描顺序靠前的demo
+        best_id = min(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        return demos[best_id]
 
-    for demo in demos:
-        folder_name = demo["name"].lower()
-        score = 0
+    return None
 
-        for keyword in keywords:
-            kw_lower = keyword.lower()
-            if kw_lower in folder_name:
-                score += 10
-            # 检查metadata中的keywords
-            if any(kw_lower in mk.lower() for mk in demo.get("keywords", [])):
-                score += 5
 
-        if score > best_score:
-            best_score = score
-            best_match = demo
+def _suggest_similar_demos(
+    output_dir: Path, language: str, keywords: List[str], storage, search
+) -> List[Tuple[str, float]]:
+    """
+    查找名称与关键字相近的已有demo(输出目录和本地库)
 
-    if best_score > 0:
-        return best_match
+    Args:
+        output_dir: 输出目录路径
+        language: 语言名称
+        keywords: 搜索关键字
+        storage: 存储服务
+        search: 搜索引擎
 
-    return None
+    Returns:
+        [(demo名称, 相似度)] 列表，按相似度降序
+    """
+    query = "-".join(kw.lower() for kw in keywords)
+    demos = _scan_output_demos(output_dir, language, storage)
+
+    names = _cached_index(
+        ("trigram", language.lower()), demos, lambda: TrigramIndex(d["name"] for d in demos)
+    )
+    similar: Dict[str, float] = {}
+    for name, similarity in names.suggest(query):
+        similar[name] = similarity
+    for name, similarity in search.suggest_demos(query, language):
+        similar[name] = max(similarity, similar.get(name, 0.0))
+
+    return sorted(similar.items(), key=lambda item: (-item[1], item[0]))[:5]
 
 
 def _update_demo_list(storage):
@@ -187,11 +311,16 @@ def _update_demo_list(storage):
     Args:
         storage: 存储服务
     """
+    from opendemo.core.demo_list_updater import DemoListUpdater
+
     logger = get_logger(__name__)
 
     try:
         output_dir = storage.get_output_directory()
-        updater = DemoListUpdater(output_dir, DEMO_LIST_PATH)
+        storage.refresh_index(output_dir)
+        updater = DemoListUpdater(
+            output_dir, DEMO_LIST_PATH, metadata_loader=storage.load_demo_metadata
+        )
         success = updater.update()
 
         if success:
@@ -205,6 +334,16 @@ def _update_demo_list(storage):
         print_warning(f"更新 demo-list.md 失败: {e}")
 
 
+def _print_generation_progress(event: str, value):
+    """显示流式生成进度(文件写入目标目录后立即提示)"""
+    if event == "path":
+        print_info(f"写入目录: {value}")
+    elif event == "file":
+        print_info(f"  已写入 {value}")
+    elif event == "retry":
+        print_warning(f"生成中断，正在重试 (第{value}次)")
+
+
 def _display_output_demo(demo_info: Dict[str, Any], demo_path: Path, language: str):
     """显示输出目录中的demo信息"""
     from rich.console import Console
@@ -366,13 +505,67 @@ def _handle_library_command(
             )
     else:
         print_warning(f"在库 {library_name} 中未找到匹配 '{feature_keyword}' 的功能")
+        suggestions = search.suggest_library_features(language, library_name, feature_keyword)
+        if suggestions:
+            print_info(f"您是不是要找: {', '.join(name for name, _ in suggestions)}")
         print_info(f"使用 'opendemo get python {library_name}' 查看所有可用功能")
         sys.exit(1)
 
 
+def _complete_language(ctx, param, incomplete: str) -> List[str]:
+    """补全语言参数"""
+    return [lang for lang in SUPPORTED_LANGUAGES if lang.startswith(incomplete.lower())]
+
+
+def _complete_get_keywords(ctx, param, incomplete: str) -> List[str]:
+    """
+    补全get命令的关键字
+
+    第一个关键字补全库名和输出目录中的demo名称；
+    第一个关键字是库名时，第二个关键字补全该库的功能名称。
+
+    Args:
+        ctx: click上下文
+        param: 参数
+        incomplete: 已输入的部分
+
+    Returns:
+        候选列表
+    """
+    language = (ctx.params.get("language") or "").lower()
+    if language not in SUPPORTED_LANGUAGES:
+        return []
+
+    previous = list(ctx.params.get("keywords") or [])
+    try:
+        app = _get_context()
+        storage = app.storage
+        repository = app.repository
+
+        if not previous:
+            candidates = set(repository.get_supported_libraries(language))
+            lang_dir = storage.get_output_directory() / language
+            if lang_dir.exists():
+                candidates.update(item.name for item in lang_dir.iterdir() if item.is_dir())
+            candidates = sorted(candidates)
+            index = _cached_index(
+                ("complete", language), candidates, lambda: PrefixIndex(candidates)
+            )
+            return index.prefix(incomplete)
+
+        library = previous[0].lower()
+        if len(previous) == 1 and library in repository.get_supported_libraries(language):
+            return app.search.complete_feature_names(language, library, incomplete)
+    except Exception:
+        # 补全失败时不输出任何候选，避免干扰shell
+        return []
+
+    return []
+
+
 @cli.command()
-@click.argument("language")
-@click.argument("keywords", nargs=-1, required=True)
+@click.argument("language", shell_complete=_complete_language)
+@click.argument("keywords", nargs=-1, required=True, shell_complete=_complete_get_keywords)
 @click.option("--verify", is_flag=True, help="启用自动验证")
 def get(language, keywords, verify):
     """获取demo代码
@@ -392,17 +585,25 @@ def get(language, keywords, verify):
         print_info(f"当前支持的语言: {', '.join(SUPPORTED_LANGUAGES)}")
         sys.exit(1)
 
-    # 初始化服务
-    config = ConfigService()
-    storage = StorageService(config)
-    repository = DemoRepository(storage, config)
-    search = DemoSearch(repository)
-    ai_service = AIService(config)
-    generator = DemoGenerator(ai_service, repository, config)
-    verifier = DemoVerifier(config)
+    # 常驻服务运行时先由其在内存中的目录索引匹配输出目录，命中即可直接显示
+    keywords_list = list(keywords)
+    if keywords_list and keywords_list[-1].lower() != "new":
+        forwarded = _forward_to_server("match", {"language": language, "keywords": keywords_list})
+        matched_demo = forwarded.get("demo") if forwarded else None
+        if matched_demo:
+            print_success(f"在输出目录中找到匹配的demo: {matched_demo['name']}")
+            _display_output_demo(matched_demo, Path(matched_demo["path"]), language)
+            return
+
+    # 初始化服务(AI服务仅在需要生成时创建)
+    app = _get_context()
+    config = app.config
+    storage = app.storage
+    repository = app.repository
+    search = app.search
+    verifier = app.verifier
 
     # 检查是否为库命令
-    keywords_list = list(keywords)
     library_command = repository.detect_library_command(language, keywords_list)
 
     if library_command:
@@ -434,7 +635,7 @@ def get(language, keywords, verify):
         print_progress(f"搜索 {language} - {topic} 的demo")
 
         # 首先在 opendemo_output/<language>/ 目录中匹配
-        matched_demo = _match_demo_in_output(output_dir, language, keywords_list)
+        matched_demo = _match_demo_in_output(output_dir, language, keywords_list, storage)
 
         if matched_demo:
             demo_path = matched_demo["path"]
@@ -461,6 +662,17 @@ def get(language, keywords, verify):
                 sys.exit(1)
             return
 
+        # 生成前检查是否为已有demo的拼写错误，避免重复生成
+        suggestions = _suggest_similar_demos(output_dir, language, keywords_list, storage, search)
+        if suggestions and suggestions[0][1] >= TYPO_SIMILARITY_THRESHOLD:
+            print_warning("未找到完全匹配的demo")
+            print_info(f"您是不是要找: {', '.join(name for name, _ in suggestions)}")
+            print_info(
+                f"使用 'opendemo get {language} <名称>' 获取，"
+                f"或使用 'opendemo get {language} {topic} new' 强制生成"
+            )
+            return
+
     # 未找到或强制生成,使用AI生成
     if force_new:
         print_info(f"强制重新生成: {topic}")
@@ -469,8 +681,8 @@ def get(language, keywords, verify):
 
     print_progress("使用AI生成demo")
 
-    # 检查API密钥
-    if not config.get("ai.api_key"):
+    # 检查API密钥(使用 local / stub 提供方时不需要)
+    if not app.ai_service.router.providers:
         print_error("AI API密钥未配置")
         print_info("请运行: opendemo config set ai.api_key YOUR_KEY")
         sys.exit(1)
@@ -489,8 +701,13 @@ def get(language, keywords, verify):
                 suffix += 1
 
     # 生成demo
-    result = generator.generate(
-        language, topic, difficulty="beginner", custom_folder_name=custom_name
+    result = app.generator.generate(
+        language,
+        topic,
+        difficulty="beginner",
+        custom_folder_name=custom_name,
+        use_cache=not force_new,
+        on_progress=_print_generation_progress,
     )
 
     if not result:
@@ -523,19 +740,12 @@ def search(language, keywords):
         opendemo search python 数据结构  # 按关键字搜索
         opendemo search                 # 列出所有语言
     """
-    # 初始化服务
-    config = ConfigService()
-    storage = StorageService(config)
-
-    # 获取输出目录
-    output_dir = storage.get_output_directory()
-
     # 如果没有指定语言,列出所有语言
     if not language:
+        result = _forward_to_server("search", {}) or _run_search(_get_context(), None, [])
         print_info("可用的语言:")
-        for lang in SUPPORTED_LANGUAGES:
-            output_demos = _scan_output_demos(output_dir, lang)
-            print(f"  - {lang}: {len(output_demos)} 个demo")
+        for lang, count in result["counts"].items():
+            print(f"  - {lang}: {count} 个demo")
 
         print_info("\n使用 'opendemo search <语言>' 查看特定语言的demo")
         return
@@ -546,8 +756,42 @@ def search(language, keywords):
         print_info(f"当前支持的语言: {', '.join(SUPPORTED_LANGUAGES)}")
         sys.exit(1)
 
+    # 常驻服务运行时由其返回结果，否则在本地扫描
+    result = _forward_to_server("search", {"language": language, "keywords": list(keywords)})
+    if result is None:
+        result = _run_search(_get_context(), language, keywords)
+
+    # 显示结果
+    print_search_results(result["demos"])
+
+
+def _run_search(app: AppContext, language: Optional[str], keywords) -> Dict[str, Any]:
+    """
+    执行 search 命令的查询部分(本地执行和常驻服务共用)
+
+    Args:
+        app: 应用上下文
+        language: 语言名称，为空时统计各语言的demo数量
+        keywords: 搜索关键字
+
+    Returns:
+        {"counts": {语言: 数量}} 或 {"demos": [demo信息]}(路径为字符串，可序列化为JSON)
+    """
+    storage = app.storage
+
+    # 获取输出目录
+    output_dir = storage.get_output_directory()
+
+    if not language:
+        return {
+            "counts": {
+                lang: len(_scan_output_demos(output_dir, lang, storage))
+                for lang in SUPPORTED_LANGUAGES
+            }
+        }
+
     # 扫描输出目录中的demo
-    output_demos = _scan_output_demos(output_dir, language)
+    output_demos = _scan_output_demos(output_dir, language, storage)
 
     # 如果有关键字，进行过滤
     if keywords:
@@ -568,8 +812,54 @@ def search(language, keywords):
     # 按名称排序
     output_demos.sort(key=lambda x: x["name"])
 
-    # 显示结果
-    print_search_results(output_demos)
+    return {"demos": [dict(demo, path=str(demo["path"])) for demo in output_demos]}
+
+
+def _run_match(app: AppContext, language: str, keywords: List[str]) -> Dict[str, Any]:
+    """
+    在输出目录中匹配demo(供常驻服务调用)
+
+    Args:
+        app: 应用上下文
+        language: 语言名称
+        keywords: 搜索关键字
+
+    Returns:
+        {"demo": demo信息或None}，库命令交给本地完整流程处理
+    """
+    if language.lower() not in SUPPORTED_LANGUAGES or not keywords:
+        return {"demo": None}
+    if app.repository.detect_library_command(language, list(keywords)):
+        return {"demo": None}
+
+    storage = app.storage
+    matched = _match_demo_in_output(storage.get_output_directory(), language, keywords, storage)
+    return {"demo": dict(matched, path=str(matched["path"])) if matched else None}
+
+
+def _forward_to_server(command: str, payload: Dict[str, Any]) -> Optional[dict]:
+    """
+    将请求转发给正在运行的常驻服务
+
+    Args:
+        command: 命令名
+        payload: 请求参数
+
+    Returns:
+        服务响应，服务未运行或请求失败时返回None
+    """
+    client = ServerClient.from_state_file()
+    if client is None:
+        return None
+    return client.request(command, dict(payload, cwd=os.getcwd()))
+
+
+def _server_handlers() -> Dict[str, Any]:
+    """常驻服务支持的命令"""
+    return {
+        "search": lambda app, p: _run_search(app, p.get("language"), p.get("keywords") or []),
+        "match": lambda app, p: _run_match(app, p.get("language", ""), p.get("keywords") or []),
+    }
 
 
 @cli.command()
@@ -597,19 +887,19 @@ def new(language, topic, difficulty, verify):
         sys.exit(1)
 
     # 初始化服务
-    config = ConfigService()
+    app = _get_context()
+    config = app.config
 
-    # 检查API密钥
-    if not config.get("ai.api_key"):
+    # 检查API密钥(使用 local / stub 提供方时不需要)
+    if not app.ai_service.router.providers:
         print_error("AI API密钥未配置")
         print_info("请运行: opendemo config set ai.api_key YOUR_KEY")
         sys.exit(1)
 
-    storage = StorageService(config)
-    repository = DemoRepository(storage, config)
-    ai_service = AIService(config)
-    generator = DemoGenerator(ai_service, repository, config)
-    verifier = DemoVerifier(config)
+    storage = app.storage
+    repository = app.repository
+    generator = app.generator
+    verifier = app.verifier
 
     # 初始化库相关服务（传入AI服务用于智能判断库名）
 
@@ -640,6 +930,7 @@ def new(language, topic, difficulty, verify):
         difficulty=difficulty,
         save_to_user_library=False,
         library_name=library_name,
+        on_progress=_print_generation_progress,
     )
 
     if not result:
@@ -664,6 +955,331 @@ def new(language, topic, difficulty, verify):
     _update_demo_list(storage)
 
 
+@cli.command()
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option("-j", "--concurrency", type=int, default=None, help="同时进行的生成数")
+@click.option("--language", default=None, help="清单条目未指定语言时使用的语言")
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="把每个条目的结果和AI调用指标(token、耗时、重试)写入JSON报告",
+)
+@click.option(
+    "--journal",
+    "journal_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="任务日志路径(默认为清单旁的 <清单名>.journal.jsonl)",
+)
+@click.option("--fresh", is_flag=True, help="忽略任务日志中的记录，重新生成全部条目")
+def batch(manifest, concurrency, language, report_path, journal_path, fresh):
+    """按主题清单并发批量生成demo
+
+    清单为JSON或YAML文件，可以是条目列表，也可以是带默认值的字典:
+
+    \b
+        language: go
+        difficulty: beginner
+        demos:
+          - goroutines
+          - {topic: select, difficulty: intermediate}
+
+    每个条目的状态(排队、生成中、已生成、已验证、失败)记录在任务日志中，
+    中断后重新运行同一清单时跳过已完成的条目，只重新生成失败和未完成的条目。
+
+    示例:
+        opendemo batch go-topics.yaml -j 8
+        opendemo batch go-topics.yaml --report logs/batch_report.json
+        opendemo batch go-topics.yaml --fresh
+    """
+    from opendemo.core.batch_generator import BatchGenerator, load_manifest
+    from opendemo.core.batch_journal import BatchJournal
+    from opendemo.services.ai_service import AsyncAIService
+
+    entries = load_manifest(Path(manifest), default_language=language)
+    if not entries:
+        print_error(f"清单中没有可生成的demo: {manifest}")
+        sys.exit(1)
+
+    unsupported = sorted({e["language"] for e in entries} - set(SUPPORTED_LANGUAGES))
+    if unsupported:
+        print_error(f"不支持的语言: {', '.join(unsupported)}")
+        print_info(f"当前支持的语言: {', '.join(SUPPORTED_LANGUAGES)}")
+        sys.exit(1)
+
+    app = _get_context()
+    config = app.config
+
+    # 检查API密钥(使用 local / stub 提供方时不需要)
+    if not app.ai_service.router.providers:
+        print_error("AI API密钥未配置")
+        print_info("请运行: opendemo config set ai.api_key YOUR_KEY")
+        sys.exit(1)
+
+    concurrency = concurrency or int(config.get("ai.max_concurrency", 4))
+
+    journal = BatchJournal(Path(journal_path) if journal_path else _journal_path(manifest))
+    if fresh:
+        journal.reset()
+    pending = len(journal.pending(entries))
+    if pending < len(entries):
+        print_info(f"任务日志 {journal.path} 中已完成 {len(entries) - pending} 个，将跳过")
+    print_progress(f"批量生成 {pending} 个demo (并发数: {concurrency})")
+
+    done = [0]
+
+    def report(result):
+        done[0] += 1
+        entry = result["entry"]
+        label = f"[{done[0]}/{len(entries)}] {entry['language']} - {entry['topic']}"
+        if result.get("skipped"):
+            print_info(f"{label}: 已完成，跳过")
+        elif result["success"]:
+            print_success(f"{label} ({result['elapsed']:.1f}s): {result['path']}")
+        else:
+            print_error(f"{label}: {result['error']}")
+
+    async_ai = AsyncAIService(app.ai_service, max_workers=concurrency)
+    try:
+        generator = BatchGenerator(async_ai, app.generator, concurrency, journal=journal)
+        results = generator.run(entries, report)
+    finally:
+        async_ai.close()
+
+    if config.get("enable_verification", False):
+        _verify_batch(app.verifier, journal, [r for r in results if r["success"]])
+
+    succeeded = sum(1 for r in results if r["success"])
+    print_info(f"完成: 成功 {succeeded} 个，失败 {len(results) - succeeded} 个")
+
+    metrics = app.ai_service.metrics
+    totals = metrics.summary()["total"]
+    print_info(
+        f"AI调用 {totals['calls']} 次，重试 {totals['retries']} 次，"
+        f"token {totals['prompt_tokens']} + {totals['completion_tokens']}"
+    )
+    if report_path:
+        extra = {"manifest": str(manifest), "concurrency": concurrency, "results": results}
+        if metrics.write_report(Path(report_path), extra):
+            print_info(f"报告已保存至: {report_path}")
+
+    if succeeded:
+        _update_demo_list(app.storage)
+    if succeeded < len(results):
+        sys.exit(1)
+
+
+def _journal_path(manifest) -> Path:
+    """清单默认的任务日志路径"""
+    manifest = Path(manifest)
+    return manifest.with_name(f"{manifest.stem}.journal.jsonl")
+
+
+def _verify_batch(verifier, journal, results):
+    """验证批量生成中已生成但尚未验证的demo，并记录到任务日志"""
+    from opendemo.core.batch_journal import FAILED, GENERATED, VERIFIED
+
+    verified_keys = set()
+    for result in results:
+        entry = result["entry"]
+        key = journal.key(entry)
+        if key in verified_keys or journal.state(entry) != GENERATED:
+            continue
+        verified_keys.add(key)
+
+        print_progress(f"验证 {entry['language']} - {entry['topic']}")
+        outcome = verifier.verify(Path(result["path"]), entry["language"])
+        if outcome.get("verified"):
+            journal.record(entry, VERIFIED, path=result["path"])
+        elif not outcome.get("skipped"):
+            errors = outcome.get("errors") or ["验证未通过"]
+            print_warning(f"验证未通过: {result['path']}")
+            journal.record(
+                entry,
+                FAILED,
+                path=result["path"],
+                error=f"验证未通过: {errors[0]}",
+                verification_failed=True,
+            )
+
+
+@cli.command()
+@click.argument("names", nargs=-1)
+@click.option("--all", "verify_all", is_flag=True, help="验证demo库中的全部demo")
+@click.option("--language", default=None, help="只验证指定语言的demo")
+@click.option("-j", "--jobs", type=int, default=None, help="同时验证的demo数(默认为CPU核数)")
+@click.option("--timeout", type=float, default=None, help="单个demo的验证超时(秒)")
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="把每个demo的验证结果和汇总写入JSON报告",
+)
+@click.option(
+    "--prefetch", is_flag=True, help="只把Python demo的依赖下载到本地wheel目录，供离线验证使用"
+)
+@click.option("--force", is_flag=True, help="忽略验证结果缓存，重新验证全部demo")
+def verify(names, verify_all, language, jobs, timeout, report_path, prefetch, force):
+    """并行验证demo
+
+    NAMES 为demo名称或demo目录路径。每个demo在独立的工作进程中验证，
+    超时的demo被终止并记为 timeout，不影响其他demo。验证结果写回各demo的
+    metadata.json(verified 字段)，语言不支持或工具链不可用的demo记为 skipped，不改变该字段。
+    内容和工具链都没有变化的demo直接使用上次的验证结果。
+
+    示例:
+        opendemo verify --all -j 8
+        opendemo verify --all --language go --report logs/verify_report.json
+        opendemo verify python/logging-basics
+        opendemo verify --all --language python --prefetch
+        opendemo verify --all --force
+    """
+    from opendemo.core.bulk_verifier import FAILED, BulkVerifier
+
+    if not names and not verify_all:
+        print_error("请指定要验证的demo，或使用 --all 验证全部demo")
+        sys.exit(1)
+
+    app = _get_context()
+    demos = _resolve_verify_demos(app.repository, app.storage, names, verify_all, language)
+    if not demos:
+        print_error("没有找到要验证的demo")
+        sys.exit(1)
+
+    if prefetch:
+        _prefetch_wheels(app.verifier, demos)
+        return
+
+    bulk = BulkVerifier(app.config, workers=jobs, job_timeout=timeout, use_cache=not force)
+    print_progress(f"验证 {len(demos)} 个demo (并行数: {bulk.workers})")
+
+    done = [0]
+    labels = {
+        "verified": print_success,
+        "partial": print_success,
+        "failed": print_error,
+        "timeout": print_warning,
+        "error": print_error,
+        "skipped": print_warning,
+    }
+
+    def report(result):
+        done[0] += 1
+        label = f"[{done[0]}/{len(demos)}] {result['language']} - {result['name']}"
+        cached = ", 缓存" if result.get("cached") else ""
+        message = f"{label}: {result['status']} ({result['elapsed']:.1f}s{cached})"
+        errors = result.get("errors") or [result.get("error") or result.get("message")]
+        if not result.get("verified") and errors[0]:
+            message += f" - {errors[0]}"
+        labels.get(result["status"], print_info)(message)
+
+    jobs_list = [{"name": d.name, "path": str(d.path), "language": d.language} for d in demos]
+    results = bulk.run(jobs_list, report)
+
+    # 批量写回验证状态: 通过的标记为已验证，明确失败的取消标记(超时、错误和跳过不改变)
+    updates = []
+    for demo, result in zip(demos, results):
+        if result.get("verified"):
+            updates.append((demo, {"verified": True}))
+        elif result["status"] == FAILED:
+            updates.append((demo, {"verified": False}))
+    app.repository.update_metadata_many(updates)
+
+    summary = bulk.summarize(results)
+    print_info(
+        f"完成: 通过 {summary['passed']} 个，失败 {summary['failed']} 个，"
+        f"超时 {summary['timeout']} 个，错误 {summary['error']} 个，"
+        f"跳过 {summary['skipped']} 个，使用缓存结果 {summary['cached']} 个"
+    )
+    if report_path and bulk.write_report(Path(report_path), results):
+        print_info(f"报告已保存至: {report_path}")
+
+    if summary["passed"] + summary["skipped"] < summary["total"]:
+        sys.exit(1)
+
+
+def _prefetch_wheels(verifier, demos):
+    """下载Python demo的依赖到本地wheel目录"""
+    requirements = [
+        demo.path / "requirements.txt"
+        for demo in demos
+        if demo.language.lower() == "python" and (demo.path / "requirements.txt").exists()
+    ]
+    if not requirements:
+        print_info("所选demo没有需要下载的Python依赖")
+        return
+
+    print_progress(f"下载 {len(requirements)} 个demo的依赖")
+    result = verifier.prefetch(requirements)
+    if result["wheelhouse"] is None:
+        print_error("未配置wheel目录")
+        print_info("请运行: opendemo config set verification_wheelhouse PATH")
+        sys.exit(1)
+
+    for failure in result["failed"]:
+        print_error(f"{failure['file']}: {failure['error']}")
+    print_info(
+        f"完成: 成功 {result['prefetched']} 组依赖，失败 {len(result['failed'])} 个，"
+        f"wheel目录: {result['wheelhouse']}"
+    )
+    if result["failed"]:
+        sys.exit(1)
+
+
+def _resolve_verify_demos(
+    repository, storage, names, verify_all: bool, language: Optional[str]
+) -> list:
+    """
+    确定要验证的demo
+
+    名称在输出目录和demo库(用户库、内置库)中查找。
+
+    Args:
+        repository: demo仓库
+        storage: 存储服务
+        names: demo名称、<语言>/<目录名> 或demo目录路径
+        verify_all: 是否验证全部demo
+        language: 语言过滤
+
+    Returns:
+        Demo对象列表(去重，保持顺序)
+    """
+
+    def load_catalog() -> list:
+        output_demos = [repository.load_demo(p) for p in storage.list_output_demos(language)]
+        return [d for d in output_demos if d] + repository.load_all_demos(language=language)
+
+    if verify_all:
+        demos = load_catalog()
+    else:
+        demos = []
+        catalog = None
+        for name in names:
+            path = Path(name)
+            demo = repository.load_demo(path) if (path / "metadata.json").exists() else None
+            if demo is None:
+                if catalog is None:
+                    catalog = load_catalog()
+                matches = [
+                    d
+                    for d in catalog
+                    if name in (d.name, d.path.name, f"{d.language}/{d.path.name}")
+                ]
+                if not matches:
+                    print_warning(f"未找到demo: {name}")
+                demos.extend(matches)
+            elif not language or demo.language == language:
+                demos.append(demo)
+
+    unique = {}
+    for demo in demos:
+        unique.setdefault(str(demo.path.absolute()), demo)
+    return list(unique.values())
+
+
 @cli.group()
 def config():
     """配置管理"""
@@ -674,7 +1290,7 @@ def config():
 @click.option("--api-key", prompt="AI API密钥", help="AI服务API密钥")
 def config_init(api_key):
     """初始化配置"""
-    config_service = ConfigService()
+    config_service = _get_context().config
     config_service.init_config(api_key=api_key)
     print_success(f"配置文件已创建: {config_service.global_config_path}")
 
@@ -690,7 +1306,7 @@ def config_set(key, value, is_global):
         opendemo config set ai.api_key sk-xxx
         opendemo config set enable_verification true
     """
-    config_service = ConfigService()
+    config_service = _get_context().config
 
     # 转换值类型
     if value.lower() in ("true", "false"):
@@ -710,7 +1326,7 @@ def config_get(key):
     示例:
         opendemo config get ai.model
     """
-    config_service = ConfigService()
+    config_service = _get_context().config
     value = config_service.get(key)
 
     if value is not None:
@@ -726,7 +1342,7 @@ def config_get(key):
 @config.command("list")
 def config_list():
     """列出所有配置"""
-    config_service = ConfigService()
+    config_service = _get_context().config
     all_config = config_service.get_all()
     print_config_list(all_config)
 
@@ -746,6 +1362,7 @@ def check(verbose):
     from rich.console import Console
     from rich.table import Table
     from rich import box
+    from opendemo.core.quality_checker import QualityChecker
 
     console = Console()
 
@@ -808,6 +1425,58 @@ def check(verbose):
         sys.exit(1)
 
 
+@cli.command()
+@click.option("--host", default="127.0.0.1", help="监听地址")
+@click.option("--port", default=0, type=int, help="监听端口(默认自动分配)")
+@click.option("--stop", is_flag=True, help="停止正在运行的服务")
+def serve(host, port, stop):
+    """启动常驻服务，在内存中保持目录索引，加速 search / get 查询
+
+    服务运行期间 search 和 get(匹配已有demo)会自动转发给服务，
+    服务未运行时回退到本地执行。
+
+    示例:
+        opendemo serve          # 前台运行，Ctrl+C 停止
+        opendemo serve --stop   # 停止正在运行的服务
+    """
+    client = ServerClient.from_state_file()
+
+    if stop:
+        if client is None or client.request("shutdown") is None:
+            print_warning("没有正在运行的服务")
+        else:
+            print_success("服务已停止")
+        return
+
+    if client is not None and client.request("ping") is not None:
+        print_warning("服务已在运行，使用 'opendemo serve --stop' 停止")
+        return
+
+    from opendemo.services.catalog_watcher import CatalogWatcher
+    from opendemo.services.demo_server import DemoServer
+
+    app = _get_context()
+    storage = app.storage
+    watcher = CatalogWatcher([storage.get_output_directory(), storage.user_library_path])
+    try:
+        server = DemoServer(app, _server_handlers(), host=host, port=port, watcher=watcher)
+    except OSError as e:
+        print_error(f"启动服务失败: {e}")
+        sys.exit(1)
+
+    # 预热: 构建各语言输出目录的索引，之后由监听器推送的变化精确清除缓存
+    _run_search(app, None, [])
+    backend = watcher.start()
+
+    address, bound_port = server.address
+    print_success(f"服务已启动: http://{address}:{bound_port}")
+    print_info(f"目录监听: {'系统通知' if backend == 'native' else '定时轮询'}，按 Ctrl+C 停止")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
 def _verify_demo(demo, verifier, language, repository):
     """验证demo"""
     print_progress("验证demo可执行性")
@@ -876,6 +1545,8 @@ def _update_readme_after_new(
         demo_name: demo名称
         library_name: 第三方库名称（如果是库demo）
     """
+    from opendemo.core.readme_updater import ReadmeUpdater
+
     logger = get_logger(__name__)
 
     if not README_PATH.exists():
@@ -914,6 +1585,7 @@ def _update_status_md(output_dir: Path, status_path: Path):
     """更新STATUS.md中的Demo统计"""
     import re
     from datetime import datetime
+    from opendemo.core.readme_updater import ReadmeUpdater
 
     updater = ReadmeUpdater(output_dir, status_path.parent / "README.md")
     stats = updater.collect_stats()
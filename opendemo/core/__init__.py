@@ -1,24 +1,44 @@
 """Core business logic modules"""
 
-from opendemo.core.demo_repository import DemoRepository, Demo
-from opendemo.core.demo_search import DemoSearch
-from opendemo.core.demo_generator import DemoGenerator
-from opendemo.core.demo_verifier import DemoVerifier
-from opendemo.core.readme_updater import ReadmeUpdater
-from opendemo.core.quality_checker import QualityChecker
+import importlib
 
-# Backward compatibility aliases
-DemoManager = DemoRepository
-SearchEngine = DemoSearch
+# 公开名称 -> (模块, 属性)，首次访问时才导入子模块
+_LAZY_ATTRIBUTES = {
+    "DemoRepository": ("opendemo.core.demo_repository", "DemoRepository"),
+    "Demo": ("opendemo.core.demo_repository", "Demo"),
+    "DemoSearch": ("opendemo.core.demo_search", "DemoSearch"),
+    "DemoGenerator": ("opendemo.core.demo_generator", "DemoGenerator"),
+    "BatchGenerator": ("opendemo.core.batch_generator", "BatchGenerator"),
+    "DemoVerifier": ("opendemo.core.demo_verifier", "DemoVerifier"),
+    "ReadmeUpdater": ("opendemo.core.readme_updater", "ReadmeUpdater"),
+    "QualityChecker": ("opendemo.core.quality_checker", "QualityChecker"),
+    # Backward compatibility aliases
+    "DemoManager": ("opendemo.core.demo_repository", "DemoRepository"),
+    "SearchEngine": ("opendemo.core.demo_search", "DemoSearch"),
+}
 
 __all__ = [
     "DemoRepository",
     "Demo",
     "DemoSearch",
     "DemoGenerator",
+    "BatchGenerator",
     "DemoVerifier",
     "ReadmeUpdater",
     "QualityChecker",
     "DemoManager",  # Alias
     "SearchEngine",  # Alias
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = getattr(importlib.import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
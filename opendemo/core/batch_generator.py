@@ -0,0 +1,220 @@
+"""
+批量生成模块
+
+读取主题清单，在一个事件循环中并发生成多个demo，并发数受信号量限制。
+AI响应返回后在事件循环线程中通过 DemoGenerator / DemoRepository.create_demo 依次写入，
+避免并发写仓库缓存。清单中重复的条目只生成和写入一次。
+传入任务日志(BatchJournal)时记录每个条目的状态，已生成的条目不再重复生成。
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from opendemo.core.batch_journal import FAILED, GENERATED, IN_FLIGHT, QUEUED
+from opendemo.utils.logger import get_logger
+from opendemo.utils.single_flight import AsyncSingleFlight
+
+logger = get_logger(__name__)
+
+# 清单条目支持的字段
+MANIFEST_FIELDS = ("language", "topic", "difficulty", "library", "folder_name")
+
+
+def load_manifest(path: Path, default_language: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    读取主题清单(JSON或YAML)
+
+    清单可以是条目列表，也可以是包含默认值和 demos 列表的字典::
+
+        language: go
+        difficulty: beginner
+        demos:
+          - goroutines
+          - {topic: select, difficulty: intermediate}
+
+    Args:
+        path: 清单文件路径
+        default_language: 条目和清单都未指定语言时使用的语言
+
+    Returns:
+        条目列表，每个条目包含 language、topic、difficulty，可选 library、folder_name；
+        读取失败返回空列表
+    """
+    path = Path(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.suffix.lower() in (".yaml", ".yml"):
+                import yaml
+
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load manifest {path}: {e}")
+        return []
+
+    defaults = {"language": default_language, "difficulty": "beginner"}
+    if isinstance(data, dict):
+        defaults.update({k: v for k, v in data.items() if k in MANIFEST_FIELDS})
+        data = data.get("demos", [])
+    if not isinstance(data, list):
+        logger.error(f"Manifest {path} must contain a list of demos")
+        return []
+
+    entries = []
+    for i, item in enumerate(data):
+        entry = dict(defaults)
+        if isinstance(item, str):
+            entry["topic"] = item
+        elif isinstance(item, dict):
+            entry.update({k: v for k, v in item.items() if k in MANIFEST_FIELDS})
+        else:
+            logger.warning(f"Skipping invalid manifest entry #{i + 1}: {item!r}")
+            continue
+
+        if not entry.get("language") or not entry.get("topic"):
+            logger.warning(f"Skipping manifest entry #{i + 1} without language or topic")
+            continue
+        entry["language"] = str(entry["language"]).lower()
+        entries.append(entry)
+
+    return entries
+
+
+class BatchGenerator:
+    """批量demo生成器"""
+
+    def __init__(self, async_ai_service, generator, concurrency: int = 4, journal=None):
+        """
+        初始化批量生成器
+
+        Args:
+            async_ai_service: 异步AI服务实例(AsyncAIService)
+            generator: Demo生成器实例，用于补充元数据并保存
+            concurrency: 同时进行的生成数
+            journal: 任务日志(BatchJournal)，None表示不记录
+        """
+        self.ai_service = async_ai_service
+        self.generator = generator
+        self.concurrency = max(1, concurrency)
+        self.journal = journal
+
+    def run(
+        self,
+        entries: List[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        并发生成清单中的所有demo
+
+        Args:
+            entries: 清单条目
+            on_result: 每个条目完成时的回调(在事件循环线程中调用)
+
+        Returns:
+            与条目顺序一致的结果列表，每项包含 entry、success、path、error、elapsed(不含排队时间)；
+            任务日志中已完成的条目 skipped 为True
+        """
+        return asyncio.run(self.run_async(entries, on_result))
+
+    async def run_async(
+        self,
+        entries: List[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        并发生成清单中的所有demo(协程版本)
+
+        Args:
+            entries: 清单条目
+            on_result: 每个条目完成时的回调
+
+        Returns:
+            与条目顺序一致的结果列表
+        """
+        if self.journal is not None:
+            queued = set()
+            for entry in self.journal.pending(entries):
+                key = self.journal.key(entry)
+                if key not in queued:
+                    queued.add(key)
+                    self.journal.record(entry, QUEUED)
+
+        # 信号量需在事件循环内创建
+        semaphore = asyncio.Semaphore(self.concurrency)
+        flights = AsyncSingleFlight()
+        tasks = [self._generate_one(entry, semaphore, flights, on_result) for entry in entries]
+        return list(await asyncio.gather(*tasks))
+
+    async def _generate_one(
+        self,
+        entry: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        flights: AsyncSingleFlight,
+        on_result: Optional[Callable[[Dict[str, Any]], None]],
+    ) -> Dict[str, Any]:
+        """生成单个条目(相同条目合并为一次生成)"""
+        result = {"entry": entry}
+        if self.journal is not None and self.journal.is_done(entry):
+            path = self.journal.get(entry).get("path")
+            result.update(success=True, path=path, error=None, elapsed=0.0, skipped=True)
+        else:
+            key = tuple(str(entry.get(field) or "") for field in MANIFEST_FIELDS)
+            result.update(await flights.do(key, lambda: self._generate_entry(entry, semaphore)))
+
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    async def _generate_entry(
+        self, entry: Dict[str, Any], semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """调用AI生成并保存，返回 success、path、error、elapsed"""
+        language = entry["language"]
+        topic = entry["topic"]
+        difficulty = entry.get("difficulty") or "beginner"
+        outcome = {"success": False, "path": None, "error": None}
+        # 上次生成的demo验证未通过时，缓存的是同一份有问题的响应，需要重新请求
+        fresh = self.journal is not None and self.journal.needs_fresh_response(entry)
+
+        async with semaphore:
+            if self.journal is not None:
+                self.journal.record(entry, IN_FLIGHT)
+            start = time.perf_counter()
+            try:
+                demo_data = await self.ai_service.generate_demo(
+                    language, topic, difficulty, use_cache=not fresh
+                )
+            except Exception as e:
+                logger.error(f"Batch generation failed for {language}/{topic}: {e}")
+                demo_data = None
+                outcome["error"] = str(e)
+
+        if demo_data:
+            saved = self.generator.save_generated(
+                demo_data,
+                language,
+                topic,
+                difficulty=difficulty,
+                custom_folder_name=entry.get("folder_name"),
+                library_name=entry.get("library"),
+            )
+            if saved:
+                outcome["success"] = True
+                outcome["path"] = saved["path"]
+            else:
+                outcome["error"] = "保存demo失败"
+        elif outcome["error"] is None:
+            outcome["error"] = "AI生成失败"
+
+        outcome["elapsed"] = time.perf_counter() - start
+        if self.journal is not None:
+            if outcome["success"]:
+                self.journal.record(
+                    entry, GENERATED, path=outcome["path"], elapsed=round(outcome["elapsed"], 3)
+                )
+            else:
+                self.journal.record(entry, FAILED, error=outcome["error"])
+        return outcome
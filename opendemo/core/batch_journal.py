@@ -0,0 +1,170 @@
+"""
+批量生成任务日志模块
+
+以 JSON Lines 格式记录批量生成中每个条目的状态变化:
+queued(已排队) -> in_flight(生成中) -> generated(已生成) -> verified(已验证)，失败为 failed。
+每次状态变化立即追加并刷盘，进程崩溃或被中断后重新运行时，已生成或已验证的条目被跳过，
+失败以及中断时仍在排队或生成中的条目重新生成。
+生成后验证未通过的条目记录 verification_failed(重新生成成功前的记录都保留该标记)，
+重新生成时不使用缓存的AI响应。
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 条目状态
+QUEUED = "queued"
+IN_FLIGHT = "in_flight"
+GENERATED = "generated"
+VERIFIED = "verified"
+FAILED = "failed"
+
+# 重新运行时跳过的状态
+DONE_STATES = (GENERATED, VERIFIED)
+
+
+class BatchJournal:
+    """批量生成任务日志(线程安全)"""
+
+    def __init__(self, path: Path, key_fields: Optional[Tuple[str, ...]] = None):
+        """
+        打开任务日志，读取已有记录
+
+        Args:
+            path: 日志文件路径(不存在时在首次记录时创建)
+            key_fields: 标识条目的字段，默认为清单条目的全部字段
+        """
+        if key_fields is None:
+            from opendemo.core.batch_generator import MANIFEST_FIELDS as key_fields
+
+        self.path = Path(path)
+        self.key_fields = tuple(key_fields)
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._attempts: Counter = Counter()
+        self._load()
+
+    def key(self, entry: Dict[str, Any]) -> str:
+        """
+        条目的键
+
+        Args:
+            entry: 清单条目
+
+        Returns:
+            由 key_fields 的值拼接而成的字符串
+        """
+        return "|".join(str(entry.get(field) or "") for field in self.key_fields)
+
+    def _load(self):
+        """重放日志文件，得到每个条目的最新状态(忽略中断时写了一半的行)"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not isinstance(record, dict) or "key" not in record:
+                        continue
+                    self._latest[record["key"]] = record
+                    if record.get("state") == IN_FLIGHT:
+                        self._attempts[record["key"]] += 1
+        except OSError as e:
+            logger.error(f"Failed to read batch journal {self.path}: {e}")
+
+    def record(self, entry: Dict[str, Any], state: str, **fields) -> Dict[str, Any]:
+        """
+        追加一条状态记录
+
+        Args:
+            entry: 清单条目
+            state: 新状态
+            **fields: 附加字段(如 path、error、elapsed)
+
+        Returns:
+            写入的记录
+        """
+        key = self.key(entry)
+        with self._lock:
+            if state == IN_FLIGHT:
+                self._attempts[key] += 1
+            record = {
+                "key": key,
+                "state": state,
+                "time": time.time(),
+                "attempt": self._attempts[key],
+                "entry": {f: entry[f] for f in self.key_fields if entry.get(f) is not None},
+            }
+            previous = self._latest.get(key)
+            if previous and previous.get("verification_failed") and state not in DONE_STATES:
+                record["verification_failed"] = True
+            record.update(fields)
+            self._latest[key] = record
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                logger.error(f"Failed to write batch journal {self.path}: {e}")
+        return record
+
+    def get(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """条目的最新记录，没有记录时返回None"""
+        with self._lock:
+            return self._latest.get(self.key(entry))
+
+    def state(self, entry: Dict[str, Any]) -> Optional[str]:
+        """条目的最新状态"""
+        record = self.get(entry)
+        return record.get("state") if record else None
+
+    def is_done(self, entry: Dict[str, Any]) -> bool:
+        """条目是否已生成或已验证"""
+        return self.state(entry) in DONE_STATES
+
+    def needs_fresh_response(self, entry: Dict[str, Any]) -> bool:
+        """条目上次生成的demo是否验证未通过(重新生成时不应使用缓存的AI响应)"""
+        record = self.get(entry)
+        return bool(record and record.get("verification_failed"))
+
+    def pending(self, entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        需要(重新)生成的条目
+
+        Args:
+            entries: 清单条目
+
+        Returns:
+            未完成的条目(保持原顺序)
+        """
+        return [entry for entry in entries if not self.is_done(entry)]
+
+    def counts(self) -> Dict[str, int]:
+        """各状态的条目数"""
+        with self._lock:
+            return dict(Counter(record.get("state") for record in self._latest.values()))
+
+    def reset(self):
+        """清空日志，重新开始"""
+        with self._lock:
+            self._latest.clear()
+            self._attempts.clear()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Failed to remove batch journal {self.path}: {e}")
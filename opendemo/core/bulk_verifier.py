@@ -0,0 +1,298 @@
+"""
+批量验证模块
+
+把多个demo的验证分发到工作进程池中并行执行。每个demo在独立的子进程(及其进程组)中
+调用 DemoVerifier.verify，超过单个任务的超时时间时整个进程组被终止(包括其中的
+pip、go、node 等子进程)，不会拖住其余任务；某个任务崩溃也不影响其他任务。
+结果按输入顺序汇总为一份结构化报告。
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 传给工作进程的验证配置项
+VERIFIER_CONFIG_KEYS = (
+    "cache_directory",
+    "verification_method",
+    "verification_venv_cache",
+    "verification_venv_cache_mb",
+    "verification_wheelhouse",
+    "verification_offline",
+    "verification_cache",
+    "verification_cache_mb",
+    "verification_timeout",
+    "kubernetes.kubectl_timeout",
+    "kubernetes.helm_timeout",
+)
+
+# 任务状态
+VERIFIED = "verified"
+PARTIAL = "partial"
+FAILED = "failed"
+TIMEOUT = "timeout"
+ERROR = "error"
+# 语言不支持或工具链不可用
+SKIPPED = "skipped"
+
+
+class StaticConfig:
+    """只读的扁平配置(工作进程中代替 ConfigService)"""
+
+    def __init__(self, values: Dict[str, Any]):
+        """
+        初始化
+
+        Args:
+            values: 点分键 -> 值
+        """
+        self.values = values
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """获取配置值"""
+        value = self.values.get(key)
+        return default if value is None else value
+
+
+class BulkVerifier:
+    """并行批量验证器"""
+
+    def __init__(
+        self,
+        config_service,
+        workers: Optional[int] = None,
+        job_timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ):
+        """
+        初始化批量验证器
+
+        Args:
+            config_service: 配置服务实例
+            workers: 同时验证的demo数，默认取 verification_workers(0为CPU核数)
+            job_timeout: 单个demo的验证超时(秒)，默认取 verification_job_timeout
+            use_cache: 是否使用验证结果缓存(False时重新验证全部demo，并更新缓存)
+        """
+        self.config = config_service
+        workers = workers or config_service.get("verification_workers") or os.cpu_count()
+        self.workers = max(1, int(workers or 1))
+        self.job_timeout = float(
+            job_timeout or config_service.get("verification_job_timeout", 900)
+        )
+        self.use_cache = use_cache
+
+    def _worker_config(self) -> Dict[str, Any]:
+        """工作进程使用的配置(批量验证总是启用验证)"""
+        values = {key: self.config.get(key) for key in VERIFIER_CONFIG_KEYS}
+        values["enable_verification"] = True
+        if not self.use_cache:
+            values["verification_cache_refresh"] = True
+        return values
+
+    def run(
+        self,
+        jobs: List[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        并行验证
+
+        Args:
+            jobs: 任务列表，每项包含 path、language，可选 name
+            on_result: 每个任务完成时的回调(在工作线程中调用)
+
+        Returns:
+            与任务顺序一致的结果列表，每项为 DemoVerifier.verify 的结果加上
+            name、language、path、status、elapsed
+        """
+        config = self._worker_config()
+
+        def run_one(job):
+            result = self._run_job(job, config)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(run_one, jobs))
+
+    def _worker_command(self) -> List[str]:
+        """启动工作进程的命令"""
+        return [sys.executable, "-m", "opendemo.core.bulk_verifier"]
+
+    def _run_job(self, job: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """在子进程中验证一个demo"""
+        path = Path(job["path"])
+        payload = json.dumps(
+            {"path": str(path), "language": job["language"], "config": config},
+            ensure_ascii=False,
+        )
+        env = dict(os.environ)
+        package_root = str(Path(__file__).resolve().parent.parent.parent)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+        env["PYTHONIOENCODING"] = "utf-8"
+
+        start = time.perf_counter()
+        try:
+            process = subprocess.Popen(
+                self._worker_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+                text=True,
+                encoding="utf-8",
+                start_new_session=os.name != "nt",
+            )
+        except OSError as e:
+            result = _error_result(f"Failed to start verification worker: {e}", ERROR)
+        else:
+            try:
+                stdout, stderr = process.communicate(payload, timeout=self.job_timeout)
+                result = _parse_worker_output(stdout, stderr, process.returncode)
+            except subprocess.TimeoutExpired:
+                _kill_process_group(process)
+                process.communicate()
+                logger.warning(f"Verification of {path} timed out after {self.job_timeout:.0f}s")
+                result = _error_result(
+                    f"Verification timed out after {self.job_timeout:.0f}s", TIMEOUT
+                )
+
+        result.setdefault("status", _status(result))
+        result.update(
+            name=job.get("name") or path.name,
+            language=job["language"],
+            path=str(path),
+            elapsed=round(time.perf_counter() - start, 3),
+        )
+        return result
+
+    @staticmethod
+    def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        汇总验证结果
+
+        Args:
+            results: run 返回的结果
+
+        Returns:
+            总数、各状态数量、使用缓存结果的数量、按语言的通过数和总耗时
+        """
+        counts = {status: 0 for status in (VERIFIED, PARTIAL, FAILED, TIMEOUT, ERROR, SKIPPED)}
+        by_language: Dict[str, Dict[str, int]] = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+            stats = by_language.setdefault(result["language"], {"total": 0, "passed": 0})
+            stats["total"] += 1
+            stats["passed"] += 1 if result.get("verified") else 0
+
+        passed = counts[VERIFIED] + counts[PARTIAL]
+        return {
+            "total": len(results),
+            "passed": passed,
+            **counts,
+            "pass_rate": round(passed / len(results), 4) if results else 0.0,
+            "cached": sum(1 for r in results if r.get("cached")),
+            "by_language": by_language,
+            "cpu_seconds": round(sum(r.get("elapsed", 0) for r in results), 3),
+        }
+
+    def write_report(
+        self,
+        path: Path,
+        results: List[Dict[str, Any]],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        写入JSON验证报告
+
+        Args:
+            path: 报告路径
+            results: run 返回的结果
+            extra: 附加到报告中的字段
+
+        Returns:
+            是否写入成功
+        """
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "workers": self.workers,
+            "job_timeout": self.job_timeout,
+            **(extra or {}),
+            "summary": self.summarize(results),
+            "results": results,
+        }
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            return True
+        except OSError as e:
+            logger.error(f"Failed to write verification report {path}: {e}")
+            return False
+
+
+def _status(result: Dict[str, Any]) -> str:
+    """验证结果对应的状态"""
+    if result.get("verified"):
+        return PARTIAL if result.get("partial") else VERIFIED
+    if result.get("skipped"):
+        return SKIPPED
+    return FAILED
+
+
+def _error_result(message: str, status: str) -> Dict[str, Any]:
+    """没有得到验证结果时的结果"""
+    return {"verified": False, "status": status, "steps": [], "outputs": [], "errors": [message]}
+
+
+def _parse_worker_output(stdout: str, stderr: str, returncode: int) -> Dict[str, Any]:
+    """解析工作进程输出的最后一行JSON"""
+    lines = [line for line in (stdout or "").splitlines() if line.strip()]
+    if lines:
+        try:
+            result = json.loads(lines[-1])
+            if isinstance(result, dict):
+                return result
+        except ValueError:
+            pass
+    detail = (stderr or "").strip()[-500:]
+    return _error_result(f"Verification worker exited with code {returncode}: {detail}", ERROR)
+
+
+def _kill_process_group(process: subprocess.Popen):
+    """终止工作进程及其启动的所有子进程"""
+    try:
+        if os.name != "nt":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _worker_main():
+    """工作进程入口: 从标准输入读取任务，把验证结果作为一行JSON写到标准输出"""
+    from opendemo.core.demo_verifier import DemoVerifier
+
+    job = json.loads(sys.stdin.read())
+    verifier = DemoVerifier(StaticConfig(job["config"]))
+    try:
+        result = verifier.verify(Path(job["path"]), job["language"])
+    except Exception as e:
+        result = _error_result(f"Verification crashed: {e}", ERROR)
+    sys.stdout.write("\n" + json.dumps(result, ensure_ascii=False, default=str) + "\n")
+
+
+if __name__ == "__main__":
+    _worker_main()
@@ -1,12 +1,17 @@
 """Demo生成协调器模块
 
-协调AI服务生成demo，补充元数据。
+协调AI服务生成demo，补充元数据。流式生成时每个文件完整后即写入目标目录旁的
+暂存目录，生成成功后再移入目标目录。
 """
 
+import os
+import shutil
+import threading
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Set
 from pathlib import Path
 from opendemo.utils.logger import get_logger
+from opendemo.utils.single_flight import SingleFlight
 
 logger = get_logger(__name__)
 
@@ -26,6 +31,8 @@ class DemoGenerator:
         self.ai_service = ai_service
         self.repository = demo_repository
         self.config = config_service
+        # 相同请求并发时只调用一次AI并写入一次
+        self._flights = SingleFlight()
 
     def generate(
         self,
@@ -35,6 +42,8 @@ class DemoGenerator:
         save_to_user_library: bool = False,
         custom_folder_name: str = None,
         library_name: str = None,
+        use_cache: bool = True,
+        on_progress: Optional[Callable[[str, Any], None]] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         生成demo
@@ -46,19 +55,113 @@ class DemoGenerator:
             save_to_user_library: 是否保存到用户库
             custom_folder_name: 自定义文件夹名称
             library_name: 库名称，如"numpy"，用于库demo生成
+            use_cache: 是否使用缓存的AI响应
+            on_progress: 进度回调，以 ("path", demo目录)、("file", 文件相对路径)、
+                ("retry", 次数) 调用
 
         Returns:
-            生成结果字典,包含demo路径和信息
+            生成结果字典,包含demo路径和信息；与正在进行的相同请求合并时返回同一结果
         """
+        # 不使用缓存的请求只与同样不使用缓存的请求合并，不会得到缓存响应生成的结果
+        key = (
+            language.lower(),
+            topic,
+            difficulty,
+            save_to_user_library,
+            custom_folder_name,
+            library_name,
+            use_cache,
+        )
+        return self._flights.do(
+            key,
+            self._generate,
+            language,
+            topic,
+            difficulty,
+            save_to_user_library,
+            custom_folder_name,
+            library_name,
+            use_cache,
+            on_progress,
+        )
+
+    def _generate(
+        self,
+        language: str,
+        topic: str,
+        difficulty: str,
+        save_to_user_library: bool,
+        custom_folder_name: Optional[str],
+        library_name: Optional[str],
+        use_cache: bool,
+        on_progress: Optional[Callable[[str, Any], None]],
+    ) -> Optional[Dict[str, Any]]:
+        """执行一次生成(由 generate 合并相同的并发请求后调用)"""
         logger.info(f"Generating demo for {language} - {topic}")
 
-        # 调用AI生成
-        demo_data = self.ai_service.generate_demo(language, topic, difficulty)
+        writer = _StreamWriter(
+            self.repository,
+            language,
+            topic,
+            save_to_user_library=save_to_user_library,
+            custom_folder_name=custom_folder_name,
+            library_name=library_name,
+            on_progress=on_progress,
+        )
+
+        # 调用AI生成(流式响应中的文件完整后由writer立即写入)
+        demo_data = self.ai_service.generate_demo(
+            language, topic, difficulty, use_cache=use_cache, on_stream=writer.handle
+        )
 
         if not demo_data:
             logger.error("Failed to generate demo from AI")
+            writer.discard()
             return None
 
+        written_files = writer.commit()
+
+        return self.save_generated(
+            demo_data,
+            language,
+            topic,
+            difficulty=difficulty,
+            save_to_user_library=save_to_user_library,
+            custom_folder_name=custom_folder_name,
+            library_name=library_name,
+            demo_path=writer.path,
+            written_files=written_files,
+        )
+
+    def save_generated(
+        self,
+        demo_data: Dict[str, Any],
+        language: str,
+        topic: str,
+        difficulty: str = "beginner",
+        save_to_user_library: bool = False,
+        custom_folder_name: str = None,
+        library_name: str = None,
+        demo_path: Optional[Path] = None,
+        written_files: Optional[Set[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        补充元数据并保存AI生成的demo
+
+        Args:
+            demo_data: AI返回的demo数据(包含metadata和files)
+            language: 编程语言
+            topic: 主题
+            difficulty: 难度级别
+            save_to_user_library: 是否保存到用户库
+            custom_folder_name: 自定义文件夹名称
+            library_name: 库名称，如"numpy"，用于库demo生成
+            demo_path: 流式生成时已确定的demo目录
+            written_files: 流式生成时已写入demo_path的文件
+
+        Returns:
+            生成结果字典,包含demo路径和信息
+        """
         # 提取元数据和文件
         metadata = demo_data.get("metadata", {})
         files = demo_data.get("files", [])
@@ -72,14 +175,7 @@ class DemoGenerator:
         metadata["verified"] = False
 
         # 创建demo
-        # 优先级: custom_folder_name > metadata.folder_name > topic生成
-        folder_name = custom_folder_name
-        if not folder_name:
-            # 使用AI返回的folder_name
-            folder_name = metadata.get("folder_name")
-        if not folder_name and library_name:
-            # 库demo使用topic作为文件夹名
-            folder_name = topic.lower().replace(" ", "-").replace("_", "-")
+        folder_name = _demo_folder_name(metadata, topic, custom_folder_name, library_name)
 
         demo = self.repository.create_demo(
             name=metadata.get("name", f"{language}-{topic}"),
@@ -92,6 +188,8 @@ class DemoGenerator:
             save_to_user_library=save_to_user_library,
             custom_folder_name=folder_name,
             library_name=library_name,
+            demo_path=demo_path,
+            written_files=written_files,
         )
 
         if not demo:
@@ -138,4 +236,170 @@ class DemoGenerator:
         self.repository.storage.delete_demo(demo_path)
 
         # 生成新demo
-        return self.generate(language, topic, difficulty)
+        # 重新生成需要新的响应，不使用缓存
+        return self.generate(language, topic, difficulty, use_cache=False)
+
+
+def _demo_folder_name(
+    metadata: Dict[str, Any], topic: str, custom_folder_name: str, library_name: str
+) -> Optional[str]:
+    """
+    确定demo文件夹名
+
+    优先级: custom_folder_name > metadata.folder_name > topic生成(仅库demo)
+    """
+    folder_name = custom_folder_name
+    if not folder_name:
+        # 使用AI返回的folder_name
+        folder_name = metadata.get("folder_name")
+    if not folder_name and library_name:
+        # 库demo使用topic作为文件夹名
+        folder_name = topic.lower().replace(" ", "-").replace("_", "-")
+    return folder_name
+
+
+class _StreamWriter:
+    """流式生成时把完整的文件立即写入暂存目录
+
+    收到元数据后确定目标目录，文件写入目标目录旁以点开头的暂存目录(不会被目录索引和
+    验证缓存计入)，此前到达的文件暂存在内存中。生成成功后 commit 把文件移入目标目录；
+    重试或最终失败时只删除暂存目录，不改动目标目录中已有的文件。
+    """
+
+    def __init__(
+        self,
+        repository,
+        language: str,
+        topic: str,
+        save_to_user_library: bool = False,
+        custom_folder_name: str = None,
+        library_name: str = None,
+        on_progress: Optional[Callable[[str, Any], None]] = None,
+    ):
+        self.repository = repository
+        self.language = language
+        self.topic = topic
+        self.save_to_user_library = save_to_user_library
+        self.custom_folder_name = custom_folder_name
+        self.library_name = library_name
+        self.on_progress = on_progress
+        self.path: Optional[Path] = None
+        self.written: Set[str] = set()
+        self._pending: List[Dict[str, Any]] = []
+        self._staging: Optional[Path] = None
+        # 创建暂存目录时新建的最上层目录(放弃时一并删除)
+        self._created_root: Optional[Path] = None
+
+    def handle(self, event: str, value: Any):
+        """
+        处理AI服务的流式事件
+
+        Args:
+            event: 事件类型(metadata / file / retry)
+            value: 元数据、文件或重试次数
+        """
+        if event == "metadata" and self.path is None:
+            folder_name = _demo_folder_name(
+                value, self.topic, self.custom_folder_name, self.library_name
+            )
+            self.path = self.repository.resolve_demo_path(
+                value.get("name", f"{self.language}-{self.topic}"),
+                self.language,
+                save_to_user_library=self.save_to_user_library,
+                custom_folder_name=folder_name,
+                library_name=self.library_name,
+            )
+            self._staging = self.path.with_name(
+                f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.partial"
+            )
+            self._created_root = _first_missing(self._staging.parent)
+            self._notify("path", self.path)
+            pending, self._pending = self._pending, []
+            for file_info in pending:
+                self._write(file_info)
+        elif event == "file":
+            if self.path is None:
+                self._pending.append(value)
+            else:
+                self._write(value)
+        elif event == "retry":
+            self.discard()
+            self._notify("retry", value)
+
+    def commit(self) -> Set[str]:
+        """
+        把暂存目录中的文件移入目标目录(覆盖同名文件)
+
+        Returns:
+            已移入目标目录、保存时无需再次写入的文件相对路径
+        """
+        committed: Set[str] = set()
+        if self._staging is None:
+            return committed
+        try:
+            if not self.path.exists():
+                os.rename(self._staging, self.path)
+                committed = set(self.written)
+            else:
+                for relative in sorted(self.written):
+                    target = self.path / relative
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(self._staging / relative, target)
+                    committed.add(relative)
+        except OSError as e:
+            logger.warning(f"Failed to move streamed files into {self.path}: {e}")
+        shutil.rmtree(self._staging, ignore_errors=True)
+        self._staging = None
+        self._created_root = None
+        return committed
+
+    def discard(self):
+        """删除暂存目录(以及为其新建的上层目录)并重置状态"""
+        if self._staging is not None:
+            shutil.rmtree(self._staging, ignore_errors=True)
+            if self._created_root is not None:
+                directory = self._staging.parent
+                while True:
+                    try:
+                        directory.rmdir()
+                    except OSError:
+                        break
+                    if directory == self._created_root:
+                        break
+                    directory = directory.parent
+        self.path = None
+        self.written = set()
+        self._pending = []
+        self._staging = None
+        self._created_root = None
+
+    def _write(self, file_info: Dict[str, Any]):
+        """写入单个文件"""
+        relative = file_info["path"]
+        if self.repository.storage.write_file(self._staging / relative, file_info["content"]):
+            self.written.add(relative)
+            self._notify("file", relative)
+
+    def _notify(self, event: str, value: Any):
+        """调用进度回调"""
+        if self.on_progress is not None:
+            self.on_progress(event, value)
+
+
+def _first_missing(path: Path) -> Optional[Path]:
+    """
+    path 及其上层目录中最上层的不存在的目录
+
+    Args:
+        path: 目录
+
+    Returns:
+        最上层的不存在的目录，path已存在时返回None
+    """
+    missing = None
+    while not path.exists():
+        missing = path
+        if path.parent == path:
+            break
+        path = path.parent
+    return missing
@@ -7,7 +7,7 @@ Demo List 自动更新模块
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 
 from opendemo.utils.logger import get_logger
 
@@ -26,7 +26,13 @@ LANGUAGE_CONFIG = {
 class DemoListUpdater:
     """Demo List 更新器"""
 
-    def __init__(self, output_dir: Path, demo_list_path: Path, mapping_path: Optional[Path] = None):
+    def __init__(
+        self,
+        output_dir: Path,
+        demo_list_path: Path,
+        mapping_path: Optional[Path] = None,
+        metadata_loader: Optional[Callable[[Path], Optional[Dict[str, Any]]]] = None,
+    ):
         """
         初始化更新器
 
@@ -34,8 +40,11 @@ class DemoListUpdater:
             output_dir: opendemo_output目录路径
             demo_list_path: demo-list.md文件路径
             mapping_path: demo_mapping.json文件路径
+            metadata_loader: 元数据加载函数(如 StorageService.load_demo_metadata)，
+                为None时直接解析metadata.json
         """
         self.output_dir = output_dir
+        self.metadata_loader = metadata_loader
         self.demo_list_path = demo_list_path
         data_path = Path(__file__).parent.parent.parent / "data" / "demo_mapping.json"
         self.mapping_path = mapping_path or data_path
@@ -126,8 +135,13 @@ class DemoListUpdater:
 
         if metadata_file.exists():
             try:
-                with open(metadata_file, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
+                if self.metadata_loader is not None:
+                    metadata = self.metadata_loader(demo_dir)
+                    if metadata is None:
+                        return info
+                else:
+                    with open(metadata_file, "r", encoding="utf-8") as f:
+                        metadata = json.load(f)
                 info["name"] = metadata.get("name", demo_dir.name)
                 info["description"] = metadata.get("description", "")
                 info["keywords"] = metadata.get("keywords", [])
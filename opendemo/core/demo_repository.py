@@ -6,9 +6,10 @@ Demo仓库管理模块
 """
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Set, Tuple
 from opendemo.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -93,6 +94,7 @@ class DemoRepository:
 
         # 缓存
         self._demo_cache: Dict[str, Demo] = {}
+        self._demo_mtimes: Dict[str, Optional[float]] = {}
         self._library_metadata_cache: Dict[str, Dict[str, Any]] = {}
         self._library_features_cache: Dict[str, List[Dict[str, Any]]] = {}
         self._supported_libraries_cache: Dict[str, List[str]] = {}
@@ -109,9 +111,10 @@ class DemoRepository:
         Returns:
             Demo对象,加载失败返回None
         """
-        # 检查缓存
+        # 检查缓存(metadata.json的mtime变化时重新加载)
         cache_key = str(demo_path.absolute())
-        if cache_key in self._demo_cache:
+        mtime = self._metadata_mtime(demo_path)
+        if cache_key in self._demo_cache and self._demo_mtimes.get(cache_key) == mtime:
             return self._demo_cache[cache_key]
 
         # 加载元数据
@@ -121,8 +124,16 @@ class DemoRepository:
 
         demo = Demo(demo_path, metadata)
         self._demo_cache[cache_key] = demo
+        self._demo_mtimes[cache_key] = mtime
         return demo
 
+    def _metadata_mtime(self, demo_path: Path) -> Optional[float]:
+        """获取metadata.json的mtime，不存在返回None"""
+        try:
+            return (demo_path / "metadata.json").stat().st_mtime
+        except OSError:
+            return None
+
     def load_all_demos(self, library: str = "all", language: str = None) -> List[Demo]:
         """
         加载所有demo
@@ -156,6 +167,8 @@ class DemoRepository:
         save_to_user_library: bool = False,
         custom_folder_name: str = None,
         library_name: Optional[str] = None,
+        demo_path: Optional[Path] = None,
+        written_files: Optional[Set[str]] = None,
     ) -> Optional[Demo]:
         """
         创建新demo
@@ -171,10 +184,66 @@ class DemoRepository:
             save_to_user_library: 是否保存到用户库
             custom_folder_name: 自定义文件夹名称
             library_name: 库名称，如"numpy"，用于库demo生成
+            demo_path: 已确定的demo路径(流式生成时文件已写入该目录)
+            written_files: 已写入demo_path、无需再次写入的文件相对路径
 
         Returns:
             创建的Demo对象,失败返回None
         """
+        if demo_path is None:
+            demo_path = self.resolve_demo_path(
+                name,
+                language,
+                save_to_user_library=save_to_user_library,
+                custom_folder_name=custom_folder_name,
+                library_name=library_name,
+            )
+
+        # 创建元数据
+        metadata = {
+            "name": name,
+            "language": language,
+            "keywords": keywords,
+            "description": description,
+            "difficulty": difficulty,
+            "author": author,
+            "created_at": datetime.now().isoformat(),
+            "updated_at": datetime.now().isoformat(),
+            "version": "1.0.0",
+            "dependencies": {},
+            "verified": False,
+        }
+
+        # 组织demo数据
+        demo_data = {"metadata": metadata, "files": files}
+
+        # 保存demo
+        if self.storage.save_demo(demo_data, demo_path, skip_files=written_files):
+            return self.load_demo(demo_path)
+
+        return None
+
+    def resolve_demo_path(
+        self,
+        name: str,
+        language: str,
+        save_to_user_library: bool = False,
+        custom_folder_name: str = None,
+        library_name: Optional[str] = None,
+    ) -> Path:
+        """
+        确定新demo的保存路径
+
+        Args:
+            name: demo名称
+            language: 编程语言
+            save_to_user_library: 是否保存到用户库
+            custom_folder_name: 自定义文件夹名称
+            library_name: 库名称
+
+        Returns:
+            demo目录路径
+        """
         # 生成demo目录名
         if custom_folder_name:
             demo_dir_name = custom_folder_name
@@ -201,31 +270,7 @@ class DemoRepository:
                 # 其他语言生成到 <language>/libraries/<library_name>/
                 base_path = base_path / "libraries" / library_name
 
-        demo_path = base_path / demo_dir_name
-
-        # 创建元数据
-        metadata = {
-            "name": name,
-            "language": language,
-            "keywords": keywords,
-            "description": description,
-            "difficulty": difficulty,
-            "author": author,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "version": "1.0.0",
-            "dependencies": {},
-            "verified": False,
-        }
-
-        # 组织demo数据
-        demo_data = {"metadata": metadata, "files": files}
-
-        # 保存demo
-        if self.storage.save_demo(demo_data, demo_path):
-            return self.load_demo(demo_path)
-
-        return None
+        return base_path / demo_dir_name
 
     def update_metadata(self, demo: Demo, updates: Dict[str, Any]) -> bool:
         """
@@ -250,8 +295,8 @@ class DemoRepository:
 
             # 清除缓存
             cache_key = str(demo.path.absolute())
-            if cache_key in self._demo_cache:
-                del self._demo_cache[cache_key]
+            self._demo_cache.pop(cache_key, None)
+            self._demo_mtimes.pop(cache_key, None)
 
             logger.info(f"Updated metadata for demo {demo.name}")
             return True
@@ -260,6 +305,23 @@ class DemoRepository:
             logger.error(f"Failed to update demo metadata: {e}")
             return False
 
+    def update_metadata_many(self, updates: List[Tuple[Demo, Dict[str, Any]]]) -> int:
+        """
+        批量更新demo元数据(值没有变化的demo不写文件)
+
+        Args:
+            updates: (Demo对象, 要更新的字段) 列表
+
+        Returns:
+            实际写入的demo数
+        """
+        written = 0
+        for demo, fields in updates:
+            changed = {k: v for k, v in fields.items() if demo.metadata.get(k) != v}
+            if changed and self.update_metadata(demo, changed):
+                written += 1
+        return written
+
     def copy_to_output(self, demo: Demo, output_name: str = None) -> Optional[Path]:
         """
         将demo复制到输出目录
@@ -948,12 +1010,13 @@ class DemoRepository:
             if not item.is_dir() or item.name.startswith("_") or item.name.startswith("."):
                 continue
 
-            # 尝试读取 metadata.json
+            # 尝试读取 metadata.json(通过存储服务，命中目录索引时无需重新解析)
             metadata_file = item / "metadata.json"
             if metadata_file.exists():
                 try:
-                    with open(metadata_file, "r", encoding="utf-8") as f:
-                        metadata = json.load(f)
+                    metadata = self.storage.load_demo_metadata(item)
+                    if metadata is None:
+                        continue
 
                     features.append(
                         {
@@ -1018,11 +1081,118 @@ class DemoRepository:
     def clear_cache(self):
         """清除所有缓存"""
         self._demo_cache.clear()
+        self._demo_mtimes.clear()
         self._library_metadata_cache.clear()
         self._library_features_cache.clear()
         self._supported_libraries_cache.clear()
         logger.info("Cleared all repository caches")
 
+    def invalidate_path(self, path: Path) -> int:
+        """
+        按文件系统变化精确清除缓存
+
+        只清除受影响的条目: 变化路径所在(或其下)的demo、所属库的功能列表和元数据，
+        库目录本身增删时再清除该语言的库列表。供目录监听器在长驻进程中调用。
+
+        Args:
+            path: 发生变化(新增、修改、删除、重命名)的文件或目录路径
+
+        Returns:
+            清除的缓存条目数
+        """
+        path = Path(path).absolute()
+        target = str(path)
+        removed = 0
+
+        # demo缓存: 变化路径是demo目录本身、demo的上级目录或demo内的文件
+        for key in list(self._demo_cache):
+            if key == target or key.startswith(target + os.sep) or target.startswith(key + os.sep):
+                self._demo_cache.pop(key, None)
+                self._demo_mtimes.pop(key, None)
+                removed += 1
+
+        parts = self._catalog_parts(path)
+        if parts is None:
+            return removed
+        if not parts:
+            # 库根目录本身变化
+            removed += len(self._library_features_cache) + len(self._library_metadata_cache)
+            removed += len(self._supported_libraries_cache)
+            self._library_features_cache.clear()
+            self._library_metadata_cache.clear()
+            self._supported_libraries_cache.clear()
+            return removed
+
+        language = parts[0].lower()
+        if language == "kubernetes":
+            # kubernetes/<工具>/<demo>/metadata.json
+            library = parts[1] if len(parts) > 1 else None
+            library_level = len(parts) <= 4
+        elif len(parts) > 1 and parts[1] == "libraries":
+            # <语言>/libraries/<库>/_library.json 或 <语言>/libraries/<库>/<功能>/...
+            library = parts[2] if len(parts) > 2 else None
+            library_level = len(parts) <= 3 or parts[3] == "_library.json"
+        elif len(parts) == 1:
+            # 语言目录本身
+            library = None
+            library_level = True
+        else:
+            # 普通demo，不影响库缓存
+            return removed
+
+        removed += self._drop_library_entries(language, library)
+        if library_level:
+            for key in list(self._supported_libraries_cache):
+                if key.lower() == language:
+                    del self._supported_libraries_cache[key]
+                    removed += 1
+
+        if removed:
+            logger.debug(f"Invalidated {removed} cache entries for {path}")
+        return removed
+
+    def _catalog_parts(self, path: Path) -> Optional[Tuple[str, ...]]:
+        """
+        获取路径相对于所在库根目录(输出目录、用户库、内置库)的各级名称
+
+        Args:
+            path: 绝对路径
+
+        Returns:
+            相对路径各级名称，不在任何库目录下返回None
+        """
+        roots = (
+            self.storage.get_output_directory(),
+            self.storage.user_library_path,
+            self.storage.builtin_library_path,
+        )
+        for root in roots:
+            try:
+                return path.relative_to(Path(root).absolute()).parts
+            except ValueError:
+                continue
+        return None
+
+    def _drop_library_entries(self, language: str, library: Optional[str] = None) -> int:
+        """
+        清除库功能列表和库元数据缓存
+
+        Args:
+            language: 编程语言(小写)
+            library: 库名称，为None时清除该语言的所有库
+
+        Returns:
+            清除的缓存条目数
+        """
+        removed = 0
+        for cache in (self._library_features_cache, self._library_metadata_cache):
+            for key in list(cache):
+                key_language, _, key_library = key.partition(":")
+                if key_language.lower() == language and library in (None, key_library):
+                    del cache[key]
+                    removed += 1
+        return removed
+
 
 # 向后兼容的别名
 DemoManager = DemoRepository
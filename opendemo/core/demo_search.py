@@ -7,6 +7,7 @@ Demo搜索引擎模块
 
 from typing import List, Dict, Any, Optional, Tuple
 from opendemo.core.demo_repository import Demo
+from opendemo.core.search_index import SearchIndex, PrefixIndex, TrigramIndex
 from opendemo.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,6 +23,17 @@ MATCH_WEIGHTS = {
     "description_match": 3.0,  # 描述匹配
 }
 
+# 倒排索引中各字段的权重
+FIELD_BOOSTS = {
+    "name": MATCH_WEIGHTS["contain_name"],
+    "keywords": MATCH_WEIGHTS["keyword_match"],
+    "title": MATCH_WEIGHTS["title_match"],
+    "description": MATCH_WEIGHTS["description_match"],
+}
+
+# 难度匹配时的附加分
+DIFFICULTY_MATCH_SCORE = 10.0
+
 
 class DemoSearch:
     """Demo搜索引擎类
@@ -37,6 +49,8 @@ class DemoSearch:
             demo_repository: Demo仓库实例
         """
         self.repository = demo_repository
+        # 索引缓存: 缓存键 -> (文档元组, SearchIndex 或 PrefixIndex)
+        self._index_cache: Dict[str, Tuple[Tuple[Any, ...], Any]] = {}
 
     # ==================== 普通Demo搜索 ====================
 
@@ -69,17 +83,28 @@ class DemoSearch:
         if not keywords and not difficulty:
             return self._sort_demos(all_demos)
 
-        # 过滤demo
+        difficulty_lower = difficulty.lower() if difficulty else None
+
+        if keywords:
+            index = self._get_index(f"demos:{library}:{language}", all_demos, _demo_fields)
+            scored = self._score_keywords(index, keywords)
+        else:
+            scored = {doc_id: 0.0 for doc_id in range(len(all_demos))}
+
+        # 难度过滤(精确匹配)
         matched_demos = []
-        for demo in all_demos:
-            score = self._calculate_demo_match_score(demo, keywords, difficulty)
-            if score > 0:
-                matched_demos.append((demo, score))
+        for doc_id, score in scored.items():
+            demo = all_demos[doc_id]
+            if difficulty_lower:
+                if demo.difficulty.lower() != difficulty_lower:
+                    continue
+                score += DIFFICULTY_MATCH_SCORE
+            matched_demos.append((doc_id, score))
 
-        # 按分数排序
-        matched_demos.sort(key=lambda x: x[1], reverse=True)
+        # 按分数排序，同分保持加载顺序
+        matched_demos.sort(key=lambda x: (-x[1], x[0]))
 
-        return [demo for demo, score in matched_demos]
+        return [all_demos[doc_id] for doc_id, score in matched_demos]
 
     def find_exact(self, name: str, language: str = None) -> Optional[Demo]:
         """
@@ -93,12 +118,12 @@ class DemoSearch:
             找到的Demo对象,未找到返回None
         """
         all_demos = self.repository.load_all_demos("all", language)
+        if not all_demos:
+            return None
 
-        for demo in all_demos:
-            if demo.name.lower() == name.lower():
-                return demo
-
-        return None
+        names = self._get_prefix_index(f"demos:all:{language}", all_demos, _demo_name)
+        matches = names.exact(name)
+        return matches[0] if matches else None
 
     def get_all_languages(self) -> List[str]:
         """
@@ -189,13 +214,18 @@ class DemoSearch:
         if not all_features:
             return []
 
-        keyword_lower = keyword.lower()
-        scored_features = []
+        cache_key = f"features:{language}:{library}"
+        index = self._get_index(cache_key, all_features, _feature_fields)
+        names = self._get_prefix_index(cache_key, all_features, _feature_name)
+
+        # 精确/前缀匹配通过前缀索引二分查找，不逐个比较功能名
+        bonuses = {id(f): MATCH_WEIGHTS["prefix_name"] for f in names.prefix(keyword)}
+        bonuses.update({id(f): MATCH_WEIGHTS["exact_name"] for f in names.exact(keyword)})
 
-        for feature in all_features:
-            score = self._calculate_feature_match_score(feature, keyword_lower)
-            if score > 0:
-                scored_features.append((feature, score))
+        scored_features = []
+        for doc_id, score in index.match(keyword.lower()).items():
+            feature = all_features[doc_id]
+            scored_features.append((feature, score + bonuses.get(id(feature), 0.0)))
 
         # 按分数降序、难度升序、名称升序排序
         scored_features.sort(
@@ -208,128 +238,185 @@ class DemoSearch:
 
         return scored_features
 
-    # ==================== 内部辅助方法 ====================
-
-    def _calculate_demo_match_score(
-        self, demo: Demo, keywords: List[str] = None, difficulty: str = None
-    ) -> float:
+    def complete_feature_names(self, language: str, library: str, prefix: str) -> List[str]:
         """
-        计算demo的匹配分数
+        按前缀补全库功能名称
 
         Args:
-            demo: Demo对象
-            keywords: 关键字列表
-            difficulty: 难度级别
+            language: 编程语言
+            library: 库名称
+            prefix: 已输入的前缀
 
         Returns:
-            匹配分数,0表示不匹配
+            以prefix开头的功能名称列表(按名称排序)
         """
-        score = 0.0
+        all_features = self.repository.list_library_features(language, library)
+        if not all_features:
+            return []
 
-        # 难度匹配(精确匹配)
-        if difficulty:
-            if demo.difficulty.lower() == difficulty.lower():
-                score += 10.0
-            else:
-                return 0.0  # 难度不匹配则不返回
+        cache_key = f"features:{language}:{library}"
+        names = self._get_prefix_index(cache_key, all_features, _feature_name)
+        return [feature["name"] for feature in names.prefix(prefix)]
 
-        # 关键字匹配
-        if keywords:
-            demo_text = self._get_demo_text(demo).lower()
-            matched_keywords = 0
+    # ==================== 相近名称提示 ====================
 
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
+    def suggest_demos(
+        self, query: str, language: str = None, limit: int = 5
+    ) -> List[Tuple[str, float]]:
+        """
+        查找名称与查询词相近的demo(用于拼写错误提示)
 
-                # 在名称中匹配(权重最高)
-                if keyword_lower in demo.name.lower():
-                    score += 10.0
-                    matched_keywords += 1
+        Args:
+            query: 查询词
+            language: 语言过滤
+            limit: 最多返回数量
 
-                # 在关键字列表中匹配
-                elif any(keyword_lower in kw.lower() for kw in demo.keywords):
-                    score += 8.0
-                    matched_keywords += 1
+        Returns:
+            [(demo名称, 相似度)] 列表，按相似度降序
+        """
+        all_demos = self.repository.load_all_demos("all", language)
+        if not all_demos:
+            return []
 
-                # 在描述中匹配
-                elif keyword_lower in demo.description.lower():
-                    score += 5.0
-                    matched_keywords += 1
+        index = self._cached_index(
+            f"trigram:demos:all:{language}",
+            all_demos,
+            lambda: TrigramIndex(demo.name for demo in all_demos),
+        )
+        return index.suggest(query, limit)
 
-                # 在整体文本中匹配
-                elif keyword_lower in demo_text:
-                    score += 2.0
-                    matched_keywords += 1
+    def suggest_library_features(
+        self, language: str, library: str, keyword: str, limit: int = 5
+    ) -> List[Tuple[str, float]]:
+        """
+        查找名称与关键字相近的库功能(用于拼写错误提示)
 
-            # 如果没有任何关键字匹配,返回0
-            if matched_keywords == 0:
-                return 0.0
+        Args:
+            language: 编程语言
+            library: 库名称
+            keyword: 搜索关键字
+            limit: 最多返回数量
 
-            # 根据匹配关键字的比例调整分数
-            match_ratio = matched_keywords / len(keywords)
-            score *= match_ratio
+        Returns:
+            [(功能名称, 相似度)] 列表，按相似度降序
+        """
+        all_features = self.repository.list_library_features(language, library)
+        if not all_features:
+            return []
+
+        index = self._cached_index(
+            f"trigram:features:{language}:{library}",
+            all_features,
+            lambda: TrigramIndex(feature["name"] for feature in all_features),
+        )
+        return index.suggest(keyword, limit)
 
-        return score
+    # ==================== 内部辅助方法 ====================
 
-    def _calculate_feature_match_score(self, feature: Dict[str, Any], keyword: str) -> float:
+    def _get_index(self, cache_key: str, docs: List[Any], extract) -> SearchIndex:
         """
-        计算功能模块的匹配分数
+        获取文档列表对应的倒排索引(文档列表未变化时复用)
 
         Args:
-            feature: 功能模块字典
-            keyword: 搜索关键字（小写）
+            cache_key: 缓存键
+            docs: 文档列表
+            extract: 从文档提取字段的函数
 
         Returns:
-            匹配分数
+            倒排索引
         """
-        score = 0.0
-        feature_name = feature["name"].lower()
+        return self._cached_index(
+            f"search:{cache_key}", docs, lambda: SearchIndex.build(docs, extract, FIELD_BOOSTS)
+        )
 
-        # 精确匹配：功能名完全等于关键字
-        if feature_name == keyword:
-            score += MATCH_WEIGHTS["exact_name"]
-        # 前缀匹配：功能名以关键字开头
-        elif feature_name.startswith(keyword):
-            score += MATCH_WEIGHTS["prefix_name"]
-        # 包含匹配：功能名包含关键字
-        elif keyword in feature_name:
-            score += MATCH_WEIGHTS["contain_name"]
+    def _get_prefix_index(self, cache_key: str, docs: List[Any], key) -> PrefixIndex:
+        """
+        获取文档列表对应的名称前缀索引(文档列表未变化时复用)
 
-        # 关键字匹配：metadata.keywords 中包含关键字
-        keywords = feature.get("keywords", [])
-        for kw in keywords:
-            if keyword in kw.lower():
-                score += MATCH_WEIGHTS["keyword_match"]
-                break
+        Args:
+            cache_key: 缓存键
+            docs: 文档列表
+            key: 从文档提取名称的函数
 
-        # 标题匹配：title 中包含关键字
-        title = feature.get("title", "").lower()
-        if keyword in title:
-            score += MATCH_WEIGHTS["title_match"]
+        Returns:
+            前缀索引
+        """
+        return self._cached_index(f"prefix:{cache_key}", docs, lambda: PrefixIndex(docs, key))
 
-        # 描述匹配：description 中包含关键字
-        description = feature.get("description", "").lower()
-        if keyword in description:
-            score += MATCH_WEIGHTS["description_match"]
+    def _cached_index(self, cache_key: str, docs: List[Any], build):
+        """
+        按文档列表缓存索引
 
-        return score
+        仓库层会缓存Demo对象和功能列表，因此逐个比较文档对象是否为同一对象判断列表是否变化。
+        缓存中保存文档对象本身(而不只是id)，被替换的旧对象不会被回收后让新对象复用相同的id。
 
-    def _get_demo_text(self, demo: Demo) -> str:
+        Args:
+            cache_key: 缓存键
+            docs: 文档列表
+            build: 构建索引的函数
+
+        Returns:
+            索引对象
         """
-        获取demo的所有文本内容(用于搜索)
+        cached = self._index_cache.get(cache_key)
+        if (
+            cached is not None
+            and len(cached[0]) == len(docs)
+            and all(a is b for a, b in zip(cached[0], docs))
+        ):
+            return cached[1]
+
+        index = build()
+        self._index_cache[cache_key] = (tuple(docs), index)
+        logger.debug(f"Built index {cache_key} with {len(docs)} documents")
+        return index
+
+    def _score_keywords(self, index: SearchIndex, keywords: List[str]) -> Dict[int, float]:
+        """
+        对多个关键字查询索引并合并得分
+
+        任一关键字命中即返回，得分按命中关键字的比例折算。
 
         Args:
-            demo: Demo对象
+            index: 倒排索引
+            keywords: 关键字列表
+
+        Returns:
+            {文档编号: 得分}
+        """
+        totals: Dict[int, float] = {}
+        hits: Dict[int, int] = {}
+
+        for keyword in keywords:
+            keyword_lower = keyword.lower()
+            for doc_id, score in index.match(keyword_lower).items():
+                name = index.docs[doc_id].name
+                totals[doc_id] = (
+                    totals.get(doc_id, 0.0) + score + self._name_bonus(name, keyword_lower)
+                )
+                hits[doc_id] = hits.get(doc_id, 0) + 1
+
+        return {
+            doc_id: score * hits[doc_id] / len(keywords) for doc_id, score in totals.items()
+        }
+
+    def _name_bonus(self, name: str, keyword: str) -> float:
+        """
+        名称整体匹配的附加分
+
+        Args:
+            name: 名称
+            keyword: 搜索关键字（小写）
 
         Returns:
-            合并的文本
+            精确匹配或前缀匹配的附加分
         """
-        parts = [
-            demo.name,
-            demo.description,
-            " ".join(demo.keywords),
-        ]
-        return " ".join(parts)
+        name_lower = name.lower()
+        if name_lower == keyword:
+            return MATCH_WEIGHTS["exact_name"]
+        if name_lower.startswith(keyword):
+            return MATCH_WEIGHTS["prefix_name"]
+        return 0.0
 
     def _sort_demos(self, demos: List[Demo]) -> List[Demo]:
         """
@@ -358,5 +445,35 @@ class DemoSearch:
         return difficulty_map.get(difficulty.lower(), 999)
 
 
+def _demo_fields(demo: Demo) -> Dict[str, Any]:
+    """提取Demo的索引字段"""
+    return {
+        "name": demo.name,
+        "keywords": demo.keywords,
+        "title": demo.metadata.get("title"),
+        "description": demo.description,
+    }
+
+
+def _demo_name(demo: Demo) -> str:
+    """提取Demo名称"""
+    return demo.name
+
+
+def _feature_name(feature: Dict[str, Any]) -> str:
+    """提取功能模块名称"""
+    return feature["name"]
+
+
+def _feature_fields(feature: Dict[str, Any]) -> Dict[str, Any]:
+    """提取功能模块的索引字段"""
+    return {
+        "name": feature.get("name"),
+        "keywords": feature.get("keywords"),
+        "title": feature.get("title"),
+        "description": feature.get("description"),
+    }
+
+
 # 向后兼容的别名
 SearchEngine = DemoSearch
@@ -4,16 +4,32 @@
 负责验证demo的可执行性。
 """
 
+import os
 import sys
 import subprocess
 import tempfile
 import shutil
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from opendemo.core.venv_pool import VenvPool
+from opendemo.core.verification_cache import VerificationCache, hash_demo_tree
+from opendemo.utils.file_staging import FileStager
 from opendemo.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 验证器版本，验证逻辑变化时递增，使缓存的验证结果失效
+VERIFIER_VERSION = 1
+
+# 检测各语言工具链版本的命令(影响验证结果缓存的键)
+TOOLCHAIN_COMMANDS = {
+    "java": [["javac", "-version"]],
+    "go": [["go", "version"]],
+    "nodejs": [["node", "--version"], ["npm", "--version"]],
+    "kubernetes": [["kubectl", "version", "--client"], ["helm", "version", "--short"]],
+}
+
 
 class DemoVerifier:
     """Demo验证器类"""
@@ -26,6 +42,7 @@ class DemoVerifier:
             config_service: 配置服务实例
         """
         self.config = config_service
+        self._toolchains: Dict[str, str] = {}
 
     def verify(self, demo_path: Path, language: str) -> Dict[str, Any]:
         """
@@ -36,11 +53,29 @@ class DemoVerifier:
             language: 编程语言
 
         Returns:
-            验证结果字典
+            验证结果字典(来自验证结果缓存时包含 cached 和 duration，只缓存通过的结果)
         """
         if not self.config.get("enable_verification", False):
             return {"verified": False, "skipped": True, "message": "Verification is disabled"}
 
+        cache = self._result_cache()
+        cache_key = self._result_cache_key(demo_path, language) if cache is not None else None
+        # verification_cache_refresh: 忽略已缓存的结果重新验证(opendemo verify --force)
+        if cache_key is not None and not self.config.get("verification_cache_refresh", False):
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached verification result for {demo_path}")
+                return dict(cached["result"], cached=True, duration=cached["duration"])
+
+        start = time.perf_counter()
+        result = self._verify_language(demo_path, language)
+        # 只缓存通过的结果: 失败可能来自网络、依赖安装或超时等暂时性原因，下次仍需重新验证
+        if cache_key is not None and result.get("verified"):
+            cache.put(cache_key, result, time.perf_counter() - start)
+        return result
+
+    def _verify_language(self, demo_path: Path, language: str) -> Dict[str, Any]:
+        """按语言执行验证"""
         verification_method = self.config.get("verification_method", "venv")
 
         if language.lower() == "python":
@@ -54,7 +89,8 @@ class DemoVerifier:
         elif language.lower() == "kubernetes":
             return self._verify_kubernetes(demo_path)
         else:
-            return {"verified": False, "error": f"Verification not supported for {language}"}
+            message = f"Verification not supported for {language}"
+            return {"verified": False, "skipped": True, "message": message, "error": message}
 
     def _verify_python(self, demo_path: Path, method: str = "venv") -> Dict[str, Any]:
         """
@@ -70,30 +106,51 @@ class DemoVerifier:
         result = {"verified": False, "method": method, "steps": [], "outputs": [], "errors": []}
 
         # 创建临时目录
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory(dir=self._staging_directory()) as temp_dir:
             temp_path = Path(temp_dir)
+            venv_pool = self._venv_pool()
+            base_venv = None
 
             try:
                 # 复制demo到临时目录
                 demo_copy = temp_path / "demo"
-                shutil.copytree(demo_path, demo_copy)
+                shutil.copytree(demo_path, demo_copy, copy_function=FileStager(hardlink=True))
                 result["steps"].append("Copied demo to temp directory")
 
-                # 创建虚拟环境
-                venv_path = temp_path / "venv"
-                self._create_venv(venv_path)
-                result["steps"].append("Created virtual environment")
-
-                # 安装依赖
                 requirements_file = demo_copy / "requirements.txt"
-                if requirements_file.exists():
-                    success, output = self._install_dependencies(venv_path, requirements_file)
-                    result["steps"].append("Installed dependencies")
-                    result["outputs"].append(output)
-
-                    if not success:
-                        result["errors"].append("Failed to install dependencies")
+                if venv_pool is not None:
+                    # 复用依赖相同的缓存虚拟环境(通过本次验证独有的叠加环境使用)
+                    requirements = ""
+                    if requirements_file.exists():
+                        requirements = requirements_file.read_text(encoding="utf-8")
+                    base_venv = self._acquire_venv(
+                        venv_pool, requirements, requirements_file, result
+                    )
+                    if base_venv is None:
                         return result
+                    venv_path = base_venv
+                    if VenvPool.normalize_requirements(requirements):
+                        venv_path = temp_path / "venv"
+                        created = self._create_venv(venv_path, with_pip=False)
+                        if not created or not VenvPool.link_overlay(base_venv, venv_path):
+                            result["errors"].append("Failed to create virtual environment overlay")
+                            return result
+                    # 没有依赖的demo直接在池中的空环境中运行，不创建叠加环境
+                else:
+                    # 创建虚拟环境
+                    venv_path = temp_path / "venv"
+                    self._create_venv(venv_path)
+                    result["steps"].append("Created virtual environment")
+
+                    # 安装依赖
+                    if requirements_file.exists():
+                        success, output = self._install_dependencies(venv_path, requirements_file)
+                        result["steps"].append("Installed dependencies")
+                        result["outputs"].append(output)
+
+                        if not success:
+                            result["errors"].append("Failed to install dependencies")
+                            return result
 
                 # 执行代码文件
                 code_dir = demo_copy / "code"
@@ -116,14 +173,171 @@ class DemoVerifier:
             except Exception as e:
                 result["errors"].append(str(e))
                 logger.error(f"Verification failed: {e}")
+            finally:
+                if base_venv is not None:
+                    venv_pool.release(base_venv)
 
         return result
 
-    def _create_venv(self, venv_path: Path) -> bool:
-        """创建Python虚拟环境"""
+    def _result_cache(self) -> Optional[VerificationCache]:
+        """
+        获取验证结果缓存
+
+        Returns:
+            验证结果缓存，未启用或未配置缓存目录时返回None
+        """
+        cache_directory = self.config.get("cache_directory")
+        if not isinstance(cache_directory, str) or not cache_directory:
+            return None
+        if not self.config.get("verification_cache", True):
+            return None
+        max_mb = self.config.get("verification_cache_mb", 50)
+        return VerificationCache(Path(cache_directory) / "verification", int(max_mb) << 20)
+
+    def _result_cache_key(self, demo_path: Path, language: str) -> Optional[str]:
+        """
+        验证结果的缓存键
+
+        Args:
+            demo_path: demo路径
+            language: 编程语言
+
+        Returns:
+            由demo内容哈希、工具链版本、验证器版本和验证设置计算的键，demo无法读取时返回None
+        """
+        try:
+            content_hash = hash_demo_tree(demo_path)
+        except OSError as e:
+            logger.debug(f"Not caching verification of {demo_path}: {e}")
+            return None
+        settings = {
+            "method": self.config.get("verification_method", "venv"),
+            "timeout": self.config.get("verification_timeout", 300),
+            "offline": self.config.get("verification_offline", False),
+        }
+        toolchain = self._toolchain_version(language)
+        return VerificationCache.make_key(
+            content_hash, language, toolchain, VERIFIER_VERSION, settings
+        )
+
+    def _toolchain_version(self, language: str) -> str:
+        """
+        验证该语言使用的工具链版本(每个验证器实例只检测一次)
+
+        Args:
+            language: 编程语言
+
+        Returns:
+            版本信息，工具不可用时为 "unavailable"
+        """
+        language = language.lower()
+        if language not in self._toolchains:
+            if language == "python":
+                version = f"{sys.implementation.name} {sys.version}"
+            else:
+                versions = []
+                for command in TOOLCHAIN_COMMANDS.get(language, []):
+                    try:
+                        process = subprocess.run(
+                            command, capture_output=True, text=True, timeout=10
+                        )
+                        output = (process.stdout or process.stderr or "").strip()
+                        versions.append(output if process.returncode == 0 else "unavailable")
+                    except Exception:
+                        versions.append("unavailable")
+                version = "; ".join(versions)
+            self._toolchains[language] = version
+        return self._toolchains[language]
+
+    def _staging_directory(self) -> Optional[str]:
+        """
+        验证时复制demo的临时目录所在位置
+
+        与demo库位于同一文件系统的缓存目录下时可以使用 reflink 或硬链接，
+        不复制文件内容(大的 node_modules、vendor 目录不再在每次验证时复制)。
+
+        Returns:
+            cache_directory/staging，未配置缓存目录时返回None(使用系统临时目录)
+        """
+        cache_directory = self.config.get("cache_directory")
+        if not isinstance(cache_directory, str) or not cache_directory:
+            return None
+        staging = os.path.join(cache_directory, "staging")
+        try:
+            os.makedirs(staging, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to create staging directory {staging}: {e}")
+            return None
+        return staging
+
+    def _venv_pool(self) -> Optional[VenvPool]:
+        """
+        获取虚拟环境池
+
+        Returns:
+            虚拟环境池，未启用或未配置缓存目录时返回None
+        """
+        cache_directory = self.config.get("cache_directory")
+        if not cache_directory or not self.config.get("verification_venv_cache", True):
+            return None
+        max_mb = self.config.get("verification_venv_cache_mb", 2048)
+        return VenvPool(Path(cache_directory) / "venvs", int(max_mb) << 20)
+
+    def _acquire_venv(
+        self,
+        venv_pool: VenvPool,
+        requirements: str,
+        requirements_file: Path,
+        result: Dict[str, Any],
+    ) -> Optional[Path]:
+        """
+        从虚拟环境池获取demo依赖对应的虚拟环境(使用结束后须释放租约)
+
+        Args:
+            venv_pool: 虚拟环境池
+            requirements: requirements.txt 内容(没有依赖时为空字符串)
+            requirements_file: requirements.txt 路径(可以不存在)
+            result: 验证结果，记录步骤、输出和错误
+
+        Returns:
+            虚拟环境路径，创建或安装依赖失败时返回None
+        """
+
+        def build(venv_path: Path) -> tuple:
+            if not self._create_venv(venv_path):
+                return False, "Failed to create virtual environment"
+            if not VenvPool.normalize_requirements(requirements):
+                return True, ""
+            return self._install_dependencies(venv_path, requirements_file)
+
+        venv_path, reused, output = venv_pool.acquire(requirements, build)
+        if output:
+            result["outputs"].append(output)
+        if venv_path is None:
+            result["errors"].append("Failed to install dependencies")
+        elif reused:
+            result["steps"].append("Reused cached virtual environment")
+        else:
+            result["steps"].append("Created virtual environment")
+            if requirements_file.exists():
+                result["steps"].append("Installed dependencies")
+        return venv_path
+
+    def _create_venv(self, venv_path: Path, with_pip: bool = True) -> bool:
+        """
+        创建Python虚拟环境
+
+        Args:
+            venv_path: 虚拟环境路径
+            with_pip: 是否安装pip(叠加环境使用池中环境的pip，不需要安装)
+
+        Returns:
+            是否成功
+        """
         try:
             subprocess.run(
-                [sys.executable, "-m", "venv", str(venv_path)],
+                [sys.executable, "-m", "venv", str(venv_path)]
+                + ([] if with_pip else ["--without-pip"]),
                 check=True,
                 capture_output=True,
                 timeout=60,
@@ -148,7 +362,8 @@ class DemoVerifier:
                 pip_path = venv_path / "bin" / "pip"
 
             result = subprocess.run(
-                [str(pip_path), "install", "-r", str(requirements_file)],
+                [str(pip_path), "install", "-r", str(requirements_file)]
+                + self._wheelhouse_args(),
                 capture_output=True,
                 text=True,
                 timeout=300,
@@ -160,6 +375,85 @@ class DemoVerifier:
             logger.error(f"Failed to install dependencies: {e}")
             return False, str(e)
 
+    def _wheelhouse(self) -> Optional[Path]:
+        """
+        本地wheel目录
+
+        Returns:
+            verification_wheelhouse，未配置时为缓存目录下的 wheelhouse；都未配置时返回None
+        """
+        directory = self.config.get("verification_wheelhouse")
+        if not directory:
+            cache_directory = self.config.get("cache_directory")
+            if not isinstance(cache_directory, str) or not cache_directory:
+                return None
+            directory = str(Path(cache_directory) / "wheelhouse")
+        return Path(directory).expanduser() if isinstance(directory, str) else None
+
+    def _wheelhouse_args(self) -> List[str]:
+        """
+        pip install 使用本地wheel目录的参数
+
+        离线模式(verification_offline)下只从wheel目录安装(--no-index)；
+        否则wheel目录存在时优先使用其中的wheel，缺少的包仍从索引下载。
+
+        Returns:
+            pip参数列表
+        """
+        wheelhouse = self._wheelhouse()
+        offline = self.config.get("verification_offline", False) is True
+        if wheelhouse is None or not (offline or wheelhouse.is_dir()):
+            return []
+        return (["--no-index"] if offline else []) + ["--find-links", str(wheelhouse)]
+
+    def prefetch(self, requirements_files: List[Path]) -> Dict[str, Any]:
+        """
+        把demo的依赖构建为wheel保存到本地wheel目录，供离线验证使用
+
+        Args:
+            requirements_files: requirements.txt 路径列表(内容相同的只处理一次)
+
+        Returns:
+            {"wheelhouse": 目录, "prefetched": 成功的文件数, "failed": [{"file", "error"}]}
+        """
+        wheelhouse = self._wheelhouse()
+        if wheelhouse is None:
+            return {"wheelhouse": None, "prefetched": 0, "failed": []}
+        result = {"wheelhouse": str(wheelhouse), "prefetched": 0, "failed": []}
+
+        seen = set()
+        for requirements_file in requirements_files:
+            try:
+                requirements = VenvPool.normalize_requirements(
+                    requirements_file.read_text(encoding="utf-8")
+                )
+            except OSError as e:
+                result["failed"].append({"file": str(requirements_file), "error": str(e)})
+                continue
+            if not requirements or requirements in seen:
+                continue
+            seen.add(requirements)
+
+            try:
+                wheelhouse.mkdir(parents=True, exist_ok=True)
+                process = subprocess.run(
+                    [sys.executable, "-m", "pip", "wheel", "-q", "-r", str(requirements_file)]
+                    + ["-w", str(wheelhouse), "--find-links", str(wheelhouse)],
+                    capture_output=True,
+                    text=True,
+                    timeout=600,
+                )
+                if process.returncode == 0:
+                    result["prefetched"] += 1
+                    continue
+                error = (process.stderr or process.stdout or "").strip()[-500:]
+            except Exception as e:
+                error = str(e)
+            logger.error(f"Failed to prefetch wheels for {requirements_file}: {error}")
+            result["failed"].append({"file": str(requirements_file), "error": error})
+
+        return result
+
     def _run_python_file(self, venv_path: Path, py_file: Path) -> tuple:
         """
         运行Python文件
@@ -204,15 +498,9 @@ class DemoVerifier:
             验证结果
         """
         # Java验证的简化实现
-        result = {
-            "verified": False,
-            "method": "java",
-            "steps": [],
-            "outputs": [],
-            "errors": ["Java verification not fully implemented yet"],
-        }
+        result = {"verified": False, "method": "java", "steps": [], "outputs": [], "errors": []}
 
-        return result
+        return _skip(result, "Java verification not fully implemented yet")
 
     def _verify_go(self, demo_path: Path) -> Dict[str, Any]:
         """
@@ -227,22 +515,24 @@ class DemoVerifier:
         result = {"verified": False, "method": "go", "steps": [], "outputs": [], "errors": []}
 
         # 创建临时目录
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory(dir=self._staging_directory()) as temp_dir:
             temp_path = Path(temp_dir)
 
             try:
                 # 检查Go环境
-                go_check = subprocess.run(
-                    ["go", "version"], capture_output=True, text=True, timeout=10
-                )
-                if go_check.returncode != 0:
-                    result["errors"].append("Go is not installed or not in PATH")
-                    return result
+                try:
+                    go_check = subprocess.run(
+                        ["go", "version"], capture_output=True, text=True, timeout=10
+                    )
+                except FileNotFoundError:
+                    go_check = None
+                if go_check is None or go_check.returncode != 0:
+                    return _skip(result, "Go is not installed or not in PATH")
                 result["steps"].append(f"Go environment check: {go_check.stdout.strip()}")
 
                 # 复制demo到临时目录
                 demo_copy = temp_path / "demo"
-                shutil.copytree(demo_path, demo_copy)
+                shutil.copytree(demo_path, demo_copy, copy_function=FileStager(hardlink=True))
                 result["steps"].append("Copied demo to temp directory")
 
                 # 检查是否有go.mod，如果没有则初始化
@@ -346,22 +636,24 @@ class DemoVerifier:
         result = {"verified": False, "method": "nodejs", "steps": [], "outputs": [], "errors": []}
 
         # 创建临时目录
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory(dir=self._staging_directory()) as temp_dir:
             temp_path = Path(temp_dir)
 
             try:
                 # 检查Node环境
-                node_check = subprocess.run(
-                    ["node", "--version"], capture_output=True, text=True, timeout=10
-                )
-                if node_check.returncode != 0:
-                    result["errors"].append("Node.js is not installed or not in PATH")
-                    return result
+                try:
+                    node_check = subprocess.run(
+                        ["node", "--version"], capture_output=True, text=True, timeout=10
+                    )
+                except FileNotFoundError:
+                    node_check = None
+                if node_check is None or node_check.returncode != 0:
+                    return _skip(result, "Node.js is not installed or not in PATH")
                 result["steps"].append(f"Node.js environment check: {node_check.stdout.strip()}")
 
                 # 复制demo到临时目录
                 demo_copy = temp_path / "demo"
-                shutil.copytree(demo_path, demo_copy)
+                shutil.copytree(demo_path, demo_copy, copy_function=FileStager(hardlink=True))
                 result["steps"].append("Copied demo to temp directory")
 
                 # 安装依赖（如果有package.json）
@@ -648,3 +940,18 @@ class DemoVerifier:
                 lines.append(f"- {error}")
 
         return "\n".join(lines)
+
+
+def _skip(result: Dict[str, Any], message: str) -> Dict[str, Any]:
+    """
+    标记为跳过(语言不支持或工具链不可用，与demo本身是否正确无关)
+
+    Args:
+        result: 验证结果
+        message: 跳过原因
+
+    Returns:
+        验证结果
+    """
+    result.update(skipped=True, message=message)
+    return result
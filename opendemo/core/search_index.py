@@ -0,0 +1,408 @@
+"""
+搜索索引模块
+
+对demo/功能模块的名称、关键字、标题、描述分字段建立倒排索引，
+使用BM25计算字段内相关度，并按字段权重合并得分。
+查询词与索引词表做子串匹配(与原有 `in` 判断语义一致)，
+词表扩展结果会被缓存，重复查询只需查倒排表。
+
+中日韩文字没有空格分词，连续的CJK字符按二元组(bigram)切分，
+多个二元组同时命中即近似于原文子串匹配；中英文混写时分别切分。
+
+另提供基于排序数组的名称前缀索引，用于精确/前缀查找和命令行补全；
+以及字符三元组相似度索引，用于拼写错误时给出相近名称提示。
+"""
+
+import math
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# CJK字符范围: 日文假名、CJK扩展A、CJK统一汉字、CJK兼容汉字、韩文音节
+_CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+
+# 分词：CJK字符连续段单独成段，其余按非字母数字字符切分(连字符、下划线、空白、标点)
+_TOKEN_REGEX = f"([{_CJK_RANGES}]+)|([^\\W_{_CJK_RANGES}]+)"
+
+# 名称中的分隔符(非字母数字字符)
+_SEPARATOR_PATTERN = re.compile(r"[\W_]+")
+
+# 词表拼接时使用的分隔符，不会出现在任何词中
+_VOCAB_SEPARATOR = "\n"
+
+# 前缀查找的上界字符，大于任何名称中可能出现的字符
+_PREFIX_UPPER_BOUND = "\U0010ffff"
+
+
+@lru_cache(maxsize=None)
+def _token_pattern():
+    """分词正则(包含大段Unicode范围，编译需数毫秒，延迟到首次分词时编译)"""
+    return re.compile(_TOKEN_REGEX)
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    将文本切分为小写词项
+
+    Args:
+        text: 文本或文本列表
+
+    Returns:
+        词项列表
+    """
+    if not text:
+        return []
+    if isinstance(text, (list, tuple)):
+        text = " ".join(str(item) for item in text)
+
+    tokens = []
+    for cjk, word in _token_pattern().findall(str(text).lower()):
+        if word:
+            tokens.append(word)
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(cjk[i : i + 2] for i in range(len(cjk) - 1))
+    return tokens
+
+
+class SearchIndex:
+    """分字段BM25倒排索引
+
+    文档以添加顺序编号，查询返回 {文档编号: 得分}。
+    """
+
+    def __init__(self, field_boosts: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        """
+        初始化索引
+
+        Args:
+            field_boosts: 字段名到权重的映射，只索引其中列出的字段
+            k1: BM25词频饱和参数
+            b: BM25长度归一化参数
+        """
+        self.field_boosts = field_boosts
+        self.k1 = k1
+        self.b = b
+        self.docs: List[Any] = []
+
+        # postings[field][term] = {doc_id: tf}
+        self._postings: Dict[str, Dict[str, Dict[int, int]]] = {f: {} for f in field_boosts}
+        self._lengths: Dict[str, List[int]] = {f: [] for f in field_boosts}
+        self._total_lengths: Dict[str, int] = {f: 0 for f in field_boosts}
+
+        # 词表(用于子串扩展)，在首次查询时构建
+        self._vocab: Optional[List[str]] = None
+        self._vocab_text = ""
+        self._vocab_offsets: List[int] = []
+        self._expansions: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, doc: Any, fields: Dict[str, Any]) -> int:
+        """
+        添加文档
+
+        Args:
+            doc: 文档对象(查询结果通过 docs[doc_id] 取回)
+            fields: 字段名到文本(或文本列表)的映射
+
+        Returns:
+            文档编号
+        """
+        doc_id = len(self.docs)
+        self.docs.append(doc)
+
+        for field, postings in self._postings.items():
+            tokens = tokenize(fields.get(field))
+            self._lengths[field].append(len(tokens))
+            self._total_lengths[field] += len(tokens)
+
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                postings.setdefault(token, {})[doc_id] = tf
+
+        self._vocab = None
+        self._expansions.clear()
+        return doc_id
+
+    @classmethod
+    def build(
+        cls, docs: Iterable[Any], extract, field_boosts: Dict[str, float]
+    ) -> "SearchIndex":
+        """
+        批量构建索引
+
+        Args:
+            docs: 文档序列
+            extract: 从文档提取字段字典的函数
+            field_boosts: 字段权重
+
+        Returns:
+            构建好的索引
+        """
+        index = cls(field_boosts)
+        for doc in docs:
+            index.add(doc, extract(doc))
+        return index
+
+    # ==================== 查询 ====================
+
+    def match(self, query: str) -> Dict[int, float]:
+        """
+        查询单个关键字
+
+        关键字切分后的每个词项都必须在文档的某个字段中出现(子串匹配)，
+        得分为各词项在各字段上的BM25得分乘以字段权重之和。
+
+        Args:
+            query: 关键字
+
+        Returns:
+            {文档编号: 得分}，无匹配返回空字典
+        """
+        query_terms = tokenize(query)
+        if not query_terms or not self.docs:
+            return {}
+
+        scores: Optional[Dict[int, float]] = None
+        for query_term in query_terms:
+            term_scores = self._score_term(query_term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    doc_id: score + term_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in term_scores
+                }
+            if not scores:
+                return {}
+
+        return scores
+
+    def _score_term(self, query_term: str) -> Dict[int, float]:
+        """计算单个查询词项的得分(同一字段内取扩展词中的最高分)"""
+        expanded = self._expand(query_term)
+        if not expanded:
+            return {}
+
+        total_docs = len(self.docs)
+        scores: Dict[int, float] = {}
+        for field, boost in self.field_boosts.items():
+            postings = self._postings[field]
+            lengths = self._lengths[field]
+            avg_length = (self._total_lengths[field] / total_docs) or 1.0
+
+            field_scores: Dict[int, float] = {}
+            for term in expanded:
+                docs = postings.get(term)
+                if not docs:
+                    continue
+                df = len(docs)
+                idf = math.log(1.0 + (total_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf in docs.items():
+                    norm = self.k1 * (1.0 - self.b + self.b * lengths[doc_id] / avg_length)
+                    score = idf * tf * (self.k1 + 1.0) / (tf + norm)
+                    if score > field_scores.get(doc_id, 0.0):
+                        field_scores[doc_id] = score
+
+            for doc_id, score in field_scores.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + boost * score
+
+        return scores
+
+    def _expand(self, query_term: str) -> List[str]:
+        """
+        将查询词项扩展为词表中包含它的所有词
+
+        Args:
+            query_term: 查询词项
+
+        Returns:
+            词表中的匹配词列表
+        """
+        cached = self._expansions.get(query_term)
+        if cached is not None:
+            return cached
+
+        if self._vocab is None:
+            self._build_vocab()
+
+        # 在拼接后的词表字符串中查找，定位到具体词
+        matches = []
+        last = -1
+        pos = self._vocab_text.find(query_term)
+        while pos != -1:
+            idx = bisect_right(self._vocab_offsets, pos) - 1
+            if idx != last:
+                matches.append(self._vocab[idx])
+                last = idx
+            pos = self._vocab_text.find(query_term, pos + 1)
+
+        self._expansions[query_term] = matches
+        return matches
+
+    def _build_vocab(self):
+        """构建排序词表及其拼接字符串"""
+        vocab = set()
+        for postings in self._postings.values():
+            vocab.update(postings)
+        self._vocab = sorted(vocab)
+
+        offsets = []
+        position = 0
+        for term in self._vocab:
+            offsets.append(position)
+            position += len(term) + len(_VOCAB_SEPARATOR)
+        self._vocab_offsets = offsets
+        self._vocab_text = _VOCAB_SEPARATOR.join(self._vocab)
+
+
+class PrefixIndex:
+    """名称前缀索引
+
+    将名称(小写)排序后存入数组，精确查找和前缀查找均通过二分完成，
+    复杂度为 O(len(key) * log(n))，不需要遍历全部名称。
+    """
+
+    def __init__(self, items: Iterable[Any] = (), key=None):
+        """
+        初始化前缀索引
+
+        Args:
+            items: 文档序列
+            key: 从文档提取名称的函数，默认文档本身即名称
+        """
+        key = key or (lambda item: item)
+        pairs = sorted(((str(key(item)).lower(), i, item) for i, item in enumerate(items)))
+        self._keys: List[str] = [pair[0] for pair in pairs]
+        self._items: List[Any] = [pair[2] for pair in pairs]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        name = name.lower()
+        pos = bisect_left(self._keys, name)
+        return pos < len(self._keys) and self._keys[pos] == name
+
+    def exact(self, name: str) -> List[Any]:
+        """
+        精确查找(不区分大小写)
+
+        Args:
+            name: 名称
+
+        Returns:
+            名称完全相同的文档列表
+        """
+        name = name.lower()
+        return self._items[bisect_left(self._keys, name) : bisect_right(self._keys, name)]
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[Any]:
+        """
+        前缀查找(不区分大小写)，结果按名称排序
+
+        Args:
+            prefix: 名称前缀
+            limit: 最多返回数量
+
+        Returns:
+            名称以prefix开头的文档列表(包括精确匹配)
+        """
+        prefix = prefix.lower()
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + _PREFIX_UPPER_BOUND, lo=start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._items[start:end]
+
+
+class TrigramIndex:
+    """名称三元组相似度索引
+
+    每个名称(首尾补空格后)拆成字符三元组，按三元组建立倒排表。
+    查询时只需遍历查询词的三元组倒排表即可得到与每个候选名称的公共三元组数，
+    再以Jaccard系数作为相似度，用于拼写错误时的"您是不是要找"提示。
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        初始化三元组索引
+
+        Args:
+            names: 名称序列(重复名称只保留一个)
+        """
+        self._names: List[str] = []
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        seen = set()
+        for name in names:
+            if not name or name.lower() in seen:
+                continue
+            seen.add(name.lower())
+            grams = _trigrams(name)
+            name_id = len(self._names)
+            self._names.append(name)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(name_id)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def suggest(
+        self, query: str, limit: int = 5, threshold: float = 0.3
+    ) -> List[Tuple[str, float]]:
+        """
+        查找与查询词相近的名称
+
+        Args:
+            query: 查询词
+            limit: 最多返回数量
+            threshold: 最低相似度(0-1)
+
+        Returns:
+            [(名称, 相似度)] 列表，按相似度降序
+        """
+        query_grams = _trigrams(query)
+        if not query_grams:
+            return []
+
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for name_id in self._postings.get(gram, ()):
+                shared[name_id] = shared.get(name_id, 0) + 1
+
+        results = []
+        for name_id, count in shared.items():
+            similarity = count / (len(query_grams) + self._sizes[name_id] - count)
+            if similarity >= threshold:
+                results.append((self._names[name_id], similarity))
+
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:limit]
+
+
+def _trigrams(name: str) -> set:
+    """
+    提取名称的字符三元组集合
+
+    Args:
+        name: 名称
+
+    Returns:
+        三元组集合
+    """
+    # 分隔符统一为空格，使 asyncio-basics 与 asyncio_basics 等价
+    text = _SEPARATOR_PATTERN.sub(" ", str(name).lower()).strip()
+    if not text:
+        return set()
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
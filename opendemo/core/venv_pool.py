@@ -0,0 +1,405 @@
+"""
+虚拟环境池模块
+
+按规范化后的 requirements.txt 和解释器版本的SHA-256复用Python虚拟环境，
+依赖相同(包括没有依赖)的demo共用同一个虚拟环境，只在第一次验证时创建和安装依赖。
+
+虚拟环境持有 {键}.lock 锁文件时直接在以键命名的目录中创建(venv 的脚本和 pyvenv.cfg
+中记录的是绝对路径，创建后不能移动)，依赖安装成功后最后写入 READY_FILE，
+并行验证的多个进程只有一个进行创建，其余等待锁释放后直接复用，不会用到安装了一半的环境。
+安装失败的环境不会保存。总大小超过上限时按最近使用时间淘汰最久未用的环境。
+
+池中的环境由多个并行任务共用，验证时不直接使用，而是为每个任务创建一个叠加在其上的
+轻量虚拟环境(overlay)，demo运行时安装或修改的包只写入各自的叠加环境。
+获取环境时在其中登记租约文件，使用结束后释放，淘汰时跳过仍有租约的环境。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import sysconfig
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 标记虚拟环境已可用的文件(记录大小，mtime为最近使用时间)
+READY_FILE = ".opendemo-ready"
+
+# 超过该时间(秒)的锁文件视为中断的创建，等待锁的进程接管创建
+BUILD_LOCK_TIMEOUT = 900
+
+# 等待锁时检查锁文件的间隔(秒)
+BUILD_LOCK_POLL = 0.2
+
+# 叠加环境中引入池中环境 site-packages 的 .pth 文件名
+OVERLAY_PTH = "_opendemo_base.pth"
+
+# 虚拟环境中保存租约文件的目录(每个正在使用该环境的任务一个文件)
+LEASE_DIR = ".opendemo-leases"
+
+# 超过该时间(秒)的租约视为中断的验证遗留，不再阻止淘汰
+LEASE_TIMEOUT = 6 * 3600
+
+
+class VenvPool:
+    """磁盘虚拟环境池"""
+
+    def __init__(self, directory: Path, max_bytes: int = 2048 << 20):
+        """
+        初始化虚拟环境池
+
+        Args:
+            directory: 保存虚拟环境的目录
+            max_bytes: 总大小上限(字节)，0表示不限制
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def normalize_requirements(text: str) -> str:
+        """
+        规范化依赖列表(去掉注释、空行和多余空白，排序去重)
+
+        Args:
+            text: requirements.txt 内容
+
+        Returns:
+            规范化后的内容
+        """
+        lines = set()
+        for line in text.splitlines():
+            line = line.split(" #", 1)[0].strip()
+            if line and not line.startswith("#"):
+                lines.add(" ".join(line.split()))
+        return "\n".join(sorted(lines))
+
+    @classmethod
+    def make_key(cls, requirements: str) -> str:
+        """
+        虚拟环境的键
+
+        Args:
+            requirements: requirements.txt 内容(没有依赖时为空字符串)
+
+        Returns:
+            规范化依赖和解释器版本的SHA-256
+        """
+        interpreter = f"{sys.implementation.name} {sys.version} {os.path.realpath(sys.executable)}"
+        content = f"{interpreter}\n{cls.normalize_requirements(requirements)}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def acquire(
+        self, requirements: str, build: Callable[[Path], Tuple[bool, str]]
+    ) -> Tuple[Optional[Path], bool, str]:
+        """
+        获取依赖对应的虚拟环境，不存在时创建
+
+        获取成功时为当前线程登记租约，使用结束后须调用 release 释放。
+
+        Args:
+            requirements: requirements.txt 内容
+            build: 在给定路径创建虚拟环境并安装依赖的函数，返回 (成功, 输出)
+
+        Returns:
+            (虚拟环境路径，创建失败时为None; 是否复用了已有环境; 创建时的输出)
+        """
+        key = self.make_key(requirements)
+        path = self.directory / key
+        if self._lease(path):
+            logger.debug(f"Reusing cached venv {key[:12]}")
+            return path, True, ""
+
+        lock_path = self.directory / f"{key}.lock"
+        if not self._lock(lock_path):
+            return None, False, f"Failed to lock {lock_path}"
+        try:
+            # 等待锁期间其他进程可能已经创建完成
+            if self._lease(path):
+                return path, True, ""
+            # 中断的创建留下的不完整环境
+            shutil.rmtree(path, ignore_errors=True)
+            try:
+                success, output = build(path)
+            except Exception as e:
+                success, output = False, str(e)
+            if success:
+                try:
+                    size = _directory_size(path)
+                    with open(path / READY_FILE, "w", encoding="utf-8") as f:
+                        json.dump({"size": size, "created_at": time.time()}, f)
+                except OSError as e:
+                    success, output = False, f"{output}\n{e}".strip()
+            if success and not self._lease(path):
+                success, output = False, f"{output}\nFailed to lease {path}".strip()
+            if not success:
+                shutil.rmtree(path, ignore_errors=True)
+                return None, False, output
+        finally:
+            _unlock(lock_path)
+
+        self.evict(keep=key)
+        return path, False, output
+
+    def release(self, path: Path):
+        """
+        释放当前线程对虚拟环境的租约
+
+        Args:
+            path: acquire 返回的虚拟环境路径
+        """
+        try:
+            os.remove(path / LEASE_DIR / _lease_name())
+        except OSError:
+            pass
+
+    @staticmethod
+    def link_overlay(base: Path, overlay: Path) -> bool:
+        """
+        使叠加环境可以导入池中环境安装的包
+
+        在叠加环境的 site-packages 中写入 .pth 文件，以 site.addsitedir 加入池中环境的
+        site-packages(其中的 .pth 文件同样生效)；叠加环境自身的 site-packages 优先。
+
+        Args:
+            base: 池中的虚拟环境
+            overlay: 叠加环境(已创建的空虚拟环境)
+
+        Returns:
+            是否成功
+        """
+        try:
+            target = _site_packages(overlay)
+            target.mkdir(parents=True, exist_ok=True)
+            with open(target / OVERLAY_PTH, "w", encoding="utf-8") as f:
+                f.write(f"import site; site.addsitedir({str(_site_packages(base))!r})\n")
+            return True
+        except OSError as e:
+            logger.error(f"Failed to link venv overlay {overlay}: {e}")
+            return False
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        淘汰最久未使用的虚拟环境，使总大小不超过上限
+
+        Args:
+            keep: 不淘汰的键(刚获取的环境)
+
+        Returns:
+            删除的虚拟环境数
+        """
+        if not self.directory.exists():
+            return 0
+
+        entries = []
+        total = 0
+        for path in self.directory.iterdir():
+            try:
+                if path.suffix == ".lock":
+                    continue
+                ready = path / READY_FILE
+                if not ready.exists():
+                    # 中断的创建(没有进程持有锁时)留下的不完整环境
+                    lock_path = path.with_name(f"{path.name}.lock")
+                    if not lock_path.exists() and _age(path) > BUILD_LOCK_TIMEOUT:
+                        shutil.rmtree(path, ignore_errors=True)
+                    continue
+                stat = ready.stat()
+                with open(ready, "r", encoding="utf-8") as f:
+                    size = int(json.load(f).get("size") or 0)
+            except (OSError, ValueError, AttributeError):
+                continue
+            entries.append((stat.st_mtime, size, path))
+            total += size
+
+        if not self.max_bytes:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path.name == keep or not self._remove(path):
+                continue
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} cached virtual environments")
+        return removed
+
+    def clear(self) -> int:
+        """
+        删除全部虚拟环境
+
+        Returns:
+            删除的虚拟环境数
+        """
+        if not self.directory.exists():
+            return 0
+        removed = 0
+        for path in self.directory.iterdir():
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _lock(self, lock_path: Path) -> bool:
+        """
+        获取创建环境的锁(独占创建锁文件)，锁文件超过 BUILD_LOCK_TIMEOUT 时接管
+
+        Args:
+            lock_path: 锁文件路径
+
+        Returns:
+            是否获取成功
+        """
+        try:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to create venv cache directory: {e}")
+            return False
+        while True:
+            try:
+                fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if _age(lock_path) > BUILD_LOCK_TIMEOUT:
+                    logger.warning(f"Removing stale venv build lock {lock_path}")
+                    _unlock(lock_path)
+                else:
+                    time.sleep(BUILD_LOCK_POLL)
+                continue
+            except OSError as e:
+                logger.error(f"Failed to lock {lock_path}: {e}")
+                return False
+            os.write(fd, str(os.getpid()).encode("ascii"))
+            os.close(fd)
+            return True
+
+    def _lease(self, path: Path) -> bool:
+        """
+        环境已可用时登记当前线程的租约并更新最近使用时间
+
+        先写租约再确认 READY_FILE 仍然存在，与 _remove 的顺序相反，
+        因此不会登记到正在被淘汰的环境上。
+
+        Args:
+            path: 虚拟环境路径
+
+        Returns:
+            是否获取成功
+        """
+        ready = path / READY_FILE
+        lease = path / LEASE_DIR / _lease_name()
+        try:
+            os.utime(ready)
+            lease.parent.mkdir(exist_ok=True)
+            lease.touch()
+        except OSError:
+            return False
+        if ready.exists():
+            return True
+        self.release(path)
+        return False
+
+    def _remove(self, path: Path) -> bool:
+        """
+        删除没有租约的虚拟环境
+
+        持有环境的创建锁，先删除 READY_FILE 再检查租约，检查到新租约时恢复。
+
+        Args:
+            path: 虚拟环境路径
+
+        Returns:
+            是否已删除
+        """
+        lock_path = path.with_name(f"{path.name}.lock")
+        try:
+            fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError:
+            # 其他进程正在创建或淘汰该环境
+            return False
+        os.close(fd)
+        try:
+            if _leased(path):
+                return False
+            ready = path / READY_FILE
+            content = ready.read_bytes()
+            os.remove(ready)
+            if _leased(path):
+                ready.write_bytes(content)
+                return False
+            shutil.rmtree(path, ignore_errors=True)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to evict cached venv {path}: {e}")
+            return False
+        finally:
+            _unlock(lock_path)
+
+
+def _unlock(lock_path: Path):
+    """释放创建环境的锁"""
+    try:
+        os.remove(lock_path)
+    except OSError:
+        pass
+
+
+def _lease_name() -> str:
+    """当前进程和线程的租约文件名"""
+    return f"{os.getpid()}-{threading.get_ident()}"
+
+
+def _leased(path: Path) -> bool:
+    """虚拟环境是否有未过期的租约(顺带清理过期租约)"""
+    try:
+        leases = list((path / LEASE_DIR).iterdir())
+    except OSError:
+        return False
+    leased = False
+    for lease in leases:
+        if _age(lease) <= LEASE_TIMEOUT:
+            leased = True
+        else:
+            try:
+                os.remove(lease)
+            except OSError:
+                pass
+    return leased
+
+
+def _age(path: Path) -> float:
+    """文件或目录距最后修改的秒数，不存在时为0"""
+    try:
+        return time.time() - path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _site_packages(venv_path: Path) -> Path:
+    """虚拟环境的 site-packages 目录(与当前解释器相同的版本和布局)"""
+    scheme = "nt" if os.name == "nt" else "posix_prefix"
+    return Path(
+        sysconfig.get_path(
+            "purelib", scheme, vars={"base": str(venv_path), "platbase": str(venv_path)}
+        )
+    )
+
+
+def _directory_size(path: Path) -> int:
+    """目录下所有文件的大小之和(不跟随符号链接)"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
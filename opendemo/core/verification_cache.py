@@ -0,0 +1,143 @@
+"""
+验证结果缓存模块
+
+以demo目录内容的哈希、工具链版本、验证器版本和验证设置作为键保存验证结果、输出和耗时，
+内容和环境都没有变化的demo再次验证时直接返回缓存的结果，不再创建环境、安装依赖和运行代码。
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+from opendemo.services.response_cache import ResponseCache
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 读取文件内容的块大小
+HASH_CHUNK_SIZE = 1 << 20
+
+# 不影响验证结果、不计入哈希的文件(metadata.json 的 verified 字段由验证结果写回)
+UNHASHED_FILES = ("metadata.json",)
+
+
+def hash_demo_tree(demo_path: Path) -> str:
+    """
+    计算demo目录内容的哈希
+
+    与 DemoRepository.get_demo_files 一样跳过 __pycache__ 和以点开头的文件(以及以点开头的目录)，
+    并跳过demo根目录下的 metadata.json。
+
+    Args:
+        demo_path: demo路径
+
+    Returns:
+        按相对路径排序后的文件路径和内容的SHA-256
+    """
+    demo_path = Path(demo_path)
+    if not demo_path.is_dir():
+        raise FileNotFoundError(f"Demo directory not found: {demo_path}")
+
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(demo_path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+        for name in sorted(files):
+            if name.startswith(".") or (root == str(demo_path) and name in UNHASHED_FILES):
+                continue
+            file_path = Path(root) / name
+            relative = file_path.relative_to(demo_path).as_posix()
+            digest.update(relative.encode("utf-8") + b"\0")
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class VerificationCache:
+    """磁盘验证结果缓存"""
+
+    def __init__(self, directory: Path, max_bytes: int = 50 << 20):
+        """
+        初始化缓存
+
+        Args:
+            directory: 缓存目录
+            max_bytes: 缓存总大小上限(字节)，超出时淘汰最久未用的结果
+        """
+        self._cache = ResponseCache(directory, ttl_seconds=0, max_bytes=max_bytes)
+
+    @staticmethod
+    def make_key(
+        content_hash: str,
+        language: str,
+        toolchain: str,
+        verifier_version: int,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        计算缓存键
+
+        Args:
+            content_hash: demo目录内容的哈希
+            language: 编程语言
+            toolchain: 工具链版本
+            verifier_version: 验证器版本
+            settings: 影响验证结果的设置
+
+        Returns:
+            十六进制SHA-256
+        """
+        return ResponseCache.make_key(
+            f"verify:v{verifier_version}",
+            {
+                "content": content_hash,
+                "language": language.lower(),
+                "toolchain": toolchain,
+                "settings": settings or {},
+            },
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存的验证结果
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            {"result": 验证结果, "duration": 耗时(秒)}，不存在时返回None
+        """
+        content = self._cache.get(key)
+        if content is None:
+            return None
+        try:
+            entry = json.loads(content)
+        except ValueError:
+            return None
+        return entry if isinstance(entry, dict) and "result" in entry else None
+
+    def put(self, key: str, result: Dict[str, Any], duration: float) -> bool:
+        """
+        保存验证结果
+
+        Args:
+            key: 缓存键
+            result: 验证结果
+            duration: 验证耗时(秒)
+
+        Returns:
+            是否保存成功
+        """
+        entry = {"result": result, "duration": round(duration, 3)}
+        return self._cache.put(key, json.dumps(entry, ensure_ascii=False, default=str))
+
+    def clear(self) -> int:
+        """
+        清空缓存
+
+        Returns:
+            删除的条目数
+        """
+        return self._cache.clear()
@@ -0,0 +1,384 @@
+"""
+AI提供方模块
+
+把LLM后端抽象为提供方(provider):
+  - openai: OpenAI 兼容的 chat/completions 端点(需要API密钥)
+  - local:  本地模型服务(Ollama、vLLM、llama.cpp 等的 OpenAI 兼容接口)，API密钥可选
+  - stub:   离线的确定性补全，不访问网络，作为其他提供方都不可用时的兜底
+
+ProviderRouter 根据每次请求的结果跟踪提供方的健康状态: 请求失败的提供方在冷却期内
+不再使用(熔断)，健康的提供方按平滑后的响应耗时从低到高排序，调用方依次尝试，
+某个提供方失败时立即切换到下一个，而不是对同一个端点等待超时后再重试。
+配置了状态文件时健康状态跨进程保存，每次运行 opendemo 都能沿用之前的测量结果。
+"""
+
+import io
+import json
+import os
+import threading
+import time
+import requests
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_OPENAI_ENDPOINT = "https://api.openai.com/v1/chat/completions"
+DEFAULT_LOCAL_ENDPOINT = "http://localhost:11434/v1/chat/completions"
+
+# 请求异常之外，表示提供方暂时不可用、应切换到下一个提供方的HTTP状态码
+FAILOVER_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class AIProvider:
+    """提供方基类(OpenAI 兼容的 chat/completions 接口)"""
+
+    type = ""
+    # 是否必须配置API密钥
+    requires_api_key = False
+    # 兜底提供方只在其他提供方都不可用时使用
+    fallback = False
+    # 是否经过网络(需要限流)
+    remote = True
+    default_endpoint = DEFAULT_OPENAI_ENDPOINT
+
+    def __init__(
+        self,
+        name: str,
+        endpoint: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+    ):
+        """
+        初始化提供方
+
+        Args:
+            name: 提供方名称(日志和健康状态中使用)
+            endpoint: chat/completions 端点，默认使用该类型的默认端点
+            api_key: API密钥
+            model: 模型名称，None表示使用请求体中的模型
+        """
+        self.name = name
+        self.endpoint = endpoint or self.default_endpoint
+        self.api_key = api_key or ""
+        self.model = model
+
+    @property
+    def available(self) -> bool:
+        """配置是否完整(需要密钥的提供方已配置密钥)"""
+        return bool(self.api_key) or not self.requires_api_key
+
+    @property
+    def key(self) -> str:
+        """健康状态的键"""
+        return f"{self.type}:{self.endpoint}"
+
+    def headers(self) -> Dict[str, str]:
+        """请求头"""
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def send(
+        self, session: requests.Session, data: Dict[str, Any], timeout: Any, stream: bool = False
+    ) -> requests.Response:
+        """
+        发送请求
+
+        Args:
+            session: HTTP会话
+            data: 请求体
+            timeout: 超时时间(秒，或 (连接超时, 读取超时))
+            stream: 是否流式读取响应体
+
+        Returns:
+            HTTP响应
+        """
+        if self.model:
+            data = dict(data, model=self.model)
+        return session.post(
+            self.endpoint, headers=self.headers(), json=data, timeout=timeout, stream=stream
+        )
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name} {self.endpoint}>"
+
+
+class OpenAIProvider(AIProvider):
+    """OpenAI 兼容的云端API"""
+
+    type = "openai"
+    requires_api_key = True
+
+
+class LocalProvider(AIProvider):
+    """本地模型服务"""
+
+    type = "local"
+    default_endpoint = DEFAULT_LOCAL_ENDPOINT
+
+
+class StubProvider(AIProvider):
+    """离线的确定性补全(与 mock_llm_server 返回相同格式的内容)"""
+
+    type = "stub"
+    fallback = True
+    remote = False
+    default_endpoint = "stub://"
+
+    def send(
+        self, session: requests.Session, data: Dict[str, Any], timeout: Any, stream: bool = False
+    ) -> requests.Response:
+        """在本地构造补全响应(忽略 stream，调用方按非流式响应处理)"""
+        from opendemo.utils.mock_llm_server import MockCompletions
+
+        content = MockCompletions().content(data)
+        body = {
+            "choices": [{"message": {"content": content}, "finish_reason": "stop"}],
+            "usage": MockCompletions.usage(data, content),
+        }
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.endpoint
+        response.headers["Content-Type"] = "application/json"
+        response.encoding = "utf-8"
+        response.raw = io.BytesIO(json.dumps(body, ensure_ascii=False).encode("utf-8"))
+        return response
+
+
+# 提供方类型 -> 类
+PROVIDER_TYPES = {cls.type: cls for cls in (OpenAIProvider, LocalProvider, StubProvider)}
+
+
+def build_providers(config) -> List[AIProvider]:
+    """
+    根据配置构造提供方列表
+
+    主提供方由 ai.provider / ai.api_key / ai.api_endpoint / ai.model 配置，
+    ai.providers 中的条目(type、name、api_endpoint、api_key、model)作为备用提供方。
+    缺少API密钥或类型未知的提供方会被忽略。
+
+    Args:
+        config: 配置服务实例
+
+    Returns:
+        可用的提供方列表(主提供方在前)
+    """
+    entries = [
+        {
+            "type": config.get("ai.provider") or "openai",
+            "api_endpoint": config.get("ai.api_endpoint"),
+            "api_key": config.get("ai.api_key"),
+        }
+    ]
+    extra = config.get("ai.providers") or []
+    if isinstance(extra, list):
+        entries += [entry for entry in extra if isinstance(entry, dict)]
+    else:
+        logger.warning("ai.providers must be a list, ignoring it")
+
+    providers = []
+    names = set()
+    for index, entry in enumerate(entries):
+        provider_type = str(entry.get("type") or "openai").lower()
+        provider_cls = PROVIDER_TYPES.get(provider_type)
+        if provider_cls is None:
+            logger.warning(f"Unknown AI provider type '{provider_type}', ignoring it")
+            continue
+
+        name = str(entry.get("name") or provider_type)
+        if name in names:
+            name = f"{name}-{index}"
+        provider = provider_cls(
+            name,
+            endpoint=entry.get("api_endpoint") or entry.get("endpoint"),
+            api_key=entry.get("api_key"),
+            model=entry.get("model") if index else None,
+        )
+        if not provider.available:
+            logger.debug(f"AI provider {name} has no API key, skipping it")
+            continue
+        names.add(name)
+        providers.append(provider)
+    return providers
+
+
+class ProviderHealth:
+    """提供方健康状态"""
+
+    def __init__(
+        self,
+        latency: Optional[float] = None,
+        failures: int = 0,
+        unhealthy_until: float = 0.0,
+    ):
+        """
+        初始化
+
+        Args:
+            latency: 平滑后的响应耗时(秒)，None表示尚未测量
+            failures: 连续失败次数
+            unhealthy_until: 熔断结束时间(time.time)
+        """
+        self.latency = latency
+        self.failures = failures
+        self.unhealthy_until = unhealthy_until
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "latency": self.latency,
+            "failures": self.failures,
+            "unhealthy_until": self.unhealthy_until,
+        }
+
+
+class ProviderRouter:
+    """按健康状态和响应耗时选择提供方(线程安全)"""
+
+    def __init__(
+        self,
+        providers: List[AIProvider],
+        cooldown: float = 30.0,
+        failure_threshold: int = 1,
+        smoothing: float = 0.3,
+        state_path: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        初始化路由
+
+        Args:
+            providers: 提供方列表(耗时相同时按此顺序)
+            cooldown: 提供方失败后的熔断时间(秒)
+            failure_threshold: 触发熔断的连续失败次数
+            smoothing: 耗时指数平滑系数，越大越偏重最近的测量
+            state_path: 保存健康状态的JSON文件，None表示只保存在内存中
+            clock: 时钟函数(测试用)
+        """
+        self.providers = list(providers)
+        self.cooldown = cooldown
+        self.failure_threshold = max(1, failure_threshold)
+        self.smoothing = smoothing
+        self.state_path = Path(state_path) if state_path else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._health: Dict[str, ProviderHealth] = {p.key: ProviderHealth() for p in providers}
+        self._load_state()
+
+    def health(self, provider: AIProvider) -> ProviderHealth:
+        """提供方的健康状态"""
+        return self._health[provider.key]
+
+    def is_healthy(self, provider: AIProvider) -> bool:
+        """提供方是否不在熔断期内"""
+        return self.health(provider).unhealthy_until <= self._clock()
+
+    def candidates(self) -> List[AIProvider]:
+        """
+        本次请求依次尝试的提供方
+
+        Returns:
+            健康的提供方(尚未测量的优先，其余按耗时从低到高)，然后是兜底提供方；
+            全部处于熔断期时按熔断结束时间返回全部提供方
+        """
+        with self._lock:
+            order = {p.key: i for i, p in enumerate(self.providers)}
+            healthy = [p for p in self.providers if self.is_healthy(p)]
+            if not healthy:
+                return sorted(
+                    self.providers,
+                    key=lambda p: (self.health(p).unhealthy_until, order[p.key]),
+                )
+
+            def rank(provider):
+                latency = self.health(provider).latency
+                return (provider.fallback, latency or 0.0, order[provider.key])
+
+            return sorted(healthy, key=rank)
+
+    def record_success(self, provider: AIProvider, latency: float):
+        """
+        记录一次成功的请求
+
+        Args:
+            provider: 提供方
+            latency: 响应耗时(秒，到收到响应头为止)
+        """
+        with self._lock:
+            health = self.health(provider)
+            if health.latency is None:
+                health.latency = latency
+            else:
+                health.latency += self.smoothing * (latency - health.latency)
+            health.failures = 0
+            health.unhealthy_until = 0.0
+            self._save_state()
+
+    def record_failure(self, provider: AIProvider):
+        """
+        记录一次失败的请求，连续失败达到阈值时熔断
+
+        Args:
+            provider: 提供方
+        """
+        with self._lock:
+            health = self.health(provider)
+            health.failures += 1
+            if health.failures >= self.failure_threshold:
+                health.unhealthy_until = self._clock() + self.cooldown
+                logger.warning(
+                    f"AI provider {provider.name} marked unhealthy for {self.cooldown:.0f}s"
+                )
+            self._save_state()
+
+    def status(self) -> List[Dict[str, Any]]:
+        """
+        各提供方的状态
+
+        Returns:
+            [{"name", "type", "endpoint", "healthy", "latency", "failures"}]，按配置顺序
+        """
+        with self._lock:
+            return [
+                {
+                    "name": p.name,
+                    "type": p.type,
+                    "endpoint": p.endpoint,
+                    "healthy": self.is_healthy(p),
+                    "latency": self.health(p).latency,
+                    "failures": self.health(p).failures,
+                }
+                for p in self.providers
+            ]
+
+    def _load_state(self):
+        """读取保存的健康状态"""
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            for key, health in self._health.items():
+                saved = state.get(key)
+                if isinstance(saved, dict):
+                    health.latency = saved.get("latency")
+                    health.failures = int(saved.get("failures") or 0)
+                    health.unhealthy_until = float(saved.get("unhealthy_until") or 0)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Failed to load provider state {self.state_path}: {e}")
+
+    def _save_state(self):
+        """保存健康状态(调用方持有锁)"""
+        if self.state_path is None:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({k: h.to_dict() for k, h in self._health.items()}, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"Failed to save provider state {self.state_path}: {e}")
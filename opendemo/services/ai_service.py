@@ -2,16 +2,52 @@
 AI服务模块
 
 负责与LLM API交互,生成demo代码。
+AsyncAIService 提供 asyncio 接口，供批量生成并发调用。
 """
 
+import asyncio
 import json
+import threading
 import time
 import requests
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Any, Generator, Iterator, Optional, Tuple, Union
+from opendemo.services.ai_providers import (
+    DEFAULT_OPENAI_ENDPOINT,
+    FAILOVER_STATUS_CODES,
+    AIProvider,
+    ProviderRouter,
+    build_providers,
+)
+from opendemo.services.rate_limiter import (
+    RETRYABLE_STATUS_CODES,
+    RateLimiter,
+    backoff_delay,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from opendemo.services.metrics import (
+    CACHE_HIT,
+    PARSE_FAILURE,
+    RETRY,
+    AIMetrics,
+    metrics_sink_from_env,
+)
+from opendemo.services.response_cache import ResponseCache
+from opendemo.utils.json_stream import DemoStreamParser
 from opendemo.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# prompt模板版本，修改 _build_prompt 或分类prompt、解析逻辑时递增，使旧的缓存响应失效
+PROMPT_VERSION = 1
+
+# 分类响应无法解析时的描述(此类响应不写入缓存)
+CLASSIFY_PARSE_ERROR = "Failed to parse AI response"
+
 
 class AIService:
     """AI服务类"""
@@ -27,18 +63,377 @@ class AIService:
         self._api_key = None
         self._api_endpoint = None
         self._model = None
+        self._session: Optional[requests.Session] = None
+        self._response_cache: Optional[ResponseCache] = None
+        self._metrics: Optional[AIMetrics] = None
+        self._router: Optional[ProviderRouter] = None
+        # 每个线程最近一次返回响应的提供方
+        self._served = threading.local()
+        # 每个线程当前生成的截止时间(time.monotonic)，限流暂停不会等待超过该时间
+        self._deadline = threading.local()
 
     def _load_config(self):
         """加载AI配置"""
         if self._api_key is None:
             self._api_key = self.config.get("ai.api_key")
-            self._api_endpoint = (
-                self.config.get("ai.api_endpoint") or "https://api.openai.com/v1/chat/completions"
-            )
+            self._api_endpoint = self.config.get("ai.api_endpoint") or DEFAULT_OPENAI_ENDPOINT
             self._model = self.config.get("ai.model", "gpt-4")
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        共享的HTTP会话
+
+        同一进程内的分类、生成、验证请求复用连接池中的TCP/TLS连接，
+        连接池大小由 ai.pool_size 配置，ai.keep_alive 为false时每次请求后关闭连接。
+        """
+        if self._session is None:
+            pool_size = int(self.config.get("ai.pool_size", 10))
+            adapter = HTTPAdapter(pool_maxsize=pool_size)
+
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if not self.config.get("ai.keep_alive", True):
+                session.headers["Connection"] = "close"
+            self._session = session
+        return self._session
+
+    def close(self):
+        """关闭HTTP会话及其连接池"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """主端点的限流器"""
+        return self._rate_limiter_for(self._api_endpoint)
+
+    def _rate_limiter_for(self, endpoint: str) -> RateLimiter:
+        """
+        端点的限流器(进程内所有AIService实例共享)
+
+        由 ai.requests_per_minute 和 ai.tokens_per_minute 配置，0表示不限制。
+        """
+        return get_rate_limiter(
+            endpoint,
+            self.config.get("ai.requests_per_minute", 0),
+            self.config.get("ai.tokens_per_minute", 0),
+        )
+
+    @property
+    def router(self) -> ProviderRouter:
+        """
+        AI提供方路由
+
+        提供方由 ai.provider 及 ai.providers 配置，请求失败的提供方在
+        ai.provider_cooldown 秒内不再使用；配置了缓存目录时健康状态跨进程保存。
+        """
+        if self._router is None:
+            self._load_config()
+            cache_directory = self.config.get("cache_directory")
+            self._router = ProviderRouter(
+                build_providers(self.config),
+                cooldown=float(self.config.get("ai.provider_cooldown", 30)),
+                state_path=Path(cache_directory) / "provider_health.json"
+                if cache_directory
+                else None,
+            )
+        return self._router
+
+    def _post(
+        self, data: Dict[str, Any], timeout: float, stream: bool = False
+    ) -> requests.Response:
+        """
+        向AI提供方发送请求
+
+        按路由顺序依次尝试提供方，请求异常或返回 FAILOVER_STATUS_CODES 时立即切换到
+        下一个提供方；最后一个提供方的异常直接抛出，错误响应直接返回，由调用方重试。
+        返回响应的提供方可在同一线程中通过 _served_provider 取得。
+
+        Args:
+            data: 请求体
+            timeout: 读取超时时间(秒)，连接超时由 ai.connect_timeout 配置
+            stream: 是否流式读取响应体
+
+        Returns:
+            HTTP响应
+        """
+        candidates = self.router.candidates()
+        if not candidates:
+            raise RuntimeError("No AI provider is configured")
+
+        self._served.provider = None
+        connect_timeout = min(float(self.config.get("ai.connect_timeout", 5)), timeout)
+        for index, provider in enumerate(candidates):
+            is_last = index == len(candidates) - 1
+            started = time.perf_counter()
+            try:
+                response = self._send(provider, data, (connect_timeout, timeout), stream)
+            except requests.RequestException as e:
+                self.router.record_failure(provider)
+                if is_last:
+                    raise
+                logger.warning(f"AI provider {provider.name} failed: {e}, trying next provider")
+                continue
+
+            if response.status_code in FAILOVER_STATUS_CODES:
+                self.router.record_failure(provider)
+                if not is_last:
+                    logger.warning(
+                        f"AI provider {provider.name} returned {response.status_code}, "
+                        "trying next provider"
+                    )
+                    response.close()
+                    continue
+            else:
+                self.router.record_success(provider, time.perf_counter() - started)
+            self._served.provider = provider
+            return response
+
+    def _served_provider(self) -> Optional[AIProvider]:
+        """
+        取出当前线程最近一次 _post 返回响应的提供方
+
+        Returns:
+            提供方，没有请求时返回None
+        """
+        provider = getattr(self._served, "provider", None)
+        self._served.provider = None
+        return provider
+
+    def _send(
+        self, provider: AIProvider, data: Dict[str, Any], timeout: Any, stream: bool
+    ) -> requests.Response:
+        """
+        向单个提供方发送请求(远程提供方经过限流)
+
+        Args:
+            provider: 提供方
+            data: 请求体
+            timeout: 超时时间
+            stream: 是否流式读取响应体
+
+        Returns:
+            HTTP响应
+        """
+        if not provider.remote:
+            return provider.send(self.session, data, timeout, stream)
+
+        limiter = self._rate_limiter_for(provider.endpoint)
+        deadline = getattr(self._deadline, "value", None)
+        max_wait = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+        limiter.acquire(_estimate_tokens(data), max_wait=max_wait)
+
+        response = provider.send(self.session, data, timeout, stream)
+
+        # 被限流时让所有并发请求一起暂停，而不是各自立即重试
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            retry_after = self._retry_after(response)
+            if retry_after is None:
+                retry_after = float(self.config.get("ai.retry_interval", 5))
+            limiter.pause(retry_after)
+
+        return response
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """
+        响应要求的重试等待时间
+
+        Args:
+            response: HTTP响应
+
+        Returns:
+            Retry-After 的秒数(不超过 ai.retry_max_interval)，没有时返回None
+        """
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is None:
+            return None
+        return min(retry_after, float(self.config.get("ai.retry_max_interval", 60)))
+
+    @contextmanager
+    def _deadline_scope(self, deadline: Optional[float]) -> Iterator[None]:
+        """
+        为当前线程中的后续请求设置截止时间
+
+        Args:
+            deadline: _retry_deadline 返回的截止时间
+        """
+        previous = getattr(self._deadline, "value", None)
+        self._deadline.value = deadline
+        try:
+            yield
+        finally:
+            self._deadline.value = previous
+
+    @property
+    def metrics(self) -> AIMetrics:
+        """
+        AI调用指标
+
+        记录文件由环境变量 OPENDEMO_METRICS_FILE 或 ai.metrics_file 指定，
+        费用按 ai.prompt_token_price / ai.completion_token_price (每千token) 估算。
+        """
+        if self._metrics is None:
+            sink = metrics_sink_from_env() or self.config.get("ai.metrics_file")
+            self._metrics = AIMetrics(
+                sink_path=Path(sink).expanduser() if sink else None,
+                prompt_price=float(self.config.get("ai.prompt_token_price", 0) or 0),
+                completion_price=float(self.config.get("ai.completion_token_price", 0) or 0),
+            )
+        return self._metrics
+
+    def _record_response(
+        self,
+        kind: str,
+        started: float,
+        response: Optional[requests.Response],
+        result: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        记录一次非流式调用的指标
+
+        Args:
+            kind: 调用类别
+            started: 开始时间(time.perf_counter)
+            response: HTTP响应，请求异常时为None
+            result: 解析后的响应体
+        """
+        result = result if isinstance(result, dict) else {}
+        choices = result.get("choices") or [{}]
+        self.metrics.record_call(
+            kind,
+            time.perf_counter() - started,
+            response.status_code if response is not None else "error",
+            usage=result.get("usage"),
+            finish_reason=choices[0].get("finish_reason"),
+        )
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """
+        AI响应缓存
+
+        由 ai.cache_enabled、ai.cache_ttl_days、ai.cache_max_mb 配置，
+        禁用或未配置缓存目录时为None。
+        """
+        if self._response_cache is None and self.config.get("ai.cache_enabled", True):
+            cache_directory = self.config.get("cache_directory")
+            if cache_directory:
+                self._response_cache = ResponseCache(
+                    Path(cache_directory) / "ai_responses",
+                    ttl_seconds=float(self.config.get("ai.cache_ttl_days", 30)) * 86400,
+                    max_bytes=int(float(self.config.get("ai.cache_max_mb", 100)) * (1 << 20)),
+                )
+        return self._response_cache
+
+    def _cache_key(self, kind: str, data: Dict[str, Any]) -> Optional[str]:
+        """
+        计算请求的缓存键
+
+        Args:
+            kind: 请求类别(generate / classify)
+            data: 请求体(模型、消息、参数)
+
+        Returns:
+            缓存键，缓存不可用时返回None
+        """
+        if self.response_cache is None:
+            return None
+        request = dict(data, endpoint=self._api_endpoint)
+        return ResponseCache.make_key(f"{kind}:v{PROMPT_VERSION}", request)
+
+    def _cached_response(self, cache_key: Optional[str]) -> Optional[str]:
+        """读取缓存的响应内容"""
+        if cache_key is None:
+            return None
+        return self.response_cache.get(cache_key)
+
+    def _store_response(
+        self,
+        cache_key: Optional[str],
+        content: Union[str, Dict[str, Any]],
+        provider: Optional[AIProvider] = None,
+    ):
+        """
+        保存解析成功的响应内容
+
+        兜底提供方(离线stub)的占位内容不写入缓存，以免提供方恢复后仍返回占位内容。
+
+        Args:
+            cache_key: 缓存键
+            content: 响应内容，或流式解析得到的demo数据(序列化为JSON后保存)
+            provider: 返回响应的提供方
+        """
+        if provider is not None and provider.fallback:
+            logger.warning(
+                f"Response was served by fallback AI provider {provider.name}, "
+                "the content is a placeholder and is not cached"
+            )
+            return
+        if cache_key is not None:
+            if isinstance(content, dict):
+                content = json.dumps(content, ensure_ascii=False)
+            self.response_cache.put(cache_key, content)
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """
+        计算失败后的重试等待时间
+
+        Args:
+            attempt: 已失败次数(从0开始)
+            error: 本次失败的异常
+
+        Returns:
+            等待秒数: 有 Retry-After 时以其为准(不超过 ai.retry_max_interval)，
+            否则为带抖动的指数退避
+        """
+        retry_after = None
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = self._retry_after(response)
+
+        return backoff_delay(
+            attempt,
+            float(self.config.get("ai.retry_interval", 5)),
+            float(self.config.get("ai.retry_max_interval", 60)),
+            retry_after,
+        )
+
+    def _retry_deadline(self) -> Optional[float]:
+        """
+        本次生成(含重试)的截止时间
+
+        Returns:
+            time.monotonic 时间，ai.total_timeout 为0时返回None(不限制)
+        """
+        total_timeout = float(self.config.get("ai.total_timeout", 120) or 0)
+        return time.monotonic() + total_timeout if total_timeout > 0 else None
+
+    def _past_deadline(self, deadline: Optional[float], delay: float) -> bool:
+        """
+        等待 delay 秒后再重试是否会超过截止时间
+
+        Args:
+            deadline: _retry_deadline 返回的截止时间
+            delay: 重试前的等待时间(秒)
+
+        Returns:
+            是否应放弃重试
+        """
+        if deadline is None or time.monotonic() + delay < deadline:
+            return False
+        logger.error("AI request exceeded ai.total_timeout, giving up retries")
+        return True
+
     def generate_demo(
-        self, language: str, topic: str, difficulty: str = "beginner"
+        self,
+        language: str,
+        topic: str,
+        difficulty: str = "beginner",
+        use_cache: bool = True,
+        on_stream: Optional[Callable[[str, Any], None]] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         生成demo代码
@@ -47,40 +442,131 @@ class AIService:
             language: 编程语言
             topic: 主题
             difficulty: 难度级别
+            use_cache: 是否使用缓存的响应(为False时仍会用新响应更新缓存)
+            on_stream: 流式事件回调(ai.stream 开启时生效)，响应到达过程中以
+                ("metadata", 元数据)、("file", 文件) 调用，重试前以 ("retry", 次数) 调用
 
         Returns:
             包含代码和文档的字典,失败返回None
         """
         self._load_config()
 
-        if not self._api_key:
+        if not self.router.providers:
             logger.error("AI API key is not configured")
             return None
 
         # 构建prompt
         prompt = self._build_prompt(language, topic, difficulty)
 
-        # 调用API
+        with self.metrics.label(f"{language}/{topic}"):
+            return self._generate(prompt, language, topic, use_cache, on_stream)
+
+    def _generate(
+        self,
+        prompt: str,
+        language: str,
+        topic: str,
+        use_cache: bool,
+        on_stream: Optional[Callable[[str, Any], None]],
+    ) -> Optional[Dict[str, Any]]:
+        """使用缓存或调用API(含重试)生成demo"""
+        stream = on_stream is not None and self.config.get("ai.stream", True)
+
+        def call(attempt: int) -> Tuple[Any, Optional[AIProvider]]:
+            if stream:
+                if attempt:
+                    on_stream("retry", attempt)
+                response = self._stream_api(prompt, language, topic, on_stream)
+            else:
+                response = self._call_api(prompt)
+            return response, self._served_provider()
+
+        deadline = self._retry_deadline()
+        steps = self._generation_steps(prompt, language, topic, use_cache, deadline=deadline)
+        try:
+            step, value = next(steps)
+            while True:
+                if step == "sleep":
+                    time.sleep(value)
+                    step, value = next(steps)
+                    continue
+                try:
+                    with self._deadline_scope(deadline):
+                        outcome = call(value)
+                except Exception as e:
+                    step, value = steps.throw(e)
+                else:
+                    step, value = steps.send(outcome)
+        except StopIteration as done:
+            return done.value
+
+    def _generation_steps(
+        self,
+        prompt: str,
+        language: str,
+        topic: str,
+        use_cache: bool,
+        label: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> Generator[Tuple[str, Any], Any, Optional[Dict[str, Any]]]:
+        """
+        生成demo的缓存查找、重试退避和缓存写入流程(不执行请求和等待)
+
+        同步和异步生成共用: 产出 ("call", 尝试次数) 时由调用方执行请求，send 回
+        (响应内容或流式组装的demo数据, 提供方)，请求异常时 throw 回异常；产出 ("sleep", 秒数)
+        时由调用方等待后继续。生成器的返回值为demo数据，失败为None。
+
+        Args:
+            prompt: 提示文本
+            language: 编程语言
+            topic: 主题
+            use_cache: 是否使用缓存的响应(为False时仍会用新响应更新缓存)
+            label: 指标标签，默认使用当前线程的标签
+            deadline: 重试的截止时间，默认为从现在起 ai.total_timeout 秒
+
+        Returns:
+            生成器
+        """
+        # 相同请求直接使用缓存的响应(批量重跑时已生成过的主题直接命中)
+        cache_key = self._cache_key("generate", self._generation_request(prompt))
+        demo_data = self._load_cached_demo(cache_key, language, topic) if use_cache else None
+        if demo_data:
+            self.metrics.record_event(CACHE_HIT, "generate", label)
+            return demo_data
+
         retry_times = self.config.get("ai.retry_times", 3)
-        retry_interval = self.config.get("ai.retry_interval", 5)
+        if deadline is None:
+            deadline = self._retry_deadline()
 
         for attempt in range(retry_times):
+            if attempt:
+                self.metrics.record_event(RETRY, "generate", label)
             try:
-                response = self._call_api(prompt)
+                response, provider = yield "call", attempt
+                if isinstance(response, dict):
+                    # 流式响应已由解析事件组装为demo数据
+                    self._store_response(cache_key, response, provider)
+                    return response
                 if response:
-                    # 解析响应
                     demo_data = self._parse_response(response, language, topic)
                     if demo_data:
+                        self._store_response(cache_key, response, provider)
                         return demo_data
+                    self.metrics.record_event(PARSE_FAILURE, "generate", label)
 
             except Exception as e:
-                logger.error(f"API call failed (attempt {attempt + 1}/{retry_times}): {e}")
+                logger.error(
+                    f"API call failed for {language}/{topic} "
+                    f"(attempt {attempt + 1}/{retry_times}): {e}"
+                )
 
                 if attempt < retry_times - 1:
-                    time.sleep(retry_interval)
-                    continue
+                    delay = self._retry_delay(attempt, e)
+                    if self._past_deadline(deadline, delay):
+                        break
+                    yield "sleep", delay
 
-        logger.error("Failed to generate demo after all retries")
+        logger.error(f"Failed to generate demo {language}/{topic} after all retries")
         return None
 
     def _build_prompt(self, language: str, topic: str, difficulty: str) -> str:
@@ -172,19 +658,37 @@ class AIService:
 
         return prompt
 
-    def _call_api(self, prompt: str) -> Optional[str]:
+    def _load_cached_demo(
+        self, cache_key: Optional[str], language: str, topic: str
+    ) -> Optional[Dict[str, Any]]:
         """
-        调用LLM API
+        从缓存读取并解析生成结果
 
         Args:
-            prompt: 提示文本
+            cache_key: 缓存键
+            language: 编程语言
+            topic: 主题
 
         Returns:
-            API响应内容,失败返回None
+            demo数据，未命中返回None
+        """
+        cached = self._cached_response(cache_key)
+        if not cached:
+            return None
+        logger.info(f"Using cached AI response for {language} - {topic}")
+        return self._parse_response(cached, language, topic)
+
+    def _generation_request(self, prompt: str) -> Dict[str, Any]:
         """
-        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {self._api_key}"}
+        构建生成demo的请求体
 
-        data = {
+        Args:
+            prompt: 提示文本
+
+        Returns:
+            请求体
+        """
+        return {
             "model": self._model,
             "messages": [
                 {
@@ -197,15 +701,132 @@ class AIService:
             "max_tokens": self.config.get("ai.max_tokens", 4000),
         }
 
+    def _stream_api(
+        self, prompt: str, language: str, topic: str, on_stream: Callable[[str, Any], None]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        流式调用LLM API，元数据和每个文件完整时立即回调
+
+        结果直接由解析事件组装，已解析的文本片段随即丢弃，不再拼接和整体解析完整响应。
+
+        Args:
+            prompt: 提示文本
+            language: 编程语言
+            topic: 主题
+            on_stream: 流式事件回调
+
+        Returns:
+            demo数据，响应不完整或缺少元数据时返回None
+        """
+        parser = DemoStreamParser()
+        metadata = None
+        files = []
+        for text in self._iter_completion(self._generation_request(prompt)):
+            for event, value in parser.feed(text):
+                if event == "metadata":
+                    metadata = value = self._normalize_metadata(value, language, topic)
+                elif not isinstance(value.get("path"), str) or "content" not in value:
+                    continue
+                else:
+                    files.append(value)
+                on_stream(event, value)
+
+        if not parser.done or metadata is None:
+            logger.error("Streamed response is incomplete or missing metadata")
+            return None
+        logger.info(f"Successfully parsed AI response for {metadata['name']}")
+        return {"metadata": metadata, "files": files}
+
+    def _iter_completion(self, data: Dict[str, Any]) -> Iterator[str]:
+        """
+        以SSE流式请求补全，逐段返回生成的文本
+
+        端点不支持流式(未返回 text/event-stream)时整体返回一次。
+
+        Args:
+            data: 请求体
+
+        Returns:
+            文本片段迭代器
+        """
+        timeout = self.config.get("ai.timeout", 60)
+        # include_usage 使最后一个事件携带token用量
+        request = dict(data, stream=True, stream_options={"include_usage": True})
+        started = time.perf_counter()
+        try:
+            response = self._post(request, timeout, stream=True)
+        except Exception:
+            self._record_response("generate", started, None)
+            raise
+
+        usage = finish_reason = first_token = None
+        try:
+            response.raise_for_status()
+
+            if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                result = response.json()
+                self._record_response("generate", started, response, result)
+                started = None
+                yield result["choices"][0]["message"]["content"]
+                return
+
+            # text/event-stream 未声明charset时requests默认按ISO-8859-1解码；
+            # chunk_size=None 使每个分块到达后立即处理，而不是凑满固定字节数
+            response.encoding = "utf-8"
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                event = json.loads(payload)
+                usage = event.get("usage") or usage
+                choices = event.get("choices") or []
+                if choices:
+                    finish_reason = choices[0].get("finish_reason") or finish_reason
+                text = (choices[0].get("delta") or {}).get("content") if choices else None
+                if text:
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    yield text
+        finally:
+            response.close()
+            if started is not None:
+                self.metrics.record_call(
+                    "generate",
+                    time.perf_counter() - started,
+                    response.status_code,
+                    usage=usage,
+                    finish_reason=finish_reason,
+                    first_token=first_token,
+                )
+
+    def _call_api(self, prompt: str) -> Optional[str]:
+        """
+        调用LLM API
+
+        Args:
+            prompt: 提示文本
+
+        Returns:
+            API响应内容,失败返回None
+        """
+        data = self._generation_request(prompt)
+
         timeout = self.config.get("ai.timeout", 60)
 
         logger.info(f"Calling AI API with model {self._model}")
 
-        response = requests.post(self._api_endpoint, headers=headers, json=data, timeout=timeout)
+        started = time.perf_counter()
+        response = result = None
+        try:
+            response = self._post(data, timeout)
 
-        response.raise_for_status()
+            response.raise_for_status()
 
-        result = response.json()
+            result = response.json()
+        finally:
+            self._record_response("generate", started, response, result)
         content = result["choices"][0]["message"]["content"]
 
         return content
@@ -251,33 +872,7 @@ class AIService:
                 logger.error("Response missing required fields")
                 return None
 
-            # 确保metadata包含必需字段
-            metadata = data["metadata"]
-            if "name" not in metadata:
-                metadata["name"] = f"{language}-{topic}"
-            if "language" not in metadata:
-                metadata["language"] = language
-            if "keywords" not in metadata:
-                metadata["keywords"] = [topic]
-
-            # 如果没有folder_name，从name或topic生成一个英文的folder_name
-            if "folder_name" not in metadata or not metadata["folder_name"]:
-                # 尝试从topic生成
-                folder_name = topic.lower().replace(" ", "-").replace("_", "-")
-                # 只保留ASCII字符
-                folder_name = "".join(
-                    c for c in folder_name if c.isascii() and (c.isalnum() or c == "-")
-                )
-                while "--" in folder_name:
-                    folder_name = folder_name.replace("--", "-")
-                folder_name = folder_name.strip("-")
-                if folder_name:
-                    metadata["folder_name"] = folder_name
-                else:
-                    # 最后回退：使用时间戳
-                    import time
-
-                    metadata["folder_name"] = f"demo-{int(time.time())}"
+            metadata = self._normalize_metadata(data["metadata"], language, topic)
 
             logger.info(f"Successfully parsed AI response for {metadata['name']}")
             return data
@@ -290,32 +885,68 @@ class AIService:
             logger.error(f"Failed to parse response: {e}")
             return None
 
+    def _normalize_metadata(
+        self, metadata: Dict[str, Any], language: str, topic: str
+    ) -> Dict[str, Any]:
+        """
+        补全AI返回的元数据中缺少的必需字段
+
+        Args:
+            metadata: AI返回的元数据(原地修改)
+            language: 编程语言
+            topic: 主题
+
+        Returns:
+            补全后的元数据
+        """
+        # 确保metadata包含必需字段
+        if "name" not in metadata:
+            metadata["name"] = f"{language}-{topic}"
+        if "language" not in metadata:
+            metadata["language"] = language
+        if "keywords" not in metadata:
+            metadata["keywords"] = [topic]
+
+        # 如果没有folder_name，从name或topic生成一个英文的folder_name
+        if "folder_name" not in metadata or not metadata["folder_name"]:
+            # 尝试从topic生成
+            folder_name = topic.lower().replace(" ", "-").replace("_", "-")
+            # 只保留ASCII字符
+            folder_name = "".join(
+                c for c in folder_name if c.isascii() and (c.isalnum() or c == "-")
+            )
+            while "--" in folder_name:
+                folder_name = folder_name.replace("--", "-")
+            folder_name = folder_name.strip("-")
+            if folder_name:
+                metadata["folder_name"] = folder_name
+            else:
+                # 最后回退：使用时间戳
+                metadata["folder_name"] = f"demo-{int(time.time())}"
+
+        return metadata
+
     def validate_api_key(self) -> bool:
         """
-        验证API密钥是否有效
+        验证API密钥是否有效(只请求主提供方，不切换到备用提供方)
 
         Returns:
             是否有效
         """
         self._load_config()
 
-        if not self._api_key:
+        if not self._api_key or not self.router.providers:
             return False
 
         try:
             # 发送一个简单的测试请求
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self._api_key}",
-            }
-
             data = {
                 "model": self._model,
                 "messages": [{"role": "user", "content": "test"}],
                 "max_tokens": 5,
             }
 
-            response = requests.post(self._api_endpoint, headers=headers, json=data, timeout=10)
+            response = self._send(self.router.providers[0], data, 10, stream=False)
 
             return response.status_code == 200
 
@@ -342,7 +973,7 @@ class AIService:
         """
         self._load_config()
 
-        if not self._api_key:
+        if not self.router.providers:
             logger.warning("AI API key not configured, using heuristic detection")
             return self._heuristic_classify(language, keyword)
 
@@ -373,11 +1004,6 @@ class AIService:
 只返回JSON，不要其他文字。"""
 
         try:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self._api_key}",
-            }
-
             data = {
                 "model": self._model,
                 "messages": [
@@ -391,20 +1017,37 @@ class AIService:
                 "max_tokens": 200,
             }
 
+            # 相同语言和关键字的分类结果直接使用缓存
+            cache_key = self._cache_key("classify", data)
+            cached = self._cached_response(cache_key)
+            if cached:
+                with self.metrics.label(f"{language}/{keyword}"):
+                    self.metrics.record_event(CACHE_HIT, "classify")
+                return self._parse_classify_response(cached, keyword)
+
             timeout = self.config.get("ai.timeout", 30)
 
             logger.info(f"Classifying keyword '{keyword}' for language {language}")
 
-            response = requests.post(
-                self._api_endpoint, headers=headers, json=data, timeout=timeout
-            )
-
-            response.raise_for_status()
-            result = response.json()
-            content = result["choices"][0]["message"]["content"].strip()
-
-            # 解析JSON响应
-            return self._parse_classify_response(content, keyword)
+            with self.metrics.label(f"{language}/{keyword}"):
+                started = time.perf_counter()
+                response = result = None
+                try:
+                    response = self._post(data, timeout)
+
+                    response.raise_for_status()
+                    result = response.json()
+                finally:
+                    self._record_response("classify", started, response, result)
+                content = result["choices"][0]["message"]["content"].strip()
+
+                # 解析JSON响应
+                classification = self._parse_classify_response(content, keyword)
+                if classification["description"] != CLASSIFY_PARSE_ERROR:
+                    self._store_response(cache_key, content, self._served_provider())
+                else:
+                    self.metrics.record_event(PARSE_FAILURE, "classify")
+            return classification
 
         except Exception as e:
             logger.warning(f"AI classification failed: {e}, using heuristic detection")
@@ -445,7 +1088,7 @@ class AIService:
                 "is_library": False,
                 "confidence": 0.0,
                 "library_name": None,
-                "description": "Failed to parse AI response",
+                "description": CLASSIFY_PARSE_ERROR,
             }
 
     def _heuristic_classify(self, language: str, keyword: str) -> Dict[str, Any]:
@@ -624,3 +1267,114 @@ class AIService:
             "library_name": None,
             "description": "不符合库名特征，判断为编程主题",
         }
+
+
+def _estimate_tokens(data: Dict[str, Any]) -> int:
+    """
+    粗略估计请求消耗的token数(用于限流)
+
+    Args:
+        data: 请求体
+
+    Returns:
+        提示词字符数的一半(中文约每字1个token，英文约每4个字符1个token) + 最大输出token数
+    """
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in data.get("messages", []))
+    return prompt_chars // 2 + int(data.get("max_tokens") or 0)
+
+
+class AsyncAIService:
+    """AIService 的 asyncio 版本
+
+    阻塞的HTTP请求在线程池中执行，并复用 AIService 的连接池会话，
+    多个生成任务可以在同一个事件循环中并发等待API响应。
+    """
+
+    def __init__(self, ai_service: AIService, max_workers: int = 4):
+        """
+        初始化异步AI服务
+
+        Args:
+            ai_service: 同步AI服务实例
+            max_workers: 执行HTTP请求的线程数(即同时进行的请求上限)
+        """
+        self.ai_service = ai_service
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="opendemo-ai"
+        )
+
+    async def _run(self, func, *args):
+        """在线程池中执行阻塞调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def generate_demo(
+        self, language: str, topic: str, difficulty: str = "beginner", use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        生成demo代码(重试等待不占用线程)
+
+        Args:
+            language: 编程语言
+            topic: 主题
+            difficulty: 难度级别
+            use_cache: 是否使用缓存的响应
+
+        Returns:
+            包含代码和文档的字典,失败返回None
+        """
+        service = self.ai_service
+        service._load_config()
+
+        if not service.router.providers:
+            logger.error("AI API key is not configured")
+            return None
+
+        prompt = service._build_prompt(language, topic, difficulty)
+
+        # 事件循环线程由多个协程共享，指标标签需显式传递
+        label = f"{language}/{topic}"
+        deadline = service._retry_deadline()
+        steps = service._generation_steps(prompt, language, topic, use_cache, label, deadline)
+        try:
+            step, value = next(steps)
+            while True:
+                if step == "sleep":
+                    await asyncio.sleep(value)
+                    step, value = next(steps)
+                    continue
+                try:
+                    outcome = await self._run(self._call_api_labelled, label, prompt, deadline)
+                except Exception as e:
+                    step, value = steps.throw(e)
+                else:
+                    step, value = steps.send(outcome)
+        except StopIteration as done:
+            return done.value
+
+    def _call_api_labelled(
+        self, label: str, prompt: str, deadline: Optional[float] = None
+    ) -> Tuple[Optional[str], Optional[AIProvider]]:
+        """在工作线程中以给定指标标签和截止时间调用API，返回响应内容和返回响应的提供方"""
+        service = self.ai_service
+        with service.metrics.label(label), service._deadline_scope(deadline):
+            content = service._call_api(prompt)
+            return content, service._served_provider()
+
+    async def classify_keyword(self, language: str, keyword: str) -> Dict[str, Any]:
+        """
+        判断关键字是库名还是编程主题
+
+        Args:
+            language: 编程语言
+            keyword: 待判断的关键字
+
+        Returns:
+            分类结果字典，格式同 AIService.classify_keyword
+        """
+        return await self._run(self.ai_service.classify_keyword, language, keyword)
+
+    def close(self):
+        """关闭线程池和HTTP会话"""
+        self._executor.shutdown(wait=True)
+        self.ai_service.close()
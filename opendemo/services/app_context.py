@@ -0,0 +1,131 @@
+"""
+应用上下文模块
+
+集中创建并缓存一次命令执行(或一个长驻进程)中共享的服务实例，
+避免每个命令、每个辅助函数各自重复构造配置、存储和仓库对象。
+"""
+
+from typing import Callable, Optional
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _default_config_factory():
+    from opendemo.services.config_service import ConfigService
+
+    return ConfigService()
+
+
+def _default_storage_factory(config):
+    from opendemo.services.storage_service import StorageService
+
+    return StorageService(config)
+
+
+def _default_repository_factory(storage, config):
+    from opendemo.core.demo_repository import DemoRepository
+
+    return DemoRepository(storage, config)
+
+
+class AppContext:
+    """应用上下文
+
+    所有服务在首次访问时创建并缓存，重量级服务(AI、验证器)所在模块
+    也在首次访问时才导入。
+    """
+
+    def __init__(
+        self,
+        config_factory: Optional[Callable] = None,
+        storage_factory: Optional[Callable] = None,
+        repository_factory: Optional[Callable] = None,
+    ):
+        """
+        初始化应用上下文
+
+        Args:
+            config_factory: 创建配置服务的函数，默认 ConfigService()
+            storage_factory: 创建存储服务的函数，参数为配置服务
+            repository_factory: 创建Demo仓库的函数，参数为存储服务和配置服务
+        """
+        self._config_factory = config_factory or _default_config_factory
+        self._storage_factory = storage_factory or _default_storage_factory
+        self._repository_factory = repository_factory or _default_repository_factory
+
+        self._config = None
+        self._storage = None
+        self._repository = None
+        self._search = None
+        self._ai_service = None
+        self._generator = None
+        self._verifier = None
+
+    @property
+    def config(self):
+        """配置服务"""
+        if self._config is None:
+            self._config = self._config_factory()
+        return self._config
+
+    @property
+    def storage(self):
+        """存储服务"""
+        if self._storage is None:
+            self._storage = self._storage_factory(self.config)
+        return self._storage
+
+    @property
+    def repository(self):
+        """Demo仓库"""
+        if self._repository is None:
+            self._repository = self._repository_factory(self.storage, self.config)
+        return self._repository
+
+    @property
+    def search(self):
+        """搜索引擎"""
+        if self._search is None:
+            from opendemo.core.demo_search import DemoSearch
+
+            self._search = DemoSearch(self.repository)
+        return self._search
+
+    @property
+    def ai_service(self):
+        """AI服务"""
+        if self._ai_service is None:
+            from opendemo.services.ai_service import AIService
+
+            self._ai_service = AIService(self.config)
+        return self._ai_service
+
+    @property
+    def generator(self):
+        """Demo生成器"""
+        if self._generator is None:
+            from opendemo.core.demo_generator import DemoGenerator
+
+            self._generator = DemoGenerator(self.ai_service, self.repository, self.config)
+        return self._generator
+
+    @property
+    def verifier(self):
+        """Demo验证器"""
+        if self._verifier is None:
+            from opendemo.core.demo_verifier import DemoVerifier
+
+            self._verifier = DemoVerifier(self.config)
+        return self._verifier
+
+    def reset(self):
+        """丢弃所有已创建的服务(配置变更后调用)"""
+        self._config = None
+        self._storage = None
+        self._repository = None
+        self._search = None
+        self._ai_service = None
+        self._generator = None
+        self._verifier = None
+        logger.debug("Application context reset")
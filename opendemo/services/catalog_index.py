@@ -0,0 +1,431 @@
+"""
+Demo目录索引模块
+
+将demo库的扫描结果持久化到磁盘，避免每次命令都遍历整个目录树。
+索引记录每个demo的路径、语言、库/工具名、元数据以及metadata.json的mtime，
+并记录每个目录的mtime和子目录列表，用于增量重新验证：只有mtime变化的目录
+才会重新列举，只有mtime变化的metadata.json才会重新解析。
+遍历不进入以点开头的目录和依赖、缓存目录(SKIPPED_DIRS)，也不进入demo目录的子目录。
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, List, Tuple
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 索引格式版本，格式不兼容时递增
+INDEX_VERSION = 3
+
+# 遍历时不进入的目录(依赖、虚拟环境、构建输出、缓存)，以点开头的目录同样跳过；
+# 目录监听使用同一规则
+SKIPPED_DIRS = frozenset({"__pycache__", "node_modules", "target", "vendor", "venv"})
+
+
+class CatalogIndex:
+    """Demo目录持久化索引
+
+    索引以扫描根目录为单位组织，每个根目录下按相对路径记录目录和demo条目：
+
+        {
+            "version": 3,
+            "roots": {
+                "/abs/opendemo_output": {
+                    "scanned_at": 1700000000.0,
+                    "dirs": {
+                        "python": {"mtime": 1700000000.0, "subdirs": ["logging"],
+                                   "has_metadata": false}
+                    },
+                    "demos": {
+                        "python/logging": {
+                            "mtime": 1700000000.0,
+                            "language": "python",
+                            "library": null,
+                            "metadata": {...}
+                        }
+                    }
+                }
+            }
+        }
+    """
+
+    def __init__(self, index_path: Path):
+        """
+        初始化索引
+
+        Args:
+            index_path: 索引文件路径
+        """
+        self.index_path = Path(index_path)
+        self._data: Optional[Dict[str, Any]] = None
+        self._dirty = False
+
+    # ==================== 读写 ====================
+
+    def _load(self) -> Dict[str, Any]:
+        """加载索引文件，不存在或版本不兼容时返回空索引"""
+        if self._data is not None:
+            return self._data
+
+        data = {"version": INDEX_VERSION, "roots": {}}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                if loaded.get("version") == INDEX_VERSION:
+                    data = loaded
+                else:
+                    logger.info("Catalog index version changed, rebuilding")
+            except Exception as e:
+                logger.warning(f"Failed to load catalog index {self.index_path}: {e}")
+
+        self._data = data
+        return data
+
+    def save(self) -> bool:
+        """
+        将索引写回磁盘(仅在有变更时)
+
+        写入采用临时文件+原子替换，避免并发进程读到半写入的索引。
+
+        Returns:
+            是否成功
+        """
+        if not self._dirty or self._data is None:
+            return True
+
+        # 清理已不存在的根目录，避免索引无限增长
+        roots = self._data["roots"]
+        for root in [r for r in roots if not os.path.isdir(r)]:
+            del roots[root]
+
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save catalog index {self.index_path}: {e}")
+            return False
+
+    def clear(self):
+        """清空索引"""
+        self._data = {"version": INDEX_VERSION, "roots": {}}
+        self._dirty = True
+
+    # ==================== 查询 ====================
+
+    def _find_root(self, path: Path) -> Optional[Tuple[str, str]]:
+        """
+        查找包含指定路径的已扫描根目录
+
+        Args:
+            path: 待查询路径
+
+        Returns:
+            (根目录绝对路径, 相对前缀)，未找到返回None；前缀为空表示path本身就是根目录
+        """
+        abs_path = os.path.abspath(str(path))
+        for root in self._load()["roots"]:
+            if abs_path == root:
+                return root, ""
+            if abs_path.startswith(root.rstrip(os.sep) + os.sep):
+                return root, Path(os.path.relpath(abs_path, root)).as_posix()
+        return None
+
+    def lookup(self, path: Path) -> Optional[List[Tuple[Path, Dict[str, Any]]]]:
+        """
+        从索引中查询路径下的所有demo
+
+        Args:
+            path: 搜索路径
+
+        Returns:
+            [(demo路径, 索引条目)] 列表；路径未被索引过返回None
+        """
+        found = self._find_root(path)
+        if found is None:
+            return None
+
+        root, prefix = found
+        demos = self._data["roots"][root]["demos"]
+        results = []
+        for rel, entry in demos.items():
+            if not prefix:
+                results.append((path / rel, entry))
+            elif rel.startswith(prefix + "/"):
+                results.append((path / rel[len(prefix) + 1 :], entry))
+        return results
+
+    def get_entry(self, demo_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        获取单个demo的索引条目
+
+        Args:
+            demo_path: demo路径
+
+        Returns:
+            索引条目，未索引返回None
+        """
+        found = self._find_root(demo_path)
+        if found is None or not found[1]:
+            return None
+        root, rel = found
+        return self._data["roots"][root]["demos"].get(rel)
+
+    # ==================== 更新 ====================
+
+    def refresh(
+        self, path: Path, read_metadata: Callable[[Path], Optional[Dict[str, Any]]]
+    ) -> int:
+        """
+        增量刷新路径下的索引
+
+        每个目录只做一次stat；目录mtime未变化时复用记录的子目录列表，
+        metadata.json的mtime未变化时复用记录的元数据。新增、删除、重命名的
+        目录会改变其父目录的mtime，因此只有发生变化的子树会被重新列举。
+        demo目录(包含metadata.json)是遍历的终点，其下的代码和依赖目录不记录。
+
+        Args:
+            path: 需要刷新的路径
+            read_metadata: 解析metadata.json的函数，失败返回None
+
+        Returns:
+            重新列举的目录数
+        """
+        data = self._load()
+        found = self._find_root(path)
+        if found is None:
+            root = self._add_root(path)
+            prefix = ""
+        else:
+            root, prefix = found
+
+        record = data["roots"][root]
+        dirs = record["dirs"]
+        demos = record["demos"]
+        changed = 0
+
+        stack = [prefix]
+        while stack:
+            rel = stack.pop()
+            abs_dir = os.path.join(root, *rel.split("/")) if rel else root
+
+            try:
+                mtime = os.stat(abs_dir).st_mtime
+            except OSError:
+                self._drop_subtree(record, rel)
+                continue
+
+            info = dirs.get(rel)
+            if info is None or info["mtime"] != mtime:
+                subdirs, has_metadata = self._list_dir(abs_dir)
+                # 与 rglob 不同，不在demo目录之下继续查找
+                if rel and has_metadata:
+                    subdirs = []
+                if info is not None:
+                    for name in set(info["subdirs"]) - set(subdirs):
+                        self._drop_subtree(record, f"{rel}/{name}" if rel else name)
+                info = {"mtime": mtime, "subdirs": subdirs, "has_metadata": has_metadata}
+                dirs[rel] = info
+                changed += 1
+                self._dirty = True
+
+            # 与 rglob 一致，根目录本身不作为demo
+            if rel and info["has_metadata"]:
+                self._refresh_demo(demos, rel, abs_dir, read_metadata)
+            elif rel in demos:
+                del demos[rel]
+                self._dirty = True
+
+            for name in info["subdirs"]:
+                stack.append(f"{rel}/{name}" if rel else name)
+
+        if changed:
+            logger.debug(f"Catalog index refreshed {changed} directories under {path}")
+        return changed
+
+    def _refresh_demo(
+        self,
+        demos: Dict[str, Dict[str, Any]],
+        rel: str,
+        abs_dir: str,
+        read_metadata: Callable[[Path], Optional[Dict[str, Any]]],
+    ):
+        """检查单个demo的metadata.json，mtime变化时重新解析"""
+        metadata_file = os.path.join(abs_dir, "metadata.json")
+        try:
+            mtime = os.stat(metadata_file).st_mtime
+        except OSError:
+            if demos.pop(rel, None) is not None:
+                self._dirty = True
+            return
+
+        entry = demos.get(rel)
+        if entry is not None and entry["mtime"] == mtime:
+            return
+
+        # 解析失败的demo也保留条目(metadata为None)，避免每次都重新解析
+        metadata = read_metadata(Path(metadata_file))
+        demos[rel] = build_entry(Path(abs_dir), metadata or {}, mtime)
+        if metadata is None:
+            demos[rel]["metadata"] = None
+        self._dirty = True
+
+    def _add_root(self, path: Path) -> str:
+        """
+        新增扫描根目录，并合并其下已有的子根目录
+
+        Args:
+            path: 根目录
+
+        Returns:
+            根目录绝对路径
+        """
+        roots = self._load()["roots"]
+        abs_root = os.path.abspath(str(path))
+        record = {"scanned_at": time.time(), "dirs": {}, "demos": {}}
+
+        prefix = abs_root.rstrip(os.sep) + os.sep
+        for existing in [r for r in roots if r.startswith(prefix)]:
+            sub_prefix = Path(os.path.relpath(existing, abs_root)).as_posix()
+            old = roots.pop(existing)
+            for key in ("dirs", "demos"):
+                for rel, value in old[key].items():
+                    record[key][f"{sub_prefix}/{rel}" if rel else sub_prefix] = value
+
+        roots[abs_root] = record
+        self._dirty = True
+        return abs_root
+
+    @staticmethod
+    def _list_dir(abs_dir: str) -> Tuple[List[str], bool]:
+        """
+        列举目录
+
+        Returns:
+            (子目录名列表(不含 is_skipped_dir 跳过的目录), 是否包含metadata.json)
+        """
+        subdirs = []
+        has_metadata = False
+        try:
+            with os.scandir(abs_dir) as it:
+                for item in it:
+                    if item.is_dir(follow_symlinks=False):
+                        if not is_skipped_dir(item.name):
+                            subdirs.append(item.name)
+                    elif item.name == "metadata.json":
+                        has_metadata = True
+        except OSError as e:
+            logger.warning(f"Failed to list directory {abs_dir}: {e}")
+        subdirs.sort()
+        return subdirs, has_metadata
+
+    @staticmethod
+    def _drop_subtree(record: Dict[str, Any], rel: str) -> int:
+        """移除相对路径rel及其下所有目录和demo条目"""
+        removed = 0
+        for key in ("dirs", "demos"):
+            table = record[key]
+            if not rel:
+                removed += len(table)
+                table.clear()
+                continue
+            stale = [k for k in table if k == rel or k.startswith(rel + "/")]
+            for k in stale:
+                del table[k]
+            removed += len(stale)
+        return removed
+
+    def update_entry(self, demo_path: Path, entry: Dict[str, Any]) -> bool:
+        """
+        新增或更新单个demo条目(仅当其位于已扫描的根目录下)
+
+        Args:
+            demo_path: demo路径
+            entry: 索引条目
+
+        Returns:
+            是否写入了索引
+        """
+        found = self._find_root(demo_path)
+        if found is None or not found[1]:
+            return False
+        root, rel = found
+        self._data["roots"][root]["demos"][rel] = entry
+        self._dirty = True
+        return True
+
+    def remove_entry(self, demo_path: Path) -> int:
+        """
+        移除demo条目(包括其下嵌套的demo和目录记录)
+
+        Args:
+            demo_path: demo路径
+
+        Returns:
+            移除的条目数
+        """
+        found = self._find_root(demo_path)
+        if found is None:
+            return 0
+        root, rel = found
+        removed = self._drop_subtree(self._data["roots"][root], rel)
+        if removed:
+            self._dirty = True
+        return removed
+
+
+def is_skipped_dir(name: str) -> bool:
+    """
+    查找demo时是否跳过该目录
+
+    Args:
+        name: 目录名
+
+    Returns:
+        以点开头或属于 SKIPPED_DIRS 时为True
+    """
+    return name.startswith(".") or name in SKIPPED_DIRS
+
+
+def build_entry(demo_path: Path, metadata: Dict[str, Any], mtime: float) -> Dict[str, Any]:
+    """
+    根据demo路径和元数据构建索引条目
+
+    路径约定: <language>/<demo>、<language>/libraries/<library>/<demo>、
+    kubernetes/<tool>/<demo>
+
+    Args:
+        demo_path: demo路径
+        metadata: demo元数据
+        mtime: metadata.json的修改时间
+
+    Returns:
+        索引条目
+    """
+    parts = Path(os.path.abspath(str(demo_path))).parts
+    language = metadata.get("language")
+    library = None
+
+    if len(parts) >= 4 and parts[-3] == "libraries":
+        library = parts[-2]
+        language = language or parts[-4]
+    elif len(parts) >= 3 and parts[-3] == "kubernetes":
+        library = parts[-2]
+        language = language or "kubernetes"
+    elif len(parts) >= 2:
+        language = language or parts[-2]
+
+    return {
+        "mtime": mtime,
+        "language": (language or "unknown").lower(),
+        "library": library,
+        "metadata": metadata,
+    }
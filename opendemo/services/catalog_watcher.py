@@ -0,0 +1,225 @@
+"""
+目录监听模块
+
+监听输出目录和用户库中demo的新增、修改、重命名和删除，
+收集变化路径供长驻进程(如 `opendemo serve`)精确清除仓库缓存，无需全量重新扫描。
+
+安装了 watchdog 时使用系统原生通知(Linux下为inotify)，
+否则回退为定时轮询目录和元数据文件的mtime。
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from opendemo.services.catalog_index import is_skipped_dir
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 轮询时记录mtime的元数据文件
+_TRACKED_FILES = ("metadata.json", "_library.json")
+
+# 轮询时进入的最大目录深度(<语言>/libraries/<库>/<功能>/code)
+_POLL_MAX_DEPTH = 5
+
+# 不表示内容变化的原生事件
+_IGNORED_EVENT_TYPES = {"opened", "closed", "closed_no_write"}
+
+
+class CatalogWatcher:
+    """demo目录监听器
+
+    变化路径在后台线程中收集，由使用方通过 drain() 取出后在自己的线程中处理，
+    避免与正在读取缓存的查询并发修改。
+    """
+
+    def __init__(self, paths: Iterable[Path], interval: float = 2.0, use_native: bool = True):
+        """
+        初始化监听器
+
+        Args:
+            paths: 需要监听的根目录
+            interval: 轮询间隔(秒)，仅轮询模式使用
+            use_native: 是否优先使用系统原生通知(需要安装watchdog)
+        """
+        self.paths = [Path(p).absolute() for p in paths]
+        self.interval = interval
+        self.use_native = use_native
+        self.backend: Optional[str] = None
+
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._snapshot: Dict[str, float] = {}
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def start(self) -> str:
+        """
+        开始监听
+
+        Returns:
+            使用的后端: "native" 或 "polling"
+        """
+        if self.use_native and self._start_native():
+            self.backend = "native"
+        else:
+            self._snapshot = self._take_snapshot()
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._poll_loop, name="catalog-watcher", daemon=True
+            )
+            self._thread.start()
+            self.backend = "polling"
+
+        logger.info(f"Watching {len(self.paths)} catalog directories ({self.backend})")
+        return self.backend
+
+    def stop(self):
+        """停止监听"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def drain(self) -> List[str]:
+        """
+        取出并清空已收集的变化路径
+
+        Returns:
+            变化路径列表(已排序)
+        """
+        with self._lock:
+            changes = sorted(self._pending)
+            self._pending.clear()
+        return changes
+
+    def poll(self) -> int:
+        """
+        轮询一次，与上次快照比较并收集变化
+
+        Returns:
+            新发现的变化路径数
+        """
+        old = self._snapshot
+        new = self._take_snapshot()
+        self._snapshot = new
+
+        added_or_removed = (new.keys() - old.keys()) | (old.keys() - new.keys())
+        modified = {path for path in new.keys() & old.keys() if new[path] != old[path]}
+
+        # 子项增删会改变父目录mtime，子项本身已记录时不再重复记录父目录
+        parents = {os.path.dirname(path) for path in added_or_removed}
+        changes = added_or_removed | {path for path in modified if path not in parents}
+
+        self._record(changes)
+        return len(changes)
+
+    def _record(self, paths: Iterable[str]):
+        """记录变化路径"""
+        with self._lock:
+            self._pending.update(paths)
+
+    def _skipped(self, path: str) -> bool:
+        """
+        路径是否位于跳过的目录中(与目录索引相同的 is_skipped_dir 规则)
+
+        只检查监听根目录之下的部分，根目录本身可以位于以点开头的目录中(如 ~/.opendemo)。
+
+        Args:
+            path: 变化路径
+
+        Returns:
+            是否忽略该路径的变化
+        """
+        for root in self.paths:
+            try:
+                parts = Path(path).relative_to(root).parts
+            except ValueError:
+                continue
+            return any(is_skipped_dir(part) for part in parts)
+        return False
+
+    def _poll_loop(self):
+        """轮询线程"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning(f"Catalog polling failed: {e}")
+
+    def _take_snapshot(self) -> Dict[str, float]:
+        """
+        记录所有监听目录下目录和元数据文件的mtime
+
+        Returns:
+            {路径: mtime}
+        """
+        snapshot: Dict[str, float] = {}
+        for root in self.paths:
+            if root.is_dir():
+                self._scan(str(root), 0, snapshot)
+        return snapshot
+
+    def _scan(self, directory: str, depth: int, snapshot: Dict[str, float]):
+        """递归记录目录及其下元数据文件的mtime"""
+        try:
+            snapshot[directory] = os.stat(directory).st_mtime
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if depth < _POLL_MAX_DEPTH and not is_skipped_dir(entry.name):
+                        self._scan(entry.path, depth + 1, snapshot)
+                elif entry.name in _TRACKED_FILES:
+                    snapshot[entry.path] = entry.stat().st_mtime
+            except OSError:
+                continue
+
+    def _start_native(self) -> bool:
+        """
+        使用watchdog启动原生监听
+
+        Returns:
+            是否启动成功，未安装watchdog或超出系统监听数量限制时返回False
+        """
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.debug("watchdog not installed, falling back to polling")
+            return False
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in _IGNORED_EVENT_TYPES:
+                    return
+                # 目录的修改事件伴随子项的增删事件出现，只记录子项
+                if event.is_directory and event.event_type == "modified":
+                    return
+                paths = [event.src_path, getattr(event, "dest_path", "")]
+                paths = [os.fsdecode(path) for path in paths if path]
+                watcher._record(path for path in paths if not watcher._skipped(path))
+
+        try:
+            observer = Observer()
+            for path in self.paths:
+                if path.is_dir():
+                    observer.schedule(_Handler(), str(path), recursive=True)
+            observer.start()
+        except Exception as e:
+            logger.warning(f"Failed to start native watcher, falling back to polling: {e}")
+            return False
+
+        self._observer = observer
+        return True
@@ -19,20 +19,47 @@ class ConfigService:
     DEFAULT_CONFIG = {
         "output_directory": "./opendemo_output",
         "user_demo_library": None,  # 将在初始化时设置为 ~/.opendemo/demos
+        "cache_directory": None,  # 将在初始化时设置为 ~/.opendemo/cache
+        "catalog_index": True,  # 使用持久化索引加速demo扫描
         "default_language": "python",
         "enable_verification": False,
         "verification_method": "venv",
         "verification_timeout": 300,
+        "verification_job_timeout": 900,  # opendemo verify 中单个demo的验证超时(秒)
+        "verification_workers": 0,  # opendemo verify 的并行数，0表示CPU核数
+        "verification_venv_cache": True,  # 依赖相同的Python demo复用缓存的虚拟环境
+        "verification_venv_cache_mb": 2048,  # 缓存虚拟环境的总大小上限(MB)，0表示不限制
+        "verification_wheelhouse": None,  # 本地wheel目录，默认为 cache_directory/wheelhouse
+        "verification_offline": False,  # 只从本地wheel目录安装依赖(pip --no-index)
+        "verification_cache": True,  # 内容和工具链都没有变化的demo直接使用上次的验证结果
+        "verification_cache_mb": 50,  # 验证结果缓存的总大小上限(MB)
         "ai": {
-            "provider": "openai",
+            "provider": "openai",  # 主提供方类型: openai / local / stub
+            "providers": [],  # 备用提供方列表，主提供方失败时依次切换
             "api_key": "",
             "api_endpoint": "",
             "model": "gpt-4",
             "temperature": 0.7,
             "max_tokens": 4000,
             "timeout": 60,
+            "connect_timeout": 5,  # 连接超时(秒)，端点不可达时尽快切换到备用提供方
+            "total_timeout": 120,  # 一次生成(含所有重试)的总时间上限(秒)，0表示不限制
+            "provider_cooldown": 30,  # 提供方请求失败后暂停使用的时间(秒)
             "retry_times": 3,
-            "retry_interval": 5,
+            "retry_interval": 5,  # 重试退避的基础间隔(秒)，之后按指数增长并加随机抖动
+            "retry_max_interval": 60,  # 重试退避的最大间隔(秒)
+            "requests_per_minute": 0,  # 每分钟请求数上限(进程内共享)，0表示不限制
+            "tokens_per_minute": 0,  # 每分钟token数上限(进程内共享)，0表示不限制
+            "pool_size": 10,  # 每个API端点保持的最大连接数
+            "keep_alive": True,  # 复用连接，避免每次请求重新握手
+            "max_concurrency": 4,  # batch 命令同时进行的生成数
+            "stream": True,  # 流式接收生成结果，每个文件完整后立即写入磁盘
+            "metrics_file": "",  # 追加记录每次AI调用指标的JSON Lines文件，空表示不记录
+            "prompt_token_price": 0,  # 每千个prompt token的价格，用于估算费用
+            "completion_token_price": 0,  # 每千个completion token的价格
+            "cache_enabled": True,  # 缓存AI响应，相同请求不再重复调用API
+            "cache_ttl_days": 30,  # 缓存响应的有效期(天)
+            "cache_max_mb": 100,  # 缓存总大小上限(MB)，超出时淘汰最久未用的响应
         },
         "contribution": {
             "auto_prompt": True,
@@ -47,6 +74,9 @@ class ConfigService:
         },
     }
 
+    # 本进程中已确认存在用户目录的HOME路径，避免重复创建实例时重复mkdir
+    _ensured_user_dirs = set()
+
     def __init__(self):
         """初始化配置服务"""
         self.global_config_path = self._get_global_config_path()
@@ -60,8 +90,11 @@ class ConfigService:
         return home / ".opendemo" / "config.yaml"
 
     def _ensure_user_dirs(self):
-        """确保用户目录存在"""
+        """确保用户目录存在(每个进程只检查一次)"""
         user_dir = Path.home() / ".opendemo"
+        if user_dir in ConfigService._ensured_user_dirs:
+            return
+
         user_dir.mkdir(parents=True, exist_ok=True)
 
         # 创建demos目录
@@ -72,6 +105,8 @@ class ConfigService:
         logs_dir = user_dir / "logs"
         logs_dir.mkdir(exist_ok=True)
 
+        ConfigService._ensured_user_dirs.add(user_dir)
+
     def load(self) -> Dict[str, Any]:
         """
         加载配置,合并全局配置和项目配置
@@ -89,6 +124,10 @@ class ConfigService:
         if config["user_demo_library"] is None:
             config["user_demo_library"] = str(Path.home() / ".opendemo" / "demos")
 
+        # 设置cache_directory默认值
+        if config["cache_directory"] is None:
+            config["cache_directory"] = str(Path.home() / ".opendemo" / "cache")
+
         # 加载全局配置
         if self.global_config_path.exists():
             global_config = self._load_yaml(self.global_config_path)
@@ -250,7 +289,7 @@ class ConfigService:
         errors = []
 
         # 检查AI配置
-        if not config["ai"].get("api_key"):
+        if config["ai"].get("provider", "openai") == "openai" and not config["ai"].get("api_key"):
             errors.append(
                 "AI API key is not configured. Run 'opendemo config set ai.api_key YOUR_KEY'"
             )
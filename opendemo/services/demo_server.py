@@ -0,0 +1,209 @@
+"""
+本地常驻服务模块
+
+`opendemo serve` 启动一个只监听本机的HTTP服务，在内存中保持配置、目录索引、
+Demo仓库和搜索索引，CLI和编辑器插件可将查询转发给它，省去每次调用的
+启动、配置解析和目录扫描开销。
+
+协议: POST /<命令>，请求体和响应体均为JSON，请求头 X-Opendemo-Token
+必须与状态文件中的token一致。
+"""
+
+import json
+import os
+import secrets
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from opendemo.services.server_client import TOKEN_HEADER, default_state_path
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 命令处理函数: (应用上下文, 请求参数) -> 响应字典
+Handler = Callable[[Any, Dict[str, Any]], Dict[str, Any]]
+
+
+class DemoServer:
+    """本地常驻查询服务"""
+
+    def __init__(
+        self,
+        app,
+        handlers: Dict[str, Handler],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        state_path: Optional[Path] = None,
+        watcher=None,
+    ):
+        """
+        初始化服务
+
+        Args:
+            app: 应用上下文(在服务生命周期内复用)
+            handlers: 命令名到处理函数的映射
+            host: 监听地址
+            port: 监听端口，0表示自动分配
+            state_path: 状态文件路径，默认 ~/.opendemo/server.json
+            watcher: 目录监听器(可选)，每次请求前按其收集的变化清除仓库缓存
+        """
+        self.app = app
+        self.handlers = dict(handlers)
+        self.state_path = Path(state_path) if state_path else default_state_path()
+        self.watcher = watcher
+        self.token = secrets.token_hex(16)
+        self.cwd = os.getcwd()
+        self.started_at = time.time()
+        self.request_count = 0
+        self._config_signature = self._read_config_signature()
+        self._httpd = HTTPServer((host, port), _make_request_handler(self))
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """实际监听的 (地址, 端口)"""
+        return self._httpd.server_address[:2]
+
+    def serve_forever(self):
+        """写入状态文件并处理请求，直到 shutdown 被调用"""
+        self._write_state()
+        logger.info(f"Demo server listening on {self.address[0]}:{self.address[1]}")
+        try:
+            self._httpd.serve_forever()
+        finally:
+            if self.watcher is not None:
+                self.watcher.stop()
+            self._httpd.server_close()
+            self._remove_state()
+            logger.info("Demo server stopped")
+
+    def shutdown(self):
+        """停止服务(可在其他线程调用)"""
+        self._httpd.shutdown()
+
+    def dispatch(self, command: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        处理一条命令
+
+        Args:
+            command: 命令名
+            payload: 请求参数
+
+        Returns:
+            (HTTP状态码, 响应字典)
+        """
+        if command == "ping":
+            return 200, {
+                "pid": os.getpid(),
+                "cwd": self.cwd,
+                "uptime": time.time() - self.started_at,
+                "requests": self.request_count,
+            }
+
+        if command == "shutdown":
+            # 在响应发出后再停止，避免阻塞当前请求
+            import threading
+
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return 200, {"stopping": True}
+
+        handler = self.handlers.get(command)
+        if handler is None:
+            return 404, {"error": f"unknown command: {command}"}
+
+        # 相对路径配置(输出目录、项目配置)依赖工作目录，不同目录的请求交给本地处理
+        if payload.get("cwd") and os.path.abspath(payload["cwd"]) != self.cwd:
+            return 409, {"error": "working directory mismatch"}
+
+        self._revalidate_config()
+        self._apply_catalog_changes()
+        self.request_count += 1
+        try:
+            return 200, handler(self.app, payload)
+        except Exception as e:
+            logger.error(f"Server command {command} failed: {e}")
+            return 500, {"error": str(e)}
+
+    def _revalidate_config(self):
+        """配置文件变化时丢弃已缓存的服务"""
+        signature = self._read_config_signature()
+        if signature != self._config_signature:
+            logger.info("Config changed, resetting server state")
+            self._config_signature = signature
+            self.app.reset()
+
+    def _apply_catalog_changes(self):
+        """按监听器收集的变化路径精确清除仓库缓存"""
+        if self.watcher is None:
+            return
+        for path in self.watcher.drain():
+            self.app.repository.invalidate_path(Path(path))
+
+    def _read_config_signature(self) -> Tuple[Optional[float], ...]:
+        """全局和项目配置文件的mtime"""
+        paths = (Path.home() / ".opendemo" / "config.yaml", Path(self.cwd) / ".opendemo.yaml")
+        signature = []
+        for path in paths:
+            try:
+                signature.append(path.stat().st_mtime)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _write_state(self):
+        """写入状态文件(仅当前用户可读)"""
+        host, port = self.address
+        state = {"pid": os.getpid(), "host": host, "port": port, "token": self.token}
+        state["cwd"] = self.cwd
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logger.warning(f"Failed to write server state {self.state_path}: {e}")
+
+    def _remove_state(self):
+        """删除状态文件(仅当仍属于本进程)"""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("token") == self.token:
+                self.state_path.unlink()
+        except Exception:
+            pass
+
+
+def _make_request_handler(server: DemoServer):
+    """创建绑定到服务实例的请求处理类"""
+
+    class RequestHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.headers.get(TOKEN_HEADER) != server.token:
+                self._send(403, {"error": "invalid token"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except (ValueError, json.JSONDecodeError):
+                self._send(400, {"error": "invalid json"})
+                return
+
+            status, body = server.dispatch(self.path.strip("/"), payload)
+            self._send(status, body)
+
+        def _send(self, status: int, body: Dict[str, Any]):
+            data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logger.debug(f"{self.address_string()} {format % args}")
+
+    return RequestHandler
@@ -0,0 +1,267 @@
+"""
+AI调用指标模块
+
+记录每次AI调用的耗时、token用量(响应的 usage 字段)、状态码和结束原因，
+以及重试、解析失败和缓存命中事件，按调用类别和标签(语言/主题)汇总，
+用于找出消耗大的prompt和调整 max_tokens。
+
+设置环境变量 OPENDEMO_METRICS_FILE(或配置 ai.metrics_file)后，每条记录会追加到该
+JSON Lines 文件，多个进程(如批量脚本启动的多个 opendemo new)的记录可以用
+AIMetrics.load 合并汇总。
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 指定记录文件的环境变量
+METRICS_FILE_ENV = "OPENDEMO_METRICS_FILE"
+
+# 事件类型
+CALL = "call"
+RETRY = "retry"
+PARSE_FAILURE = "parse_failure"
+CACHE_HIT = "cache_hit"
+
+
+class AIMetrics:
+    """AI调用指标收集器(线程安全)"""
+
+    def __init__(
+        self,
+        sink_path: Optional[Path] = None,
+        prompt_price: float = 0.0,
+        completion_price: float = 0.0,
+    ):
+        """
+        初始化收集器
+
+        Args:
+            sink_path: 追加写入记录的JSON Lines文件，None表示只保存在内存中
+            prompt_price: 每千个prompt token的价格，用于估算费用
+            completion_price: 每千个completion token的价格
+        """
+        self.sink_path = Path(sink_path) if sink_path else None
+        self.prompt_price = prompt_price
+        self.completion_price = completion_price
+        self._records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "AIMetrics":
+        """
+        从JSON Lines文件读取记录
+
+        Args:
+            path: 记录文件
+            **kwargs: 传给构造函数的参数(价格)
+
+        Returns:
+            包含文件中所有记录的收集器，文件不存在时为空
+        """
+        metrics = cls(**kwargs)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        metrics._records.append(json.loads(line))
+                    except ValueError:
+                        logger.warning(f"Skipping invalid metrics record in {path}")
+        except FileNotFoundError:
+            pass
+        return metrics
+
+    @contextmanager
+    def label(self, label: str) -> Iterator[None]:
+        """
+        为当前线程中的后续记录设置标签
+
+        Args:
+            label: 标签，如 "python/logging"
+        """
+        previous = getattr(self._local, "label", None)
+        self._local.label = label
+        try:
+            yield
+        finally:
+            self._local.label = previous
+
+    @property
+    def current_label(self) -> Optional[str]:
+        """当前线程的标签"""
+        return getattr(self._local, "label", None)
+
+    def record_call(
+        self,
+        kind: str,
+        latency: float,
+        status: Any,
+        usage: Optional[Dict[str, Any]] = None,
+        finish_reason: Optional[str] = None,
+        first_token: Optional[float] = None,
+    ):
+        """
+        记录一次API调用
+
+        Args:
+            kind: 调用类别(generate / classify)
+            latency: 耗时(秒)
+            status: HTTP状态码，请求异常时为 "error"
+            usage: 响应中的 usage 字段
+            finish_reason: 结束原因，"length" 表示达到 max_tokens 被截断
+            first_token: 流式响应首个片段到达的耗时(秒)
+        """
+        usage = usage or {}
+        record = {
+            "event": CALL,
+            "kind": kind,
+            "latency": round(latency, 4),
+            "status": status,
+            "prompt_tokens": int(usage.get("prompt_tokens") or 0),
+            "completion_tokens": int(usage.get("completion_tokens") or 0),
+            "finish_reason": finish_reason,
+        }
+        if first_token is not None:
+            record["first_token"] = round(first_token, 4)
+        self._add(record)
+
+    def record_event(self, event: str, kind: str, label: Optional[str] = None):
+        """
+        记录重试、解析失败或缓存命中
+
+        Args:
+            event: 事件类型(RETRY / PARSE_FAILURE / CACHE_HIT)
+            kind: 调用类别
+            label: 标签，默认使用当前线程的标签
+        """
+        self._add({"event": event, "kind": kind}, label)
+
+    def _add(self, record: Dict[str, Any], label: Optional[str] = None):
+        """保存记录"""
+        record["label"] = label or self.current_label
+        record["time"] = time.time()
+        with self._lock:
+            self._records.append(record)
+            if self.sink_path is not None:
+                try:
+                    self.sink_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.sink_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    logger.warning(f"Failed to write metrics record: {e}")
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """所有记录的副本"""
+        with self._lock:
+            return list(self._records)
+
+    def reset(self):
+        """清空内存中的记录"""
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        汇总指标
+
+        Returns:
+            {"total": 汇总, "by_kind": {类别: 汇总}, "by_label": {标签: 汇总}}，
+            汇总包含调用数、错误数、重试数、解析失败数、缓存命中数、截断数、
+            token用量、估算费用和耗时分布(p50/p95/最大/平均)
+        """
+        records = self.records
+        by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        by_label: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_kind.setdefault(record.get("kind") or "unknown", []).append(record)
+            by_label.setdefault(record.get("label") or "unlabeled", []).append(record)
+
+        return {
+            "total": self._aggregate(records),
+            "by_kind": {k: self._aggregate(v) for k, v in sorted(by_kind.items())},
+            "by_label": {k: self._aggregate(v) for k, v in sorted(by_label.items())},
+        }
+
+    def _aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """汇总一组记录"""
+        calls = [r for r in records if r.get("event") == CALL]
+        latencies = [r["latency"] for r in calls]
+        prompt_tokens = sum(r.get("prompt_tokens", 0) for r in calls)
+        completion_tokens = sum(r.get("completion_tokens", 0) for r in calls)
+        cost = prompt_tokens * self.prompt_price + completion_tokens * self.completion_price
+
+        def count(event):
+            return sum(1 for r in records if r.get("event") == event)
+
+        return {
+            "calls": len(calls),
+            "errors": sum(1 for r in calls if r.get("status") != 200),
+            "retries": count(RETRY),
+            "parse_failures": count(PARSE_FAILURE),
+            "cache_hits": count(CACHE_HIT),
+            "truncated": sum(1 for r in calls if r.get("finish_reason") == "length"),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "max_completion_tokens": max((r.get("completion_tokens", 0) for r in calls), default=0),
+            "estimated_cost": round(cost / 1000, 6),
+            "latency": _distribution(latencies),
+        }
+
+    def write_report(self, path: Path, extra: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        写入JSON汇总报告
+
+        Args:
+            path: 报告路径
+            extra: 附加到报告中的字段
+
+        Returns:
+            是否写入成功
+        """
+        report = dict(extra or {})
+        report["ai_metrics"] = self.summary()
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            return True
+        except OSError as e:
+            logger.error(f"Failed to write metrics report {path}: {e}")
+            return False
+
+
+def metrics_sink_from_env() -> Optional[Path]:
+    """环境变量指定的记录文件"""
+    value = os.environ.get(METRICS_FILE_ENV)
+    return Path(value) if value else None
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    """耗时分布"""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0, "mean": 0.0}
+    ordered = sorted(values)
+
+    def rank(q):
+        return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+    return {
+        "p50": round(rank(0.5), 4),
+        "p95": round(rank(0.95), 4),
+        "max": round(ordered[-1], 4),
+        "mean": round(statistics.mean(ordered), 4),
+    }
@@ -0,0 +1,241 @@
+"""
+AI请求限流模块
+
+进程内共享的令牌桶限流器，按API端点分别限制每分钟请求数和每分钟token数，
+并在收到 429/503 时按 Retry-After 让所有调用方一起暂停；
+重试等待使用带随机抖动的指数退避，避免并发请求同时重试。
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 表示限流/过载、应等待后重试的HTTP状态码
+RETRYABLE_STATUS_CODES = (429, 503)
+
+
+class RateLimitTimeout(Exception):
+    """服务端要求的暂停超过了调用方剩余的等待时间"""
+
+
+class TokenBucket:
+    """令牌桶
+
+    令牌以固定速率补充，桶容量即允许的突发量。线程安全。
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化令牌桶
+
+        Args:
+            rate_per_minute: 每分钟补充的令牌数
+            capacity: 桶容量，默认等于每分钟速率
+            clock: 单调时钟函数(测试时可替换)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        预留令牌(可透支)
+
+        令牌不足时仍然扣减，返回需要等待的秒数，调用方等待后即可发送请求。
+        多个调用方依次预留时等待时间依次递增，不会同时醒来。
+
+        Args:
+            amount: 需要的令牌数(超过桶容量时按容量计算)
+
+        Returns:
+            需要等待的秒数，0表示可以立即发送
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """AI请求限流器(请求数 + token数 + 服务端要求的暂停)"""
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化限流器
+
+        Args:
+            requests_per_minute: 每分钟请求数上限，0表示不限制
+            tokens_per_minute: 每分钟token数上限，0表示不限制
+            clock: 单调时钟函数(测试时可替换)
+        """
+        self._clock = clock
+        self._requests = None
+        self._tokens = None
+        if requests_per_minute:
+            self._requests = TokenBucket(requests_per_minute, clock=clock)
+        if tokens_per_minute:
+            self._tokens = TokenBucket(tokens_per_minute, clock=clock)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 0, max_wait: Optional[float] = None) -> float:
+        """
+        等待直到允许发送一个请求
+
+        Args:
+            tokens: 本次请求预计消耗的token数(提示词 + 最大输出)
+            max_wait: 最多等待服务端要求的暂停多少秒，None表示不限制
+
+        Returns:
+            实际等待的秒数
+
+        Raises:
+            RateLimitTimeout: 暂停的剩余时间超过 max_wait
+        """
+        waited = 0.0
+        limit = self._clock() + max_wait if max_wait is not None else None
+
+        # 服务端要求的暂停(可能在等待期间被其他线程延长)
+        while True:
+            with self._lock:
+                now = self._clock()
+                delay = self._paused_until - now
+            if delay <= 0:
+                break
+            if limit is not None and now + delay > limit:
+                raise RateLimitTimeout(
+                    f"AI endpoint is paused for {delay:.1f}s, "
+                    f"longer than the remaining {max(0.0, limit - now):.1f}s"
+                )
+            time.sleep(delay)
+            waited += delay
+
+        delay = 0.0
+        if self._requests is not None:
+            delay = max(delay, self._requests.reserve(1))
+        if self._tokens is not None and tokens:
+            delay = max(delay, self._tokens.reserve(tokens))
+        if delay > 0:
+            logger.debug(f"Rate limited, waiting {delay:.2f}s")
+            time.sleep(delay)
+            waited += delay
+
+        return waited
+
+    def pause(self, seconds: float):
+        """
+        让所有调用方暂停发送(收到429或Retry-After时调用)
+
+        Args:
+            seconds: 暂停秒数
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+        logger.info(f"AI endpoint throttled, pausing requests for {seconds:.1f}s")
+
+
+# 进程内共享的限流器: (端点, 每分钟请求数, 每分钟token数) -> 限流器
+_limiters: Dict[Tuple[str, float, float], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    endpoint: str, requests_per_minute: float = 0, tokens_per_minute: float = 0
+) -> RateLimiter:
+    """
+    获取端点对应的进程内共享限流器
+
+    Args:
+        endpoint: API端点
+        requests_per_minute: 每分钟请求数上限，0表示不限制
+        tokens_per_minute: 每分钟token数上限，0表示不限制
+
+    Returns:
+        限流器(相同参数返回同一实例)
+    """
+    key = (endpoint, float(requests_per_minute or 0), float(tokens_per_minute or 0))
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(key[1], key[2])
+            _limiters[key] = limiter
+        return limiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+
+    Args:
+        value: 响应头的值(秒数或HTTP日期)
+
+    Returns:
+        需要等待的秒数，无法解析返回None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    max_delay: float,
+    retry_after: Optional[float] = None,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """
+    计算第 attempt 次失败后的等待时间
+
+    服务端给出 Retry-After 时以其为准(提前重试只会再次被限流)；否则为指数退避
+    base * 2^attempt (不超过max_delay)，并在后一半区间内随机抖动。
+
+    Args:
+        attempt: 已失败次数(从0开始)
+        base: 基础等待秒数
+        max_delay: 最大等待秒数
+        retry_after: 服务端要求的等待秒数
+        rng: 返回[0, 1)随机数的函数(测试时可替换)
+
+    Returns:
+        等待秒数
+    """
+    if retry_after is not None:
+        return retry_after
+    delay = min(max_delay, base * (2 ** attempt))
+    return delay / 2 + rng() * delay / 2
@@ -0,0 +1,180 @@
+"""
+AI响应缓存模块
+
+以请求内容(端点、模型、消息、参数、prompt版本)的SHA-256作为键，
+把解析成功的AI响应保存在磁盘上，相同请求直接返回缓存结果；
+批量生成中途失败后重跑时，已完成的生成不再重复调用API。
+
+条目超过TTL后失效；总大小超过上限时按最近访问时间(文件mtime)淘汰最久未用的条目。
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 缓存文件格式版本
+CACHE_FORMAT_VERSION = 1
+
+
+class ResponseCache:
+    """磁盘AI响应缓存"""
+
+    def __init__(
+        self, directory: Path, ttl_seconds: float = 30 * 86400, max_bytes: int = 100 << 20
+    ):
+        """
+        初始化缓存
+
+        Args:
+            directory: 缓存目录
+            ttl_seconds: 条目有效期(秒)，0表示永不过期
+            max_bytes: 缓存总大小上限(字节)，0表示不限制
+        """
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(namespace: str, request: Dict[str, Any]) -> str:
+        """
+        计算请求的缓存键
+
+        Args:
+            namespace: 请求类别和prompt版本，如 "generate:v1"
+            request: 请求内容(端点、模型、消息、参数)
+
+        Returns:
+            十六进制SHA-256
+        """
+        payload = json.dumps(
+            {"namespace": namespace, "request": request},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        读取缓存的响应
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            响应内容，不存在或已过期返回None
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            self._remove(path)
+            return None
+
+        if entry.get("format") != CACHE_FORMAT_VERSION:
+            self._remove(path)
+            return None
+        if self.ttl_seconds and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        # 更新mtime作为最近访问时间(LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        logger.debug(f"AI response cache hit {key[:12]}")
+        return entry.get("content")
+
+    def put(self, key: str, content: str) -> bool:
+        """
+        保存响应
+
+        Args:
+            key: 缓存键
+            content: 响应内容
+
+        Returns:
+            是否保存成功
+        """
+        path = self._path(key)
+        entry = {"format": CACHE_FORMAT_VERSION, "created_at": time.time(), "content": content}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write AI response cache: {e}")
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        """
+        淘汰最久未访问的条目，使总大小不超过上限
+
+        Returns:
+            删除的条目数
+        """
+        if not self.max_bytes or not self.directory.exists():
+            return 0
+
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} AI response cache entries")
+        return removed
+
+    def clear(self) -> int:
+        """
+        清空缓存
+
+        Returns:
+            删除的条目数
+        """
+        removed = 0
+        for path in self.directory.glob("*/*.json"):
+            self._remove(path)
+            removed += 1
+        return removed
+
+    def _path(self, key: str) -> Path:
+        """缓存文件路径(按键前两位分目录，避免单目录文件过多)"""
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remove(self, path: Path):
+        """删除缓存文件"""
+        try:
+            path.unlink()
+        except OSError:
+            pass
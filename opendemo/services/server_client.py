@@ -0,0 +1,96 @@
+"""
+本地常驻服务客户端
+
+通过状态文件发现 `opendemo serve` 启动的服务并转发请求。
+只依赖标准库(http.client 在发送请求时才导入)，保持CLI启动轻量；
+服务不可用时返回None，由调用方回退到本地执行。
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 认证请求头
+TOKEN_HEADER = "X-Opendemo-Token"
+
+
+def default_state_path() -> Path:
+    """服务状态文件路径"""
+    return Path.home() / ".opendemo" / "server.json"
+
+
+class ServerClient:
+    """本地常驻服务客户端"""
+
+    def __init__(self, host: str, port: int, token: str, timeout: float = 5.0):
+        """
+        初始化客户端
+
+        Args:
+            host: 服务地址
+            port: 服务端口
+            token: 认证token
+            timeout: 请求超时时间(秒)
+        """
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+
+    @classmethod
+    def from_state_file(cls, path: Optional[Path] = None, timeout: float = 5.0):
+        """
+        从状态文件创建客户端
+
+        Args:
+            path: 状态文件路径，默认 ~/.opendemo/server.json
+            timeout: 请求超时时间(秒)
+
+        Returns:
+            客户端，状态文件不存在或无效时返回None
+        """
+        path = Path(path) if path else default_state_path()
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return cls(state["host"], int(state["port"]), state["token"], timeout)
+        except Exception as e:
+            logger.debug(f"Invalid server state file {path}: {e}")
+            return None
+
+    def request(self, command: str, payload: Optional[Dict[str, Any]] = None) -> Optional[dict]:
+        """
+        发送命令
+
+        Args:
+            command: 命令名
+            payload: 请求参数
+
+        Returns:
+            响应字典，连接失败或服务返回错误时返回None
+        """
+        import http.client
+
+        body = json.dumps(payload or {}, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json", TOKEN_HEADER: self.token}
+
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            connection.request("POST", f"/{command}", body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+            if response.status != 200:
+                logger.debug(f"Server returned {response.status} for {command}: {data[:200]!r}")
+                return None
+            return json.loads(data)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            logger.debug(f"Server request {command} failed: {e}")
+            return None
+        finally:
+            connection.close()
@@ -4,11 +4,15 @@
 负责文件系统操作和demo库管理。
 """
 
+import copy
 import json
+import os
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
+from opendemo.services.catalog_index import CatalogIndex, build_entry, is_skipped_dir
+from opendemo.utils.file_staging import sync_tree
 from opendemo.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -27,6 +31,9 @@ class StorageService:
         self.config = config_service
         self._builtin_library_path = None
         self._user_library_path = None
+        self._catalog_index = None
+        # (配置值, 已创建的输出目录)，配置值未变化时不再重复mkdir
+        self._output_directory = None
 
     @property
     def builtin_library_path(self) -> Path:
@@ -48,6 +55,19 @@ class StorageService:
             self._user_library_path.mkdir(parents=True, exist_ok=True)
         return self._user_library_path
 
+    @property
+    def cache_directory(self) -> Path:
+        """获取缓存目录路径"""
+        path = self.config.get("cache_directory")
+        return Path(path) if path else Path.home() / ".opendemo" / "cache"
+
+    @property
+    def catalog_index(self) -> Optional[CatalogIndex]:
+        """获取demo目录索引，配置 catalog_index 为 false 时返回None"""
+        if self._catalog_index is None and self.config.get("catalog_index", True):
+            self._catalog_index = CatalogIndex(self.cache_directory / "catalog.json")
+        return self._catalog_index
+
     def list_demos(self, library: str = "all", language: str = None) -> List[Path]:
         """
         列出demo库中的所有demo
@@ -81,27 +101,92 @@ class StorageService:
                 # 搜索所有语言目录
                 demo_paths.extend(self._find_demos_in_path(base_path))
 
+        if self.catalog_index is not None:
+            self.catalog_index.save()
+
+        return demo_paths
+
+    def list_output_demos(self, language: str = None) -> List[Path]:
+        """
+        列出输出目录中的所有demo
+
+        Args:
+            language: 过滤特定语言,None表示所有语言
+
+        Returns:
+            demo目录路径列表
+        """
+        output_dir = self.get_output_directory()
+        search_path = output_dir / language.lower() if language else output_dir
+        demo_paths = self._find_demos_in_path(search_path)
+
+        if self.catalog_index is not None:
+            self.catalog_index.save()
+
         return demo_paths
 
     def _find_demos_in_path(self, path: Path) -> List[Path]:
         """
         在指定路径下查找demo目录
 
+        启用索引时增量刷新索引后直接从索引读取：只有mtime变化的目录会被重新列举，
+        只有mtime变化的metadata.json会被重新解析。
+
         Args:
             path: 搜索路径
 
         Returns:
             demo目录列表
         """
-        demos = []
-
         if not path.exists():
-            return demos
+            return []
+
+        index = self.catalog_index
+        if index is None:
+            return self._scan_demos_in_path(path)
+
+        index.refresh(path, self._read_metadata_file)
+        return [demo_path for demo_path, _ in index.lookup(path)]
+
+    def refresh_index(self, path: Path) -> int:
+        """
+        增量刷新指定路径的目录索引
+
+        Args:
+            path: 需要刷新的路径(如输出目录或某个语言目录)
+
+        Returns:
+            重新列举的目录数，未启用索引时返回0
+        """
+        index = self.catalog_index
+        if index is None or not path.exists():
+            return 0
+
+        changed = index.refresh(path, self._read_metadata_file)
+        index.save()
+        return changed
+
+    def _scan_demos_in_path(self, path: Path) -> List[Path]:
+        """
+        遍历目录树查找包含metadata.json的目录
+
+        与目录索引一致，跳过 is_skipped_dir 的目录，不在demo目录之下继续查找。
+
+        Args:
+            path: 搜索路径
+
+        Returns:
+            demo目录列表
+        """
+        demos = []
 
         # 遍历目录,查找包含metadata.json的目录
-        for item in path.rglob("*"):
-            if item.is_dir() and (item / "metadata.json").exists():
-                demos.append(item)
+        for root, dirs, files in os.walk(path):
+            if root != str(path) and "metadata.json" in files:
+                demos.append(Path(root))
+                dirs[:] = []
+            else:
+                dirs[:] = sorted(d for d in dirs if not is_skipped_dir(d))
 
         return demos
 
@@ -109,6 +194,9 @@ class StorageService:
         """
         加载demo的元数据
 
+        索引中记录的mtime与metadata.json一致时直接返回索引中的元数据，
+        否则重新解析文件并刷新索引。
+
         Args:
             demo_path: demo目录路径
 
@@ -117,10 +205,33 @@ class StorageService:
         """
         metadata_file = demo_path / "metadata.json"
 
-        if not metadata_file.exists():
+        try:
+            mtime = metadata_file.stat().st_mtime
+        except OSError:
             logger.warning(f"Metadata file not found: {metadata_file}")
             return None
 
+        index = self.catalog_index
+        if index is not None:
+            entry = index.get_entry(demo_path)
+            if entry is not None and entry["mtime"] == mtime and entry["metadata"] is not None:
+                return copy.deepcopy(entry["metadata"])
+
+        metadata = self._read_metadata_file(metadata_file)
+        if metadata is not None and index is not None:
+            index.update_entry(demo_path, build_entry(demo_path, metadata, mtime))
+        return metadata
+
+    def _read_metadata_file(self, metadata_file: Path) -> Optional[Dict[str, Any]]:
+        """
+        解析metadata.json文件
+
+        Args:
+            metadata_file: metadata.json路径
+
+        Returns:
+            元数据字典,解析失败返回None
+        """
         try:
             with open(metadata_file, "r", encoding="utf-8") as f:
                 metadata = json.load(f)
@@ -129,13 +240,19 @@ class StorageService:
             logger.error(f"Failed to load metadata from {metadata_file}: {e}")
             return None
 
-    def save_demo(self, demo_data: Dict[str, Any], target_path: Path) -> bool:
+    def save_demo(
+        self,
+        demo_data: Dict[str, Any],
+        target_path: Path,
+        skip_files: Optional[Set[str]] = None,
+    ) -> bool:
         """
         保存demo到指定路径
 
         Args:
             demo_data: demo数据,包含metadata和files
             target_path: 目标路径
+            skip_files: 已写入目标路径、无需再次写入的文件相对路径
 
         Returns:
             保存是否成功
@@ -153,12 +270,16 @@ class StorageService:
             # 保存文件
             files = demo_data.get("files", [])
             for file_info in files:
+                if skip_files and file_info["path"] in skip_files:
+                    continue
                 file_path = target_path / file_info["path"]
                 file_path.parent.mkdir(parents=True, exist_ok=True)
 
                 with open(file_path, "w", encoding="utf-8") as f:
                     f.write(file_info["content"])
 
+            self._index_demo(target_path)
+
             logger.info(f"Successfully saved demo to {target_path}")
             return True
 
@@ -170,6 +291,9 @@ class StorageService:
         """
         复制demo到目标路径
 
+        目标路径已存在时增量同步: 只复制有变化的文件，删除源demo中没有的文件。
+        文件系统支持时使用写时复制克隆，不复制文件内容。
+
         Args:
             source_path: 源demo路径
             target_path: 目标路径
@@ -178,17 +302,36 @@ class StorageService:
             复制是否成功
         """
         try:
-            if target_path.exists():
-                shutil.rmtree(target_path)
-
-            shutil.copytree(source_path, target_path)
-            logger.info(f"Successfully copied demo from {source_path} to {target_path}")
+            stats = sync_tree(source_path, target_path)
+            self._index_demo(target_path)
+            logger.info(
+                f"Successfully copied demo from {source_path} to {target_path} "
+                f"({stats['copied']} copied, {stats['unchanged']} unchanged)"
+            )
             return True
 
         except Exception as e:
             logger.error(f"Failed to copy demo: {e}")
             return False
 
+    def _index_demo(self, demo_path: Path):
+        """
+        将新写入的demo登记到目录索引
+
+        Args:
+            demo_path: demo路径
+        """
+        index = self.catalog_index
+        metadata_file = demo_path / "metadata.json"
+        if index is None or not metadata_file.exists():
+            return
+
+        metadata = self._read_metadata_file(metadata_file)
+        if metadata is not None:
+            entry = build_entry(demo_path, metadata, metadata_file.stat().st_mtime)
+            if index.update_entry(demo_path, entry):
+                index.save()
+
     def delete_demo(self, demo_path: Path) -> bool:
         """
         删除demo
@@ -202,6 +345,8 @@ class StorageService:
         try:
             if demo_path.exists() and demo_path.is_dir():
                 shutil.rmtree(demo_path)
+                if self.catalog_index is not None and self.catalog_index.remove_entry(demo_path):
+                    self.catalog_index.save()
                 logger.info(f"Successfully deleted demo at {demo_path}")
                 return True
             else:
@@ -219,8 +364,13 @@ class StorageService:
         Returns:
             输出目录路径
         """
-        output_dir = Path(self.config.get("output_directory", "./opendemo_output"))
+        configured = self.config.get("output_directory", "./opendemo_output")
+        if self._output_directory is not None and self._output_directory[0] == configured:
+            return self._output_directory[1]
+
+        output_dir = Path(configured)
         output_dir.mkdir(parents=True, exist_ok=True)
+        self._output_directory = (configured, output_dir)
         return output_dir
 
     def read_file(self, file_path: Path) -> Optional[str]:
@@ -0,0 +1,205 @@
+"""
+文件暂存工具模块
+
+复制demo目录时尽量不复制文件内容:
+  - 文件系统支持时使用写时复制的克隆(reflink，Linux 的 FICLONE，如 btrfs、XFS)，
+    副本与源文件共享数据块，修改副本不影响源文件
+  - 否则对依赖目录(node_modules、vendor)中的文件使用硬链接，这些文件在验证时只读取；
+    依赖目录中的隐藏文件和 vendor/modules.txt 等可能被工具改写的文件仍然复制
+  - 都不可用时(跨文件系统、不支持等)回退到普通复制
+
+sync_tree 增量同步目录: 只复制大小或修改时间变化的文件，删除源目录中已不存在的文件。
+"""
+
+import errno
+import os
+import shutil
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 可以硬链接的依赖目录
+DEPENDENCY_DIRS = ("node_modules", "vendor")
+
+# 依赖目录中可能被工具原地改写、不做硬链接的文件
+MUTABLE_DEPENDENCY_FILES = ("modules.txt",)
+
+# Linux ioctl FICLONE
+FICLONE = 0x40049409
+
+# 表示文件系统不支持克隆或链接的错误码
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.EPERM,
+    errno.EMLINK,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.ENOSYS,
+}
+
+
+class FileStager:
+    """
+    复制单个文件(可作为 shutil.copytree 的 copy_function)
+
+    依次尝试 reflink、硬链接(仅依赖目录)和普通复制；某种方式不被支持后，
+    同一个实例不再尝试该方式。
+    """
+
+    def __init__(self, reflink: bool = True, hardlink: bool = False):
+        """
+        初始化
+
+        Args:
+            reflink: 是否尝试写时复制克隆
+            hardlink: 是否对依赖目录中的文件使用硬链接(目标会被修改时不要启用)
+        """
+        self.reflink = reflink and sys.platform.startswith("linux")
+        self.hardlink = hardlink
+        self.counts: Counter = Counter()
+
+    def __call__(self, src, dst) -> str:
+        """
+        复制文件
+
+        Args:
+            src: 源文件路径
+            dst: 目标文件路径
+
+        Returns:
+            目标文件路径
+        """
+        if self.reflink:
+            try:
+                _reflink(src, dst)
+                shutil.copystat(src, dst)
+                self.counts["reflink"] += 1
+                return dst
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                logger.debug(f"reflink not supported for {dst}: {e}")
+                self.reflink = False
+
+        if self.hardlink and _is_dependency_file(src):
+            try:
+                os.link(src, dst)
+                self.counts["hardlink"] += 1
+                return dst
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS and e.errno != errno.EACCES:
+                    raise
+                logger.debug(f"hardlink not supported for {dst}: {e}")
+                self.hardlink = False
+
+        shutil.copy2(src, dst)
+        self.counts["copy"] += 1
+        return dst
+
+
+def _reflink(src, dst):
+    """写时复制克隆文件(失败时删除已创建的目标文件)"""
+    import fcntl
+
+    with open(src, "rb") as source:
+        with open(dst, "wb") as target:
+            try:
+                fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            except OSError:
+                target.close()
+                os.unlink(dst)
+                raise
+
+
+def _is_dependency_file(path) -> bool:
+    """文件是否位于依赖目录中且不会被工具改写"""
+    path = Path(path)
+    if path.name.startswith(".") or path.name in MUTABLE_DEPENDENCY_FILES:
+        return False
+    return any(part in DEPENDENCY_DIRS for part in path.parts[:-1])
+
+
+def sync_tree(source: Path, target: Path, stager: Optional[FileStager] = None) -> Dict[str, int]:
+    """
+    把目标目录同步为源目录的副本
+
+    目标目录不存在时整体复制；已存在时只复制新增以及大小或修改时间变化的文件，
+    并删除源目录中不存在的文件和目录。
+
+    Args:
+        source: 源目录
+        target: 目标目录
+        stager: 复制文件的方式，默认为 FileStager()(reflink 或复制，不使用硬链接)
+
+    Returns:
+        {"copied": 复制的文件数, "unchanged": 未变化的文件数, "removed": 删除的条目数}
+    """
+    source = Path(source)
+    target = Path(target)
+    stager = stager or FileStager()
+    if not source.is_dir():
+        raise FileNotFoundError(f"Source directory not found: {source}")
+
+    stats = {"copied": 0, "unchanged": 0, "removed": 0}
+    if not target.exists():
+        shutil.copytree(source, target, copy_function=stager)
+        stats["copied"] = sum(stager.counts.values())
+        return stats
+
+    for root, dirs, files in os.walk(source, followlinks=True):
+        relative = Path(root).relative_to(source)
+        target_dir = target / relative
+        if target_dir.is_symlink() or target_dir.is_file():
+            target_dir.unlink()
+        target_dir.mkdir(exist_ok=True)
+
+        # 删除源目录中已不存在的条目
+        wanted = set(dirs) | set(files)
+        for entry in os.listdir(target_dir):
+            if entry not in wanted:
+                _remove(target_dir / entry)
+                stats["removed"] += 1
+
+        for name in files:
+            src = Path(root) / name
+            dst = target_dir / name
+            if _same_file(src, dst):
+                stats["unchanged"] += 1
+                continue
+            if dst.is_dir() and not dst.is_symlink():
+                shutil.rmtree(dst)
+            elif dst.exists() or dst.is_symlink():
+                dst.unlink()
+            stager(str(src), str(dst))
+            stats["copied"] += 1
+
+    return stats
+
+
+def _same_file(src: Path, dst: Path) -> bool:
+    """目标文件与源文件的大小和修改时间是否相同"""
+    try:
+        src_stat = src.stat()
+        dst_stat = dst.lstat()
+    except OSError:
+        return False
+    return (
+        not dst.is_symlink()
+        and dst.is_file()
+        and src_stat.st_size == dst_stat.st_size
+        and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+    )
+
+
+def _remove(path: Path):
+    """删除文件或目录"""
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
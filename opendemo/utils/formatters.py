@@ -7,8 +7,6 @@
 from typing import List, Dict, Any
 from rich.console import Console
 from rich.table import Table
-from rich.panel import Panel
-from rich.markdown import Markdown
 from rich import box
 
 
@@ -160,6 +158,8 @@ def print_panel(content: str, title: str = None, style: str = "blue"):
         title: 标题
         style: 样式
     """
+    from rich.panel import Panel
+
     panel = Panel(content, title=title, border_style=style)
     console.print(panel)
 
@@ -171,6 +171,9 @@ def print_markdown(content: str):
     Args:
         content: markdown文本
     """
+    # rich.markdown 依赖 markdown-it，导入较慢，仅在需要时导入
+    from rich.markdown import Markdown
+
     md = Markdown(content)
     console.print(md)
 
@@ -0,0 +1,141 @@
+"""
+增量JSON解析模块
+
+在流式AI响应到达过程中解析demo JSON，metadata 对象和 files 数组中的每个文件
+一旦完整即返回，不必等待整个响应结束；已返回的部分会从缓冲区丢弃。
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class DemoStreamParser:
+    """demo JSON 增量解析器
+
+    只跟踪顶层对象的结构(嵌套深度、字符串和转义)，响应前的说明文字或
+    ```json 代码块标记会被跳过。顶层的 metadata 对象完整时产生 ("metadata", dict)
+    事件，files 数组中每个对象完整时产生 ("file", dict) 事件。
+    """
+
+    def __init__(self):
+        """初始化解析器"""
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_key: Optional[str] = None
+        # 当前顶层值所属的键
+        self._value_key: Optional[str] = None
+        # 正在截取的对象(metadata 或 files 中的元素)的起始位置和深度
+        self._capture_start = -1
+        self._capture_depth = 0
+        self.done = False
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        输入一段响应文本
+
+        Args:
+            text: 新到达的文本
+
+        Returns:
+            本段文本中完成的事件列表，每项为 (事件类型, 值)
+        """
+        if self.done or not text:
+            return []
+
+        self._buffer += text
+        events = []
+        buffer = self._buffer
+        pos = self._pos
+
+        while pos < len(buffer) and not self.done:
+            ch = buffer[pos]
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._value_key is None:
+                        self._last_key = _decode_string(buffer[self._string_start : pos + 1])
+                pos += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch in "{[":
+                self._open(ch, pos)
+            elif ch in "}]":
+                event = self._close(pos)
+                if event is not None:
+                    events.append(event)
+            elif ch == ":" and self._depth == 1:
+                self._value_key = self._last_key
+            elif ch == "," and self._depth == 1:
+                self._value_key = None
+            pos += 1
+
+        # 丢弃已处理且不再需要的文本
+        keep = pos
+        if self._in_string and self._depth == 1 and self._capture_start < 0:
+            keep = min(keep, self._string_start)
+        if self._capture_start >= 0:
+            keep = min(keep, self._capture_start)
+        self._buffer = buffer[keep:]
+        self._pos = pos - keep
+        if self._capture_start >= 0:
+            self._capture_start -= keep
+        if self._string_start >= 0:
+            self._string_start -= keep
+        return events
+
+    def _open(self, ch: str, pos: int):
+        """处理 { 或 ["""
+        self._depth += 1
+        if self._capture_start >= 0:
+            return
+        if self._depth == 2 and ch == "{" and self._value_key == "metadata":
+            self._capture_start = pos
+            self._capture_depth = 2
+        elif self._depth == 3 and ch == "{" and self._value_key == "files":
+            self._capture_start = pos
+            self._capture_depth = 3
+
+    def _close(self, pos: int) -> Optional[Tuple[str, Any]]:
+        """处理 } 或 ]，截取的对象完整时返回事件"""
+        event = None
+        if self._capture_start >= 0 and self._depth == self._capture_depth:
+            try:
+                value = json.loads(self._buffer[self._capture_start : pos + 1])
+            except ValueError:
+                value = None
+            if isinstance(value, dict):
+                event = ("metadata" if self._capture_depth == 2 else "file", value)
+            self._capture_start = -1
+
+        self._depth -= 1
+        if self._depth == 0:
+            self.done = True
+        return event
+
+
+def _decode_string(literal: str) -> Optional[str]:
+    """解码JSON字符串字面量"""
+    try:
+        return json.loads(literal)
+    except ValueError:
+        return None
@@ -0,0 +1,342 @@
+"""
+本地模拟LLM服务
+
+实现 OpenAI 兼容的 /v1/chat/completions 接口(含SSE流式响应)，按请求内容返回
+固定格式的demo或关键字分类结果，可配置响应延迟和429/500错误注入。
+用于在没有真实API密钥时端到端测试和基准测试生成流程。
+
+用法:
+    python -m opendemo.utils.mock_llm_server --port 8765 --latency 0.5 --rate-429 0.1
+    opendemo config set ai.api_endpoint http://127.0.0.1:8765/v1/chat/completions
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+# 从生成prompt中提取主题和语言
+_TOPIC_PATTERN = re.compile(
+    r'为"(?P<topic>.+?)"主题生成一个完整的、可执行的(?P<language>\S+) demo'
+)
+
+# 文件扩展名
+_EXTENSIONS = {"python": "py", "java": "java", "go": "go", "nodejs": "js", "kubernetes": "yaml"}
+
+
+class MockCompletions:
+    """按请求内容构造固定格式的补全结果(不依赖网络，也用于离线的stub提供方)"""
+
+    def __init__(self, file_count: int = 3, file_size: int = 2000):
+        """
+        初始化
+
+        Args:
+            file_count: 生成的demo包含的代码文件数(另有README.md)
+            file_size: 每个代码文件的大约字节数
+        """
+        self.file_count = file_count
+        self.file_size = file_size
+
+    def content(self, request: Dict[str, Any]) -> str:
+        """
+        根据请求内容构造补全文本
+
+        Args:
+            request: chat/completions 请求体
+
+        Returns:
+            分类请求返回分类JSON，其余返回demo JSON
+        """
+        prompt = "\n".join(
+            str(m.get("content", "")) for m in request.get("messages", []) if isinstance(m, dict)
+        )
+        if '"is_library"' in prompt:
+            classification = {
+                "is_library": False,
+                "confidence": 0.9,
+                "library_name": None,
+                "description": "编程主题",
+            }
+            return json.dumps(classification, ensure_ascii=False)
+
+        match = _TOPIC_PATTERN.search(prompt)
+        topic = match.group("topic") if match else "demo"
+        language = match.group("language").lower() if match else "python"
+        return json.dumps(self._demo_payload(language, topic, prompt), ensure_ascii=False)
+
+    @staticmethod
+    def usage(request: Dict[str, Any], content: str) -> Dict[str, int]:
+        """
+        估算token用量(约每4个字符一个token)
+
+        Args:
+            request: 请求体
+            content: 补全文本
+
+        Returns:
+            usage 字段
+        """
+        messages = [m for m in request.get("messages", []) if isinstance(m, dict)]
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+        prompt_tokens = max(1, prompt_chars // 4)
+        completion_tokens = max(1, len(content) // 4)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def _demo_payload(self, language: str, topic: str, prompt: str) -> Dict[str, Any]:
+        """构造固定格式的demo数据"""
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        slug = "".join(c if c.isascii() and c.isalnum() else "-" for c in topic.lower())
+        slug = "-".join(part for part in slug.split("-") if part) or "demo"
+        extension = _EXTENSIONS.get(language, "txt")
+
+        line = f"# {topic} mock line\n"
+        body = line * max(1, self.file_size // len(line.encode("utf-8")))
+        files = [{"path": "README.md", "content": f"# {topic}\n\nMock demo for {language}.\n"}]
+        files += [
+            {"path": f"code/example_{i}.{extension}", "content": body}
+            for i in range(1, self.file_count + 1)
+        ]
+        return {
+            "metadata": {
+                "name": f"{language}-{slug}",
+                "folder_name": f"{slug}-{digest}",
+                "language": language,
+                "keywords": [topic],
+                "description": f"Mock demo for {topic}",
+                "difficulty": "beginner",
+                "dependencies": {},
+            },
+            "files": files,
+        }
+
+
+class MockLLMServer:
+    """模拟LLM服务"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        chunk_delay: float = 0.0,
+        rate_429: float = 0.0,
+        rate_500: float = 0.0,
+        retry_after: float = 0.1,
+        file_count: int = 3,
+        file_size: int = 2000,
+        seed: Optional[int] = None,
+    ):
+        """
+        初始化模拟服务
+
+        Args:
+            host: 监听地址
+            port: 监听端口，0表示自动分配
+            latency: 每个请求返回首字节前的延迟(秒)
+            chunk_delay: 流式响应中每个分块之间的延迟(秒)
+            rate_429: 返回429的概率
+            rate_500: 返回500的概率
+            retry_after: 429响应的 Retry-After 秒数
+            file_count: 生成的demo包含的代码文件数(另有README.md)
+            file_size: 每个代码文件的大约字节数
+            seed: 错误注入的随机种子
+        """
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.retry_after = retry_after
+        self.file_count = file_count
+        self.file_size = file_size
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats: Counter = Counter()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """chat/completions 端点地址"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def start(self) -> "MockLLMServer":
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def serve_forever(self):
+        """在当前线程中运行服务"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        """清空请求统计"""
+        with self._lock:
+            self.stats.clear()
+
+    def _record(self, key: str):
+        """记录请求统计"""
+        with self._lock:
+            self.stats[key] += 1
+
+    def _inject_error(self) -> Optional[int]:
+        """按概率返回要注入的错误状态码"""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.rate_429:
+            return 429
+        if roll < self.rate_429 + self.rate_500:
+            return 500
+        return None
+
+    def completion_content(self, request: Dict[str, Any]) -> str:
+        """根据请求内容构造补全文本"""
+        return MockCompletions(self.file_count, self.file_size).content(request)
+
+    def usage(self, request: Dict[str, Any], content: str) -> Dict[str, int]:
+        """估算token用量"""
+        return MockCompletions.usage(request, content)
+
+    def _make_handler(self):
+        """构造请求处理器类"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": {"message": "invalid JSON"}})
+                    return
+                server._record("requests")
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                status = server._inject_error()
+                if status is not None:
+                    server._record(str(status))
+                    headers = {"Retry-After": f"{server.retry_after:g}"} if status == 429 else {}
+                    self._send_json(status, {"error": {"message": "injected error"}}, headers)
+                    return
+
+                server._record("200")
+                content = server.completion_content(request)
+                usage = server.usage(request, content)
+                if request.get("stream"):
+                    include_usage = (request.get("stream_options") or {}).get("include_usage")
+                    self._send_stream(content, usage if include_usage else None)
+                else:
+                    choice = {"message": {"content": content}, "finish_reason": "stop"}
+                    self._send_json(200, {"choices": [choice], "usage": usage})
+
+            def _send_json(self, status: int, body: Dict[str, Any], headers: Dict[str, str] = None):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, content: str, usage: Optional[Dict[str, int]]):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                # 每个分块约相当于几个token
+                events = [
+                    {"choices": [{"delta": {"content": content[i : i + 64]}}]}
+                    for i in range(0, len(content), 64)
+                ]
+                events.append({"choices": [{"delta": {}, "finish_reason": "stop"}]})
+                if usage is not None:
+                    events.append({"choices": [], "usage": usage})
+                for event in events:
+                    self._send_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n")
+                    if server.chunk_delay:
+                        time.sleep(server.chunk_delay)
+                self._send_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+            def _send_chunk(self, text: str):
+                data = text.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="本地模拟LLM服务(OpenAI兼容)")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--latency", type=float, default=0.0, help="首字节延迟(秒)")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="流式分块间隔(秒)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="返回429的概率")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="返回500的概率")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="429的Retry-After(秒)")
+    parser.add_argument("--files", type=int, default=3, help="每个demo的代码文件数")
+    parser.add_argument("--file-size", type=int, default=2000, help="每个代码文件的字节数")
+    parser.add_argument("--seed", type=int, default=None, help="错误注入随机种子")
+    options = parser.parse_args(argv)
+
+    server = MockLLMServer(
+        host=options.host,
+        port=options.port,
+        latency=options.latency,
+        chunk_delay=options.chunk_delay,
+        rate_429=options.rate_429,
+        rate_500=options.rate_500,
+        retry_after=options.retry_after,
+        file_count=options.files,
+        file_size=options.file_size,
+        seed=options.seed,
+    )
+    print(f"Mock LLM server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
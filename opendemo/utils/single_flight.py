@@ -0,0 +1,103 @@
+"""
+请求合并模块
+
+相同键的并发调用只执行一次，其余调用方等待并共享同一结果(single-flight)。
+调用完成后键即被释放，之后的调用会重新执行。
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from opendemo.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Call:
+    """进行中的调用"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """线程间的请求合并"""
+
+    def __init__(self):
+        """初始化"""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        执行调用，相同键的调用正在进行时等待其结果
+
+        Args:
+            key: 调用键
+            fn: 要执行的函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            函数返回值(合并的调用方得到同一对象)；函数抛出的异常同样传递给所有调用方
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            logger.info(f"Joining in-flight call for {key!r}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """进行中的调用数"""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """协程间的请求合并(同一事件循环内使用)"""
+
+    def __init__(self):
+        """初始化"""
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行协程，相同键的协程正在进行时等待其结果
+
+        Args:
+            key: 调用键
+            factory: 返回协程的函数(仅在需要执行时调用)
+
+        Returns:
+            协程返回值
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            logger.info(f"Joining in-flight call for {key!r}")
+        # 某个调用方被取消时不影响其他等待同一结果的调用方
+        return await asyncio.shield(task)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+生成流程端到端基准
+
+启动本地模拟LLM服务(opendemo.utils.mock_llm_server)，在临时HOME中配置AI端点，
+然后分别运行:
+  - new:   逐个运行 `opendemo new`，统计每次生成的端到端耗时(含进程启动)
+  - batch: 运行批量生成流程(与 `opendemo batch` 相同的 BatchGenerator)，统计吞吐量
+输出吞吐量、p50/p99 耗时和重试次数(服务端返回的429/500数)。
+
+用法:
+    python scripts/benchmark_generation.py                       # new 5次 + batch 20个
+    python scripts/benchmark_generation.py --latency 0.3 -j 8    # 模拟慢速端点、8并发
+    python scripts/benchmark_generation.py --rate-429 0.2        # 注入20%的429
+    python scripts/benchmark_generation.py --json bench.jsonl    # 追加结果，按提交跟踪
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from opendemo.utils.mock_llm_server import MockLLMServer  # noqa: E402
+
+# 批量生成驱动(在子进程中运行，使用临时HOME中的配置)
+BATCH_DRIVER = """
+import json, sys, time
+from opendemo.cli import _get_context
+from opendemo.core.batch_generator import BatchGenerator, load_manifest
+from opendemo.services.ai_service import AsyncAIService
+
+concurrency = int(sys.argv[2])
+app = _get_context()
+entries = load_manifest(sys.argv[1])
+async_ai = AsyncAIService(app.ai_service, max_workers=concurrency)
+start = time.perf_counter()
+try:
+    results = BatchGenerator(async_ai, app.generator, concurrency).run(entries)
+finally:
+    async_ai.close()
+wall = time.perf_counter() - start
+print(json.dumps({
+    "wall": wall,
+    "latencies": [r["elapsed"] for r in results if r["success"]],
+    "failed": sum(1 for r in results if not r["success"]),
+}))
+"""
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    计算百分位数(最近秩法)
+
+    Args:
+        values: 样本
+        q: 百分位(0-100)
+
+    Returns:
+        百分位数，样本为空时返回0
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(q / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def write_config(home: Path, endpoint: str, stream: bool):
+    """在临时HOME中写入指向模拟服务的配置"""
+    import yaml
+
+    config_dir = home / ".opendemo"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    config = {
+        "output_directory": str(home / "output"),
+        "ai": {
+            "api_key": "benchmark-key",
+            "api_endpoint": endpoint,
+            "retry_times": 5,
+            "retry_interval": 0.05,
+            "retry_max_interval": 1,
+            "stream": stream,
+            # 每次都请求模拟服务，避免缓存命中影响结果
+            "cache_enabled": False,
+        },
+    }
+    with open(config_dir / "config.yaml", "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, allow_unicode=True)
+
+
+def run_python(code: str, args: List[str], home: Path) -> subprocess.CompletedProcess:
+    """在临时HOME中运行Python代码"""
+    env = dict(os.environ)
+    env["HOME"] = str(home)
+    env["USERPROFILE"] = str(home)
+    env["NO_PROXY"] = "127.0.0.1,localhost"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, "-c", code, *args],
+        cwd=home,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def bench_new(server: MockLLMServer, home: Path, runs: int) -> Dict[str, Any]:
+    """逐个运行 opendemo new"""
+    code = "import sys; from opendemo.cli import cli; cli(sys.argv[1:])"
+    latencies = []
+    failed = 0
+    start = time.perf_counter()
+    for i in range(runs):
+        begin = time.perf_counter()
+        result = run_python(code, ["new", "python", f"基准主题{i}"], home)
+        if result.returncode == 0:
+            latencies.append(time.perf_counter() - begin)
+        else:
+            failed += 1
+            print(f"  [X] new #{i + 1} 失败:\n{result.stdout[-1000:]}{result.stderr[-1000:]}")
+    return summarize(time.perf_counter() - start, latencies, failed, server)
+
+
+def bench_batch(server: MockLLMServer, home: Path, size: int, concurrency: int) -> Dict[str, Any]:
+    """运行批量生成"""
+    manifest = home / "manifest.json"
+    topics = [{"language": "python", "topic": f"批量主题{i}"} for i in range(size)]
+    manifest.write_text(json.dumps(topics, ensure_ascii=False), encoding="utf-8")
+
+    result = run_python(BATCH_DRIVER, [str(manifest), str(concurrency)], home)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"batch driver exited with {result.returncode}:\n{result.stderr[-2000:]}"
+        )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return summarize(report["wall"], report["latencies"], report["failed"], server)
+
+
+def summarize(
+    wall: float, latencies: List[float], failed: int, server: MockLLMServer
+) -> Dict[str, Any]:
+    """汇总一个场景的结果，并清空服务端统计"""
+    stats = dict(server.stats)
+    server.reset_stats()
+    return {
+        "succeeded": len(latencies),
+        "failed": failed,
+        "wall_s": round(wall, 3),
+        "throughput_per_s": round(len(latencies) / wall, 3) if wall else 0.0,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p99_s": round(percentile(latencies, 99), 3),
+        "mean_s": round(statistics.mean(latencies), 3) if latencies else 0.0,
+        "requests": stats.get("requests", 0),
+        "retries": stats.get("429", 0) + stats.get("500", 0),
+        "status_429": stats.get("429", 0),
+        "status_500": stats.get("500", 0),
+    }
+
+
+def git_revision() -> str:
+    """当前提交(用于按提交跟踪结果)"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        return result.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def print_report(name: str, metrics: Dict[str, Any]):
+    """打印场景结果"""
+    print(f"\n== {name} ==")
+    print(f"  成功/失败: {metrics['succeeded']}/{metrics['failed']}  总耗时: {metrics['wall_s']:.2f} s")
+    print(f"  吞吐量: {metrics['throughput_per_s']:.2f} demo/s")
+    print(
+        f"  耗时 p50: {metrics['p50_s'] * 1000:.0f} ms  p99: {metrics['p99_s'] * 1000:.0f} ms"
+        f"  平均: {metrics['mean_s'] * 1000:.0f} ms"
+    )
+    print(
+        f"  请求数: {metrics['requests']}  重试: {metrics['retries']}"
+        f" (429: {metrics['status_429']}, 500: {metrics['status_500']})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成流程端到端基准")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="opendemo new 的运行次数")
+    parser.add_argument("--batch-size", type=int, default=20, help="批量生成的demo数，0表示跳过")
+    parser.add_argument("-j", "--concurrency", type=int, default=4, help="批量生成并发数")
+    parser.add_argument("--latency", type=float, default=0.05, help="模拟端点首字节延迟(秒)")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="流式分块间隔(秒)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="注入429的概率")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="注入500的概率")
+    parser.add_argument("--files", type=int, default=3, help="每个demo的代码文件数")
+    parser.add_argument("--file-size", type=int, default=2000, help="每个代码文件的字节数")
+    parser.add_argument("--no-stream", action="store_true", help="关闭流式响应(ai.stream)")
+    parser.add_argument("--seed", type=int, default=0, help="错误注入随机种子")
+    parser.add_argument("--json", type=Path, default=None, help="把结果追加到JSON Lines文件")
+    options = parser.parse_args()
+
+    server = MockLLMServer(
+        latency=options.latency,
+        chunk_delay=options.chunk_delay,
+        rate_429=options.rate_429,
+        rate_500=options.rate_500,
+        retry_after=0.05,
+        file_count=options.files,
+        file_size=options.file_size,
+        seed=options.seed,
+    )
+    scenarios = {}
+    with server, tempfile.TemporaryDirectory() as tmpdir:
+        home = Path(tmpdir)
+        write_config(home, server.url, stream=not options.no_stream)
+        print(f"模拟端点: {server.url}")
+
+        if options.runs:
+            scenarios["new"] = bench_new(server, home, options.runs)
+            print_report("new", scenarios["new"])
+        if options.batch_size:
+            scenarios["batch"] = bench_batch(server, home, options.batch_size, options.concurrency)
+            print_report(f"batch (-j {options.concurrency})", scenarios["batch"])
+
+    if options.json is not None:
+        record = {
+            "revision": git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "options": {
+                k: (str(v) if isinstance(v, Path) else v) for k, v in vars(options).items()
+            },
+            "scenarios": scenarios,
+        }
+        with open(options.json, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"\n结果已追加到 {options.json}")
+
+    failed = sum(m["failed"] for m in scenarios.values())
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+CLI启动耗时基准
+
+使用 `python -X importtime` 在独立进程中运行常用子命令，统计导入耗时和
+进程总耗时，并检查轻量命令没有导入重量级模块(requests、AI服务、验证器等)。
+
+用法:
+    python scripts/benchmark_startup.py                 # 默认每个场景运行5次
+    python scripts/benchmark_startup.py -n 10 --top 15  # 运行10次，显示最慢的15个模块
+    python scripts/benchmark_startup.py --max-ms 200    # 导入耗时超过200ms时返回非零
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 场景名称 -> (CLI参数, 不允许导入的模块)
+SCENARIOS = {
+    "import": ([], ["requests", "opendemo.services.ai_service"]),
+    "search": (
+        ["search", "python"],
+        [
+            "requests",
+            "opendemo.services.ai_service",
+            "opendemo.core.demo_verifier",
+            "opendemo.core.quality_checker",
+            "rich.markdown",
+        ],
+    ),
+    "config get": (
+        ["config", "get", "ai.model"],
+        [
+            "requests",
+            "opendemo.services.ai_service",
+            "opendemo.core.demo_verifier",
+            "opendemo.core.quality_checker",
+            "rich.markdown",
+        ],
+    ),
+}
+
+
+def run_scenario(args: List[str], workdir: Path) -> Tuple[float, Dict[str, int]]:
+    """
+    在独立进程中运行CLI
+
+    Args:
+        args: CLI参数，为空时只导入 opendemo.cli
+        workdir: 工作目录(同时作为HOME，避免读取用户配置)
+
+    Returns:
+        (进程耗时毫秒, {模块名: 累计导入耗时微秒})
+    """
+    code = "from opendemo.cli import cli"
+    if args:
+        code += f"; cli({args!r}, standalone_mode=False)"
+
+    env = dict(os.environ)
+    env["HOME"] = str(workdir)
+    env["USERPROFILE"] = str(workdir)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"CLI exited with {result.returncode}:\n{result.stderr[-2000:]}")
+
+    return elapsed_ms, parse_importtime(result.stderr)
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """
+    解析 -X importtime 输出
+
+    Args:
+        output: 标准错误输出
+
+    Returns:
+        {模块名: 累计导入耗时微秒}
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        modules[parts[2].strip()] = int(parts[1].strip())
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI启动耗时基准")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="每个场景的运行次数")
+    parser.add_argument("--top", type=int, default=10, help="显示导入最慢的模块数")
+    parser.add_argument("--max-ms", type=float, default=None, help="opendemo.cli导入耗时上限(毫秒)")
+    options = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        for name, (args, forbidden) in SCENARIOS.items():
+            wall_times = []
+            import_times = []
+            modules: Dict[str, int] = {}
+            for _ in range(options.runs):
+                elapsed_ms, modules = run_scenario(args, workdir)
+                wall_times.append(elapsed_ms)
+                import_times.append(modules.get("opendemo.cli", 0) / 1000)
+
+            import_ms = statistics.median(import_times)
+            print(f"\n== {name} ==")
+            print(f"  进程耗时(中位数): {statistics.median(wall_times):.1f} ms")
+            print(f"  opendemo.cli 导入耗时(中位数): {import_ms:.1f} ms")
+
+            slowest = sorted(
+                ((m, t) for m, t in modules.items() if m.startswith(("opendemo", "rich", "click"))),
+                key=lambda item: -item[1],
+            )[: options.top]
+            for module, micros in slowest:
+                print(f"    {micros / 1000:8.1f} ms  {module}")
+
+            loaded = [module for module in forbidden if module in modules]
+            if loaded:
+                failed = True
+                print(f"  [X] 导入了不应加载的模块: {', '.join(loaded)}")
+            if options.max_ms is not None and import_ms > options.max_ms:
+                failed = True
+                print(f"  [X] 导入耗时超过上限 {options.max_ms:.0f} ms")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,33 @@
 批量生成 Demo 脚本
 
 用于批量生成 Go 和 Node.js 的核心概念 Demo
+每次 AI 调用的指标记录到 logs/ai_metrics_*.jsonl，结束时汇总为 ai_metrics_*.json
+每个主题的状态记录在 logs/generate_demos.journal.jsonl，中断后重新运行时跳过已生成的主题，
+使用 --fresh 重新生成全部主题
 """
 
+import argparse
+import os
 import subprocess
+import sys
 import time
 import json
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from opendemo.core.batch_journal import (  # noqa: E402
+    FAILED,
+    GENERATED,
+    IN_FLIGHT,
+    QUEUED,
+    BatchJournal,
+)
+
+# 任务日志中标识主题的字段
+JOURNAL_FIELDS = ("language", "topic", "difficulty")
+
 # Go 语言核心概念清单
 GO_DEMOS = [
     # 批次1：基础语法类
@@ -88,13 +107,22 @@ NODEJS_DEMOS = [
 class DemoGenerator:
     """批量 Demo 生成器"""
 
-    def __init__(self, log_dir="logs"):
+    def __init__(self, log_dir="logs", fresh=False):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self.journal = BatchJournal(
+            self.log_dir / "generate_demos.journal.jsonl", key_fields=JOURNAL_FIELDS
+        )
+        if fresh:
+            self.journal.reset()
         self.results = {
             "go": {"success": [], "failed": []},
             "nodejs": {"success": [], "failed": []},
         }
+        # 子进程中的 AIService 把调用指标追加到该文件
+        started = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.metrics_file = self.log_dir / f"ai_metrics_{started}.jsonl"
+        self.env = dict(os.environ, OPENDEMO_METRICS_FILE=str(self.metrics_file.resolve()))
 
     def generate_demo(self, language, topic, difficulty, retry=2, delay=3):
         """
@@ -120,7 +148,7 @@ class DemoGenerator:
                 print(f"{'='*60}")
 
                 result = subprocess.run(
-                    cmd, capture_output=True, text=True, timeout=600  # 10分钟超时
+                    cmd, capture_output=True, text=True, timeout=600, env=self.env  # 10分钟超时
                 )
 
                 if result.returncode == 0:
@@ -161,16 +189,28 @@ class DemoGenerator:
         print(f"总数: {len(demos)}")
         print(f"{'#'*60}\n")
 
-        for i, demo in enumerate(demos, 1):
+        entries = [dict(demo, language=language) for demo in demos]
+        for entry in self.journal.pending(entries):
+            self.journal.record(entry, QUEUED)
+
+        for i, (demo, entry) in enumerate(zip(demos, entries), 1):
             print(f"\n进度: {i}/{len(demos)}")
 
+            if self.journal.is_done(entry):
+                print(f"✓ 已生成，跳过: {language} - {demo['topic']}")
+                self.results[language]["success"].append(demo)
+                continue
+
+            self.journal.record(entry, IN_FLIGHT)
             success = self.generate_demo(
                 language=language, topic=demo["topic"], difficulty=demo["difficulty"]
             )
 
             if success:
+                self.journal.record(entry, GENERATED)
                 self.results[language]["success"].append(demo)
             else:
+                self.journal.record(entry, FAILED)
                 self.results[language]["failed"].append(demo)
 
             # 请求间隔，避免 API 限流
@@ -208,8 +248,18 @@ class DemoGenerator:
             json.dump(report, f, indent=2, ensure_ascii=False)
 
         print(f"\n报告已保存至: {report_file}")
+        self.save_metrics_report(timestamp)
         return report
 
+    def save_metrics_report(self, timestamp):
+        """汇总本次运行的 AI 调用指标(token、耗时、重试、解析失败)"""
+        from opendemo.services.metrics import AIMetrics
+
+        metrics_report = self.log_dir / f"ai_metrics_{timestamp}.json"
+        metrics = AIMetrics.load(self.metrics_file)
+        if metrics.write_report(metrics_report, {"timestamp": timestamp}):
+            print(f"AI 调用指标已保存至: {metrics_report}")
+
     def print_summary(self):
         """打印汇总信息"""
         print(f"\n{'='*60}")
@@ -236,7 +286,11 @@ class DemoGenerator:
 
 def main():
     """主函数"""
-    generator = DemoGenerator()
+    parser = argparse.ArgumentParser(description="批量生成 Go 和 Node.js Demo")
+    parser.add_argument("--fresh", action="store_true", help="忽略任务日志，重新生成全部主题")
+    args = parser.parse_args()
+
+    generator = DemoGenerator(fresh=args.fresh)
 
     print("=" * 60)
     print("批量生成 Go 和 Node.js Demo")
@@ -2,6 +2,7 @@
 Kubeflow Demo批量生成脚本
 
 根据设计文档批量生成35个Kubeflow Demo，使用CLI命令行方式
+每个Demo的状态记录在 logs/kubeflow_demos.journal.jsonl，中断后重新运行时跳过已生成的Demo
 """
 
 import sys
@@ -15,10 +16,14 @@ from datetime import datetime
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from opendemo.core.batch_journal import FAILED, GENERATED, IN_FLIGHT, BatchJournal
 from opendemo.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 任务日志
+JOURNAL_PATH = project_root / "logs" / "kubeflow_demos.journal.jsonl"
+
 
 # Kubeflow Demo定义
 KUBEFLOW_DEMOS = {
@@ -283,13 +288,18 @@ def generate_single_demo(demo_config: dict, retry: int = 2, delay: int = 5) -> b
     return False
 
 
-def generate_kubeflow_demos(phase: str = "all"):
+def generate_kubeflow_demos(phase: str = "all", fresh: bool = False):
     """
     生成Kubeflow Demo
     
     Args:
         phase: 生成阶段，可选值：phase1, phase2, phase3, all
+        fresh: 是否忽略任务日志，重新生成全部Demo
     """
+    journal = BatchJournal(JOURNAL_PATH, key_fields=("language", "topic", "difficulty"))
+    if fresh:
+        journal.reset()
+
     # 确定要生成的阶段
     if phase == "all":
         phases = ["phase1", "phase2", "phase3"]
@@ -317,12 +327,25 @@ def generate_kubeflow_demos(phase: str = "all"):
             logger.info(f"[{idx}/{len(demos)}] 生成Demo: {demo_name}")
             logger.info(f"  关键字: {' '.join(demo_config['keywords'])}")
             
+            entry = {
+                "language": "kubernetes",
+                "topic": " ".join(demo_config["keywords"]),
+                "difficulty": demo_config["difficulty"],
+            }
+            if journal.is_done(entry):
+                logger.info("✓ 已生成，跳过")
+                success_count += 1
+                continue
+
             # 生成Demo
+            journal.record(entry, IN_FLIGHT, name=demo_name)
             success = generate_single_demo(demo_config)
             
             if success:
+                journal.record(entry, GENERATED, name=demo_name)
                 success_count += 1
             else:
+                journal.record(entry, FAILED, name=demo_name)
                 failed_demos.append(demo_name)
             
             logger.info("")
@@ -389,6 +412,7 @@ if __name__ == "__main__":
         default="phase1",  # 默认从阶段一开始
         help="指定生成阶段（phase1: 核心组件, phase2: 训练和服务, phase3: 高级功能, all: 全部）",
     )
+    parser.add_argument("--fresh", action="store_true", help="忽略任务日志，重新生成全部Demo")
     
     args = parser.parse_args()
     
@@ -408,7 +432,7 @@ if __name__ == "__main__":
     
     logger.info("")
     
-    success, total, failed = generate_kubeflow_demos(args.phase)
+    success, total, failed = generate_kubeflow_demos(args.phase, fresh=args.fresh)
     
     # 退出码
     sys.exit(0 if len(failed) == 0 else 1)
@@ -6,6 +6,7 @@ KServe Demo 批量验证脚本
 
 import sys
 import json
+import argparse
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
@@ -15,7 +16,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from opendemo.services.config_service import ConfigService
-from opendemo.core.demo_verifier import DemoVerifier
+from opendemo.core.bulk_verifier import BulkVerifier
 from opendemo.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -45,21 +46,17 @@ def get_kserve_demos(kubeflow_path: Path) -> List[Path]:
     return sorted(kserve_demos)
 
 
-def verify_demo(verifier: DemoVerifier, demo_path: Path) -> Dict[str, Any]:
+def describe_demo(result: Dict[str, Any], demo_path: Path) -> Dict[str, Any]:
     """
-    验证单个 Demo
+    在验证结果中补充 Demo 信息和文件结构
     
     Args:
-        verifier: 验证器实例
+        result: 验证结果字典
         demo_path: Demo 路径
         
     Returns:
         验证结果字典
     """
-    logger.info(f"Verifying demo: {demo_path.name}")
-    
-    result = verifier.verify(demo_path, "kubernetes")
-    
     # 添加Demo信息
     result["demo_name"] = demo_path.name
     result["demo_path"] = str(demo_path)
@@ -260,13 +257,18 @@ def generate_markdown_report(summary: Dict[str, Any], results: List[Dict[str, An
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="KServe Demo 批量验证")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="并行验证数(默认为CPU核数)")
+    parser.add_argument("--timeout", type=float, default=None, help="单个Demo的验证超时(秒)")
+    args = parser.parse_args()
+
     logger.info("="*60)
     logger.info("KServe Demo 批量验证工具")
     logger.info("="*60)
     
     # 初始化服务
     config_service = ConfigService()
-    verifier = DemoVerifier(config_service)
+    bulk = BulkVerifier(config_service, workers=args.jobs, job_timeout=args.timeout)
     
     # 获取KServe Demo路径
     kubeflow_path = project_root / "opendemo_output" / "kubernetes" / "kubeflow"
@@ -276,18 +278,17 @@ def main():
         logger.error("No KServe demos found")
         sys.exit(1)
     
-    logger.info(f"Starting verification of {len(kserve_demos)} demos...")
+    logger.info(f"Starting verification of {len(kserve_demos)} demos ({bulk.workers} workers)...")
     logger.info("")
     
-    # 验证所有Demo
-    results = []
-    for idx, demo_path in enumerate(kserve_demos, 1):
-        logger.info(f"[{idx}/{len(kserve_demos)}] Verifying: {demo_path.name}")
-        
-        result = verify_demo(verifier, demo_path)
-        results.append(result)
+    # 并行验证所有Demo，按完成顺序输出
+    done = [0]
+
+    def report(result):
+        done[0] += 1
+        logger.info(f"[{done[0]}/{len(kserve_demos)}] Verified: {result['name']}")
         
-        status = "✅ 通过" if result.get("verified") else "❌ 失败"
+        status = "✅ 通过" if result.get("verified") else f"❌ {result['status']}"
         logger.info(f"  Result: {status}")
         
         if result.get("errors"):
@@ -299,6 +300,12 @@ def main():
                 logger.warning(f"    Warning: {warning}")
         
         logger.info("")
+
+    jobs = [{"path": str(p), "language": "kubernetes"} for p in kserve_demos]
+    results = [
+        describe_demo(result, demo_path)
+        for result, demo_path in zip(bulk.run(jobs, report), kserve_demos)
+    ]
     
     # 生成摘要
     summary = generate_summary(results)
@@ -3,6 +3,7 @@ KubeSkoop Demo 批量验证脚本
 """
 
 import sys
+import argparse
 from pathlib import Path
 
 # 添加项目根目录到路径
@@ -10,14 +11,20 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from opendemo.services.config_service import ConfigService
-from opendemo.core.demo_verifier import DemoVerifier
+from opendemo.core.bulk_verifier import BulkVerifier
 
 
-def verify_all_kubeskoop_demos():
-    """验证所有KubeSkoop Demo"""
+def verify_all_kubeskoop_demos(jobs=None, timeout=None):
+    """
+    并行验证所有KubeSkoop Demo
+
+    Args:
+        jobs: 并行验证数，None为CPU核数
+        timeout: 单个Demo的验证超时(秒)，None使用配置
+    """
     # 初始化服务
     config = ConfigService()
-    verifier = DemoVerifier(config)
+    bulk = BulkVerifier(config, workers=jobs, job_timeout=timeout)
 
     # KubeSkoop Demo 目录
     kubeskoop_dir = project_root / "opendemo_output" / "kubernetes" / "kubeskoop"
@@ -27,21 +34,19 @@ def verify_all_kubeskoop_demos():
         return
 
     # 获取所有Demo目录
-    demo_dirs = [d for d in kubeskoop_dir.iterdir() if d.is_dir()]
+    demo_dirs = sorted(d for d in kubeskoop_dir.iterdir() if d.is_dir())
 
     print(f"\n{'='*60}")
-    print(f"开始验证 {len(demo_dirs)} 个 KubeSkoop Demo")
+    print(f"开始验证 {len(demo_dirs)} 个 KubeSkoop Demo (并行数: {bulk.workers})")
     print(f"{'='*60}\n")
 
+    jobs = [{"path": str(d), "language": "kubernetes"} for d in demo_dirs]
     results = []
 
-    for demo_dir in sorted(demo_dirs):
+    for demo_dir, result in zip(demo_dirs, bulk.run(jobs)):
         print(f"\n[{len(results)+1}/{len(demo_dirs)}] 验证: {demo_dir.name}")
         print("-" * 60)
 
-        # 执行验证
-        result = verifier._verify_kubernetes(demo_dir)
-
         # 记录结果
         results.append(
             {
@@ -62,7 +67,7 @@ def verify_all_kubeskoop_demos():
             else:
                 print("✓ 完全验证通过")
         else:
-            print("✗ 验证失败")
+            print(f"✗ 验证失败 ({result['status']})")
 
         # 显示步骤
         steps = result.get("steps", [])
@@ -127,5 +132,9 @@ def verify_all_kubeskoop_demos():
 
 
 if __name__ == "__main__":
-    success = verify_all_kubeskoop_demos()
+    parser = argparse.ArgumentParser(description="KubeSkoop Demo 批量验证")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="并行验证数(默认为CPU核数)")
+    parser.add_argument("--timeout", type=float, default=None, help="单个Demo的验证超时(秒)")
+    args = parser.parse_args()
+    success = verify_all_kubeskoop_demos(args.jobs, args.timeout)
     sys.exit(0 if success else 1)
@@ -0,0 +1,249 @@
+"""
+AI提供方和路由单元测试
+"""
+
+import socket
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from opendemo.services.ai_providers import (
+    DEFAULT_LOCAL_ENDPOINT,
+    LocalProvider,
+    OpenAIProvider,
+    ProviderRouter,
+    StubProvider,
+    build_providers,
+)
+from opendemo.services.ai_service import AIService
+from opendemo.utils.mock_llm_server import MockLLMServer
+
+
+def _config(values):
+    config = Mock()
+    config.get.side_effect = lambda key, default=None: values.get(key, default)
+    return config
+
+
+def _unused_url():
+    """返回一个没有服务监听的端点"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/v1/chat/completions"
+
+
+class TestBuildProviders:
+    """提供方配置测试"""
+
+    def test_primary_from_legacy_keys(self):
+        """测试由 ai.api_key / ai.api_endpoint 构造主提供方"""
+        providers = build_providers(
+            _config({"ai.api_key": "key", "ai.api_endpoint": "https://api.example.com/v1"})
+        )
+
+        assert len(providers) == 1
+        assert isinstance(providers[0], OpenAIProvider)
+        assert providers[0].endpoint == "https://api.example.com/v1"
+        assert providers[0].headers()["Authorization"] == "Bearer key"
+
+    def test_openai_without_key_skipped(self):
+        """测试缺少密钥的openai提供方被忽略"""
+        assert build_providers(_config({})) == []
+
+    def test_backup_providers(self):
+        """测试备用提供方、默认端点和未知类型"""
+        providers = build_providers(
+            _config(
+                {
+                    "ai.provider": "local",
+                    "ai.providers": [
+                        {"type": "local", "api_endpoint": "http://gpu:8000/v1", "model": "m"},
+                        {"type": "unknown"},
+                        {"type": "stub"},
+                    ],
+                }
+            )
+        )
+
+        assert [p.name for p in providers] == ["local", "local-1", "stub"]
+        assert providers[0].endpoint == DEFAULT_LOCAL_ENDPOINT
+        assert "Authorization" not in providers[0].headers()
+        assert providers[1].model == "m"
+        assert isinstance(providers[2], StubProvider)
+
+    def test_stub_response(self):
+        """测试离线提供方返回OpenAI格式的响应"""
+        prompt = '为"logging"主题生成一个完整的、可执行的python demo'
+        data = {"messages": [{"role": "user", "content": prompt}]}
+
+        response = StubProvider("stub").send(None, data, 10)
+
+        assert response.status_code == 200
+        result = response.json()
+        assert "logging" in result["choices"][0]["message"]["content"]
+        assert result["usage"]["prompt_tokens"] > 0
+        response.close()
+
+
+class TestProviderRouter:
+    """路由测试"""
+
+    @pytest.fixture
+    def providers(self):
+        return [
+            OpenAIProvider("primary", "https://a.example.com", "key"),
+            LocalProvider("local"),
+            StubProvider("stub"),
+        ]
+
+    def test_routes_by_latency_with_fallback_last(self, providers):
+        """测试按耗时排序，未测量的优先，兜底提供方最后"""
+        router = ProviderRouter(providers)
+        assert [p.name for p in router.candidates()] == ["primary", "local", "stub"]
+
+        router.record_success(providers[0], 2.0)
+        assert [p.name for p in router.candidates()] == ["local", "primary", "stub"]
+
+        router.record_success(providers[1], 0.5)
+        assert [p.name for p in router.candidates()] == ["local", "primary", "stub"]
+
+    def test_failure_cooldown(self, providers):
+        """测试失败的提供方在冷却期内被跳过"""
+        now = [1000.0]
+        router = ProviderRouter(providers, cooldown=30, clock=lambda: now[0])
+
+        router.record_failure(providers[0])
+        assert [p.name for p in router.candidates()] == ["local", "stub"]
+        assert router.status()[0]["healthy"] is False
+
+        now[0] += 31
+        assert [p.name for p in router.candidates()] == ["primary", "local", "stub"]
+
+        router.record_success(providers[0], 0.1)
+        assert router.health(providers[0]).failures == 0
+
+    def test_all_unhealthy_returns_all(self, providers):
+        """测试全部熔断时按恢复时间返回全部提供方"""
+        now = [1000.0]
+        router = ProviderRouter(providers[:2], cooldown=30, clock=lambda: now[0])
+        router.record_failure(providers[1])
+        now[0] += 1
+        router.record_failure(providers[0])
+
+        assert [p.name for p in router.candidates()] == ["local", "primary"]
+
+    def test_state_shared_across_instances(self, providers, temp_dir):
+        """测试健康状态保存到文件并被新实例读取"""
+        path = temp_dir / "provider_health.json"
+        ProviderRouter(providers, state_path=path).record_success(providers[1], 0.25)
+
+        router = ProviderRouter(providers, state_path=path)
+
+        assert router.health(providers[1]).latency == 0.25
+
+
+class TestAIServiceFailover:
+    """AIService 提供方切换测试"""
+
+    @pytest.fixture(autouse=True)
+    def no_proxy(self, monkeypatch):
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+
+    def _service(self, **values):
+        values = {"ai.retry_interval": 0, "ai.stream": False, **values}
+        return AIService(_config(values))
+
+    def test_unreachable_primary_fails_over(self):
+        """测试主端点不可达时立即切换到备用提供方，之后不再尝试主端点"""
+        with MockLLMServer(file_count=1) as backup:
+            ai_service = self._service(
+                **{
+                    "ai.api_key": "key",
+                    "ai.api_endpoint": _unused_url(),
+                    "ai.providers": [{"type": "local", "api_endpoint": backup.url}],
+                }
+            )
+
+            with patch("time.sleep") as mock_sleep:
+                assert ai_service.generate_demo("python", "logging") is not None
+                assert ai_service.generate_demo("python", "threading") is not None
+
+            mock_sleep.assert_not_called()
+            assert backup.stats["requests"] == 2
+        assert [p.name for p in ai_service.router.candidates()] == ["local"]
+
+    def test_server_error_fails_over(self):
+        """测试主端点返回500时切换到备用提供方"""
+        with MockLLMServer(rate_500=1.0) as primary, MockLLMServer(file_count=1) as backup:
+            ai_service = self._service(
+                **{
+                    "ai.api_key": "key",
+                    "ai.api_endpoint": primary.url,
+                    "ai.providers": [{"type": "local", "api_endpoint": backup.url}],
+                }
+            )
+
+            assert ai_service.generate_demo("python", "logging") is not None
+
+            assert primary.stats["500"] == 1
+            assert backup.stats["200"] == 1
+
+    def test_offline_stub_provider(self):
+        """测试只配置离线提供方时无需密钥和网络"""
+        ai_service = self._service(**{"ai.provider": "stub"})
+
+        with patch("requests.Session.post") as mock_post:
+            demo = ai_service.generate_demo("python", "logging")
+            classification = ai_service.classify_keyword("python", "numpy")
+
+        mock_post.assert_not_called()
+        assert demo["metadata"]["language"] == "python"
+        assert classification["is_library"] is False
+
+    def test_fallback_response_not_cached(self, temp_dir):
+        """测试兜底提供方返回的占位内容不写入缓存"""
+        ai_service = self._service(
+            **{
+                "ai.api_key": "key",
+                "ai.api_endpoint": _unused_url(),
+                "ai.providers": [{"type": "stub"}],
+                "cache_directory": str(temp_dir),
+            }
+        )
+
+        with patch("time.sleep"):
+            assert ai_service.generate_demo("python", "logging") is not None
+            assert ai_service.classify_keyword("python", "numpy")["is_library"] is False
+
+        prompt = ai_service._build_prompt("python", "logging", "beginner")
+        cache_key = ai_service._cache_key("generate", ai_service._generation_request(prompt))
+        assert ai_service.response_cache.get(cache_key) is None
+        assert not list((temp_dir / "ai_responses").rglob("*.json"))
+
+    def test_total_timeout_stops_retries(self):
+        """测试超过总时间上限后不再重试"""
+        ai_service = self._service(
+            **{"ai.api_key": "key", "ai.retry_interval": 5, "ai.total_timeout": 1}
+        )
+
+        with patch("requests.Session.post", side_effect=requests.Timeout("timeout")) as mock_post:
+            with patch("time.sleep") as mock_sleep:
+                assert ai_service.generate_demo("python", "logging") is None
+
+        assert mock_post.call_count == 1
+        mock_sleep.assert_not_called()
+
+    def test_connect_timeout(self):
+        """测试连接超时和读取超时分别传递"""
+        ai_service = self._service(
+            **{"ai.api_key": "key", "ai.timeout": 60, "ai.connect_timeout": 3}
+        )
+
+        with patch("requests.Session.post") as mock_post:
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.json.return_value = {
+                "choices": [{"message": {"content": "{}"}}]
+            }
+            ai_service._call_api("prompt")
+
+        assert mock_post.call_args.kwargs["timeout"] == (3.0, 60)
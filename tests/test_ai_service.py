@@ -2,12 +2,15 @@
 AIService 单元测试
 """
 
+import asyncio
 import pytest
 import json
 import time
+import threading
 import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock, patch, MagicMock
-from opendemo.services.ai_service import AIService
+from opendemo.services.ai_service import AIService, AsyncAIService
 
 
 class TestAIServiceInit:
@@ -71,7 +74,7 @@ class TestAIServiceAPI:
         ai_service = AIService(mock_config)
         ai_service._load_config()
         
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = Mock(
                 status_code=200,
                 json=lambda: mock_ai_response
@@ -87,7 +90,7 @@ class TestAIServiceAPI:
         ai_service = AIService(mock_config)
         ai_service._load_config()
         
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.side_effect = requests.Timeout("Request timeout")
             
             with pytest.raises(requests.Timeout):
@@ -98,7 +101,7 @@ class TestAIServiceAPI:
         ai_service = AIService(mock_config)
         ai_service._load_config()
         
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_response = Mock()
             mock_response.raise_for_status.side_effect = requests.HTTPError("404")
             mock_post.return_value = mock_response
@@ -107,6 +110,281 @@ class TestAIServiceAPI:
                 ai_service._call_api("test prompt")
 
 
+class _ChatStubHandler(BaseHTTPRequestHandler):
+    """返回固定聊天补全结果的HTTP/1.1处理器，记录连接数"""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        content = json.dumps({"is_library": True, "confidence": 0.9, "library_name": "numpy"})
+        body = json.dumps({"choices": [{"message": {"content": content}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAIServiceSession:
+    """HTTP连接池测试"""
+
+    @pytest.fixture
+    def stub_endpoint(self, monkeypatch):
+        """启动本地API桩服务"""
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        _ChatStubHandler.connections = 0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatStubHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        server.shutdown()
+        server.server_close()
+
+    def _service(self, endpoint, keep_alive=True):
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: {
+            "ai.api_key": "test-key",
+            "ai.api_endpoint": endpoint,
+            "ai.keep_alive": keep_alive,
+        }.get(key, default)
+        return AIService(config)
+
+    def test_calls_reuse_one_connection(self, stub_endpoint):
+        """测试分类和生成请求复用同一连接"""
+        ai_service = self._service(stub_endpoint)
+
+        assert ai_service.classify_keyword("python", "numpy")["is_library"] is True
+        assert ai_service._call_api("test prompt") is not None
+        assert ai_service._call_api("test prompt") is not None
+        ai_service.close()
+
+        assert _ChatStubHandler.connections == 1
+
+    def test_keep_alive_disabled(self, stub_endpoint):
+        """测试关闭keep-alive时每次请求新建连接"""
+        ai_service = self._service(stub_endpoint, keep_alive=False)
+
+        ai_service.classify_keyword("python", "numpy")
+        ai_service._call_api("test prompt")
+        ai_service.close()
+
+        assert _ChatStubHandler.connections == 2
+
+
+_STREAM_DEMO = {
+    "metadata": {"name": "stream-demo", "folder_name": "stream-demo", "keywords": ["流式"]},
+    "files": [
+        {"path": "main.py", "content": "print('{第一个文件}')\n"},
+        {"path": "README.md", "content": "# 流式 \"demo\"\n"},
+    ],
+}
+
+
+class _SSEStubHandler(BaseHTTPRequestHandler):
+    """以SSE分块返回demo JSON的处理器，第一个文件发送后等待 release 再发送其余部分"""
+
+    protocol_version = "HTTP/1.1"
+    release = threading.Event()
+    timed_out = False
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+        text = json.dumps(_STREAM_DEMO, ensure_ascii=False)
+        split = text.index('{"path": "README.md"')
+
+        if not request.get("stream"):
+            body = json.dumps({"choices": [{"message": {"content": text}}]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._send_events(text[:split])
+        type(self).timed_out = not type(self).release.wait(5)
+        self._send_events(text[split:])
+        self._send_chunk(b"data: [DONE]\n\n")
+        self._send_chunk(b"")
+
+    def _send_events(self, text):
+        # 每段7个字符，模拟逐token到达
+        for i in range(0, len(text), 7):
+            event = {"choices": [{"delta": {"content": text[i : i + 7]}}]}
+            self._send_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+
+    def _send_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAIServiceStreaming:
+    """流式生成测试"""
+
+    @pytest.fixture
+    def sse_endpoint(self, monkeypatch):
+        """启动本地SSE桩服务"""
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        _SSEStubHandler.release = threading.Event()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _SSEStubHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        _SSEStubHandler.release.set()
+        server.shutdown()
+        server.server_close()
+
+    def _service(self, endpoint, stream=True):
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: {
+            "ai.api_key": "test-key",
+            "ai.api_endpoint": endpoint,
+            "ai.stream": stream,
+        }.get(key, default)
+        return AIService(config)
+
+    def test_files_reported_before_response_ends(self, sse_endpoint):
+        """测试第一个文件在响应结束前即回调"""
+        events = []
+
+        def on_stream(event, value):
+            events.append((event, value, _SSEStubHandler.release.is_set()))
+            if event == "file":
+                _SSEStubHandler.release.set()
+
+        result = self._service(sse_endpoint).generate_demo("python", "stream", on_stream=on_stream)
+
+        assert [e[0] for e in events] == ["metadata", "file", "file"]
+        assert events[0][1]["language"] == "python"
+        # 第一个文件回调时服务端仍在等待，尚未发送其余内容
+        assert events[1][1] == _STREAM_DEMO["files"][0]
+        assert events[1][2] is False
+        assert _SSEStubHandler.timed_out is False
+        assert events[2][1]["content"] == "# 流式 \"demo\"\n"
+        assert result["files"] == _STREAM_DEMO["files"]
+
+    def test_stream_disabled_uses_single_response(self, sse_endpoint):
+        """测试关闭 ai.stream 时不发送流式请求"""
+        on_stream = Mock()
+
+        result = self._service(sse_endpoint, stream=False).generate_demo(
+            "python", "stream", on_stream=on_stream
+        )
+
+        on_stream.assert_not_called()
+        assert result["metadata"]["name"] == "stream-demo"
+
+    def test_non_streaming_endpoint(self, mock_config):
+        """测试端点不支持流式时整体解析"""
+        ai_service = AIService(mock_config)
+        ai_service._load_config()
+        content = json.dumps(_STREAM_DEMO)
+
+        with patch("requests.Session.post") as mock_post:
+            mock_post.return_value.headers = {"Content-Type": "application/json"}
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.json.return_value = {
+                "choices": [{"message": {"content": content}}]
+            }
+            events = []
+            response = ai_service._stream_api(
+                "prompt", "python", "stream", lambda *e: events.append(e[0])
+            )
+
+        assert response["files"] == _STREAM_DEMO["files"]
+        assert response["metadata"]["name"] == "stream-demo"
+        assert events == ["metadata", "file", "file"]
+        assert mock_post.call_args.kwargs["stream"] is True
+
+    def test_streamed_demo_cached(self, sse_endpoint, temp_dir):
+        """测试流式组装的demo数据写入缓存，再次生成时直接命中"""
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: {
+            "ai.api_key": "test-key",
+            "ai.api_endpoint": sse_endpoint,
+            "cache_directory": str(temp_dir),
+        }.get(key, default)
+        ai_service = AIService(config)
+        _SSEStubHandler.release.set()
+
+        first = ai_service.generate_demo("python", "stream", on_stream=lambda *e: None)
+        with patch("requests.Session.post") as mock_post:
+            second = ai_service.generate_demo("python", "stream", on_stream=lambda *e: None)
+
+        mock_post.assert_not_called()
+        assert second == first
+        assert second["files"] == _STREAM_DEMO["files"]
+
+    def test_incomplete_stream_fails(self, mock_config):
+        """测试流式响应不完整时返回None"""
+        ai_service = AIService(mock_config)
+        ai_service._load_config()
+        content = json.dumps(_STREAM_DEMO)[:-20]
+
+        with patch("requests.Session.post") as mock_post:
+            mock_post.return_value.headers = {"Content-Type": "application/json"}
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.json.return_value = {
+                "choices": [{"message": {"content": content}}]
+            }
+            response = ai_service._stream_api("prompt", "python", "stream", Mock())
+
+        assert response is None
+
+
+class TestAsyncAIService:
+    """AsyncAIService 测试"""
+
+    def test_generate_demo(self, mock_config, mock_ai_response):
+        """测试异步生成复用同步服务的请求和解析"""
+        ai_service = AIService(mock_config)
+        content = mock_ai_response["choices"][0]["message"]["content"]
+        async_ai = AsyncAIService(ai_service, max_workers=2)
+
+        with patch.object(ai_service, "_call_api", return_value=content) as mock_call:
+            result = asyncio.run(async_ai.generate_demo("python", "logging"))
+        async_ai.close()
+
+        assert result["metadata"]["name"] == "ai-generated-demo"
+        mock_call.assert_called_once()
+
+    def test_generate_demo_retry(self, mock_config, mock_ai_response):
+        """测试失败后异步等待并重试"""
+        ai_service = AIService(mock_config)
+        content = mock_ai_response["choices"][0]["message"]["content"]
+        async_ai = AsyncAIService(ai_service)
+
+        async def no_sleep(seconds):
+            pass
+
+        with patch.object(
+            ai_service, "_call_api", side_effect=[requests.Timeout("timeout"), content]
+        ), patch("asyncio.sleep", side_effect=no_sleep) as mock_sleep:
+            result = asyncio.run(async_ai.generate_demo("python", "logging"))
+        async_ai.close()
+
+        assert result is not None
+        # 首次重试等待为基础间隔的后一半区间内的随机值
+        delay = mock_sleep.call_args[0][0]
+        assert 2.5 <= delay <= 5
+
+
 class TestAIServiceParsing:
     """响应解析测试"""
 
@@ -245,6 +523,22 @@ class TestAIServiceGenerate:
                 
                 assert result is None
 
+    def test_generation_steps_protocol(self, mock_config):
+        """测试同步和异步共用的生成流程: 请求异常后等待重试，成功后返回demo"""
+        ai_service = AIService(mock_config)
+        ai_service._load_config()
+        response = json.dumps({"metadata": {"name": "test", "language": "python"}, "files": []})
+
+        steps = ai_service._generation_steps("prompt", "python", "test", use_cache=False)
+
+        assert next(steps) == ("call", 0)
+        step, delay = steps.throw(Exception("API Error"))
+        assert step == "sleep" and delay >= 0
+        assert next(steps) == ("call", 1)
+        with pytest.raises(StopIteration) as done:
+            steps.send((response, None))
+        assert done.value.value["metadata"]["name"] == "test"
+
 
 class TestAIServiceLibraryDetection:
     """库检测功能测试"""
@@ -270,7 +564,7 @@ class TestAIServiceLibraryDetection:
         """测试识别为主题"""
         ai_service = AIService(mock_config)
         
-        # Mock requests.post返回响应
+        # Mock Session.post返回响应
         mock_response = Mock()
         mock_response.json.return_value = {
             "choices": [{
@@ -285,7 +579,7 @@ class TestAIServiceLibraryDetection:
             }]
         }
         
-        with patch("requests.post", return_value=mock_response):
+        with patch("requests.Session.post", return_value=mock_response):
             result = ai_service.classify_keyword("python", "logging")
             
             assert result["is_library"] is False
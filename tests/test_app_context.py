@@ -0,0 +1,78 @@
+"""
+AppContext 单元测试
+"""
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from opendemo.services.app_context import AppContext
+from opendemo.services.config_service import ConfigService
+from opendemo.services.storage_service import StorageService
+
+
+class TestAppContext:
+    """AppContext 测试"""
+
+    def test_services_are_memoized(self, mock_config):
+        """测试服务只创建一次"""
+        config_factory = Mock(return_value=mock_config)
+        storage_factory = Mock()
+        repository_factory = Mock()
+        app = AppContext(config_factory, storage_factory, repository_factory)
+
+        assert app.repository is app.repository
+        assert app.search is app.search
+        assert app.search.repository is app.repository
+
+        config_factory.assert_called_once_with()
+        storage_factory.assert_called_once_with(mock_config)
+        repository_factory.assert_called_once_with(storage_factory.return_value, mock_config)
+
+    def test_heavy_services_created_on_demand(self, mock_config):
+        """测试AI服务和生成器在访问时才创建"""
+        app = AppContext(lambda: mock_config, Mock(), Mock())
+
+        with patch("opendemo.services.ai_service.AIService") as mock_ai_cls:
+            assert app._ai_service is None
+            generator = app.generator
+            assert app.generator is generator
+            mock_ai_cls.assert_called_once_with(mock_config)
+            assert generator.ai_service is mock_ai_cls.return_value
+
+    def test_reset(self, mock_config):
+        """测试重置后重新创建服务"""
+        config_factory = Mock(side_effect=[mock_config, Mock()])
+        app = AppContext(config_factory, Mock(), Mock())
+
+        first = app.config
+        app.reset()
+        assert app.config is not first
+
+
+class TestRedundantSyscalls:
+    """重复系统调用测试"""
+
+    def test_ensure_user_dirs_once_per_home(self, temp_dir):
+        """测试同一HOME只创建一次用户目录"""
+        with patch("pathlib.Path.home", return_value=temp_dir):
+            ConfigService()
+            assert (temp_dir / ".opendemo" / "demos").is_dir()
+
+            with patch.object(Path, "mkdir") as mock_mkdir:
+                ConfigService()
+            mock_mkdir.assert_not_called()
+
+    def test_output_directory_cached(self, mock_config, temp_dir):
+        """测试输出目录只创建一次，配置变化后重新解析"""
+        values = {"output_directory": str(temp_dir / "out")}
+        mock_config.get.side_effect = lambda key, default=None: values.get(key, default)
+        storage = StorageService(mock_config)
+
+        first = storage.get_output_directory()
+        with patch.object(Path, "mkdir") as mock_mkdir:
+            assert storage.get_output_directory() == first
+        mock_mkdir.assert_not_called()
+
+        values["output_directory"] = str(temp_dir / "other")
+        assert storage.get_output_directory() == temp_dir / "other"
+        assert (temp_dir / "other").is_dir()
@@ -0,0 +1,184 @@
+"""
+BatchGenerator 单元测试
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+from opendemo.core.batch_generator import BatchGenerator, load_manifest
+from opendemo.core.batch_journal import FAILED, GENERATED, BatchJournal
+
+
+class _FakeAsyncAI:
+    """记录并发数的异步AI服务"""
+
+    def __init__(self, fail_topics=()):
+        self.fail_topics = set(fail_topics)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_demo(self, language, topic, difficulty="beginner", use_cache=True):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if topic in self.fail_topics:
+            return None
+        return {"metadata": {"name": topic}, "files": []}
+
+
+def _generator():
+    generator = Mock()
+    generator.save_generated.side_effect = lambda data, language, topic, **kwargs: {
+        "path": f"/output/{language}/{topic}"
+    }
+    return generator
+
+
+class TestLoadManifest:
+    """清单读取测试"""
+
+    def test_yaml_with_defaults(self, temp_dir):
+        """测试YAML清单和默认值"""
+        manifest = temp_dir / "topics.yaml"
+        manifest.write_text(
+            "language: go\n"
+            "difficulty: intermediate\n"
+            "demos:\n"
+            "  - goroutines\n"
+            "  - {topic: select, difficulty: advanced}\n"
+            "  - {topic: flask, language: python, library: flask}\n",
+            encoding="utf-8",
+        )
+
+        entries = load_manifest(manifest)
+
+        assert [(e["language"], e["topic"], e["difficulty"]) for e in entries] == [
+            ("go", "goroutines", "intermediate"),
+            ("go", "select", "advanced"),
+            ("python", "flask", "intermediate"),
+        ]
+        assert entries[2]["library"] == "flask"
+
+    def test_json_list_skips_invalid(self, temp_dir):
+        """测试JSON列表跳过缺少语言或主题的条目"""
+        manifest = temp_dir / "topics.json"
+        manifest.write_text(
+            json.dumps([{"topic": "closures"}, {"language": "nodejs"}, 42]), encoding="utf-8"
+        )
+
+        entries = load_manifest(manifest, default_language="NodeJS")
+        assert [(e["language"], e["topic"]) for e in entries] == [("nodejs", "closures")]
+
+    def test_invalid_file(self, temp_dir):
+        """测试无法解析的清单"""
+        manifest = temp_dir / "topics.json"
+        manifest.write_text("{not json", encoding="utf-8")
+        assert load_manifest(manifest) == []
+
+
+class TestBatchGenerator:
+    """批量生成测试"""
+
+    def test_concurrency_cap(self):
+        """测试并发数不超过上限且结果保持清单顺序"""
+        ai = _FakeAsyncAI()
+        entries = [{"language": "go", "topic": f"topic-{i}"} for i in range(10)]
+
+        results = BatchGenerator(ai, _generator(), concurrency=3).run(entries)
+
+        assert ai.max_in_flight == 3
+        assert [r["path"] for r in results] == [f"/output/go/topic-{i}" for i in range(10)]
+        assert all(r["success"] for r in results)
+
+    def test_failures_reported(self):
+        """测试AI生成失败和保存失败"""
+        ai = _FakeAsyncAI(fail_topics={"bad"})
+        generator = _generator()
+        generator.save_generated.side_effect = [None]
+        entries = [{"language": "go", "topic": "bad"}, {"language": "go", "topic": "unsaved"}]
+        reported = []
+
+        results = BatchGenerator(ai, generator, concurrency=2).run(entries, reported.append)
+
+        assert [r["error"] for r in results] == ["AI生成失败", "保存demo失败"]
+        assert len(reported) == 2
+
+    def test_entry_options_passed_to_generator(self):
+        """测试条目的库名和文件夹名传给生成器"""
+        generator = _generator()
+        entries = [{"language": "python", "topic": "arrays", "library": "numpy"}]
+
+        BatchGenerator(_FakeAsyncAI(), generator).run(entries)
+
+        kwargs = generator.save_generated.call_args[1]
+        assert kwargs["library_name"] == "numpy"
+        assert kwargs["custom_folder_name"] is None
+
+    def test_duplicate_entries_coalesced(self):
+        """测试清单中重复的条目只生成和写入一次"""
+        ai = _FakeAsyncAI()
+        ai.calls = []
+        original = ai.generate_demo
+
+        async def generate_demo(language, topic, difficulty="beginner", use_cache=True):
+            ai.calls.append(topic)
+            return await original(language, topic, difficulty)
+
+        ai.generate_demo = generate_demo
+        generator = _generator()
+        entries = [
+            {"language": "go", "topic": "channels"},
+            {"language": "go", "topic": "channels"},
+            {"language": "go", "topic": "channels", "difficulty": "advanced"},
+        ]
+        reported = []
+
+        results = BatchGenerator(ai, generator, concurrency=4).run(entries, reported.append)
+
+        assert sorted(ai.calls) == ["channels", "channels"]
+        assert generator.save_generated.call_count == 2
+        assert all(r["success"] for r in results)
+        assert [r["entry"] for r in results] == entries
+        assert len(reported) == 3
+
+    def test_resume_from_journal(self, temp_dir):
+        """测试重新运行时跳过已生成的条目，只重新生成失败的条目"""
+        journal_path = temp_dir / "topics.journal.jsonl"
+        entries = [{"language": "go", "topic": t} for t in ("maps", "select", "defer")]
+
+        first = BatchGenerator(
+            _FakeAsyncAI(fail_topics={"select"}),
+            _generator(),
+            journal=BatchJournal(journal_path),
+        ).run(entries)
+        assert [r["success"] for r in first] == [True, False, True]
+
+        ai = _FakeAsyncAI()
+        ai.generate_demo = Mock(wraps=ai.generate_demo)
+        journal = BatchJournal(journal_path)
+        second = BatchGenerator(ai, _generator(), journal=journal).run(entries)
+
+        assert [r["success"] for r in second] == [True, True, True]
+        assert [r.get("skipped", False) for r in second] == [True, False, True]
+        assert second[0]["path"] == "/output/go/maps"
+        ai.generate_demo.assert_called_once_with("go", "select", "beginner", use_cache=True)
+        assert journal.counts() == {GENERATED: 3}
+        assert journal.get(entries[1])["attempt"] == 2
+
+    def test_failed_verification_bypasses_cache(self, temp_dir):
+        """测试生成后验证未通过的条目重新生成时不使用缓存的响应"""
+        journal = BatchJournal(temp_dir / "topics.journal.jsonl")
+        entries = [{"language": "go", "topic": t} for t in ("maps", "select")]
+        journal.record(entries[0], FAILED, error="AI生成失败")
+        journal.record(entries[1], FAILED, error="验证未通过: x", verification_failed=True)
+        ai = _FakeAsyncAI(fail_topics={"select"})
+        ai.generate_demo = Mock(wraps=ai.generate_demo)
+
+        BatchGenerator(ai, _generator(), journal=journal).run(entries)
+
+        calls = {c.args[1]: c.kwargs["use_cache"] for c in ai.generate_demo.call_args_list}
+        assert calls == {"maps": True, "select": False}
+        # 重新生成再次失败时保留标记，下次运行仍然重新请求
+        assert BatchJournal(temp_dir / "topics.journal.jsonl").needs_fresh_response(entries[1])
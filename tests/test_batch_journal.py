@@ -0,0 +1,98 @@
+"""
+BatchJournal 单元测试
+"""
+
+import json
+from opendemo.core.batch_journal import (
+    FAILED,
+    GENERATED,
+    IN_FLIGHT,
+    QUEUED,
+    VERIFIED,
+    BatchJournal,
+)
+
+
+ENTRY = {"language": "go", "topic": "channels", "difficulty": "beginner"}
+
+
+class TestBatchJournal:
+    """任务日志测试"""
+
+    def test_latest_state_replayed(self, temp_dir):
+        """测试重新打开日志时得到每个条目的最新状态"""
+        path = temp_dir / "journal.jsonl"
+        journal = BatchJournal(path)
+        journal.record(ENTRY, QUEUED)
+        journal.record(ENTRY, IN_FLIGHT)
+        journal.record(ENTRY, GENERATED, path="/output/go/channels")
+
+        reopened = BatchJournal(path)
+
+        assert reopened.state(ENTRY) == GENERATED
+        assert reopened.get(ENTRY)["path"] == "/output/go/channels"
+        assert reopened.is_done(ENTRY) is True
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+    def test_pending_excludes_done(self, temp_dir):
+        """测试已生成和已验证的条目不再待处理"""
+        journal = BatchJournal(temp_dir / "journal.jsonl")
+        entries = [dict(ENTRY, topic=t) for t in ("a", "b", "c", "d", "e")]
+        journal.record(entries[0], GENERATED)
+        journal.record(entries[1], VERIFIED)
+        journal.record(entries[2], FAILED, error="AI生成失败")
+        journal.record(entries[3], IN_FLIGHT)
+
+        assert journal.pending(entries) == entries[2:]
+        assert journal.counts() == {GENERATED: 1, VERIFIED: 1, FAILED: 1, IN_FLIGHT: 1}
+
+    def test_attempts_counted_across_runs(self, temp_dir):
+        """测试生成次数跨运行累计"""
+        path = temp_dir / "journal.jsonl"
+        BatchJournal(path).record(ENTRY, IN_FLIGHT)
+
+        record = BatchJournal(path).record(ENTRY, IN_FLIGHT)
+
+        assert record["attempt"] == 2
+
+    def test_truncated_line_ignored(self, temp_dir):
+        """测试忽略中断时写了一半的行"""
+        path = temp_dir / "journal.jsonl"
+        BatchJournal(path).record(ENTRY, GENERATED)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"key": "go|channels|beginner||", "sta')
+
+        assert BatchJournal(path).state(ENTRY) == GENERATED
+
+    def test_key_fields(self, temp_dir):
+        """测试只用指定字段标识条目"""
+        journal = BatchJournal(temp_dir / "journal.jsonl", key_fields=("language", "topic"))
+        journal.record(dict(ENTRY, desc="说明"), GENERATED)
+
+        assert journal.is_done({"language": "go", "topic": "channels"})
+        record = json.loads((temp_dir / "journal.jsonl").read_text(encoding="utf-8"))
+        assert record["entry"] == {"language": "go", "topic": "channels"}
+
+    def test_reset(self, temp_dir):
+        """测试清空日志"""
+        path = temp_dir / "journal.jsonl"
+        journal = BatchJournal(path)
+        journal.record(ENTRY, GENERATED)
+
+        journal.reset()
+
+        assert journal.state(ENTRY) is None
+        assert not path.exists()
+
+    def test_verification_failure_kept_until_regenerated(self, temp_dir):
+        """测试验证未通过的标记在重新生成成功前一直保留"""
+        journal = BatchJournal(temp_dir / "journal.jsonl")
+        journal.record(ENTRY, GENERATED, path="/output/go/channels")
+        journal.record(ENTRY, FAILED, error="验证未通过", verification_failed=True)
+        journal.record(ENTRY, QUEUED)
+        journal.record(ENTRY, IN_FLIGHT)
+
+        assert BatchJournal(temp_dir / "journal.jsonl").needs_fresh_response(ENTRY)
+
+        journal.record(ENTRY, GENERATED, path="/output/go/channels")
+        assert not journal.needs_fresh_response(ENTRY)
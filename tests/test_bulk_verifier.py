@@ -0,0 +1,128 @@
+"""
+BulkVerifier 单元测试
+"""
+
+import json
+import sys
+import time
+from unittest.mock import patch
+from opendemo.core.bulk_verifier import BulkVerifier, StaticConfig
+from opendemo.core.demo_repository import Demo, DemoRepository
+
+
+CONFIGMAP_YAML = """apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: demo
+data:
+  key: value
+"""
+
+
+def _k8s_demo(root, name, yaml_text=CONFIGMAP_YAML):
+    demo_dir = root / name
+    demo_dir.mkdir()
+    (demo_dir / "configmap.yaml").write_text(yaml_text, encoding="utf-8")
+    return demo_dir
+
+
+class TestBulkVerifier:
+    """并行批量验证测试"""
+
+    def test_results_in_job_order(self, temp_dir):
+        """测试在工作进程中验证，结果按任务顺序返回"""
+        jobs = [
+            {"path": str(_k8s_demo(temp_dir, "good")), "language": "kubernetes"},
+            {"path": str(_k8s_demo(temp_dir, "bad", "a: [1,")), "language": "kubernetes"},
+            {"path": str(temp_dir / "good"), "language": "cobol", "name": "unsupported"},
+        ]
+        finished = []
+
+        results = BulkVerifier(StaticConfig({}), workers=3).run(jobs, finished.append)
+
+        assert [r["name"] for r in results] == ["good", "bad", "unsupported"]
+        assert results[0]["verified"] is True
+        assert results[0]["status"] in ("verified", "partial")
+        assert [r["status"] for r in results[1:]] == ["failed", "skipped"]
+        assert len(finished) == 3
+        assert all(r["elapsed"] > 0 for r in results)
+
+    def test_job_timeout_kills_worker(self, temp_dir):
+        """测试超时的任务被终止并记为timeout，不影响其他任务"""
+        bulk = BulkVerifier(StaticConfig({}), workers=2, job_timeout=0.5)
+        slow = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+        start = time.perf_counter()
+        with patch.object(BulkVerifier, "_worker_command", return_value=slow):
+            results = bulk.run([{"path": str(temp_dir), "language": "go"}] * 2)
+
+        assert time.perf_counter() - start < 10
+        assert [r["status"] for r in results] == ["timeout", "timeout"]
+        assert "timed out" in results[0]["errors"][0]
+
+    def test_worker_crash_reported(self, temp_dir):
+        """测试工作进程没有输出结果时记为error"""
+        crash = [sys.executable, "-c", "import sys; sys.exit('boom')"]
+
+        with patch.object(BulkVerifier, "_worker_command", return_value=crash):
+            result = BulkVerifier(StaticConfig({}), workers=1).run(
+                [{"path": str(temp_dir), "language": "go"}]
+            )[0]
+
+        assert result["status"] == "error"
+        assert "boom" in result["errors"][0]
+
+    def test_defaults_from_config(self, mock_config):
+        """测试并行数和超时默认取配置"""
+        mock_config.get.side_effect = lambda key, default=None: {
+            "verification_workers": 3,
+            "verification_job_timeout": 60,
+        }.get(key, default)
+
+        bulk = BulkVerifier(mock_config)
+
+        assert bulk.workers == 3
+        assert bulk.job_timeout == 60.0
+        assert bulk._worker_config()["enable_verification"] is True
+
+    def test_summary_and_report(self, temp_dir):
+        """测试汇总和JSON报告"""
+        results = [
+            {"status": "verified", "verified": True, "language": "go", "elapsed": 1.0},
+            {"status": "partial", "verified": True, "language": "kubernetes", "elapsed": 2.0},
+            {"status": "timeout", "verified": False, "language": "go", "elapsed": 3.0},
+            {"status": "skipped", "verified": False, "language": "rust", "elapsed": 0.5},
+        ]
+        bulk = BulkVerifier(StaticConfig({}), workers=2)
+
+        summary = bulk.summarize(results)
+        assert bulk.write_report(temp_dir / "logs" / "report.json", results)
+
+        assert summary["passed"] == 2
+        assert summary["timeout"] == 1
+        assert summary["skipped"] == 1
+        assert summary["by_language"]["go"] == {"total": 2, "passed": 1}
+        assert summary["cpu_seconds"] == 6.5
+        report = json.loads((temp_dir / "logs" / "report.json").read_text(encoding="utf-8"))
+        assert report["workers"] == 2
+        assert report["summary"] == summary
+        assert len(report["results"]) == 4
+
+
+class TestUpdateMetadataMany:
+    """批量更新元数据测试"""
+
+    def test_unchanged_demos_not_written(self, temp_dir, mock_config):
+        """测试只写入值有变化的demo"""
+        demos = []
+        for name, verified in (("a", False), ("b", True)):
+            demo_dir = temp_dir / name
+            demo_dir.mkdir()
+            demos.append(Demo(demo_dir, {"name": name, "verified": verified}))
+        repository = DemoRepository(None, mock_config)
+
+        written = repository.update_metadata_many([(d, {"verified": True}) for d in demos])
+
+        assert written == 1
+        assert (temp_dir / "a" / "metadata.json").exists()
+        assert not (temp_dir / "b" / "metadata.json").exists()
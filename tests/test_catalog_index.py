@@ -0,0 +1,276 @@
+"""
+CatalogIndex 单元测试
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from opendemo.services.catalog_index import CatalogIndex, build_entry
+from opendemo.services.storage_service import StorageService
+
+
+def _write_demo(demo_path: Path, metadata: dict):
+    """创建带metadata.json的demo目录"""
+    demo_path.mkdir(parents=True, exist_ok=True)
+    (demo_path / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+
+
+def _read_json(metadata_file: Path):
+    """解析metadata.json"""
+    return json.loads(metadata_file.read_text(encoding="utf-8"))
+
+
+def _make_storage(mock_config, temp_dir):
+    """创建使用临时缓存目录的存储服务"""
+    mock_config.get.side_effect = lambda key, default=None: {
+        "user_demo_library": str(temp_dir / "user"),
+        "cache_directory": str(temp_dir / "cache"),
+    }.get(key, default)
+    return StorageService(mock_config)
+
+
+class TestCatalogIndex:
+    """CatalogIndex 基础功能测试"""
+
+    def test_lookup_unindexed_path(self, temp_dir):
+        """测试未索引的路径返回None"""
+        index = CatalogIndex(temp_dir / "catalog.json")
+        assert index.lookup(temp_dir / "output") is None
+
+    def test_refresh_and_lookup_subpath(self, temp_dir):
+        """测试刷新根目录后可查询子路径"""
+        root = temp_dir / "output"
+        demo = root / "python" / "logging"
+        _write_demo(demo, {"name": "logging"})
+
+        index = CatalogIndex(temp_dir / "catalog.json")
+        index.refresh(root, _read_json)
+
+        results = index.lookup(root / "python")
+        assert [path for path, _ in results] == [demo]
+        assert results[0][1]["metadata"]["name"] == "logging"
+        assert index.lookup(root / "go") == []
+
+    def test_save_and_reload(self, temp_dir):
+        """测试索引持久化"""
+        root = temp_dir / "output"
+        demo = root / "python" / "logging"
+        _write_demo(demo, {"name": "logging"})
+
+        index = CatalogIndex(temp_dir / "catalog.json")
+        index.refresh(root, _read_json)
+        assert index.save() is True
+
+        reloaded = CatalogIndex(temp_dir / "catalog.json")
+        assert reloaded.get_entry(demo)["metadata"]["name"] == "logging"
+
+    def test_save_prunes_missing_roots(self, temp_dir):
+        """测试保存时清理已删除的根目录"""
+        gone = temp_dir / "gone"
+        gone.mkdir()
+        index = CatalogIndex(temp_dir / "catalog.json")
+        index.refresh(gone, _read_json)
+        gone.rmdir()
+        index.save()
+
+        data = json.loads((temp_dir / "catalog.json").read_text(encoding="utf-8"))
+        assert data["roots"] == {}
+
+    def test_remove_entry(self, temp_dir):
+        """测试移除demo条目"""
+        root = temp_dir / "output"
+        outer = root / "python" / "outer"
+        _write_demo(outer, {"name": "outer"})
+        index = CatalogIndex(temp_dir / "catalog.json")
+        index.refresh(root, _read_json)
+
+        assert len(index.lookup(root)) == 1
+        index.remove_entry(outer)
+        assert index.lookup(root) == []
+
+    def test_walk_stops_at_demo_and_skips_dependency_dirs(self, temp_dir):
+        """测试不进入demo的子目录、以点开头的目录和依赖目录"""
+        root = temp_dir / "output"
+        outer = root / "nodejs" / "outer"
+        _write_demo(outer, {"name": "outer"})
+        _write_demo(outer / "nested" / "inner", {"name": "inner"})
+        _write_demo(root / "nodejs" / "node_modules" / "pkg", {"name": "pkg"})
+        _write_demo(root / "go" / "vendor" / "mod", {"name": "mod"})
+        _write_demo(root / "python" / "__pycache__" / "x", {"name": "x"})
+        _write_demo(root / ".git" / "objects", {"name": "objects"})
+        index = CatalogIndex(temp_dir / "catalog.json")
+        index.refresh(root, _read_json)
+
+        assert [entry["metadata"]["name"] for _, entry in index.lookup(root)] == ["outer"]
+        dirs = index._load()["roots"][str(root)]["dirs"]
+        assert sorted(dirs) == ["", "go", "nodejs", "nodejs/outer", "python"]
+
+
+    def test_build_entry_library_layouts(self, temp_dir):
+        """测试从路径推断语言和库名"""
+        lib_demo = temp_dir / "python" / "libraries" / "numpy" / "array-creation"
+        k8s_demo = temp_dir / "kubernetes" / "helm" / "chart-basics"
+        base_demo = temp_dir / "go" / "go-channels"
+
+        assert build_entry(lib_demo, {}, 0)["library"] == "numpy"
+        assert build_entry(lib_demo, {}, 0)["language"] == "python"
+        assert build_entry(k8s_demo, {}, 0)["library"] == "helm"
+        assert build_entry(k8s_demo, {}, 0)["language"] == "kubernetes"
+        assert build_entry(base_demo, {}, 0)["library"] is None
+        assert build_entry(base_demo, {}, 0)["language"] == "go"
+
+
+class TestCatalogIndexIncremental:
+    """增量重新验证测试"""
+
+    def _build_tree(self, root: Path):
+        for lang in ("python", "go"):
+            for i in range(3):
+                _write_demo(root / lang / f"demo-{i}", {"name": f"{lang}-{i}"})
+        _write_demo(root / "python" / "libraries" / "numpy" / "arrays", {"name": "arrays"})
+        _write_demo(root / "kubernetes" / "helm" / "charts", {"name": "charts"})
+
+    def test_unchanged_tree_does_no_work(self, temp_dir):
+        """测试目录未变化时不重新列举也不重新解析"""
+        root = temp_dir / "output"
+        self._build_tree(root)
+        index = CatalogIndex(temp_dir / "catalog.json")
+        index.refresh(root, _read_json)
+        index.save()
+
+        reader = Mock(side_effect=_read_json)
+        reloaded = CatalogIndex(temp_dir / "catalog.json")
+        assert reloaded.refresh(root, reader) == 0
+        reader.assert_not_called()
+        assert len(reloaded.lookup(root)) == 8
+
+    def test_new_demo_only_rescans_changed_dirs(self, temp_dir):
+        """测试新增demo只重新列举变化的目录并只解析新的metadata"""
+        root = temp_dir / "output"
+        self._build_tree(root)
+        index = CatalogIndex(temp_dir / "catalog.json")
+        index.refresh(root, _read_json)
+
+        _write_demo(root / "python" / "libraries" / "numpy" / "broadcasting", {"name": "bc"})
+
+        reader = Mock(side_effect=_read_json)
+        changed = index.refresh(root, reader)
+
+        # numpy 目录 + 新demo目录
+        assert changed == 2
+        assert reader.call_count == 1
+        names = {entry["metadata"]["name"] for _, entry in index.lookup(root)}
+        assert "bc" in names
+
+    def test_removed_demo_dropped(self, temp_dir):
+        """测试删除目录后条目被移除"""
+        import shutil
+
+        root = temp_dir / "output"
+        self._build_tree(root)
+        index = CatalogIndex(temp_dir / "catalog.json")
+        index.refresh(root, _read_json)
+
+        shutil.rmtree(root / "kubernetes" / "helm")
+        index.refresh(root, _read_json)
+
+        assert all(entry["library"] != "helm" for _, entry in index.lookup(root))
+
+    def test_subroot_merged_into_parent(self, temp_dir):
+        """测试先索引子目录再索引父目录时复用已有条目"""
+        root = temp_dir / "output"
+        self._build_tree(root)
+        index = CatalogIndex(temp_dir / "catalog.json")
+        index.refresh(root / "python", _read_json)
+
+        reader = Mock(side_effect=_read_json)
+        index.refresh(root, reader)
+
+        # 只需要解析 go 和 kubernetes 下的 4 个demo
+        assert reader.call_count == 4
+        assert len(index.lookup(root)) == 8
+
+
+class TestStorageServiceCatalogIndex:
+    """StorageService 使用索引的测试"""
+
+    def test_second_listing_skips_tree_walk(self, mock_config, temp_dir):
+        """测试第二次列出demo时直接读取索引"""
+        _write_demo(temp_dir / "user" / "python" / "demo-a", {"name": "demo-a"})
+
+        with patch.object(StorageService, "builtin_library_path", temp_dir / "builtin"):
+            storage = _make_storage(mock_config, temp_dir)
+            assert len(storage.list_demos(library="user")) == 1
+
+            fresh = _make_storage(mock_config, temp_dir)
+            with patch.object(fresh, "_scan_demos_in_path") as mock_scan:
+                demos = fresh.list_demos(library="user", language="python")
+
+        mock_scan.assert_not_called()
+        assert demos == [temp_dir / "user" / "python" / "demo-a"]
+
+    def test_metadata_served_from_index(self, mock_config, temp_dir):
+        """测试mtime未变化时不重新解析metadata.json"""
+        demo_path = temp_dir / "user" / "python" / "demo-a"
+        _write_demo(demo_path, {"name": "demo-a"})
+
+        with patch.object(StorageService, "builtin_library_path", temp_dir / "builtin"):
+            storage = _make_storage(mock_config, temp_dir)
+            storage.list_demos(library="user")
+
+            with patch.object(storage, "_read_metadata_file") as mock_read:
+                metadata = storage.load_demo_metadata(demo_path)
+
+        mock_read.assert_not_called()
+        assert metadata["name"] == "demo-a"
+
+    def test_changed_metadata_is_reparsed(self, mock_config, temp_dir):
+        """测试metadata.json修改后重新解析"""
+        import os
+
+        demo_path = temp_dir / "user" / "python" / "demo-a"
+        _write_demo(demo_path, {"name": "demo-a"})
+
+        with patch.object(StorageService, "builtin_library_path", temp_dir / "builtin"):
+            storage = _make_storage(mock_config, temp_dir)
+            storage.list_demos(library="user")
+
+            metadata_file = demo_path / "metadata.json"
+            metadata_file.write_text(json.dumps({"name": "renamed"}), encoding="utf-8")
+            stat = metadata_file.stat()
+            os.utime(metadata_file, (stat.st_atime, stat.st_mtime + 10))
+
+            assert storage.load_demo_metadata(demo_path)["name"] == "renamed"
+
+    def test_save_and_delete_update_index(self, mock_config, temp_dir):
+        """测试保存和删除demo时同步更新索引"""
+        with patch.object(StorageService, "builtin_library_path", temp_dir / "builtin"):
+            storage = _make_storage(mock_config, temp_dir)
+            (temp_dir / "user" / "python").mkdir(parents=True)
+            assert storage.list_demos(library="user") == []
+
+            new_demo = temp_dir / "user" / "python" / "new-demo"
+            storage.save_demo({"metadata": {"name": "new-demo"}, "files": []}, new_demo)
+            assert storage.list_demos(library="user") == [new_demo]
+
+            storage.delete_demo(new_demo)
+            assert storage.list_demos(library="user") == []
+
+    def test_index_disabled(self, mock_config, temp_dir):
+        """测试关闭索引时不写入缓存目录，遍历规则与索引一致"""
+        _write_demo(temp_dir / "user" / "python" / "demo-a", {"name": "demo-a"})
+        _write_demo(temp_dir / "user" / "python" / "demo-a" / "nested", {"name": "nested"})
+        _write_demo(temp_dir / "user" / "nodejs" / "node_modules" / "pkg", {"name": "pkg"})
+        mock_config.get.side_effect = lambda key, default=None: {
+            "user_demo_library": str(temp_dir / "user"),
+            "cache_directory": str(temp_dir / "cache"),
+            "catalog_index": False,
+        }.get(key, default)
+
+        with patch.object(StorageService, "builtin_library_path", temp_dir / "builtin"):
+            storage = StorageService(mock_config)
+            assert len(storage.list_demos(library="user")) == 1
+
+        assert storage.catalog_index is None
+        assert not (temp_dir / "cache" / "catalog.json").exists()
@@ -0,0 +1,105 @@
+"""
+CatalogWatcher 单元测试
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from opendemo.services.catalog_watcher import CatalogWatcher
+
+
+def _create_demo(path: Path, name: str):
+    """创建带metadata.json的demo目录"""
+    path.mkdir(parents=True)
+    (path / "metadata.json").write_text(json.dumps({"name": name}), encoding="utf-8")
+
+
+def _touch(path: Path, offset: float = 10):
+    """修改文件mtime"""
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + offset))
+
+
+class TestCatalogWatcherPolling:
+    """轮询模式测试"""
+
+    def _watcher(self, root):
+        watcher = CatalogWatcher([root], use_native=False)
+        watcher._snapshot = watcher._take_snapshot()
+        return watcher
+
+    def test_no_changes(self, temp_dir):
+        """测试没有变化时不记录路径"""
+        _create_demo(temp_dir / "python" / "logging", "logging")
+        watcher = self._watcher(temp_dir)
+
+        assert watcher.poll() == 0
+        assert watcher.drain() == []
+
+    def test_metadata_modified(self, temp_dir):
+        """测试metadata.json修改"""
+        _create_demo(temp_dir / "python" / "logging", "logging")
+        watcher = self._watcher(temp_dir)
+
+        metadata = temp_dir / "python" / "logging" / "metadata.json"
+        _touch(metadata)
+        watcher.poll()
+
+        assert watcher.drain() == [str(metadata)]
+        assert watcher.drain() == []
+
+    def test_demo_added_and_renamed(self, temp_dir):
+        """测试新增和重命名demo只记录变化的目录，不记录父目录"""
+        _create_demo(temp_dir / "python" / "logging", "logging")
+        watcher = self._watcher(temp_dir)
+
+        _create_demo(temp_dir / "python" / "http", "http")
+        (temp_dir / "python" / "logging").rename(temp_dir / "python" / "logging-basics")
+        watcher.poll()
+
+        changes = watcher.drain()
+        assert str(temp_dir / "python" / "http") in changes
+        assert str(temp_dir / "python" / "logging") in changes
+        assert str(temp_dir / "python" / "logging-basics") in changes
+        assert str(temp_dir / "python") not in changes
+
+    def test_demo_deleted(self, temp_dir):
+        """测试删除demo"""
+        _create_demo(temp_dir / "python" / "logging", "logging")
+        watcher = self._watcher(temp_dir)
+
+        (temp_dir / "python" / "logging" / "metadata.json").unlink()
+        (temp_dir / "python" / "logging").rmdir()
+        watcher.poll()
+
+        assert str(temp_dir / "python" / "logging") in watcher.drain()
+
+    def test_skipped_dirs_ignored(self, temp_dir):
+        """测试依赖、虚拟环境和以点开头的目录中的变化不被记录"""
+        _create_demo(temp_dir / "python" / "logging", "logging")
+        watcher = self._watcher(temp_dir)
+
+        for name in ("venv", "node_modules", ".git"):
+            _create_demo(temp_dir / "python" / "logging" / name / "pkg", "pkg")
+        watcher.poll()
+
+        assert watcher.drain() == [str(temp_dir / "python" / "logging")]
+
+    def test_native_events_in_skipped_dirs_ignored(self, temp_dir):
+        """测试原生事件使用与目录索引相同的跳过规则，只检查根目录之下的部分"""
+        root = temp_dir / ".opendemo" / "library"
+        watcher = CatalogWatcher([root])
+
+        assert watcher._skipped(str(root / "python" / "logging" / "target" / "out.class"))
+        assert watcher._skipped(str(root / "python" / ".cache"))
+        assert not watcher._skipped(str(root / "python" / "logging" / "metadata.json"))
+
+    def test_start_falls_back_to_polling(self, temp_dir):
+        """测试未安装watchdog时回退到轮询"""
+        watcher = CatalogWatcher([temp_dir], interval=60)
+        with patch.object(CatalogWatcher, "_start_native", return_value=False):
+            assert watcher.start() == "polling"
+        watcher.stop()
+        assert watcher._thread is None
@@ -8,6 +8,8 @@ from unittest.mock import Mock, MagicMock, patch, mock_open
 from click.testing import CliRunner
 import tempfile
 
+from opendemo.core.search_index import SearchIndex
+
 from opendemo.cli import (
     cli,
     _scan_output_demos,
@@ -161,6 +163,35 @@ class TestMatchDemoInOutput:
             assert result is not None
             assert result["name"] == "my-demo"
 
+    def test_match_demo_prefix_preferred_over_contains(self):
+        """测试前缀匹配优先于包含匹配"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir)
+            lang_dir = output_dir / "python"
+            for name in ["python-asyncio-basics", "asyncio-basics-advanced", "asyncio-basics-demo"]:
+                (lang_dir / name).mkdir(parents=True)
+
+            result = _match_demo_in_output(output_dir, "python", ["asyncio", "basics"])
+
+            assert result is not None
+            assert result["name"] == "asyncio-basics-demo"
+
+    def test_match_demo_by_chinese_keywords(self):
+        """测试通过中文关键字匹配demo"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir)
+            lang_dir = output_dir / "python"
+            for name, keywords in [("dict-ops", ["字典", "操作"]), ("list-ops", ["列表", "操作"])]:
+                demo_dir = lang_dir / name
+                demo_dir.mkdir(parents=True)
+                with open(demo_dir / "metadata.json", "w", encoding="utf-8") as f:
+                    json.dump({"name": name, "keywords": keywords}, f, ensure_ascii=False)
+
+            result = _match_demo_in_output(output_dir, "python", ["列表", "操作"])
+
+            assert result is not None
+            assert result["name"] == "list-ops"
+
     def test_match_demo_not_found(self):
         """测试未找到匹配的demo"""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -170,6 +201,75 @@ class TestMatchDemoInOutput:
             
             assert result is None
 
+    def test_match_demo_reuses_index(self, temp_dir):
+        """测试输出目录没有变化时复用扫描结果和索引，新增demo后重建"""
+        (temp_dir / "python" / "logging-basics").mkdir(parents=True)
+
+        with patch("opendemo.cli.SearchIndex.build", wraps=SearchIndex.build) as mock_build:
+            assert _match_demo_in_output(temp_dir, "python", ["日志"]) is None
+            assert _match_demo_in_output(temp_dir, "python", ["文件"]) is None
+            assert mock_build.call_count == 1
+            assert _scan_output_demos(temp_dir, "python")[0] is (
+                _scan_output_demos(temp_dir, "python")[0]
+            )
+
+            demo_dir = temp_dir / "python" / "file-io"
+            demo_dir.mkdir()
+            (demo_dir / "metadata.json").write_text(
+                json.dumps({"keywords": ["文件"]}, ensure_ascii=False), encoding="utf-8"
+            )
+            result = _match_demo_in_output(temp_dir, "python", ["文件"])
+
+        assert result["name"] == "file-io"
+        assert mock_build.call_count == 2
+
+
+class TestGetCompletion:
+    """get命令补全测试"""
+
+    def _complete(self, args, incomplete):
+        from click.shell_completion import ShellComplete
+
+        completer = ShellComplete(cli, {}, "opendemo", "_OPENDEMO_COMPLETE")
+        return [item.value for item in completer.get_completions(args, incomplete)]
+
+    def test_complete_language(self):
+        """测试补全语言"""
+        assert self._complete(["get"], "ja") == ["java"]
+
+    def test_complete_demo_and_library_names(self):
+        """测试第一个关键字补全库名和输出目录demo名"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir)
+            for name in ["asyncio-basics", "logging"]:
+                (output_dir / "python" / name).mkdir(parents=True)
+
+            with patch("opendemo.cli.StorageService") as mock_storage_cls, patch(
+                "opendemo.cli.DemoRepository"
+            ) as mock_repo_cls:
+                mock_storage_cls.return_value.get_output_directory.return_value = output_dir
+                mock_repo_cls.return_value.get_supported_libraries.return_value = ["attrs"]
+
+                assert self._complete(["get", "python"], "a") == ["asyncio-basics", "attrs"]
+
+    def test_complete_library_features(self):
+        """测试库名之后补全功能名"""
+        with patch("opendemo.cli.StorageService"), patch(
+            "opendemo.cli.DemoRepository"
+        ) as mock_repo_cls:
+            repository = mock_repo_cls.return_value
+            repository.get_supported_libraries.return_value = ["numpy"]
+            repository.list_library_features.return_value = [
+                {"name": "array-creation"},
+                {"name": "linalg"},
+            ]
+
+            assert self._complete(["get", "python", "numpy"], "ar") == ["array-creation"]
+
+    def test_complete_unknown_language(self):
+        """测试不支持的语言不补全"""
+        assert self._complete(["get", "rust"], "") == []
+
 
 class TestDisplayOutputDemo:
     """_display_output_demo函数测试"""
@@ -241,6 +341,50 @@ class TestGetCommand:
         assert result.exit_code != 0
 
 
+class TestGetTypoSuggestion:
+    """get命令拼写错误提示测试"""
+
+    def _invoke_get(self, output_dir, keywords):
+        with patch("opendemo.cli.ConfigService"), patch(
+            "opendemo.cli.StorageService"
+        ) as mock_storage_cls, patch("opendemo.cli.DemoRepository") as mock_repo_cls, patch(
+            "opendemo.services.ai_service.AIService"
+        ), patch(
+            "opendemo.core.demo_generator.DemoGenerator"
+        ) as mock_generator_cls:
+            mock_storage_cls.return_value.get_output_directory.return_value = output_dir
+            repository = mock_repo_cls.return_value
+            repository.detect_library_command.return_value = None
+            repository.load_all_demos.return_value = []
+            mock_generator_cls.return_value.generate.return_value = None
+
+            result = CliRunner().invoke(cli, ["get", "python"] + keywords)
+        return result, mock_generator_cls.return_value
+
+    def test_typo_suggests_existing_demo(self):
+        """测试拼写错误时提示已有demo且不调用AI生成"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir)
+            (output_dir / "python" / "asyncio-basics").mkdir(parents=True)
+
+            result, generator = self._invoke_get(output_dir, ["asyncio-basicss"])
+
+            assert result.exit_code == 0
+            assert "asyncio-basics" in result.output
+            generator.generate.assert_not_called()
+
+    def test_unrelated_topic_falls_through_to_generation(self):
+        """测试无相近demo时继续走AI生成"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir)
+            (output_dir / "python" / "asyncio-basics").mkdir(parents=True)
+
+            result, generator = self._invoke_get(output_dir, ["decorators"])
+
+            assert "您是不是要找" not in result.output
+            generator.generate.assert_called_once()
+
+
 class TestNewCommand:
     """new命令测试"""
 
@@ -260,6 +404,116 @@ class TestNewCommand:
         assert result.exit_code != 0
 
 
+class TestBatchCommand:
+    """batch命令测试"""
+
+    def test_batch_empty_manifest(self, temp_dir):
+        """测试清单中没有有效条目"""
+        manifest = temp_dir / "topics.json"
+        manifest.write_text("[]", encoding="utf-8")
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["batch", str(manifest)])
+
+        assert result.exit_code != 0
+        assert "没有可生成的demo" in result.output
+
+    def test_batch_unsupported_language(self, temp_dir):
+        """测试清单包含不支持的语言"""
+        manifest = temp_dir / "topics.json"
+        manifest.write_text('[{"language": "rust", "topic": "ownership"}]', encoding="utf-8")
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["batch", str(manifest)])
+
+        assert result.exit_code != 0
+        assert "不支持的语言: rust" in result.output
+
+
+class TestVerifyCommand:
+    """verify命令测试"""
+
+    def test_verify_requires_target(self):
+        """测试未指定demo也未使用 --all"""
+        result = CliRunner().invoke(cli, ["verify"])
+
+        assert result.exit_code != 0
+        assert "--all" in result.output
+
+    def test_verify_demo_path(self, temp_dir):
+        """测试验证demo目录并写回verified字段"""
+        demo_dir = temp_dir / "configmap-basics"
+        demo_dir.mkdir()
+        (demo_dir / "configmap.yaml").write_text(
+            "apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: demo\n", encoding="utf-8"
+        )
+        metadata = {"name": "configmap-basics", "language": "kubernetes", "verified": False}
+        (demo_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+        report = temp_dir / "report.json"
+
+        result = CliRunner().invoke(cli, ["verify", str(demo_dir), "--report", str(report)])
+
+        assert result.exit_code == 0, result.output
+        saved = json.loads((demo_dir / "metadata.json").read_text(encoding="utf-8"))
+        assert saved["verified"] is True
+        assert json.loads(report.read_text(encoding="utf-8"))["summary"]["passed"] == 1
+
+    def test_verify_output_directory(self, temp_dir, monkeypatch):
+        """测试 --all 和 <语言>/<目录名> 在输出目录中查找demo"""
+        demo_dir = temp_dir / "opendemo_output" / "kubernetes" / "configmap-basics"
+        demo_dir.mkdir(parents=True)
+        (demo_dir / "configmap.yaml").write_text(
+            "apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: demo\n", encoding="utf-8"
+        )
+        metadata = {"name": "configmap-basics", "language": "kubernetes", "verified": False}
+        (demo_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+        monkeypatch.chdir(temp_dir)
+        report = temp_dir / "report.json"
+
+        for args in (["--all", "--language", "kubernetes"], ["kubernetes/configmap-basics"]):
+            result = CliRunner().invoke(cli, ["verify", *args, "--report", str(report)])
+
+            assert result.exit_code == 0, result.output
+            results = json.loads(report.read_text(encoding="utf-8"))["results"]
+            assert [(temp_dir / r["path"]).resolve() for r in results] == [demo_dir.resolve()]
+        saved = json.loads((demo_dir / "metadata.json").read_text(encoding="utf-8"))
+        assert saved["verified"] is True
+
+    def test_verify_unsupported_language_skipped(self, temp_dir):
+        """测试不支持的语言记为跳过，不改写verified字段"""
+        demo_dir = temp_dir / "ownership-basics"
+        demo_dir.mkdir()
+        metadata = {"name": "ownership-basics", "language": "rust", "verified": True}
+        (demo_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+        report = temp_dir / "report.json"
+
+        result = CliRunner().invoke(cli, ["verify", str(demo_dir), "--report", str(report)])
+
+        assert result.exit_code == 0, result.output
+        saved = json.loads((demo_dir / "metadata.json").read_text(encoding="utf-8"))
+        assert saved["verified"] is True
+        assert json.loads(report.read_text(encoding="utf-8"))["results"][0]["status"] == "skipped"
+
+    def test_verify_prefetch(self, temp_dir):
+        """测试 --prefetch 只下载依赖，不执行验证"""
+        demo_dir = temp_dir / "requests-basics"
+        demo_dir.mkdir()
+        (demo_dir / "requirements.txt").write_text("requests\n", encoding="utf-8")
+        metadata = {"name": "requests-basics", "language": "python"}
+        (demo_dir / "metadata.json").write_text(json.dumps(metadata), encoding="utf-8")
+        prefetched = {"wheelhouse": str(temp_dir / "wheels"), "prefetched": 1, "failed": []}
+
+        with patch(
+            "opendemo.core.demo_verifier.DemoVerifier.prefetch", return_value=prefetched
+        ) as mock_prefetch:
+            with patch("opendemo.core.bulk_verifier.BulkVerifier.run") as mock_run:
+                result = CliRunner().invoke(cli, ["verify", str(demo_dir), "--prefetch"])
+
+        assert result.exit_code == 0, result.output
+        assert mock_prefetch.call_args[0][0] == [demo_dir / "requirements.txt"]
+        mock_run.assert_not_called()
+
+
 class TestConfigCommand:
     """config命令测试"""
 
@@ -2,8 +2,11 @@
 DemoGenerator单元测试
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import ANY, Mock, MagicMock, patch
 from datetime import datetime
 from opendemo.core.demo_generator import DemoGenerator
 from opendemo.core.demo_repository import Demo
@@ -64,7 +67,9 @@ class TestDemoGenerator:
         assert result["verified"] is False
 
         # 验证调用
-        ai_service.generate_demo.assert_called_once_with("python", "test topic", "beginner")
+        ai_service.generate_demo.assert_called_once_with(
+            "python", "test topic", "beginner", use_cache=True, on_stream=ANY
+        )
         repository.create_demo.assert_called_once()
 
     def test_generate_with_library(self):
@@ -226,7 +231,7 @@ class TestDemoGenerator:
         storage.delete_demo.assert_called_once_with(demo_path)
         # 验证生成新demo
         ai_service.generate_demo.assert_called_once_with(
-            "python", "old-demo", "intermediate"
+            "python", "old-demo", "intermediate", use_cache=False, on_stream=ANY
         )
 
     def test_regenerate_metadata_not_found(self):
@@ -275,7 +280,9 @@ class TestDemoGenerator:
 
         assert result is not None
         # 验证使用原有难度
-        ai_service.generate_demo.assert_called_once_with("go", "test-demo", "advanced")
+        ai_service.generate_demo.assert_called_once_with(
+            "go", "test-demo", "advanced", use_cache=False, on_stream=ANY
+        )
 
     def test_generate_metadata_enrichment(self):
         """测试元数据补充"""
@@ -307,3 +314,120 @@ class TestDemoGenerator:
         # 验证create_demo调用时的作者参数
         call_args = repository.create_demo.call_args
         assert call_args[1]["author"] == "John Doe"
+
+
+class TestDemoGeneratorStreaming:
+    """流式生成写入测试"""
+
+    def _generator(self, temp_dir, stream_events, result):
+        """构造按给定事件回调的生成器"""
+
+        def write_file(path, content):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+            return True
+
+        def generate_demo(language, topic, difficulty, use_cache=True, on_stream=None):
+            for event, value in stream_events:
+                on_stream(event, value)
+            return result
+
+        ai_service = Mock()
+        ai_service.generate_demo.side_effect = generate_demo
+        repository = Mock()
+        repository.resolve_demo_path.return_value = temp_dir / "python" / "stream-demo"
+        repository.storage.write_file.side_effect = write_file
+        repository.create_demo.return_value = Demo(temp_dir / "python" / "stream-demo", {})
+        config = Mock()
+        config.get.return_value = ""
+        return DemoGenerator(ai_service, repository, config)
+
+    def test_files_written_as_they_arrive(self, temp_dir):
+        """测试文件在流式事件到达时即写入，保存时不再重复写入"""
+        files = [{"path": "main.py", "content": "print(1)"}, {"path": "a/b.txt", "content": "b"}]
+        metadata = {"name": "stream-demo", "folder_name": "stream-demo"}
+        events = [("file", files[0]), ("metadata", metadata), ("file", files[1])]
+        generator = self._generator(temp_dir, events, {"metadata": metadata, "files": files})
+        progress = []
+
+        generator.generate("python", "stream", on_progress=lambda *e: progress.append(e))
+
+        demo_dir = temp_dir / "python" / "stream-demo"
+        assert (demo_dir / "main.py").read_text(encoding="utf-8") == "print(1)"
+        assert (demo_dir / "a" / "b.txt").exists()
+        assert progress == [("path", demo_dir), ("file", "main.py"), ("file", "a/b.txt")]
+        kwargs = generator.repository.create_demo.call_args.kwargs
+        assert kwargs["demo_path"] == demo_dir
+        assert kwargs["written_files"] == {"main.py", "a/b.txt"}
+
+    def test_retry_and_failure_remove_partial_files(self, temp_dir):
+        """测试重试和最终失败时删除已写入的部分文件"""
+        metadata = {"name": "stream-demo", "folder_name": "stream-demo"}
+        partial = ("file", {"path": "main.py", "content": "x"})
+        events = [("metadata", metadata), partial, ("retry", 1), ("metadata", metadata), partial]
+        generator = self._generator(temp_dir, events, None)
+
+        assert generator.generate("python", "stream") is None
+        assert not (temp_dir / "python").exists()
+        generator.repository.create_demo.assert_not_called()
+
+    def test_existing_demo_untouched_until_success(self, temp_dir):
+        """测试目标目录已存在时，失败不改动已有文件，成功后才覆盖同名文件"""
+        demo_dir = temp_dir / "python" / "stream-demo"
+        demo_dir.mkdir(parents=True)
+        (demo_dir / "README.md").write_text("old readme", encoding="utf-8")
+        (demo_dir / "metadata.json").write_text("{}", encoding="utf-8")
+        metadata = {"name": "stream-demo", "folder_name": "stream-demo"}
+        readme = {"path": "README.md", "content": "new readme"}
+        events = [("metadata", metadata), ("file", readme), ("retry", 1)]
+        events += [("metadata", metadata), ("file", readme)]
+
+        assert self._generator(temp_dir, events, None).generate("python", "stream") is None
+        assert (demo_dir / "README.md").read_text(encoding="utf-8") == "old readme"
+        assert sorted(p.name for p in (temp_dir / "python").iterdir()) == ["stream-demo"]
+
+        result = {"metadata": metadata, "files": [readme]}
+        generator = self._generator(temp_dir, events, result)
+        generator.generate("python", "stream")
+
+        assert (demo_dir / "README.md").read_text(encoding="utf-8") == "new readme"
+        assert (demo_dir / "metadata.json").exists()
+        assert sorted(p.name for p in (temp_dir / "python").iterdir()) == ["stream-demo"]
+        assert generator.repository.create_demo.call_args.kwargs["written_files"] == {"README.md"}
+
+
+class TestDemoGeneratorCoalescing:
+    """相同请求合并测试"""
+
+    def test_concurrent_identical_generations_share_one_call(self):
+        """测试并发的相同生成请求只调用一次AI并写入一次"""
+        started = threading.Event()
+
+        def generate_demo(language, topic, difficulty, use_cache=True, on_stream=None):
+            started.set()
+            time.sleep(0.1)
+            return {"metadata": {"name": topic}, "files": []}
+
+        ai_service = Mock()
+        ai_service.generate_demo.side_effect = generate_demo
+        repository = Mock()
+        repository.create_demo.return_value = Demo(Path("/output/go/channels"), {})
+        config = Mock()
+        config.get.return_value = ""
+        generator = DemoGenerator(ai_service, repository, config)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            first = pool.submit(generator.generate, "go", "channels")
+            started.wait(5)
+            others = [pool.submit(generator.generate, "go", "channels") for _ in range(3)]
+            different = pool.submit(generator.generate, "go", "channels", "advanced")
+            uncached = pool.submit(generator.generate, "go", "channels", use_cache=False)
+            results = [first.result()] + [f.result() for f in others]
+            different.result()
+            uncached.result()
+
+        assert ai_service.generate_demo.call_count == 3
+        calls = ai_service.generate_demo.call_args_list
+        assert [c.kwargs["use_cache"] for c in calls].count(False) == 1
+        assert repository.create_demo.call_count == 3
+        assert all(r is results[0] for r in results)
@@ -182,3 +182,92 @@ class TestDemoRepositoryIntegration:
 
         assert isinstance(demos, list)
         mock_storage.list_demos.assert_called_once()
+
+    def test_load_demo_reloads_when_metadata_changes(self):
+        """测试 metadata.json 修改后缓存失效"""
+        import os
+
+        mock_storage = Mock()
+        mock_storage.load_demo_metadata.side_effect = [{"name": "v1"}, {"name": "v2"}]
+
+        repository = DemoRepository(mock_storage)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            demo_path = Path(temp_dir) / "test-demo"
+            demo_path.mkdir()
+            metadata_file = demo_path / "metadata.json"
+            metadata_file.write_text("{}")
+
+            assert repository.load_demo(demo_path).name == "v1"
+            assert repository.load_demo(demo_path).name == "v1"
+
+            stat = metadata_file.stat()
+            os.utime(metadata_file, (stat.st_atime, stat.st_mtime + 10))
+
+            assert repository.load_demo(demo_path).name == "v2"
+
+
+class TestInvalidatePath:
+    """DemoRepository.invalidate_path 测试"""
+
+    def _repository(self, root):
+        storage = Mock()
+        storage.get_output_directory.return_value = root / "output"
+        storage.user_library_path = root / "user"
+        storage.builtin_library_path = root / "builtin"
+        repository = DemoRepository(storage)
+
+        output = (root / "output").absolute()
+        for name in ("python-logging", "python-http"):
+            key = str(output / "python" / name)
+            repository._demo_cache[key] = Demo(Path(key), {"name": name})
+        repository._library_features_cache = {"python:numpy": [], "python:pandas": [], "go:gin": []}
+        repository._library_metadata_cache = {"python:numpy": {}, "go:gin": {}}
+        repository._supported_libraries_cache = {"python": ["numpy", "pandas"], "go": ["gin"]}
+        return repository
+
+    def test_demo_file_change_only_drops_that_demo(self):
+        """测试demo内文件变化只清除该demo"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            repository = self._repository(root)
+
+            changed = root / "output" / "python" / "python-logging" / "metadata.json"
+            assert repository.invalidate_path(changed) == 1
+
+            assert [Path(k).name for k in repository._demo_cache] == ["python-http"]
+            assert len(repository._library_features_cache) == 3
+            assert "python" in repository._supported_libraries_cache
+
+    def test_library_feature_change(self):
+        """测试库功能变化只清除该库的功能列表"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            repository = self._repository(root)
+
+            feature = root / "user" / "python" / "libraries" / "numpy" / "array-creation"
+            repository.invalidate_path(feature)
+
+            assert set(repository._library_features_cache) == {"python:pandas", "go:gin"}
+            assert set(repository._library_metadata_cache) == {"go:gin"}
+            assert set(repository._supported_libraries_cache) == {"python", "go"}
+
+    def test_library_added(self):
+        """测试新增库目录时清除该语言的库列表"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            repository = self._repository(root)
+
+            repository.invalidate_path(root / "builtin" / "python" / "libraries" / "scipy")
+
+            assert set(repository._supported_libraries_cache) == {"go"}
+            assert len(repository._library_features_cache) == 3
+
+    def test_path_outside_catalog(self):
+        """测试库目录以外的路径不影响缓存"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            repository = self._repository(root)
+
+            assert repository.invalidate_path(root / "elsewhere" / "file.txt") == 0
+            assert len(repository._demo_cache) == 2
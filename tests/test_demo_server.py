@@ -0,0 +1,193 @@
+"""
+DemoServer / ServerClient 单元测试
+"""
+
+import json
+import os
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from opendemo.cli import cli
+from opendemo.services.demo_server import DemoServer
+from opendemo.services.server_client import ServerClient
+
+
+@pytest.fixture
+def running_server(temp_dir):
+    """在后台线程中启动服务"""
+    app = Mock()
+    handlers = {"echo": lambda app, payload: {"keywords": payload.get("keywords")}}
+    server = DemoServer(app, handlers, port=0, state_path=temp_dir / "server.json")
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    # 等待状态文件写入
+    for _ in range(100):
+        if server.state_path.exists():
+            break
+        threading.Event().wait(0.01)
+
+    yield server
+
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+class TestDemoServer:
+    """DemoServer 测试"""
+
+    def test_ping_and_command(self, running_server):
+        """测试通过状态文件连接并调用命令"""
+        client = ServerClient.from_state_file(running_server.state_path)
+
+        assert client.request("ping")["pid"] == os.getpid()
+        result = client.request("echo", {"keywords": ["列表"], "cwd": os.getcwd()})
+        assert result == {"keywords": ["列表"]}
+
+    def test_state_file_removed_on_shutdown(self, temp_dir):
+        """测试服务停止后删除状态文件"""
+        server = DemoServer(Mock(), {}, port=0, state_path=temp_dir / "server.json")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        for _ in range(100):
+            if server.state_path.exists():
+                break
+            threading.Event().wait(0.01)
+
+        state = json.loads(server.state_path.read_text(encoding="utf-8"))
+        assert state["port"] == server.address[1]
+
+        server.shutdown()
+        thread.join(timeout=5)
+        assert not server.state_path.exists()
+
+    def test_invalid_token_rejected(self, running_server):
+        """测试token错误时拒绝请求"""
+        host, port = running_server.address
+        client = ServerClient(host, port, "wrong-token")
+        assert client.request("ping") is None
+
+    def test_cwd_mismatch_and_unknown_command(self, running_server, temp_dir):
+        """测试工作目录不一致或未知命令时返回None(由调用方回退到本地执行)"""
+        client = ServerClient.from_state_file(running_server.state_path)
+
+        assert client.request("echo", {"cwd": str(temp_dir / "other")}) is None
+        assert client.request("missing", {"cwd": os.getcwd()}) is None
+
+    def test_handler_error(self, temp_dir):
+        """测试命令执行异常时返回500"""
+
+        def failing(app, payload):
+            raise RuntimeError("boom")
+
+        server = DemoServer(Mock(), {"fail": failing}, state_path=temp_dir / "server.json")
+        try:
+            status, body = server.dispatch("fail", {})
+        finally:
+            server._httpd.server_close()
+
+        assert status == 500
+        assert "boom" in body["error"]
+
+    def test_watcher_changes_applied_before_command(self, temp_dir):
+        """测试处理命令前按监听器收集的变化清除仓库缓存"""
+        app = Mock()
+        watcher = Mock()
+        watcher.drain.return_value = ["/demos/python/logging"]
+        handlers = {"echo": lambda app, payload: {}}
+
+        server = DemoServer(app, handlers, state_path=temp_dir / "server.json", watcher=watcher)
+        try:
+            status, _ = server.dispatch("echo", {})
+        finally:
+            server._httpd.server_close()
+
+        assert status == 200
+        app.repository.invalidate_path.assert_called_once()
+        assert str(app.repository.invalidate_path.call_args[0][0]).endswith("logging")
+
+
+class TestServerClient:
+    """ServerClient 测试"""
+
+    def test_missing_or_invalid_state_file(self, temp_dir):
+        """测试状态文件不存在或无效"""
+        assert ServerClient.from_state_file(temp_dir / "missing.json") is None
+
+        invalid = temp_dir / "server.json"
+        invalid.write_text("{not json", encoding="utf-8")
+        assert ServerClient.from_state_file(invalid) is None
+
+    def test_server_not_running(self):
+        """测试服务未运行时返回None"""
+        client = ServerClient("127.0.0.1", 1, "token", timeout=1)
+        assert client.request("ping") is None
+
+
+class TestCLIForwarding:
+    """CLI转发到常驻服务的测试"""
+
+    def test_search_forwarded(self):
+        """测试服务运行时search使用服务返回的结果"""
+        demo = {"name": "python-logging", "language": "python", "keywords": ["log"]}
+        client = Mock()
+        client.request.return_value = {"demos": [demo]}
+
+        runner = CliRunner()
+        with patch("opendemo.cli.ServerClient.from_state_file", return_value=client), patch(
+            "opendemo.cli.StorageService"
+        ) as mock_storage:
+            result = runner.invoke(cli, ["search", "python", "log"])
+
+        assert result.exit_code == 0
+        assert "python-logging" in result.output
+        command, payload = client.request.call_args[0]
+        assert command == "search"
+        assert payload["keywords"] == ["log"]
+        mock_storage.assert_not_called()
+
+    def test_search_falls_back_when_server_fails(self, temp_dir):
+        """测试服务请求失败时回退到本地扫描"""
+        client = Mock()
+        client.request.return_value = None
+
+        runner = CliRunner()
+        with patch("opendemo.cli.ServerClient.from_state_file", return_value=client), patch(
+            "opendemo.cli.StorageService"
+        ) as mock_storage:
+            mock_storage.return_value.get_output_directory.return_value = temp_dir
+            result = runner.invoke(cli, ["search", "python"])
+
+        assert result.exit_code == 0
+        assert "未找到匹配的demo" in result.output
+
+    def test_get_uses_server_match(self, temp_dir):
+        """测试服务匹配到输出目录中的demo时直接显示"""
+        demo_path = temp_dir / "python" / "python-logging"
+        client = Mock()
+        client.request.return_value = {
+            "demo": {"name": "python-logging", "path": str(demo_path), "keywords": []}
+        }
+
+        runner = CliRunner()
+        with patch("opendemo.cli.ServerClient.from_state_file", return_value=client), patch(
+            "opendemo.cli.ConfigService"
+        ) as mock_config:
+            result = runner.invoke(cli, ["get", "python", "logging"])
+
+        assert result.exit_code == 0
+        assert "python-logging" in result.output
+        assert client.request.call_args[0][0] == "match"
+        mock_config.assert_not_called()
+
+    def test_serve_stop_without_server(self):
+        """测试没有运行中的服务时 --stop 给出提示"""
+        runner = CliRunner()
+        with patch("opendemo.cli.ServerClient.from_state_file", return_value=None):
+            result = runner.invoke(cli, ["serve", "--stop"])
+
+        assert result.exit_code == 0
+        assert "没有正在运行的服务" in result.output
@@ -416,6 +416,7 @@ class TestDemoVerifier:
         result = verifier.verify(Path("/test/demo"), "rust")
         
         assert result["verified"] is False
+        assert result["skipped"] is True
         assert "not supported" in result["error"]
 
     def test_generate_report(self):
@@ -478,3 +479,56 @@ class TestDemoVerifier:
         assert "Verification is disabled" in report
         assert "已跳过" in report
         assert "Verification is disabled" in report
+
+
+class TestWheelhouse:
+    """本地wheel目录测试"""
+
+    def _verifier(self, **values):
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: values.get(key, default)
+        return DemoVerifier(config)
+
+    def test_offline_install_uses_wheelhouse_only(self, temp_dir):
+        """测试离线模式下只从wheel目录安装"""
+        verifier = self._verifier(
+            verification_wheelhouse=str(temp_dir / "wheels"), verification_offline=True
+        )
+
+        with patch("opendemo.core.demo_verifier.subprocess.run") as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout="ok")
+            verifier._install_dependencies(temp_dir / "venv", temp_dir / "requirements.txt")
+
+        args = mock_run.call_args[0][0]
+        assert args[-3:] == ["--no-index", "--find-links", str(temp_dir / "wheels")]
+
+    def test_online_prefers_existing_wheelhouse(self, temp_dir):
+        """测试在线模式下wheel目录存在时优先使用，不存在时不添加参数"""
+        verifier = self._verifier(cache_directory=str(temp_dir))
+        assert verifier._wheelhouse_args() == []
+
+        (temp_dir / "wheelhouse").mkdir()
+
+        assert verifier._wheelhouse_args() == ["--find-links", str(temp_dir / "wheelhouse")]
+
+    def test_prefetch_dedupes_requirements(self, temp_dir):
+        """测试内容相同的依赖只下载一次，失败的文件被记录"""
+        verifier = self._verifier(verification_wheelhouse=str(temp_dir / "wheels"))
+        files = []
+        for name, text in (("a", "rich\n"), ("b", "# same\nrich"), ("c", ""), ("d", "nope")):
+            path = temp_dir / f"{name}.txt"
+            path.write_text(text, encoding="utf-8")
+            files.append(path)
+
+        with patch("opendemo.core.demo_verifier.subprocess.run") as mock_run:
+            mock_run.side_effect = [
+                Mock(returncode=0, stdout="", stderr=""),
+                Mock(returncode=1, stdout="", stderr="No matching distribution found for nope"),
+            ]
+            result = verifier.prefetch(files)
+
+        assert mock_run.call_count == 2
+        assert "wheel" in mock_run.call_args_list[0][0][0]
+        assert result["prefetched"] == 1
+        assert result["failed"][0]["file"] == str(files[3])
+        assert "No matching distribution" in result["failed"][0]["error"]
@@ -0,0 +1,90 @@
+"""
+文件暂存工具单元测试
+"""
+
+import errno
+import os
+import shutil
+from unittest.mock import patch
+from opendemo.utils.file_staging import FileStager, sync_tree
+
+
+def _demo(root):
+    (root / "node_modules" / "left-pad").mkdir(parents=True)
+    (root / "node_modules" / "left-pad" / "index.js").write_text("module.exports = 1")
+    (root / "node_modules" / ".package-lock.json").write_text("{}")
+    (root / "index.js").write_text("require('left-pad')")
+    return root
+
+
+class TestFileStager:
+    """单文件复制测试"""
+
+    def test_hardlinks_dependency_files_only(self, temp_dir):
+        """测试只硬链接依赖目录中的文件，demo自身的文件和隐藏文件仍然复制"""
+        source = _demo(temp_dir / "source")
+        stager = FileStager(reflink=False, hardlink=True)
+
+        shutil.copytree(source, temp_dir / "staged", copy_function=stager)
+
+        def same_inode(relative):
+            staged = temp_dir / "staged" / relative
+            return os.stat(source / relative).st_ino == os.stat(staged).st_ino
+
+        assert same_inode("node_modules/left-pad/index.js")
+        assert not same_inode("node_modules/.package-lock.json")
+        assert not same_inode("index.js")
+        assert stager.counts == {"hardlink": 1, "copy": 2}
+
+    def test_reflink_fallback(self, temp_dir):
+        """测试不支持reflink时回退到复制，之后不再尝试reflink"""
+        source = _demo(temp_dir / "source")
+        stager = FileStager()
+        stager.reflink = True  # 非Linux平台上也走reflink分支
+        unsupported = OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+        with patch("opendemo.utils.file_staging._reflink", side_effect=unsupported) as mock_clone:
+            shutil.copytree(source, temp_dir / "staged", copy_function=stager)
+
+        assert mock_clone.call_count == 1
+        assert stager.counts == {"copy": 3}
+        assert (temp_dir / "staged" / "index.js").read_text() == "require('left-pad')"
+
+
+class TestSyncTree:
+    """增量同步测试"""
+
+    def test_only_changed_files_copied(self, temp_dir):
+        """测试只复制变化的文件并删除多余的文件"""
+        source = _demo(temp_dir / "source")
+        target = temp_dir / "target"
+        assert sync_tree(source, target)["copied"] == 3
+
+        (source / "index.js").write_text("require('left-pad') // v2")
+        (source / "README.md").write_text("# demo")
+        (target / "notes.txt").write_text("本地文件")
+        shutil.rmtree(source / "node_modules" / "left-pad")
+        (source / "node_modules" / "right-pad").mkdir()
+        (source / "node_modules" / "right-pad" / "index.js").write_text("module.exports = 2")
+
+        stats = sync_tree(source, target)
+
+        assert stats == {"copied": 3, "unchanged": 1, "removed": 2}
+        assert (target / "index.js").read_text() == "require('left-pad') // v2"
+        assert (target / "README.md").exists()
+        assert not (target / "notes.txt").exists()
+        assert not (target / "node_modules" / "left-pad").exists()
+        assert (target / "node_modules" / "right-pad" / "index.js").exists()
+
+        assert sync_tree(source, target) == {"copied": 0, "unchanged": 4, "removed": 0}
+
+    def test_edited_target_restored(self, temp_dir):
+        """测试目标中被修改的文件恢复为源文件内容"""
+        source = _demo(temp_dir / "source")
+        target = temp_dir / "target"
+        sync_tree(source, target)
+
+        (target / "index.js").write_text("edited")
+
+        assert sync_tree(source, target)["copied"] == 1
+        assert (target / "index.js").read_text() == "require('left-pad')"
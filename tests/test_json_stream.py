@@ -0,0 +1,75 @@
+"""
+DemoStreamParser 单元测试
+"""
+
+import json
+import pytest
+from opendemo.utils.json_stream import DemoStreamParser
+
+
+DEMO = {
+    "metadata": {"name": "demo", "keywords": ["a", "}"], "extra": {"nested": [1, {"x": "]"}]}},
+    "files": [
+        {"path": "main.py", "content": 'print("{[\\"]}")\n# 中文注释\n'},
+        {"path": "README.md", "content": ""},
+    ],
+}
+
+
+def _feed(text, step):
+    """按固定长度分段输入"""
+    parser = DemoStreamParser()
+    events = []
+    for i in range(0, len(text), step):
+        events.extend(parser.feed(text[i : i + step]))
+    return parser, events
+
+
+class TestDemoStreamParser:
+    """增量解析测试"""
+
+    @pytest.mark.parametrize("step", [1, 2, 5, 64, 100000])
+    def test_events_independent_of_chunking(self, step):
+        """测试任意分段方式都得到相同事件"""
+        parser, events = _feed(json.dumps(DEMO, ensure_ascii=False), step)
+
+        assert parser.done
+        assert events == [
+            ("metadata", DEMO["metadata"]),
+            ("file", DEMO["files"][0]),
+            ("file", DEMO["files"][1]),
+        ]
+
+    def test_skips_code_fence_and_preamble(self):
+        """测试跳过响应前的说明文字和代码块标记"""
+        text = "下面是demo:\n```json\n" + json.dumps(DEMO) + "\n```"
+        parser, events = _feed(text, 3)
+
+        assert parser.done
+        assert [e[0] for e in events] == ["metadata", "file", "file"]
+
+    def test_files_before_metadata(self):
+        """测试 files 在 metadata 之前时同样逐个返回"""
+        text = json.dumps({"files": DEMO["files"], "metadata": DEMO["metadata"]})
+        _, events = _feed(text, 4)
+
+        assert [e[0] for e in events] == ["file", "file", "metadata"]
+
+    def test_ignores_other_keys_and_scalars(self):
+        """测试忽略其他键中的对象和 files 中的非对象元素"""
+        text = json.dumps({"note": {"files": [{"path": "x"}]}, "files": ["bad", {"path": "ok"}]})
+        _, events = _feed(text, 6)
+
+        assert events == [("file", {"path": "ok"})]
+
+    def test_buffer_released_after_each_file(self):
+        """测试已返回的文件不再保留在缓冲区中"""
+        big = {"metadata": {}, "files": [{"path": f"f{i}", "content": "x" * 5000} for i in range(5)]}
+        parser = DemoStreamParser()
+        text = json.dumps(big)
+        peak = 0
+        for i in range(0, len(text), 100):
+            parser.feed(text[i : i + 100])
+            peak = max(peak, len(parser._buffer))
+
+        assert peak < 5200
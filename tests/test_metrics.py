@@ -0,0 +1,161 @@
+"""
+AIMetrics 单元测试
+"""
+
+import json
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from opendemo.services.ai_service import AIService
+from opendemo.services.metrics import CACHE_HIT, PARSE_FAILURE, RETRY, AIMetrics
+from opendemo.utils.mock_llm_server import MockLLMServer
+
+
+class TestAIMetrics:
+    """指标收集和汇总测试"""
+
+    def test_summary_by_kind_and_label(self):
+        """测试按类别和标签汇总token、耗时和事件"""
+        metrics = AIMetrics(prompt_price=1.0, completion_price=2.0)
+        with metrics.label("go/channels"):
+            metrics.record_call(
+                "generate", 1.0, 200, {"prompt_tokens": 100, "completion_tokens": 50}
+            )
+            metrics.record_event(RETRY, "generate")
+            metrics.record_call(
+                "generate",
+                3.0,
+                200,
+                {"prompt_tokens": 100, "completion_tokens": 400},
+                finish_reason="length",
+            )
+            metrics.record_event(PARSE_FAILURE, "generate")
+        metrics.record_call("classify", 0.5, 429)
+        metrics.record_event(CACHE_HIT, "classify", label="go/gin")
+
+        summary = metrics.summary()
+
+        generate = summary["by_kind"]["generate"]
+        assert generate["calls"] == 2
+        assert generate["prompt_tokens"] == 200
+        assert generate["completion_tokens"] == 450
+        assert generate["max_completion_tokens"] == 400
+        assert generate["truncated"] == 1
+        assert generate["retries"] == 1
+        assert generate["parse_failures"] == 1
+        assert generate["estimated_cost"] == pytest.approx((200 * 1 + 450 * 2) / 1000)
+        assert generate["latency"]["max"] == 3.0
+
+        assert summary["by_kind"]["classify"]["errors"] == 1
+        assert summary["by_kind"]["classify"]["cache_hits"] == 1
+        assert set(summary["by_label"]) == {"go/channels", "go/gin", "unlabeled"}
+        assert summary["total"]["calls"] == 3
+
+    def test_labels_are_per_thread(self):
+        """测试标签只作用于当前线程"""
+        metrics = AIMetrics()
+        entered = threading.Event()
+        release = threading.Event()
+
+        def worker():
+            with metrics.label("thread"):
+                entered.set()
+                release.wait(5)
+                metrics.record_call("generate", 0.1, 200)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        entered.wait(5)
+        metrics.record_call("generate", 0.1, 200)
+        release.set()
+        thread.join()
+
+        assert sorted(str(r["label"]) for r in metrics.records) == ["None", "thread"]
+
+    def test_sink_file_and_load(self, temp_dir):
+        """测试记录追加到文件并可合并读取"""
+        sink = temp_dir / "metrics.jsonl"
+        for label in ("python/a", "python/b"):
+            metrics = AIMetrics(sink_path=sink)
+            with metrics.label(label):
+                metrics.record_call("generate", 0.2, 200, {"prompt_tokens": 10})
+
+        loaded = AIMetrics.load(sink)
+
+        assert loaded.summary()["total"]["prompt_tokens"] == 20
+        assert len(sink.read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_write_report(self, temp_dir):
+        """测试写入JSON报告"""
+        metrics = AIMetrics()
+        metrics.record_call("generate", 0.2, 200)
+        path = temp_dir / "logs" / "report.json"
+
+        assert metrics.write_report(path, {"run": "test"}) is True
+
+        report = json.loads(path.read_text(encoding="utf-8"))
+        assert report["run"] == "test"
+        assert report["ai_metrics"]["total"]["calls"] == 1
+
+
+class TestAIServiceMetrics:
+    """AIService 指标集成测试"""
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        """启动模拟LLM服务"""
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        with MockLLMServer(file_count=1) as server:
+            yield server
+
+    def _service(self, endpoint):
+        values = {"ai.api_key": "test-key", "ai.api_endpoint": endpoint, "ai.retry_interval": 0}
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: values.get(key, default)
+        return AIService(config)
+
+    def test_generation_usage_recorded(self, server):
+        """测试非流式生成记录usage和标签"""
+        ai_service = self._service(server.url)
+
+        assert ai_service.generate_demo("python", "logging") is not None
+
+        (record,) = ai_service.metrics.records
+        assert record["kind"] == "generate"
+        assert record["label"] == "python/logging"
+        assert record["status"] == 200
+        assert record["prompt_tokens"] > 0
+        assert record["completion_tokens"] > 0
+        assert record["finish_reason"] == "stop"
+
+    def test_streaming_usage_recorded(self, server):
+        """测试流式生成记录usage和首个片段耗时"""
+        ai_service = self._service(server.url)
+
+        ai_service.generate_demo("python", "logging", on_stream=lambda *event: None)
+
+        (record,) = ai_service.metrics.records
+        assert record["prompt_tokens"] > 0
+        assert record["finish_reason"] == "stop"
+        assert 0 <= record["first_token"] <= record["latency"]
+
+    def test_retries_and_errors_counted(self, server):
+        """测试429后重试被记录"""
+        ai_service = self._service(server.url)
+
+        with patch.object(server, "_inject_error", side_effect=[429, None]):
+            with patch("time.sleep"):
+                assert ai_service.generate_demo("python", "logging") is not None
+
+        summary = ai_service.metrics.summary()["by_label"]["python/logging"]
+        assert summary["calls"] == 2
+        assert summary["errors"] == 1
+        assert summary["retries"] == 1
+
+    def test_classify_recorded(self, server):
+        """测试分类调用按关键字标签记录"""
+        ai_service = self._service(server.url)
+
+        ai_service.classify_keyword("python", "numpy")
+
+        assert ai_service.metrics.summary()["by_label"]["python/numpy"]["calls"] == 1
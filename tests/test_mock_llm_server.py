@@ -0,0 +1,91 @@
+"""
+MockLLMServer 单元测试
+"""
+
+import json
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from opendemo.services.ai_service import AIService
+from opendemo.utils.mock_llm_server import MockLLMServer
+
+
+@pytest.fixture
+def no_proxy(monkeypatch):
+    """本地请求不经过代理"""
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+
+
+def _service(endpoint, **overrides):
+    """构造指向模拟服务的AIService"""
+    values = {"ai.api_key": "test-key", "ai.api_endpoint": endpoint, "ai.retry_interval": 0}
+    values.update(overrides)
+    config = Mock()
+    config.get.side_effect = lambda key, default=None: values.get(key, default)
+    return AIService(config)
+
+
+class TestMockLLMServer:
+    """模拟LLM服务测试"""
+
+    def test_generate_demo(self, no_proxy):
+        """测试非流式生成返回可解析的demo"""
+        with MockLLMServer(file_count=2) as server:
+            result = _service(server.url).generate_demo("go", "并发 channels")
+
+        assert result["metadata"]["language"] == "go"
+        assert result["metadata"]["keywords"] == ["并发 channels"]
+        assert [f["path"] for f in result["files"]] == [
+            "README.md",
+            "code/example_1.go",
+            "code/example_2.go",
+        ]
+        assert server.stats["200"] == 1
+
+    def test_streaming_generation(self, no_proxy):
+        """测试流式生成逐个回调文件"""
+        events = []
+        with MockLLMServer(file_count=3) as server:
+            result = _service(server.url).generate_demo(
+                "python", "logging", on_stream=lambda event, value: events.append(event)
+            )
+
+        assert events == ["metadata", "file", "file", "file", "file"]
+        assert len(result["files"]) == 4
+
+    def test_classify_keyword(self, no_proxy):
+        """测试分类请求返回分类结果"""
+        with MockLLMServer() as server:
+            result = _service(server.url).classify_keyword("python", "numpy")
+
+        assert result["is_library"] is False
+        assert result["confidence"] == 0.9
+
+    def test_injected_429_is_retried(self, no_proxy):
+        """测试注入的429带有Retry-After并被重试"""
+        with MockLLMServer(rate_429=1.0, retry_after=0.01) as server:
+            response = requests.post(server.url, json={"messages": []}, timeout=5)
+            assert response.status_code == 429
+            assert response.headers["Retry-After"] == "0.01"
+
+            with patch("time.sleep"):
+                result = _service(server.url, **{"ai.retry_times": 2}).generate_demo("go", "x")
+
+        assert result is None
+        assert server.stats["429"] == 3
+
+    def test_injected_500(self, no_proxy):
+        """测试注入500错误"""
+        with MockLLMServer(rate_500=1.0) as server:
+            response = requests.post(server.url, json={"messages": []}, timeout=5)
+
+        assert response.status_code == 500
+        assert server.stats == {"requests": 1, "500": 1}
+
+    def test_invalid_json_request(self, no_proxy):
+        """测试无效请求体返回400"""
+        with MockLLMServer() as server:
+            response = requests.post(server.url, data=b"{bad", timeout=5)
+
+        assert response.status_code == 400
+        assert "error" in json.loads(response.content)
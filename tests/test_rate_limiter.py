@@ -0,0 +1,257 @@
+"""
+RateLimiter 单元测试
+"""
+
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+
+from opendemo.services.ai_service import AIService
+from opendemo.services.rate_limiter import (
+    RateLimiter,
+    RateLimitTimeout,
+    TokenBucket,
+    backoff_delay,
+    get_rate_limiter,
+    parse_retry_after,
+)
+
+
+class _FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """令牌桶测试"""
+
+    def test_burst_then_wait(self):
+        """测试突发用尽后等待时间依次递增"""
+        clock = _FakeClock()
+        bucket = TokenBucket(60, capacity=2, clock=clock)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(1.0)
+        assert bucket.reserve() == pytest.approx(2.0)
+
+    def test_refill(self):
+        """测试令牌按速率补充"""
+        clock = _FakeClock()
+        bucket = TokenBucket(60, capacity=1, clock=clock)
+
+        bucket.reserve()
+        clock.now += 1.0
+        assert bucket.reserve() == 0
+
+
+class TestRateLimiter:
+    """限流器测试"""
+
+    def test_unlimited_by_default(self):
+        """测试未配置上限时不等待"""
+        limiter = RateLimiter()
+        with patch("time.sleep") as mock_sleep:
+            assert limiter.acquire(tokens=10000) == 0
+        mock_sleep.assert_not_called()
+
+    def test_tokens_per_minute(self):
+        """测试按token数限流"""
+        clock = _FakeClock()
+        limiter = RateLimiter(tokens_per_minute=6000, clock=clock)
+
+        with patch("time.sleep") as mock_sleep:
+            limiter.acquire(tokens=6000)
+            limiter.acquire(tokens=3000)
+
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args[0][0] == pytest.approx(30.0)
+
+    def test_pause_applies_to_all_callers(self):
+        """测试暂停期间所有调用方等待"""
+        clock = _FakeClock()
+        limiter = RateLimiter(clock=clock)
+        limiter.pause(5)
+
+        def sleep(seconds):
+            clock.now += seconds
+
+        with patch("time.sleep", side_effect=sleep):
+            assert limiter.acquire() == pytest.approx(5.0)
+            assert limiter.acquire() == 0
+
+    def test_pause_beyond_max_wait(self):
+        """测试暂停的剩余时间超过调用方可等待的时间时立即失败"""
+        clock = _FakeClock()
+        limiter = RateLimiter(clock=clock)
+        limiter.pause(30)
+
+        with patch("time.sleep") as mock_sleep:
+            with pytest.raises(RateLimitTimeout):
+                limiter.acquire(max_wait=5)
+
+        mock_sleep.assert_not_called()
+
+    def test_shared_per_endpoint(self):
+        """测试相同端点和配置共享同一限流器"""
+        first = get_rate_limiter("https://api.example.com/v1", 60, 0)
+        assert get_rate_limiter("https://api.example.com/v1", 60, 0) is first
+        assert get_rate_limiter("https://other.example.com/v1", 60, 0) is not first
+
+
+class TestBackoff:
+    """退避和Retry-After测试"""
+
+    def test_exponential_with_jitter(self):
+        """测试指数退避和抖动范围"""
+        assert backoff_delay(0, 2, 60, rng=lambda: 0.0) == 1.0
+        assert backoff_delay(0, 2, 60, rng=lambda: 0.999) == pytest.approx(2.0, abs=0.01)
+        assert backoff_delay(3, 2, 60, rng=lambda: 0.0) == 8.0
+        assert backoff_delay(10, 2, 60, rng=lambda: 0.0) == 30.0
+
+    def test_retry_after_takes_precedence(self):
+        """测试Retry-After优先"""
+        assert backoff_delay(0, 2, 60, retry_after=90) == 90
+
+    def test_parse_retry_after(self):
+        """测试解析秒数和HTTP日期"""
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        http_date = formatdate(timeval=time.time() + 30, usegmt=True)
+        assert 25 <= parse_retry_after(http_date) <= 30
+
+
+class _ThrottlingHandler(BaseHTTPRequestHandler):
+    """前若干次请求返回429的API桩"""
+
+    protocol_version = "HTTP/1.1"
+    throttle_count = 0
+    retry_after = "0.05"
+    requests = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        cls = type(self)
+        cls.requests += 1
+
+        if cls.requests <= cls.throttle_count:
+            body = b'{"error": "rate limited"}'
+            self.send_response(429)
+            self.send_header("Retry-After", cls.retry_after)
+        else:
+            content = json.dumps(
+                {
+                    "metadata": {"name": "demo", "folder_name": "demo", "keywords": []},
+                    "files": [{"path": "README.md", "content": "# Demo"}],
+                }
+            )
+            body = json.dumps({"choices": [{"message": {"content": content}}]}).encode("utf-8")
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestThrottledEndpoint:
+    """使用返回429的本地API桩测试重试"""
+
+    @pytest.fixture
+    def endpoint(self, monkeypatch):
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        _ThrottlingHandler.requests = 0
+        _ThrottlingHandler.retry_after = "0.05"
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _ThrottlingHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        server.shutdown()
+        server.server_close()
+
+    def _service(self, endpoint, retry_times=3, **values):
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: {
+            "ai.api_key": "test-key",
+            "ai.api_endpoint": endpoint,
+            "ai.retry_times": retry_times,
+            **values,
+        }.get(key, default)
+        return AIService(config)
+
+    def test_retry_after_honored(self, endpoint):
+        """测试429后按Retry-After等待并重试成功"""
+        _ThrottlingHandler.throttle_count = 2
+        ai_service = self._service(endpoint)
+
+        delays = []
+        original = ai_service._retry_delay
+
+        def record(attempt, error):
+            delays.append(original(attempt, error))
+            return delays[-1]
+
+        with patch.object(ai_service, "_retry_delay", side_effect=record):
+            result = ai_service.generate_demo("python", "logging")
+        ai_service.close()
+
+        assert result is not None
+        assert _ThrottlingHandler.requests == 3
+        assert delays == [0.05, 0.05]
+
+    def test_gives_up_after_retries(self, endpoint):
+        """测试持续429时在重试次数用尽后失败"""
+        _ThrottlingHandler.throttle_count = 100
+        ai_service = self._service(endpoint, retry_times=2)
+
+        result = ai_service.generate_demo("python", "logging")
+        ai_service.close()
+
+        assert result is None
+        assert _ThrottlingHandler.requests == 2
+
+    def test_retry_after_clamped(self, endpoint):
+        """测试过长的Retry-After不超过 ai.retry_max_interval"""
+        _ThrottlingHandler.throttle_count = 1
+        _ThrottlingHandler.retry_after = "3600"
+        ai_service = self._service(endpoint, **{"ai.retry_max_interval": 0.1})
+
+        delays = []
+        original = ai_service._retry_delay
+
+        def record(attempt, error):
+            delays.append(original(attempt, error))
+            return delays[-1]
+
+        with patch.object(ai_service, "_retry_delay", side_effect=record):
+            result = ai_service.generate_demo("python", "logging")
+        ai_service.close()
+
+        assert result is not None
+        assert delays == [0.1]
+
+    def test_pause_beyond_deadline_fails(self, endpoint):
+        """测试限流暂停超过 ai.total_timeout 剩余时间时放弃请求，而不是一直等待"""
+        ai_service = self._service(endpoint, **{"ai.total_timeout": 1})
+        ai_service._rate_limiter_for(endpoint).pause(3600)
+
+        started = time.monotonic()
+        result = ai_service.generate_demo("python", "logging")
+        ai_service.close()
+
+        assert result is None
+        assert time.monotonic() - started < 1
+        assert _ThrottlingHandler.requests == 0
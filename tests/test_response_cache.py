@@ -0,0 +1,196 @@
+"""
+ResponseCache 单元测试
+"""
+
+import asyncio
+import json
+import os
+import time
+import pytest
+from unittest.mock import patch
+from opendemo.services.ai_service import AIService, AsyncAIService
+from opendemo.services.response_cache import ResponseCache
+
+
+def _demo_response(name="cached-demo"):
+    """构造可解析的生成响应"""
+    return json.dumps(
+        {
+            "metadata": {
+                "name": name,
+                "folder_name": name,
+                "language": "python",
+                "keywords": [],
+                "description": "",
+                "difficulty": "beginner",
+                "dependencies": {},
+            },
+            "files": [{"path": "README.md", "content": "# Cached"}],
+        }
+    )
+
+
+@pytest.fixture
+def cached_config(mock_config, temp_dir):
+    """启用响应缓存的配置"""
+    base = mock_config.get.side_effect
+    overrides = {"cache_directory": str(temp_dir)}
+    mock_config.get.side_effect = lambda key, default=None: overrides.get(
+        key, base(key, default)
+    )
+    return mock_config
+
+
+class TestResponseCacheKey:
+    """缓存键测试"""
+
+    def test_key_is_stable_across_dict_order(self):
+        """测试键与字典顺序无关"""
+        a = ResponseCache.make_key("generate:v1", {"model": "m", "temperature": 0.7})
+        b = ResponseCache.make_key("generate:v1", {"temperature": 0.7, "model": "m"})
+        assert a == b
+
+    def test_key_changes_with_request(self):
+        """测试模型、参数或命名空间变化时键不同"""
+        base = ResponseCache.make_key("generate:v1", {"model": "m", "temperature": 0.7})
+        assert base != ResponseCache.make_key("generate:v1", {"model": "n", "temperature": 0.7})
+        assert base != ResponseCache.make_key("generate:v1", {"model": "m", "temperature": 0.2})
+        assert base != ResponseCache.make_key("generate:v2", {"model": "m", "temperature": 0.7})
+
+
+class TestResponseCacheStorage:
+    """缓存读写测试"""
+
+    def test_put_and_get(self, temp_dir):
+        """测试保存后可以读取"""
+        cache = ResponseCache(temp_dir)
+        key = ResponseCache.make_key("generate:v1", {"prompt": "hello"})
+
+        assert cache.get(key) is None
+        assert cache.put(key, "响应内容") is True
+        assert cache.get(key) == "响应内容"
+
+    def test_expired_entry_is_removed(self, temp_dir):
+        """测试过期条目失效并被删除"""
+        cache = ResponseCache(temp_dir, ttl_seconds=60)
+        key = ResponseCache.make_key("generate:v1", {"prompt": "hello"})
+        cache.put(key, "old")
+
+        with patch("opendemo.services.response_cache.time.time", return_value=time.time() + 120):
+            assert cache.get(key) is None
+        assert not cache._path(key).exists()
+
+    def test_corrupt_entry_is_discarded(self, temp_dir):
+        """测试损坏的条目被丢弃"""
+        cache = ResponseCache(temp_dir)
+        key = ResponseCache.make_key("generate:v1", {"prompt": "hello"})
+        cache.put(key, "ok")
+        cache._path(key).write_text("{not json", encoding="utf-8")
+
+        assert cache.get(key) is None
+        assert not cache._path(key).exists()
+
+    def test_evicts_least_recently_used(self, temp_dir):
+        """测试超出大小上限时淘汰最久未访问的条目"""
+        cache = ResponseCache(temp_dir, max_bytes=0)
+        keys = [ResponseCache.make_key("generate:v1", {"prompt": str(i)}) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, "x" * 1000)
+            os.utime(cache._path(key), (1000 + i, 1000 + i))
+        # 访问最早的条目，使其变为最近使用
+        cache.get(keys[0])
+
+        # 只够保留两个条目
+        sizes = [cache._path(key).stat().st_size for key in keys]
+        cache.max_bytes = sizes[0] + sizes[2]
+        assert cache.evict() == 1
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+
+    def test_clear(self, temp_dir):
+        """测试清空缓存"""
+        cache = ResponseCache(temp_dir)
+        for i in range(3):
+            cache.put(ResponseCache.make_key("generate:v1", {"prompt": str(i)}), "x")
+
+        assert cache.clear() == 3
+        assert list(temp_dir.glob("*/*.json")) == []
+
+
+class TestAIServiceResponseCache:
+    """AIService 响应缓存集成测试"""
+
+    def test_cache_disabled_without_directory(self, mock_config):
+        """测试未配置缓存目录时不启用缓存"""
+        assert AIService(mock_config).response_cache is None
+
+    def test_cache_disabled_by_config(self, cached_config):
+        """测试 ai.cache_enabled 为 false 时不启用缓存"""
+        base = cached_config.get.side_effect
+        cached_config.get.side_effect = lambda key, default=None: (
+            False if key == "ai.cache_enabled" else base(key, default)
+        )
+        assert AIService(cached_config).response_cache is None
+
+    def test_identical_generation_uses_cache(self, cached_config):
+        """测试相同请求第二次不调用API"""
+        ai_service = AIService(cached_config)
+
+        with patch.object(ai_service, "_call_api", return_value=_demo_response()) as mock_call:
+            first = ai_service.generate_demo("python", "cache test", "beginner")
+            second = AIService(cached_config).generate_demo("python", "cache test", "beginner")
+
+        assert mock_call.call_count == 1
+        assert first["metadata"]["name"] == second["metadata"]["name"] == "cached-demo"
+
+    def test_different_parameters_miss_cache(self, cached_config):
+        """测试难度不同时不命中缓存"""
+        ai_service = AIService(cached_config)
+
+        with patch.object(ai_service, "_call_api", return_value=_demo_response()) as mock_call:
+            ai_service.generate_demo("python", "cache test", "beginner")
+            ai_service.generate_demo("python", "cache test", "advanced")
+
+        assert mock_call.call_count == 2
+
+    def test_use_cache_false_refreshes_entry(self, cached_config):
+        """测试 use_cache=False 时重新调用API并更新缓存"""
+        ai_service = AIService(cached_config)
+
+        with patch.object(ai_service, "_call_api", return_value=_demo_response("first")):
+            ai_service.generate_demo("python", "cache test")
+        with patch.object(ai_service, "_call_api", return_value=_demo_response("second")) as call:
+            fresh = ai_service.generate_demo("python", "cache test", use_cache=False)
+            cached = ai_service.generate_demo("python", "cache test")
+
+        assert call.call_count == 1
+        assert fresh["metadata"]["name"] == "second"
+        assert cached["metadata"]["name"] == "second"
+
+    def test_unparseable_response_not_cached(self, cached_config):
+        """测试无法解析的响应不写入缓存"""
+        ai_service = AIService(cached_config)
+
+        with patch.object(ai_service, "_call_api", return_value="not json") as mock_call:
+            with patch("time.sleep"):
+                assert ai_service.generate_demo("python", "cache test") is None
+
+        assert mock_call.call_count == 3
+        assert list(ai_service.response_cache.directory.glob("*/*.json")) == []
+
+    def test_async_generation_uses_cache(self, cached_config):
+        """测试异步生成也命中缓存"""
+        ai_service = AIService(cached_config)
+        with patch.object(ai_service, "_call_api", return_value=_demo_response()):
+            ai_service.generate_demo("python", "cache test")
+
+        async_service = AsyncAIService(ai_service, max_workers=1)
+        try:
+            with patch.object(ai_service, "_call_api") as mock_call:
+                result = asyncio.run(async_service.generate_demo("python", "cache test"))
+            mock_call.assert_not_called()
+            assert result["metadata"]["name"] == "cached-demo"
+        finally:
+            async_service.close()
@@ -88,35 +88,44 @@ class TestDemoSearch:
         assert len(results) == 1
         assert results[0].name == "easy"
 
-    def test_calculate_match_score_name_match(self):
-        """测试名称匹配得分"""
-        demo = self._create_mock_demo("python-logging", "python", [], "Test")
+    def test_search_ranks_name_match_first(self):
+        """测试名称匹配的demo排在只有描述匹配的demo之前"""
+        described = self._create_mock_demo("python-basics", "python", [], "Intro to logging")
+        named = self._create_mock_demo("logging", "python", [], "Test")
+        prefixed = self._create_mock_demo("logging-handlers", "python", [], "Test")
 
         mock_repository = Mock()
+        mock_repository.load_all_demos.return_value = [described, prefixed, named]
+
         search = DemoSearch(mock_repository)
+        results = search.search_demos(keywords=["logging"])
 
-        score = search._calculate_demo_match_score(demo, keywords=["logging"])
-        assert score > 0
+        assert [d.name for d in results] == ["logging", "logging-handlers", "python-basics"]
 
-    def test_calculate_match_score_keyword_match(self):
-        """测试关键字匹配得分"""
-        demo = self._create_mock_demo("test", "python", ["logging", "debug"], "Test")
+    def test_search_keyword_match(self):
+        """测试只有关键字匹配的demo也被找到，且排在描述匹配之前"""
+        described = self._create_mock_demo("intro", "python", [], "Uses logging")
+        tagged = self._create_mock_demo("test", "python", ["logging", "debug"], "Test")
 
         mock_repository = Mock()
+        mock_repository.load_all_demos.return_value = [described, tagged]
+
         search = DemoSearch(mock_repository)
+        results = search.search_demos(keywords=["logging"])
 
-        score = search._calculate_demo_match_score(demo, keywords=["logging"])
-        assert score > 0
+        assert [d.name for d in results] == ["test", "intro"]
 
-    def test_calculate_match_score_no_match(self):
-        """测试无匹配得分"""
+    def test_search_no_match(self):
+        """测试没有匹配的关键字时返回空列表"""
         demo = self._create_mock_demo("test", "python", ["other"], "Test")
 
         mock_repository = Mock()
+        mock_repository.load_all_demos.return_value = [demo]
+
         search = DemoSearch(mock_repository)
 
-        score = search._calculate_demo_match_score(demo, keywords=["nonexistent"])
-        assert score == 0
+        assert search.search_demos(keywords=["nonexistent"]) == []
+        assert search.search_demos(keywords=["other"], difficulty="advanced") == []
 
     def test_find_exact(self):
         """测试精确查找"""
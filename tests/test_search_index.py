@@ -0,0 +1,324 @@
+"""
+SearchIndex 单元测试
+"""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+from opendemo.core.demo_repository import Demo
+from opendemo.core.demo_search import DemoSearch, FIELD_BOOSTS
+from opendemo.core.search_index import SearchIndex, PrefixIndex, TrigramIndex, tokenize
+
+
+def _feature(name, keywords=None, title="", description="", difficulty="beginner"):
+    """创建功能模块字典"""
+    return {
+        "name": name,
+        "keywords": keywords or [],
+        "title": title,
+        "description": description,
+        "difficulty": difficulty,
+    }
+
+
+class TestTokenize:
+    """分词测试"""
+
+    def test_split_on_separators(self):
+        """测试按连字符、下划线、空白切分"""
+        assert tokenize("Python-Logging basic_usage") == ["python", "logging", "basic", "usage"]
+
+    def test_list_input(self):
+        """测试列表输入"""
+        assert tokenize(["HTTP", "requests"]) == ["http", "requests"]
+
+    def test_cjk_bigrams(self):
+        """测试中文按二元组切分"""
+        assert tokenize("列表操作") == ["列表", "表操", "操作"]
+        assert tokenize("列") == ["列"]
+
+    def test_mixed_cjk_and_latin(self):
+        """测试中英文混写分别切分"""
+        assert tokenize("numpy数组 Python3列表") == ["numpy", "数组", "python3", "列表"]
+
+    def test_empty(self):
+        """测试空输入"""
+        assert tokenize(None) == []
+        assert tokenize("") == []
+
+
+class TestSearchIndex:
+    """SearchIndex 测试"""
+
+    def _build(self, docs):
+        return SearchIndex.build(docs, lambda d: d, FIELD_BOOSTS)
+
+    def test_exact_term_match(self):
+        """测试精确词项匹配"""
+        index = self._build([{"name": "python-logging"}, {"name": "python-http"}])
+        assert set(index.match("logging")) == {0}
+
+    def test_substring_match(self):
+        """测试子串匹配(与原有 in 判断语义一致)"""
+        index = self._build([{"name": "array-creation"}, {"name": "linalg"}])
+        assert set(index.match("arr")) == {0}
+        assert set(index.match("creat")) == {0}
+
+    def test_multi_token_query_requires_all_terms(self):
+        """测试多词项查询要求全部命中"""
+        index = self._build(
+            [
+                {"name": "array-creation"},
+                {"name": "array-indexing", "description": "slicing arrays"},
+            ]
+        )
+        assert set(index.match("array slicing")) == {1}
+
+    def test_field_boost_ordering(self):
+        """测试名称命中得分高于描述命中"""
+        index = self._build(
+            [
+                {"name": "threads", "description": "logging from threads"},
+                {"name": "logging", "description": "basic usage"},
+            ]
+        )
+        scores = index.match("logging")
+        assert scores[1] > scores[0]
+
+    def test_rare_term_scores_higher(self):
+        """测试稀有词项的IDF更高"""
+        index = self._build(
+            [
+                {"keywords": ["common", "rare"]},
+                {"keywords": ["common"]},
+                {"keywords": ["common"]},
+            ]
+        )
+        assert index.match("rare")[0] > index.match("common")[0]
+
+    def test_chinese_query(self):
+        """测试中文查询"""
+        index = self._build(
+            [
+                {"name": "list-ops", "keywords": ["列表推导式", "排序"]},
+                {"name": "dict-ops", "keywords": ["字典"], "description": "字典与列表的转换"},
+                {"name": "tuple-ops", "keywords": ["元组"]},
+            ]
+        )
+        assert set(index.match("列表")) == {0, 1}
+        assert set(index.match("列表推导")) == {0}
+        assert set(index.match("列")) == {0, 1}
+        assert index.match("集合") == {}
+
+    def test_no_match(self):
+        """测试无匹配"""
+        index = self._build([{"name": "logging"}])
+        assert index.match("nonexistent") == {}
+        assert index.match("---") == {}
+
+
+class TestPrefixIndex:
+    """PrefixIndex 测试"""
+
+    def test_exact_and_prefix(self):
+        """测试精确查找和前缀查找"""
+        index = PrefixIndex(["array-creation", "Array", "linalg", "array-indexing", "arrow"])
+
+        assert index.exact("array") == ["Array"]
+        assert index.prefix("array") == ["Array", "array-creation", "array-indexing"]
+        assert index.prefix("arr", limit=2) == ["Array", "array-creation"]
+        assert index.prefix("fft") == []
+        assert "LINALG" in index
+        assert "lin" not in index
+
+    def test_key_function_and_duplicates(self):
+        """测试自定义名称函数，同名文档保持添加顺序"""
+        first = {"name": "logging", "source": "builtin"}
+        second = {"name": "logging", "source": "output"}
+        index = PrefixIndex([first, second], key=lambda f: f["name"])
+
+        assert index.exact("logging") == [first, second]
+
+    def test_empty_prefix_returns_all(self):
+        """测试空前缀返回全部名称"""
+        index = PrefixIndex(["b", "a"])
+        assert index.prefix("") == ["a", "b"]
+
+
+class TestTrigramIndex:
+    """TrigramIndex 测试"""
+
+    def test_typo_suggestion(self):
+        """测试拼写错误时给出相近名称"""
+        index = TrigramIndex(["asyncio-basics", "asyncio-queue", "logging"])
+        suggestions = index.suggest("asyncio-basicss")
+
+        assert suggestions[0][0] == "asyncio-basics"
+        assert suggestions[0][1] > 0.6
+        assert "logging" not in [name for name, _ in suggestions]
+
+    def test_separators_are_equivalent(self):
+        """测试连字符、下划线、空格等价"""
+        index = TrigramIndex(["asyncio-basics"])
+        assert index.suggest("asyncio_basics")[0] == ("asyncio-basics", 1.0)
+
+    def test_threshold_and_limit(self):
+        """测试相似度阈值和数量限制"""
+        index = TrigramIndex([f"demo-{i}" for i in range(10)] + ["unrelated"])
+
+        assert len(index.suggest("demo-1", limit=3)) == 3
+        assert index.suggest("zzzz") == []
+
+    def test_duplicate_names_collapsed(self):
+        """测试重复名称只返回一次"""
+        index = TrigramIndex(["logging", "Logging", "logging"])
+        assert len(index) == 1
+
+
+class TestDemoSearchIndex:
+    """DemoSearch 使用索引的测试"""
+
+    def _demo(self, name, keywords=None, description="", difficulty="beginner"):
+        metadata = {
+            "name": name,
+            "language": "python",
+            "keywords": keywords or [],
+            "description": description,
+            "difficulty": difficulty,
+        }
+        return Demo(Path(f"/test/{name}"), metadata)
+
+    def test_search_demos_ranking(self):
+        """测试名称命中排在描述命中之前"""
+        by_description = self._demo("threads", description="logging from worker threads")
+        by_name = self._demo("python-logging")
+
+        repository = Mock()
+        repository.load_all_demos.return_value = [by_description, by_name]
+
+        results = DemoSearch(repository).search_demos(keywords=["logging"])
+        assert [d.name for d in results] == ["python-logging", "threads"]
+
+    def test_search_demos_partial_keywords(self):
+        """测试部分关键字命中时仍返回，但排在全部命中之后"""
+        both = self._demo("list-ops", keywords=["list", "sort"])
+        one = self._demo("list-basics", keywords=["list"])
+
+        repository = Mock()
+        repository.load_all_demos.return_value = [one, both]
+
+        results = DemoSearch(repository).search_demos(keywords=["list", "sort"])
+        assert [d.name for d in results] == ["list-ops", "list-basics"]
+
+    def test_search_demos_chinese_multi_term(self):
+        """测试中文多关键字查询"""
+        list_demo = self._demo("list-ops", keywords=["列表", "操作"], description="列表的常用操作")
+        dict_demo = self._demo("dict-ops", keywords=["字典"], description="字典操作")
+        other = self._demo("threads", keywords=["线程"])
+
+        repository = Mock()
+        repository.load_all_demos.return_value = [dict_demo, other, list_demo]
+
+        results = DemoSearch(repository).search_demos(keywords=["列表", "操作"])
+        assert [d.name for d in results] == ["list-ops", "dict-ops"]
+
+    def test_search_demos_difficulty_and_keywords(self):
+        """测试难度和关键字组合过滤"""
+        easy = self._demo("logging-easy", difficulty="beginner")
+        hard = self._demo("logging-hard", difficulty="advanced")
+
+        repository = Mock()
+        repository.load_all_demos.return_value = [easy, hard]
+
+        results = DemoSearch(repository).search_demos(keywords=["logging"], difficulty="advanced")
+        assert [d.name for d in results] == ["logging-hard"]
+
+    def test_index_reused_for_same_demos(self):
+        """测试demo列表未变化时复用索引"""
+        demos = [self._demo("python-logging")]
+        repository = Mock()
+        repository.load_all_demos.return_value = demos
+
+        search = DemoSearch(repository)
+        search.search_demos(language="python", keywords=["logging"])
+        index = search._index_cache["search:demos:all:python"][1]
+        search.search_demos(language="python", keywords=["python"])
+        assert search._index_cache["search:demos:all:python"][1] is index
+
+        repository.load_all_demos.return_value = demos + [self._demo("python-http")]
+        search.search_demos(language="python", keywords=["http"])
+        assert search._index_cache["search:demos:all:python"][1] is not index
+
+    def test_index_rebuilt_when_demo_replaced(self):
+        """测试demo对象被替换(数量不变)时重建索引，旧对象由缓存持有，id不会被新对象复用"""
+        repository = Mock()
+        repository.load_all_demos.return_value = [self._demo("python-logging")]
+        search = DemoSearch(repository)
+        search.search_demos(language="python", keywords=["logging"])
+
+        for _ in range(20):
+            repository.load_all_demos.return_value = [self._demo("python-http")]
+            results = search.search_demos(language="python", keywords=["http"])
+            assert [d.name for d in results] == ["python-http"]
+
+    def test_search_library_features(self):
+        """测试库功能搜索的精确、前缀、包含匹配排序"""
+        features = [
+            _feature("creation-array"),
+            _feature("array-creation"),
+            _feature("array"),
+            _feature("linalg", description="works on an array"),
+        ]
+        repository = Mock()
+        repository.list_library_features.return_value = features
+
+        results = DemoSearch(repository).search_library_features("python", "numpy", "array")
+        names = [feature["name"] for feature, score in results]
+        assert names[:2] == ["array", "array-creation"]
+        assert names[-1] == "linalg"
+        assert set(names) == {"array", "array-creation", "creation-array", "linalg"}
+
+    def test_complete_feature_names(self):
+        """测试功能名称前缀补全"""
+        repository = Mock()
+        repository.list_library_features.return_value = [
+            _feature("array-creation"),
+            _feature("linalg"),
+            _feature("array-indexing"),
+        ]
+
+        search = DemoSearch(repository)
+        assert search.complete_feature_names("python", "numpy", "arr") == [
+            "array-creation",
+            "array-indexing",
+        ]
+        assert search.complete_feature_names("python", "numpy", "x") == []
+
+    def test_find_exact_case_insensitive(self):
+        """测试精确查找不区分大小写"""
+        repository = Mock()
+        repository.load_all_demos.return_value = [self._demo("Python-Logging")]
+
+        result = DemoSearch(repository).find_exact("python-logging", "python")
+        assert result is not None
+        assert result.name == "Python-Logging"
+
+    def test_suggest_demos_and_features(self):
+        """测试相近demo和功能名称提示"""
+        repository = Mock()
+        repository.load_all_demos.return_value = [self._demo("python-logging")]
+        repository.list_library_features.return_value = [_feature("array-creation")]
+
+        search = DemoSearch(repository)
+        assert search.suggest_demos("python-loging", "python")[0][0] == "python-logging"
+        assert search.suggest_library_features("python", "numpy", "aray-creation")[0][0] == (
+            "array-creation"
+        )
+
+    def test_search_library_features_no_match(self):
+        """测试库功能搜索无匹配"""
+        repository = Mock()
+        repository.list_library_features.return_value = [_feature("linalg")]
+
+        search = DemoSearch(repository)
+        assert search.search_library_features("python", "numpy", "fft") == []
@@ -0,0 +1,110 @@
+"""
+SingleFlight 单元测试
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from opendemo.utils.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    """线程间请求合并测试"""
+
+    def test_concurrent_calls_share_result(self):
+        """测试相同键的并发调用只执行一次"""
+        flights = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def work():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return {"path": "/demo"}
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            first = pool.submit(flights.do, "key", work)
+            started.wait(5)
+            others = [pool.submit(flights.do, "key", work) for _ in range(4)]
+            results = [first.result()] + [f.result() for f in others]
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert flights.in_flight() == 0
+
+    def test_different_keys_run_independently(self):
+        """测试不同键互不合并"""
+        flights = SingleFlight()
+
+        assert flights.do("a", lambda: 1) == 1
+        assert flights.do("b", lambda: 2) == 2
+
+    def test_key_released_after_call(self):
+        """测试调用完成后再次调用会重新执行"""
+        flights = SingleFlight()
+        calls = []
+
+        flights.do("key", calls.append, 1)
+        flights.do("key", calls.append, 2)
+
+        assert calls == [1, 2]
+
+    def test_error_propagated_to_waiters(self):
+        """测试异常传递给所有合并的调用方"""
+        flights = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(flights.do, "key", fail)
+            started.wait(5)
+            second = pool.submit(flights.do, "key", fail)
+            for future in (first, second):
+                with pytest.raises(ValueError):
+                    future.result()
+
+        assert flights.in_flight() == 0
+
+
+class TestAsyncSingleFlight:
+    """协程间请求合并测试"""
+
+    def test_concurrent_coroutines_share_result(self):
+        """测试相同键的并发协程只执行一次"""
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+
+        async def main():
+            return await asyncio.gather(*(flights.do("key", work) for _ in range(3)))
+
+        assert asyncio.run(main()) == ["done", "done", "done"]
+        assert len(calls) == 1
+
+    def test_cancelled_waiter_does_not_cancel_call(self):
+        """测试某个调用方被取消时其他调用方仍得到结果"""
+        flights = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main():
+            first = asyncio.ensure_future(flights.do("key", work))
+            second = asyncio.ensure_future(flights.do("key", work))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(main()) == "done"
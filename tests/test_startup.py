@@ -0,0 +1,77 @@
+"""
+CLI启动导入测试
+
+轻量子命令不应导入 requests、AI服务、验证器等重量级模块。
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = [
+    "requests",
+    "opendemo.services.ai_service",
+    "opendemo.core.demo_verifier",
+    "opendemo.core.quality_checker",
+    "rich.markdown",
+]
+
+
+def _imported_modules(args, workdir: Path):
+    """在独立进程中运行CLI，返回 -X importtime 记录的模块名集合"""
+    code = "from opendemo.cli import cli"
+    if args:
+        code += f"; cli({args!r}, standalone_mode=False)"
+
+    env = dict(os.environ)
+    env["HOME"] = str(workdir)
+    env["USERPROFILE"] = str(workdir)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+class TestStartupImports:
+    """启动导入测试"""
+
+    @pytest.mark.parametrize(
+        "args",
+        [[], ["search", "python"], ["config", "get", "ai.model"]],
+        ids=["import", "search", "config-get"],
+    )
+    def test_light_commands_skip_heavy_modules(self, args, temp_dir):
+        """测试轻量命令不导入重量级模块"""
+        modules = _imported_modules(args, temp_dir)
+
+        assert "opendemo.cli" in modules
+        assert [m for m in HEAVY_MODULES if m in modules] == []
+
+    def test_package_attributes_are_lazy(self):
+        """测试包级别名称按需导入"""
+        import opendemo
+        import opendemo.core
+
+        assert opendemo.DemoManager is opendemo.DemoRepository
+        assert opendemo.core.SearchEngine is opendemo.core.DemoSearch
+        assert "QualityChecker" in dir(opendemo.core)
+        with pytest.raises(AttributeError):
+            opendemo.core.NotAThing
@@ -252,6 +252,19 @@ class TestStorageServiceCopy:
         
         assert result is False
 
+    def test_copy_demo_incremental(self, mock_config, temp_dir):
+        """测试重复复制时不重新复制未变化的文件"""
+        source_path = temp_dir / "source"
+        source_path.mkdir()
+        (source_path / "file.txt").write_text("content")
+        target_path = temp_dir / "target"
+        storage = StorageService(mock_config)
+        storage.copy_demo(source_path, target_path)
+        inode = (target_path / "file.txt").stat().st_ino
+
+        assert storage.copy_demo(source_path, target_path) is True
+        assert (target_path / "file.txt").stat().st_ino == inode
+
 
 class TestStorageServiceDelete:
     """删除Demo测试"""
@@ -0,0 +1,205 @@
+"""
+VenvPool 单元测试
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import Mock, patch
+from opendemo.core.demo_verifier import DemoVerifier
+from opendemo.core.venv_pool import VenvPool, _site_packages
+
+
+def _fake_build(size=100, delay=0.0):
+    """创建一个包含指定大小文件的“虚拟环境”"""
+
+    def build(path):
+        path.mkdir(parents=True)
+        time.sleep(delay)
+        (path / "lib.bin").write_bytes(b"x" * size)
+        return True, "installed"
+
+    return Mock(side_effect=build)
+
+
+class TestVenvPool:
+    """虚拟环境池测试"""
+
+    def test_reuse_same_requirements(self, temp_dir):
+        """测试依赖相同时只创建一次"""
+        pool = VenvPool(temp_dir)
+        build = _fake_build()
+
+        first, reused_first, output = pool.acquire("requests==2.31\n", build)
+        second, reused_second, _ = pool.acquire("requests==2.31\n", build)
+
+        assert first == second
+        assert (reused_first, reused_second) == (False, True)
+        assert output == "installed"
+        assert build.call_count == 1
+        # 直接在最终路径创建，创建后不再移动
+        assert build.call_args.args[0] == first
+        assert not list(temp_dir.glob("*.lock"))
+
+    def test_concurrent_acquire_builds_once(self, temp_dir):
+        """测试并行获取同一环境时只创建一次，其余等待后复用"""
+        pool = VenvPool(temp_dir)
+        build = _fake_build(delay=0.3)
+        results = []
+
+        def acquire():
+            results.append(pool.acquire("requests==2.31", build))
+
+        threads = [threading.Thread(target=acquire) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert build.call_count == 1
+        assert len({path for path, _, _ in results}) == 1
+        assert sorted(reused for _, reused, _ in results) == [False, True, True]
+
+    def test_key_normalizes_requirements(self):
+        """测试注释、空行、空白和顺序不影响键"""
+        a = "requests==2.31\nnumpy>=1.26  # 数组\n"
+        b = "# deps\n\nnumpy>=1.26\n  requests==2.31  \nrequests==2.31\n"
+
+        assert VenvPool.make_key(a) == VenvPool.make_key(b)
+        assert VenvPool.make_key(a) != VenvPool.make_key("requests==2.32")
+        assert VenvPool.make_key("") == VenvPool.make_key("# 仅标准库\n")
+
+    def test_failed_build_not_cached(self, temp_dir):
+        """测试安装失败的环境不保存"""
+        pool = VenvPool(temp_dir)
+
+        path, reused, output = pool.acquire("missing-pkg", lambda p: (False, "No matching"))
+
+        assert path is None
+        assert reused is False
+        assert output == "No matching"
+        assert list(temp_dir.iterdir()) == []
+
+    def test_overlay_uses_base_packages(self, temp_dir):
+        """测试叠加环境可以导入池中环境的包，且自身的前缀不同"""
+        base, overlay = temp_dir / "base", temp_dir / "overlay"
+        for path in (base, overlay):
+            subprocess.run([sys.executable, "-m", "venv", "--without-pip", str(path)], check=True)
+        (_site_packages(base) / "pooled_module.py").write_text("VALUE = 42\n", encoding="utf-8")
+
+        assert VenvPool.link_overlay(base, overlay)
+        python = overlay / ("Scripts/python.exe" if sys.platform == "win32" else "bin/python")
+        code = "import sys, pooled_module; print(pooled_module.VALUE, sys.prefix)"
+        output = subprocess.run(
+            [str(python), "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+
+        assert output[0] == "42"
+        assert os.path.samefile(output[1], overlay)
+
+    def test_evicts_least_recently_used(self, temp_dir):
+        """测试超过大小上限时淘汰最久未用的环境，保留刚获取的环境"""
+        pool = VenvPool(temp_dir, max_bytes=2500)
+        old, _, _ = pool.acquire("a", _fake_build(1000))
+        recent, _, _ = pool.acquire("b", _fake_build(1000))
+        pool.release(old)
+        pool.release(recent)
+        os.utime(old / ".opendemo-ready", (1, 1))
+
+        newest, _, _ = pool.acquire("c", _fake_build(1000))
+
+        assert not old.exists()
+        assert recent.exists()
+        assert newest.exists()
+        assert not list(temp_dir.glob("*.lock"))
+
+    def test_evict_skips_leased(self, temp_dir):
+        """测试仍在使用(持有租约)的环境不被淘汰，释放后才可淘汰"""
+        pool = VenvPool(temp_dir, max_bytes=1500)
+        in_use, _, _ = pool.acquire("a", _fake_build(1000))
+        os.utime(in_use / ".opendemo-ready", (1, 1))
+
+        newest, _, _ = pool.acquire("b", _fake_build(1000))
+
+        assert in_use.exists() and newest.exists()
+        # 其他任务复用同一环境时登记各自的租约
+        thread = threading.Thread(target=pool.acquire, args=("a", _fake_build()))
+        thread.start()
+        thread.join()
+        pool.release(in_use)
+        assert pool.evict(keep=newest.name) == 0
+
+        for lease in (in_use / ".opendemo-leases").iterdir():
+            os.utime(lease, (1, 1))
+        assert pool.evict(keep=newest.name) == 1
+        assert not in_use.exists()
+
+
+class TestVerifierVenvPool:
+    """验证器复用虚拟环境测试"""
+
+    def test_second_verification_reuses_venv(self, temp_dir):
+        """测试依赖相同的demo第二次验证时不再创建环境和安装依赖"""
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: {
+            "enable_verification": True,
+            "cache_directory": str(temp_dir / "cache"),
+        }.get(key, default)
+        verifier = DemoVerifier(config)
+        for name in ("one", "two"):
+            (temp_dir / name / "code").mkdir(parents=True)
+            (temp_dir / name / "code" / "main.py").write_text(f"print('{name}')", encoding="utf-8")
+            (temp_dir / name / "requirements.txt").write_text("rich\n", encoding="utf-8")
+
+        def create_venv(path, with_pip=True):
+            path.mkdir(parents=True)
+            return True
+
+        with patch.object(verifier, "_create_venv", side_effect=create_venv) as mock_create:
+            with patch.object(
+                verifier, "_install_dependencies", return_value=(True, "ok")
+            ) as mock_install:
+                with patch.object(verifier, "_run_python_file", return_value=(True, "1", "")):
+                    first = verifier.verify(temp_dir / "one", "python")
+                    second = verifier.verify(temp_dir / "two", "python")
+
+        assert first["verified"] is True and second["verified"] is True
+        assert "Installed dependencies" in first["steps"]
+        assert "Reused cached virtual environment" in second["steps"]
+        # 池中环境创建一次，每次验证各有一个不安装pip的叠加环境
+        pooled = [c for c in mock_create.call_args_list if c.kwargs.get("with_pip", True)]
+        assert len(pooled) == 1
+        assert mock_create.call_count == 3
+        assert mock_install.call_count == 1
+
+    def test_stdlib_demo_runs_in_pooled_venv(self, temp_dir):
+        """测试没有依赖的demo直接使用池中环境运行，不创建叠加环境，结束后释放租约"""
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: {
+            "enable_verification": True,
+            "cache_directory": str(temp_dir / "cache"),
+        }.get(key, default)
+        verifier = DemoVerifier(config)
+        (temp_dir / "demo" / "code").mkdir(parents=True)
+        (temp_dir / "demo" / "code" / "main.py").write_text("print(1)", encoding="utf-8")
+
+        def create_venv(path, with_pip=True):
+            path.mkdir(parents=True)
+            return True
+
+        with patch.object(verifier, "_create_venv", side_effect=create_venv) as mock_create:
+            with patch.object(
+                verifier, "_run_python_file", return_value=(True, "1", "")
+            ) as mock_run:
+                result = verifier.verify(temp_dir / "demo", "python")
+
+        assert result["verified"] is True
+        assert mock_create.call_count == 1
+        pooled = temp_dir / "cache" / "venvs" / VenvPool.make_key("")
+        assert mock_run.call_args.args[0] == pooled
+        assert not list((pooled / ".opendemo-leases").iterdir())
@@ -0,0 +1,123 @@
+"""
+验证结果缓存单元测试
+"""
+
+from unittest.mock import Mock, patch
+from opendemo.core.demo_verifier import VERIFIER_VERSION, DemoVerifier
+from opendemo.core.verification_cache import VerificationCache, hash_demo_tree
+
+
+def _demo(root):
+    (root / "code").mkdir(parents=True)
+    (root / "code" / "main.py").write_text("print('hello')", encoding="utf-8")
+    (root / "README.md").write_text("# demo", encoding="utf-8")
+    return root
+
+
+class TestHashDemoTree:
+    """demo内容哈希测试"""
+
+    def test_ignores_pycache_and_dotfiles(self, temp_dir):
+        """测试忽略 __pycache__、以点开头的文件和目录以及 metadata.json"""
+        demo = _demo(temp_dir / "demo")
+        before = hash_demo_tree(demo)
+
+        (demo / "code" / "__pycache__").mkdir()
+        (demo / "code" / "__pycache__" / "main.cpython-311.pyc").write_bytes(b"\0")
+        (demo / ".DS_Store").write_bytes(b"\0")
+        (demo / ".venv" / "bin").mkdir(parents=True)
+        (demo / ".venv" / "bin" / "python").write_text("", encoding="utf-8")
+        (demo / "metadata.json").write_text('{"verified": true}', encoding="utf-8")
+
+        assert hash_demo_tree(demo) == before
+
+    def test_content_and_name_changes(self, temp_dir):
+        """测试文件内容或名称变化时哈希变化"""
+        demo = _demo(temp_dir / "demo")
+        original = hash_demo_tree(demo)
+
+        (demo / "code" / "main.py").write_text("print('bye')", encoding="utf-8")
+        edited = hash_demo_tree(demo)
+        (demo / "code" / "main.py").rename(demo / "code" / "app.py")
+
+        assert len({original, edited, hash_demo_tree(demo)}) == 3
+
+
+class TestVerifierResultCache:
+    """验证器使用结果缓存测试"""
+
+    def _verifier(self, temp_dir, **values):
+        values = {
+            "enable_verification": True,
+            "cache_directory": str(temp_dir / "cache"),
+            **values,
+        }
+        config = Mock()
+        config.get.side_effect = lambda key, default=None: values.get(key, default)
+        return DemoVerifier(config)
+
+    def test_unchanged_demo_uses_cached_result(self, temp_dir):
+        """测试内容没有变化的demo不再验证，修改后重新验证"""
+        demo = _demo(temp_dir / "demo")
+        verifier = self._verifier(temp_dir)
+        passed = {"verified": True, "method": "venv", "steps": ["Executed main.py"]}
+
+        with patch.object(verifier, "_verify_python", return_value=passed) as mock_verify:
+            first = verifier.verify(demo, "python")
+            second = verifier.verify(demo, "python")
+            (demo / "code" / "main.py").write_text("print('changed')", encoding="utf-8")
+            third = verifier.verify(demo, "python")
+
+        assert mock_verify.call_count == 2
+        assert "cached" not in first
+        assert second["cached"] is True
+        assert second["steps"] == ["Executed main.py"]
+        assert second["duration"] >= 0
+        assert "cached" not in third
+
+    def test_toolchain_change_invalidates(self, temp_dir):
+        """测试工具链版本变化时重新验证"""
+        demo = _demo(temp_dir / "demo")
+        verifier = self._verifier(temp_dir)
+
+        with patch.object(verifier, "_verify_go", return_value={"verified": True}) as mock_verify:
+            with patch.object(verifier, "_toolchain_version", return_value="go1.21"):
+                verifier.verify(demo, "go")
+                verifier.verify(demo, "go")
+            with patch.object(verifier, "_toolchain_version", return_value="go1.22"):
+                verifier.verify(demo, "go")
+
+        assert mock_verify.call_count == 2
+
+    def test_refresh_and_disabled(self, temp_dir):
+        """测试失败结果不缓存，强制刷新时重新验证并更新缓存，关闭缓存时不读写缓存"""
+        demo = _demo(temp_dir / "demo")
+        failed = {"verified": False, "errors": ["Failed to install dependencies"]}
+        passed = {"verified": True}
+
+        verifier = self._verifier(temp_dir)
+        with patch.object(verifier, "_verify_python", side_effect=[failed, passed]) as mock_verify:
+            assert verifier.verify(demo, "python")["verified"] is False
+            assert verifier.verify(demo, "python")["verified"] is True
+        assert mock_verify.call_count == 2
+
+        refresh = self._verifier(temp_dir, verification_cache_refresh=True)
+        with patch.object(refresh, "_verify_python", return_value=passed) as mock_verify:
+            assert "cached" not in refresh.verify(demo, "python")
+        mock_verify.assert_called_once()
+        cached = self._verifier(temp_dir)
+        with patch.object(cached, "_verify_python") as mock_verify:
+            assert cached.verify(demo, "python")["cached"] is True
+        mock_verify.assert_not_called()
+
+        disabled = self._verifier(temp_dir, verification_cache=False)
+        with patch.object(disabled, "_verify_python", return_value=passed) as mock_verify:
+            disabled.verify(demo, "python")
+        mock_verify.assert_called_once()
+
+    def test_key_includes_verifier_version(self):
+        """测试验证器版本变化时键变化"""
+        key = VerificationCache.make_key("abc", "python", "3.11", VERIFIER_VERSION)
+
+        assert key != VerificationCache.make_key("abc", "python", "3.11", VERIFIER_VERSION + 1)
+        assert key != VerificationCache.make_key("abc", "go", "3.11", VERIFIER_VERSION)